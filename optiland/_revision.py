@@ -0,0 +1,121 @@
+"""Revision tracking utilities for Optiland.
+
+Provides a mixin that tracks the modifications of an object, so that results
+computed from the object can be reused as long as it is unmodified. Assigning
+an attribute marks the object as modified, unless the new value is identical
+or equal to the old one. In-place modifications of attribute values (e.g.,
+setting an element of a coefficient array) are not detected and must be
+followed by a call to `mark_dirty`.
+
+Revisions are drawn from a single process-wide clock, so the latest revision
+among a set of objects (see `latest_revision`) increases whenever any of them
+is modified. This is how the state version of an optic is derived from the
+revisions of its surfaces.
+
+Kramer Harrison, 2025
+"""
+
+from __future__ import annotations
+
+import threading
+from numbers import Number
+from typing import TYPE_CHECKING, Any, ClassVar
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+_MISSING = object()
+
+_clock_lock = threading.Lock()
+_clock = 0
+
+
+def next_revision(floor: int = 0) -> int:
+    """Return a new revision from the clock.
+
+    Args:
+        floor (int, optional): A revision the new revision must exceed.
+            Defaults to 0.
+
+    Returns:
+        int: A revision larger than `floor` and than all revisions returned
+        before.
+    """
+    global _clock
+    with _clock_lock:
+        _clock = max(_clock, floor) + 1
+        return _clock
+
+
+def latest_revision(objects: Iterable[Any], floor: int = 0) -> int:
+    """Return the latest revision among objects.
+
+    The clock is advanced to the returned revision, so that later
+    modifications exceed it even if the objects were created in another
+    process (e.g., unpickled in a worker).
+
+    Args:
+        objects (Iterable): The objects. Objects without a revision (e.g.,
+            None) are ignored.
+        floor (int, optional): A revision included in the maximum, e.g., of
+            state not held by the objects. Defaults to 0.
+
+    Returns:
+        int: The latest revision.
+    """
+    global _clock
+    latest = max((getattr(obj, "revision", 0) for obj in objects), default=0)
+    latest = max(latest, floor)
+    with _clock_lock:
+        _clock = max(_clock, latest)
+    return latest
+
+
+def _is_tensor(value: Any) -> bool:
+    """Whether a value is a torch tensor, without importing torch."""
+    return type(value).__module__.startswith("torch") and hasattr(
+        value, "requires_grad"
+    )
+
+
+def _unchanged(old: Any, new: Any) -> bool:
+    """Whether an attribute assignment leaves the value unchanged."""
+    if old is new:
+        return True
+    numeric = (Number, np.ndarray, np.generic)
+    if isinstance(old, numeric) and isinstance(new, numeric):
+        return bool(np.array_equal(old, new))
+    if _is_tensor(old) and _is_tensor(new):
+        # a new tensor in the autograd graph is a change, even if it is equal
+        if old.requires_grad or new.requires_grad:
+            return False
+        return old.shape == new.shape and bool((old == new).all())
+    return False
+
+
+class RevisionTracked:
+    """Mixin tracking the modifications of an object.
+
+    Attributes listed in `_untracked_attributes` (e.g., recorded ray data,
+    diagnostics or caches) do not mark the object as modified.
+    """
+
+    _revision: int = 0
+    _untracked_attributes: ClassVar[frozenset[str]] = frozenset()
+
+    def __setattr__(self, name: str, value: Any):
+        old = self.__dict__.get(name, _MISSING)
+        super().__setattr__(name, value)
+        if name not in self._untracked_attributes and not _unchanged(old, value):
+            self.mark_dirty()
+
+    @property
+    def revision(self) -> int:
+        """int: The revision of the last modification of the object."""
+        return self._revision
+
+    def mark_dirty(self):
+        """Mark the object as modified."""
+        object.__setattr__(self, "_revision", next_revision(self._revision))
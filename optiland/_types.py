@@ -29,6 +29,7 @@ __all__ = [
     "Fields",
     "FieldType",
     "PlotProjection",
+    "RecordPolicy",
     "ReferenceRay",
     "WavelengthUnit",
     "Wavelengths",
@@ -61,6 +62,7 @@ Fields = Literal["all"] | Sequence[tuple[float, float]]
 FieldType = Literal["angle", "object_height"]
 PlotProjection = Literal["2d", "3d"]
 ReferenceRay = Literal["chief", "marginal"]
+RecordPolicy = Literal["all", "image", "none"] | Sequence[int]
 Wavelengths = Literal["all", "primary"] | Sequence[float]
 WavelengthUnit = Literal["nm", "um", "mm", "cm", "m"]
 ZernikeType = Literal["standard", "noll", "fringe"]
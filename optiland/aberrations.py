@@ -5,6 +5,10 @@ This module computes first- and third-order aberrations of optical systems.
 The aberration calculations are based on the algorithms outlined in
 Modern Optical Engineering by Warren Smith (Chapter 6.3).
 
+The aberrations, and the paraxial quantities they are computed from, are
+memoized per state of the optic while its state cache is active, see
+`optiland.state_cache`.
+
 Kramer Harrison, 2023
 """
 
@@ -13,6 +17,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 import optiland.backend as be
+from optiland.state_cache import state_cached
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -34,6 +39,7 @@ class Aberrations:
     def __init__(self, optic: Optic):
         self.optic = optic
 
+    @state_cached
     def third_order(self) -> tuple[BEArray, ...]:
         """
         Compute all third-order aberrations and first-order color terms.
@@ -90,6 +96,7 @@ class Aberrations:
             S,
         )
 
+    @state_cached
     def seidels(self) -> BEArray:
         """
         Compute the Seidel aberration coefficients.
@@ -106,6 +113,7 @@ class Aberrations:
         S = self._sum_seidels(TSC, CC, TAC, TPC, DC)
         return S.squeeze()
 
+    @state_cached
     def TSC(self) -> BEArray:
         """
         Compute third-order transverse spherical aberration.
@@ -116,6 +124,7 @@ class Aberrations:
         self._precalculations()
         return self._compute_over_surfaces(self._TSC_term).flatten()
 
+    @state_cached
     def SC(self) -> BEArray:
         """
         Compute third-order longitudinal spherical aberration.
@@ -128,6 +137,7 @@ class Aberrations:
         SC = -TSC / self._ua[-1]
         return SC.flatten()
 
+    @state_cached
     def CC(self) -> BEArray:
         """
         Compute third-order sagittal coma.
@@ -138,6 +148,7 @@ class Aberrations:
         self._precalculations()
         return self._compute_over_surfaces(self._CC_term).flatten()
 
+    @state_cached
     def TCC(self) -> BEArray:
         """
         Compute third-order tangential coma.
@@ -147,6 +158,7 @@ class Aberrations:
         """
         return (self.CC() * 3).flatten()
 
+    @state_cached
     def TAC(self) -> BEArray:
         """
         Compute third-order transverse astigmatism.
@@ -157,6 +169,7 @@ class Aberrations:
         self._precalculations()
         return self._compute_over_surfaces(self._TAC_term).flatten()
 
+    @state_cached
     def AC(self) -> BEArray:
         """
         Compute third-order longitudinal astigmatism.
@@ -169,6 +182,7 @@ class Aberrations:
         AC = -TAC / self._ua[-1]
         return AC.flatten()
 
+    @state_cached
     def TPC(self) -> BEArray:
         """
         Compute third-order transverse Petzval sum.
@@ -179,6 +193,7 @@ class Aberrations:
         self._precalculations()
         return self._compute_over_surfaces(self._TPC_term).flatten()
 
+    @state_cached
     def PC(self) -> BEArray:
         """
         Compute third-order longitudinal Petzval sum.
@@ -191,6 +206,7 @@ class Aberrations:
         PC = -TPC / self._ua[-1]
         return PC.flatten()
 
+    @state_cached
     def DC(self) -> BEArray:
         """
         Compute third-order distortion.
@@ -201,6 +217,7 @@ class Aberrations:
         self._precalculations()
         return self._compute_over_surfaces(self._DC_term).flatten()
 
+    @state_cached
     def TAchC(self) -> BEArray:
         """
         Compute first-order transverse axial color.
@@ -211,6 +228,7 @@ class Aberrations:
         self._precalculations()
         return self._compute_over_surfaces(self._TAchC_term).flatten()
 
+    @state_cached
     def LchC(self) -> BEArray:
         """
         Compute first-order longitudinal axial color.
@@ -223,6 +241,7 @@ class Aberrations:
         LchC = -TAchC / self._ua[-1]
         return LchC.flatten()
 
+    @state_cached
     def TchC(self) -> BEArray:
         """
         Compute first-order lateral color.
@@ -251,57 +270,89 @@ class Aberrations:
         """
         Perform all necessary precalculations for aberration computations.
 
-        This method computes and stores common parameters required by the
-        various aberration term methods.
+        This method stores common parameters required by the various
+        aberration term methods. They are set on every call, from the
+        memoized result of `_precalculated`, such that they always match the
+        current state of the optic.
+        """
+        (
+            self._inv,
+            self._on_axis,
+            self._n,
+            self._N,
+            self._C,
+            self._ya,
+            self._ua,
+            self._yb,
+            self._ub,
+            self._hp,
+            self._dn,
+            self._i,
+            self._ip,
+            self._B,
+            self._Bp,
+        ) = self._precalculated()
+
+    @state_cached
+    def _precalculated(self) -> tuple:
+        """
+        Compute the common parameters of the aberration computations.
+
+        Returns:
+            tuple: The parameters, in the order of the attributes they are
+            stored in by `_precalculations`.
         """
-        self._inv: float = self.optic.paraxial.invariant()  # Lagrange invariant
-        self._on_axis = be.isclose(self._inv, be.array(0.0))
+        inv = self.optic.paraxial.invariant()  # Lagrange invariant
+        on_axis = be.isclose(inv, be.array(0.0))
         # Refractive indices for all surfaces
-        self._n: BEArray = self.optic.surfaces.n(self.optic.primary_wavelength)
-        self._N: int = self.optic.surfaces.num_surfaces
-        self._C = 1 / self.optic.surfaces.radii
-        self._ya, self._ua = self.optic.paraxial.marginal_ray()
-        self._yb, self._ub = self.optic.paraxial.chief_ray()
-        self._hp = self._inv / (self._n[-1] * self._ua[-1])
-        self._dn = self.optic.surfaces.n(0.4861) - self.optic.surfaces.n(0.6563)
+        n = self.optic.surfaces.n(self.optic.primary_wavelength)
+        N = self.optic.surfaces.num_surfaces
+        C = 1 / self.optic.surfaces.radii
+        ya, ua = self.optic.paraxial.marginal_ray()
+        yb, ub = self.optic.paraxial.chief_ray()
 
         i_list = []
         ip_list = []
         B_list = []
         Bp_list = []
 
-        for k in range(1, self._N - 1):
-            i_val = (self._C[k] * self._ya[k] + self._ua[k - 1])[0]
-            ip_val = (self._C[k] * self._yb[k] + self._ub[k - 1])[0]
+        for k in range(1, N - 1):
+            i_val = (C[k] * ya[k] + ua[k - 1])[0]
+            ip_val = (C[k] * yb[k] + ub[k - 1])[0]
             i_list.append(i_val)
             ip_list.append(ip_val)
 
-            if self._on_axis:
+            if on_axis:
                 B_list.append(0)
                 Bp_list.append(0)
             else:
-                denom = 2 * self._n[k] * self._inv
+                denom = 2 * n[k] * inv
                 B_val = (
-                    self._n[k - 1]
-                    * (self._n[k] - self._n[k - 1])
-                    * self._ya[k]
-                    * (self._ua[k] + i_val)
-                    / denom
+                    n[k - 1] * (n[k] - n[k - 1]) * ya[k] * (ua[k] + i_val) / denom
                 )[0]
                 Bp_val = (
-                    self._n[k - 1]
-                    * (self._n[k] - self._n[k - 1])
-                    * self._yb[k]
-                    * (self._ub[k] + ip_val)
-                    / denom
+                    n[k - 1] * (n[k] - n[k - 1]) * yb[k] * (ub[k] + ip_val) / denom
                 )[0]
                 B_list.append(B_val)
                 Bp_list.append(Bp_val)
 
-        self._i = be.array(i_list)
-        self._ip = be.array(ip_list)
-        self._B = be.array(B_list)
-        self._Bp = be.array(Bp_list)
+        return (
+            inv,
+            on_axis,
+            n,
+            N,
+            C,
+            ya,
+            ua,
+            yb,
+            ub,
+            inv / (n[-1] * ua[-1]),
+            self.optic.surfaces.n(0.4861) - self.optic.surfaces.n(0.6563),
+            be.array(i_list),
+            be.array(ip_list),
+            be.array(B_list),
+            be.array(Bp_list),
+        )
 
     def _TSC_on_axis_term(self, k: int) -> float:
         """
@@ -189,7 +189,7 @@ class EncircledEnergy(SpotDiagram):
             SpotData: SpotData object containing x, y, and intensity arrays.
 
         """
-        self.optic.trace(*field, wavelength, num_rays, distribution)
+        self.optic.trace(*field, wavelength, num_rays, distribution, record="image")
         x = self.optic.surfaces.x[-1, :]
         y = self.optic.surfaces.y[-1, :]
         intensity = self.optic.surfaces.intensity[-1, :]
@@ -3,11 +3,15 @@ from __future__ import annotations
 from .distortion_warper import DistortionWarper
 from .engine import ImageSimulationEngine
 from .psf_basis_generator import PSFBasisGenerator
+from .psf_cache import PSFCache
 from .simulator import SpatiallyVariableSimulator
+from .tiled import TiledSimulator
 
 __all__ = [
     "PSFBasisGenerator",
+    "PSFCache",
     "SpatiallyVariableSimulator",
     "DistortionWarper",
     "ImageSimulationEngine",
+    "TiledSimulator",
 ]
@@ -42,7 +42,24 @@ class DistortionWarper:
         Generates the sampling grid required by grid_sample to warp the source image
         using a polynomial fit to the distortion.
         """
-        H, W = image_shape
+        model = self.fit_distortion_map(wavelength, num_grid_points, degree)
+        return self.evaluate_distortion_map(model, image_shape)
+
+    def fit_distortion_map(self, wavelength, num_grid_points=25, degree=5):
+        """
+        Fits the polynomial model of the distortion, which maps the real image
+        plane coordinates to the normalized coordinates of the source image.
+
+        Args:
+            wavelength (float): Wavelength in um.
+            num_grid_points (int, optional): Number of traced field points
+                along each axis. Default: 25.
+            degree (int, optional): Degree of the polynomial. Default: 5.
+
+        Returns:
+            dict: The polynomial coefficients and the extent of the real
+            image plane.
+        """
         max_fx, max_fy = self.source_fov
 
         # 1. Trace Grid (normalized coordinates)
@@ -82,25 +99,55 @@ class DistortionWarper:
         X_features = self._poly_features(x_real, y_real, degree)
 
         # Solve X * c = gx  => c = lstsq(X, gx)
-        c_gx = be.lstsq(X_features, gx_flat)
-        c_gy = be.lstsq(X_features, gy_flat)
-
-        # 4. Evaluate on Target Grid (Detector Pixels)
-        min_x, max_x = be.min(x_real), be.max(x_real)
-        min_y, max_y = be.min(y_real), be.max(y_real)
+        return {
+            "c_gx": be.lstsq(X_features, gx_flat),
+            "c_gy": be.lstsq(X_features, gy_flat),
+            "extent": (
+                be.min(x_real),
+                be.max(x_real),
+                be.min(y_real),
+                be.max(y_real),
+            ),
+            "degree": degree,
+        }
+
+    def evaluate_distortion_map(self, model, image_shape, rows=None, cols=None):
+        """
+        Evaluates the distortion model on the detector pixels, optionally on
+        a window of rows and columns only, e.g., for tiled simulation.
+
+        Args:
+            model (dict): The distortion model from `fit_distortion_map`.
+            image_shape (tuple): (H, W) of the full image.
+            rows (slice, optional): Rows of the window. Default: all rows.
+            cols (slice, optional): Columns of the window. Default: all
+                columns.
+
+        Returns:
+            be.ndarray: The sampling grid (1, h, w, 2) of the window.
+        """
+        H, W = image_shape
+        min_x, max_x, min_y, max_y = model["extent"]
 
         # Create target mesh (H, W)
         ty = be.linspace(max_y, min_y, H)
         tx = be.linspace(min_x, max_x, W)
+        if rows is not None:
+            ty = ty[rows]
+        if cols is not None:
+            tx = tx[cols]
+        h, w = ty.shape[0], tx.shape[0]
         grid_x, grid_y = be.meshgrid(tx, ty)
 
-        X_grid = self._poly_features(grid_x.flatten(), grid_y.flatten(), degree)
+        X_grid = self._poly_features(
+            grid_x.flatten(), grid_y.flatten(), model["degree"]
+        )
 
         # Predict normalized coordinates for every pixel
-        target_gx = be.matmul(X_grid, c_gx).reshape([H, W])
-        target_gy = be.matmul(X_grid, c_gy).reshape([H, W])
+        target_gx = be.matmul(X_grid, model["c_gx"]).reshape([h, w])
+        target_gy = be.matmul(X_grid, model["c_gy"]).reshape([h, w])
 
-        # Stack (H, W, 2) and add batch dim (1, H, W, 2)
+        # Stack (h, w, 2) and add batch dim (1, h, w, 2)
         grid = be.stack((target_gx, -target_gy), axis=-1)
         return (
             grid.unsqueeze(0)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+
 import numpy as np
 from scipy.ndimage import zoom
 
@@ -7,7 +9,9 @@ import optiland.backend as be
 
 from .distortion_warper import DistortionWarper
 from .psf_basis_generator import PSFBasisGenerator
+from .psf_cache import PSFCache
 from .simulator import SpatiallyVariableSimulator
+from .tiled import TiledSimulator
 
 
 class ImageSimulationEngine:
@@ -19,6 +23,8 @@ class ImageSimulationEngine:
         optic (Optic): The optical system model.
         source_image (ArrayLike): The input source image (H, W, 3) or (H, W).
                                   Expected to be in RGB format if 3 channels.
+                                  A path to a `.npy` file is loaded as a
+                                  memory-mapped array.
         config (dict): Configuration dictionary.
             - wavelength (list[float]): List of 3 wavelengths (um) for R, G, B.
             - psf_grid_shape (tuple): (ny, nx) for PSF basis generation.
@@ -27,14 +33,54 @@ class ImageSimulationEngine:
             - n_components (int): Number of EigenPSFs.
             - oversample (int): Upsampling factor for simulation accuracy.
             - padding (int): Pixel padding (guard band) to avoid edge artifacts.
+            - psf_cache (PSFCache | str | None): Cache of the EigenPSF bases,
+              which can be shared by several engines, such that repeated
+              simulations through the same optic skip the PSF generation. A
+              string is the directory of an on-disk cache. Default: None.
+            - tile_size (int | None): If set, the simulation runs tile by tile
+              with tiles of this size, see `TiledSimulator`, such that peak
+              memory scales with the tile size rather than the image size.
+              The source image is then kept as is, e.g., memory-mapped. Only
+              supported with the numpy backend. Default: None.
+            - workers (int | None): Number of threads of the tiled
+              simulation. Default: None, i.e., the number of CPUs.
+            - scratch_dir (str | None): Directory of the scratch files of the
+              tiled simulation. Default: None, i.e., the temporary directory.
+            - psf_support_threshold (float): Relative threshold of the PSF
+              support, which sets the tile guard bands. Default: 0.0.
     """
 
     def __init__(self, optic, source_image, config=None):
         self.optic = optic
         self.simulated_image = None
 
+        # Default config
+        self.config = {
+            "wavelengths": [0.65, 0.55, 0.45],  # R, G, B standard approx
+            "psf_grid_shape": (5, 5),
+            "psf_size": 128,
+            "num_rays": 64,  # Optimized for performance (was 128)
+            "n_components": 3,
+            "oversample": 1,
+            "padding": 64,
+            "psf_cache": None,
+            "tile_size": None,
+            "workers": None,
+            "scratch_dir": None,
+            "psf_support_threshold": 0.0,
+        }
+        if config:
+            self.config.update(config)
+        if isinstance(self.config["psf_cache"], str | os.PathLike):
+            self.config["psf_cache"] = PSFCache(directory=self.config["psf_cache"])
+        tiled = self.config["tile_size"] is not None
+
         # Load image if path string
-        if isinstance(source_image, str):
+        if isinstance(source_image, str | os.PathLike) and str(source_image).endswith(
+            ".npy"
+        ):
+            img = np.load(source_image, mmap_mode="r")
+        elif isinstance(source_image, str):
             import matplotlib.image as mpimg
 
             img = mpimg.imread(source_image)
@@ -44,38 +90,41 @@ class ImageSimulationEngine:
         else:
             img = source_image
 
-        # Ensure source is (C, H, W) or (H, W) backend array
-        img = be.array(img)
+        # Ensure source is (C, H, W) or (H, W) backend array, or numpy array
+        # without copy in tiled mode
+        if not tiled:
+            img = be.array(img)
+        elif not isinstance(img, np.ndarray):
+            img = np.asarray(img)
         if img.ndim == 3 and img.shape[2] == 3:
             # (H, W, 3) -> (3, H, W)
-            img = be.transpose(img, (2, 0, 1))
+            img = (
+                np.transpose(img, (2, 0, 1)) if tiled else be.transpose(img, (2, 0, 1))
+            )
         elif img.ndim == 2:
             # Monochromatic/Grayscale -> (1, H, W)
             img = img[None, :, :]
 
         self.source_image = img
 
-        # Default config
-        self.config = {
-            "wavelengths": [0.65, 0.55, 0.45],  # R, G, B standard approx
-            "psf_grid_shape": (5, 5),
-            "psf_size": 128,
-            "num_rays": 64,  # Optimized for performance (was 128)
-            "n_components": 3,
-            "oversample": 1,
-            "padding": 64,
-        }
-        if config:
-            self.config.update(config)
-
-    def run(self):
+    def run(self, output=None):
         """
         Executes the simulation pipeline.
 
+        Args:
+            output (str | ArrayLike, optional): Output of the tiled
+                simulation, which is written tile by tile: the path of a
+                `.npy` file, written as a memory-mapped array, or an array
+                (H, W, C). If None, a new array is returned. Only used if
+                `tile_size` is set. Default: None.
+
         Returns:
             be.ndarray: The simulated image (H, W, C) or (H, W).
                         Values defined by input dynamic range.
         """
+        if self.config["tile_size"] is not None:
+            return self._run_tiled(output)
+
         # 1. Preprocessing
         # Pad and Upsample
         processed_input, pad_info = self._preprocess(self.source_image)
@@ -106,6 +155,7 @@ class ImageSimulationEngine:
                 grid_shape=self.config["psf_grid_shape"],
                 num_rays=self.config["num_rays"],
                 psf_grid_size=self.config["psf_size"],
+                cache=self.config["psf_cache"],
             )
             eigen_psfs, coeffs, mean_psf = gen.generate_basis(
                 n_components=self.config["n_components"]
@@ -139,6 +189,68 @@ class ImageSimulationEngine:
         self.simulated_image = result
         return result
 
+    def _run_tiled(self, output):
+        """Executes the simulation pipeline tile by tile."""
+        if be.get_backend() != "numpy":
+            raise NotImplementedError(
+                "Tiled simulation is only supported with the numpy backend."
+            )
+
+        C, H, W = self.source_image.shape
+        wavelengths = self.config["wavelengths"]
+        # Handle grayscale input with 3 wavelengths -> treat as RGB result
+        if C == 1 and len(wavelengths) == 3:
+            channels = [self.source_image[0]] * 3
+        else:
+            channels = [self.source_image[c] for c in range(min(C, len(wavelengths)))]
+
+        # EigenPSF basis and distortion model per channel
+        bases = []
+        warps = []
+        for wave in wavelengths[: len(channels)]:
+            gen = PSFBasisGenerator(
+                self.optic,
+                wavelength=wave,
+                grid_shape=self.config["psf_grid_shape"],
+                num_rays=self.config["num_rays"],
+                psf_grid_size=self.config["psf_size"],
+                cache=self.config["psf_cache"],
+            )
+            bases.append(gen.generate_basis(n_components=self.config["n_components"]))
+            warper = DistortionWarper(self.optic)
+            warps.append((warper.fit_distortion_map(wave), warper))
+
+        shape = (H, W, len(channels))
+        if output is None:
+            output = np.zeros(shape)
+        elif isinstance(output, str | os.PathLike):
+            output = np.lib.format.open_memmap(
+                output, mode="w+", dtype=np.float64, shape=shape
+            )
+        elif tuple(output.shape) != shape:
+            raise ValueError(
+                f"Output shape {tuple(output.shape)} does not match the "
+                f"simulated image shape {shape}."
+            )
+
+        simulator = TiledSimulator(
+            tile_size=self.config["tile_size"],
+            workers=self.config["workers"],
+            scratch_dir=self.config["scratch_dir"],
+            support_threshold=self.config["psf_support_threshold"],
+        )
+        result = simulator.run(
+            channels,
+            bases,
+            warps,
+            self.config["padding"],
+            self.config["oversample"],
+            output,
+        )
+
+        self.simulated_image = result
+        return result
+
     def view(self, force_rerun=False):
         """
         Visualizes the original and simulated images side-by-side.
@@ -150,11 +262,10 @@ class ImageSimulationEngine:
         import matplotlib.pyplot as plt
 
         # Prepare source for display (C, H, W) -> (H, W, C) using backend generic
-        src = self.source_image
-        if src.ndim == 3:
-            src = be.transpose(src, (1, 2, 0))
+        src_np = be.to_numpy(self.source_image)
+        if src_np.ndim == 3:
+            src_np = np.transpose(src_np, (1, 2, 0))
 
-        src_np = be.to_numpy(src)
         sim_np = be.to_numpy(self.simulated_image)
 
         # Ensure correct range for display
@@ -4,7 +4,11 @@ import numpy as np
 from scipy.ndimage import zoom
 
 import optiland.backend as be
+from optiland.psf.batched_fft import BatchedFFTPSF
 from optiland.psf.fft import FFTPSF
+from optiland.utils import resolve_wavelength
+
+_BASIS_NAMES = ("eigen_psfs", "coefficient_grid", "mean_psf")
 
 
 class PSFBasisGenerator:
@@ -22,25 +26,49 @@ class PSFBasisGenerator:
         psf_grid_size (int, optional): PSF grid size (e.g., 256 for 256x256).
 
             If None, calculated from num_rays.
+        cache (PSFCache, optional): Cache of the PSF grids and EigenPSF bases,
+            keyed on the optic state, wavelength, grid shape and sampling.
+            If None, nothing is cached. Default: None.
     """
 
     def __init__(
-        self, optic, wavelength, grid_shape=(5, 5), num_rays=128, psf_grid_size=None
+        self,
+        optic,
+        wavelength,
+        grid_shape=(5, 5),
+        num_rays=128,
+        psf_grid_size=None,
+        cache=None,
     ):
         self.optic = optic
         self.wavelength = wavelength
         self.grid_shape = grid_shape
         self.num_rays = num_rays
         self.psf_grid_size = psf_grid_size
+        self.cache = cache
+
+    def _cache_key(self, kind, **params):
+        """Returns the cache key of the data of this generator."""
+        return self.cache.make_key(
+            self.optic,
+            kind=kind,
+            wavelength=float(resolve_wavelength(self.optic, self.wavelength)),
+            grid_shape=[int(n) for n in self.grid_shape],
+            num_rays=self.num_rays,
+            psf_grid_size=self.psf_grid_size,
+            **params,
+        )
 
     def generate_basis(self, n_components=3):
         """
         Computes the EigenPSFs and their corresponding coefficient maps.
 
+        If a cache is set, the basis is read from the cache if available, and
+        added to the cache otherwise.
+
         Args:
             n_components (int): Number of principal components (EigenPSFs) to keep.
 
-        Returns:
         Returns:
             tuple:
                 - eigen_psfs (be.ndarray): Basis PSFs, shape (n_components, H, W).
@@ -49,6 +77,12 @@ class PSFBasisGenerator:
                 - mean_psf (be.ndarray): Average PSF across field, shape (H, W).
 
         """
+        if self.cache is not None:
+            key = self._cache_key("basis", n_components=n_components)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return tuple(be.array(cached[name]) for name in _BASIS_NAMES)
+
         # 1. Generate Grid of PSFs
         psf_stack = self._compute_psf_grid()
         n_psfs, h, w = psf_stack.shape
@@ -94,36 +128,65 @@ class PSFBasisGenerator:
             coeffs_t, (n_components, self.grid_shape[0], self.grid_shape[1])
         )
 
-        return eigen_psfs, coefficient_grid, mean_psf
+        basis = (eigen_psfs, coefficient_grid, mean_psf)
+        if self.cache is not None:
+            self.cache.put(
+                key,
+                {
+                    name: be.to_numpy(x)
+                    for name, x in zip(_BASIS_NAMES, basis, strict=True)
+                },
+            )
+        return basis
 
     def _compute_psf_grid(self):
-        """Generates the stack of PSFs across the field of view."""
-        psfs = []
+        """Generates the stack of PSFs across the field of view.
+
+        For unpolarized systems, the PSFs of all grid nodes are computed at
+        once with `BatchedFFTPSF`. If a cache is set, the stack is read from
+        the cache if available, and added to the cache otherwise.
+        """
+        if self.cache is None:
+            return self._trace_psf_grid()
+
+        arrays = self.cache.get_or_compute(
+            self._cache_key("psf_grid"),
+            lambda: {"psfs": be.to_numpy(self._trace_psf_grid())},
+        )
+        return be.array(arrays["psfs"])
+
+    def _trace_psf_grid(self):
+        """Computes the stack of normalized PSFs across the field of view."""
         ny, nx = self.grid_shape
 
         # Iterate over normalized field coordinates [-1, 1]
         ys = np.linspace(-1, 1, ny)
         xs = np.linspace(-1, 1, nx)
-
-        for y in ys:
-            for x in xs:
-                field = (x, y)
-
-                # Compute PSF
-                psf_calc = FFTPSF(
+        fields = [(x, y) for y in ys for x in xs]
+
+        if self.optic.polarization_state is None:
+            psf_cube = BatchedFFTPSF(
+                optic=self.optic,
+                fields=fields,
+                wavelengths=[resolve_wavelength(self.optic, self.wavelength)],
+                num_rays=self.num_rays,
+                grid_size=self.psf_grid_size,
+            ).psf
+            raw_psfs = [psf_cube[k, 0] for k in range(len(fields))]
+        else:
+            raw_psfs = [
+                FFTPSF(
                     optic=self.optic,
                     field=field,
                     wavelength=self.wavelength,
                     num_rays=self.num_rays,
                     grid_size=self.psf_grid_size,
-                )
-
-                # Normalize sum to 1 to treat as probability distribution
-                raw_psf = psf_calc.psf
-                norm_psf = raw_psf / be.sum(raw_psf)
-                psfs.append(norm_psf)
+                ).psf
+                for field in fields
+            ]
 
-        return be.stack(psfs)
+        # Normalize sum to 1 to treat as probability distribution
+        return be.stack([raw_psf / be.sum(raw_psf) for raw_psf in raw_psfs])
 
     @staticmethod
     def resize_coefficient_map(coeff_map, target_shape):
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+# names of the on-disk entries and of their temporary directories
+_KEY_PATTERN = re.compile(r"\.?[0-9a-f]{64}(\..+)?")
+
+
+class PSFCache:
+    """
+    Two-level cache of PSF data, such as PSF grids and EigenPSF bases.
+
+    Entries are dictionaries of named arrays, identified by a key that is a
+    content hash of the optic state and of the parameters the arrays depend
+    on (see `make_key`). Recently used entries are kept in memory, up to
+    `max_entries` entries. If a directory is given, entries are also stored
+    on disk, with one `.npy` file per array, so that they persist across
+    sessions and are loaded as memory-mapped arrays.
+
+    The cache can be shared by several `PSFBasisGenerator` or
+    `ImageSimulationEngine` instances, such that repeated simulations through
+    the same optic skip the PSF generation.
+
+    Args:
+        max_entries (int, optional): Maximum number of entries kept in memory.
+            Defaults to 16.
+        directory (str | Path, optional): Directory of the on-disk layer. If
+            None, entries are only kept in memory. Defaults to None.
+        mmap_mode (str | None, optional): Memory-map mode used to load arrays
+            from disk, see `numpy.load`. Defaults to "r".
+
+    Attributes:
+        hits (int): Number of lookups served from memory or disk.
+        misses (int): Number of lookups not found in the cache.
+    """
+
+    def __init__(self, max_entries=16, directory=None, mmap_mode="r"):
+        if max_entries < 1:
+            raise ValueError("max_entries must be a positive integer.")
+        self.max_entries = max_entries
+        self.directory = None if directory is None else Path(directory)
+        self.mmap_mode = mmap_mode
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(optic, **params):
+        """
+        Computes the cache key of an optic state and a set of parameters.
+
+        The optic state is its serialized form (`Optic.to_dict`), such that
+        any change of the optic, e.g., of a radius or a material, changes the
+        key.
+
+        Args:
+            optic (Optic): The optical system.
+            **params: The parameters the cached arrays depend on, e.g., the
+                wavelength, field grid and sampling. Values must be JSON
+                serializable, or are converted with `str`.
+
+        Returns:
+            str: The hexadecimal SHA-256 digest of the optic and parameters.
+        """
+        content = json.dumps(
+            {"optic": optic.to_dict(), "params": params}, sort_keys=True, default=str
+        )
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """
+        Returns the arrays of an entry, from memory or from disk.
+
+        Args:
+            key (str): The key of the entry.
+
+        Returns:
+            dict[str, np.ndarray] | None: The arrays of the entry, or None if
+            the entry is not in the cache.
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+        path = self._path(key)
+        if path is not None and path.is_dir():
+            arrays = {
+                file.stem: np.load(file, mmap_mode=self.mmap_mode)
+                for file in sorted(path.glob("*.npy"))
+            }
+            self._store(key, arrays)
+            self.hits += 1
+            return arrays
+
+        self.misses += 1
+        return None
+
+    def put(self, key, arrays):
+        """
+        Adds an entry to the cache.
+
+        Args:
+            key (str): The key of the entry.
+            arrays (dict[str, ArrayLike]): The named arrays of the entry.
+        """
+        arrays = {name: np.asarray(value) for name, value in arrays.items()}
+        self._store(key, arrays)
+
+        path = self._path(key)
+        if path is None or path.is_dir():
+            return
+
+        # write to a temporary directory first, so that concurrent readers
+        # never see a partially written entry
+        tmp = Path(tempfile.mkdtemp(prefix=f".{key}.", dir=self.directory))
+        try:
+            for name, value in arrays.items():
+                np.save(tmp / f"{name}.npy", value)
+            os.replace(tmp, path)
+        except OSError:
+            # the entry was written concurrently by another process
+            if not path.is_dir():
+                raise
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns the arrays of an entry, computing and adding it if required.
+
+        Args:
+            key (str): The key of the entry.
+            compute (Callable[[], dict[str, ArrayLike]]): Computes the arrays
+                of the entry.
+
+        Returns:
+            dict[str, np.ndarray]: The arrays of the entry.
+        """
+        arrays = self.get(key)
+        if arrays is None:
+            self.put(key, compute())
+            arrays = self._entries[key]
+        return arrays
+
+    def clear(self, disk=False):
+        """
+        Removes all entries from memory and, optionally, from disk.
+
+        Only the entries of the cache are removed from disk, i.e., the
+        directories named after a cache key and their temporary directories,
+        such that other content of the cache directory is kept.
+
+        Args:
+            disk (bool, optional): If True, the on-disk entries are also
+                removed. Defaults to False.
+        """
+        self._entries.clear()
+        if disk and self.directory is not None:
+            for path in self.directory.iterdir():
+                if path.is_dir() and self._is_entry(path.name):
+                    shutil.rmtree(path, ignore_errors=True)
+
+    def __contains__(self, key):
+        path = self._path(key)
+        return key in self._entries or (path is not None and path.is_dir())
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _is_entry(name):
+        """Checks if a directory name is an entry or a temporary entry."""
+        match = _KEY_PATTERN.fullmatch(name)
+        # entries are named "<key>", temporary entries ".<key>.<suffix>"
+        return match is not None and (name[0] == ".") == (match.group(1) is not None)
+
+    def _path(self, key):
+        """Returns the on-disk directory of an entry, if any."""
+        return None if self.directory is None else self.directory / key
+
+    def _store(self, key, arrays):
+        """Adds an entry to the memory layer, evicting the oldest entries."""
+        self._entries[key] = arrays
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+from scipy.ndimage import map_coordinates
+from scipy.signal import fftconvolve
+
+import optiland.backend as be
+
+
+def _zoom_coordinates(start, stop, size_in, size_out):
+    """Input coordinates of the output samples [start, stop) of `scipy.ndimage.zoom`
+    along one axis."""
+    return np.arange(start, stop) * ((size_in - 1) / max(size_out - 1, 1))
+
+
+def _reflect_index(index, size):
+    """Maps indices outside [0, size) into the array as `np.pad` (mode='reflect')."""
+    if size == 1:
+        return np.zeros_like(index)
+    period = 2 * (size - 1)
+    index = np.abs(index) % period
+    return np.where(index >= size, period - index, index)
+
+
+def _tiles(shape, tile_size):
+    """Yields the (row, column) slices of the tiles of an image."""
+    for r0 in range(0, shape[0], tile_size):
+        for c0 in range(0, shape[1], tile_size):
+            yield (
+                slice(r0, min(r0 + tile_size, shape[0])),
+                slice(c0, min(c0 + tile_size, shape[1])),
+            )
+
+
+def _clip(start, stop, size):
+    """Clips the range [start, stop) to [0, size)."""
+    return max(start, 0), min(stop, size)
+
+
+def _support(kernels, threshold):
+    """Bounding box of the kernel values above a relative threshold.
+
+    Args:
+        kernels (np.ndarray): Stack of kernels, shape (K, P, P).
+        threshold (float): Threshold relative to the maximum absolute value.
+
+    Returns:
+        tuple[slice, slice]: The row and column ranges of the support.
+    """
+    magnitude = np.max(np.abs(kernels), axis=0)
+    rows, cols = np.nonzero(magnitude > threshold * np.max(magnitude))
+    if rows.size == 0:
+        return slice(0, 1), slice(0, 1)
+    return (
+        slice(int(rows.min()), int(rows.max()) + 1),
+        slice(int(cols.min()), int(cols.max()) + 1),
+    )
+
+
+class TiledSimulator:
+    """
+    Tiled, out-of-core execution of the image simulation pipeline.
+
+    The padded and upsampled source image, the blurred image and the warped
+    image of `ImageSimulationEngine` are never held in memory as a whole.
+    The simulation runs in two passes over tiles, for each channel:
+
+    1. Blur: each tile of the upsampled image is computed from the source
+       image with a guard band derived from the support of the PSFs, and is
+       convolved with the mean PSF and the EigenPSFs (overlap-save). The
+       blurred image is written to a memory-mapped scratch file.
+    2. Warp: each tile of the output image is computed by warping the
+       region of the blurred image it maps to, then downsampled and cropped,
+       and written to the output image.
+
+    Padding, upsampling and coefficient map resizing use the same bilinear
+    sampling as the in-memory pipeline, evaluated on the tile only, such that
+    both pipelines give the same image. Peak memory scales with the tile size
+    and the number of workers. Tiles are processed in parallel with threads.
+
+    Args:
+        tile_size (int, optional): Size of the tiles in pixels. Default: 512.
+        workers (int, optional): Number of threads. If None, the number of
+            CPUs is used. Default: None.
+        scratch_dir (str, optional): Directory of the scratch files. If None,
+            the default temporary directory is used. Default: None.
+        support_threshold (float, optional): Kernel values below this
+            fraction of the maximum value, outside the support of the PSFs,
+            are dropped, which narrows the guard bands. Default: 0.0.
+    """
+
+    def __init__(
+        self, tile_size=512, workers=None, scratch_dir=None, support_threshold=0.0
+    ):
+        if tile_size < 1:
+            raise ValueError("tile_size must be a positive integer.")
+        self.tile_size = tile_size
+        self.workers = workers or os.cpu_count() or 1
+        self.scratch_dir = scratch_dir
+        self.support_threshold = support_threshold
+
+    def run(self, channels, bases, warps, pad, scale, out):
+        """
+        Simulates the channels of an image and writes them to the output.
+
+        Args:
+            channels (list[ArrayLike]): Source images (H, W), one per output
+                channel. Memory-mapped arrays are read tile by tile.
+            bases (list[tuple]): EigenPSF basis of each channel, as returned
+                by `PSFBasisGenerator.generate_basis`.
+            warps (list[tuple]): Distortion model of each channel, as
+                returned by `DistortionWarper.fit_distortion_map`, and the
+                warper.
+            pad (int): Padding of the source images in pixels.
+            scale (int): Upsampling factor.
+            out (ArrayLike): Output image (H, W, C), e.g., a memory-mapped
+                array. Written tile by tile.
+
+        Returns:
+            ArrayLike: The output image.
+        """
+        with tempfile.TemporaryDirectory(dir=self.scratch_dir) as scratch:
+            for c, (source, basis, warp) in enumerate(
+                zip(channels, bases, warps, strict=True)
+            ):
+                frame = _Frame(source, pad, scale)
+                eigen_psfs, coefficient_grid, mean_psf = (be.to_numpy(x) for x in basis)
+                kernels = np.concatenate([mean_psf[None], eigen_psfs])
+                support = _support(kernels, self.support_threshold)
+                blurred = np.lib.format.open_memmap(
+                    os.path.join(scratch, f"blurred_{c}.npy"),
+                    mode="w+",
+                    dtype=np.float64,
+                    shape=frame.upsampled_shape,
+                )
+                self._map(
+                    partial(
+                        self._blur_tile,
+                        frame,
+                        kernels,
+                        support,
+                        coefficient_grid,
+                        blurred,
+                    ),
+                    _tiles(frame.upsampled_shape, self.tile_size),
+                )
+                blurred.flush()
+
+                self._map(
+                    partial(self._warp_tile, frame, blurred, warp, out, c),
+                    _tiles(frame.source.shape, self.tile_size),
+                )
+                del blurred
+        if hasattr(out, "flush"):
+            out.flush()
+        return out
+
+    def _map(self, function, tiles):
+        """Applies a function to all tiles, in parallel if required."""
+        if self.workers == 1:
+            for tile in tiles:
+                function(*tile)
+            return
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for _ in executor.map(lambda tile: function(*tile), tiles):
+                pass
+
+    def _blur_tile(self, frame, kernels, support, coefficient_grid, out, rows, cols):
+        """
+        Computes a tile of the blurred upsampled image (overlap-save).
+
+        Args:
+            frame (_Frame): The frame of the source image.
+            kernels (np.ndarray): The mean PSF followed by the EigenPSFs,
+                shape (K + 1, P, P).
+            support (tuple[slice, slice]): The support of the kernels.
+            coefficient_grid (np.ndarray): Coefficient maps on the low
+                resolution grid, shape (K, ny, nx).
+            out (ArrayLike): The blurred upsampled image.
+            rows (slice): Rows of the tile.
+            cols (slice): Columns of the tile.
+        """
+
+        # the output of a 'same' convolution at index i is the full convolution
+        # at index i + (P - 1) // 2, which depends on the input over
+        # [i + (P - 1) // 2 - (stop - 1), i + (P - 1) // 2 - start]
+        windows = []
+        for s, k, size in zip((rows, cols), support, kernels.shape[1:], strict=True):
+            offset = (size - 1) // 2
+            windows.append((s.start + offset - k.stop + 1, s.stop + offset - k.start))
+
+        image = frame.upsampled(*windows)
+        coefficients = frame.coefficients(coefficient_grid, *windows)
+
+        kernels = kernels[:, support[0], support[1]]
+        tile = fftconvolve(image, kernels[0], mode="valid")
+        for k in range(1, kernels.shape[0]):
+            tile += fftconvolve(image * coefficients[k - 1], kernels[k], mode="valid")
+        out[rows, cols] = tile
+
+    def _warp_tile(self, frame, blurred, warp, out, channel, rows, cols):
+        """Computes a tile of the output image from the blurred image."""
+        model, warper = warp
+        height, width = frame.upsampled_shape
+
+        # rows and columns of the warped image required for the tile
+        ranges = []
+        for s, size, size_out in zip(
+            (rows, cols), frame.upsampled_shape, frame.downsampled_shape, strict=True
+        ):
+            if frame.scale > 1:
+                coords = _zoom_coordinates(
+                    s.start + frame.pad, s.stop + frame.pad, size, size_out
+                )
+                start = int(np.floor(coords[0]))
+                stop = min(int(np.floor(coords[-1])) + 2, size)
+                ranges.append((start, stop, coords - start))
+            else:
+                ranges.append((s.start + frame.pad, s.stop + frame.pad, None))
+
+        grid = be.to_numpy(
+            warper.evaluate_distortion_map(
+                model,
+                frame.upsampled_shape,
+                rows=slice(ranges[0][0], ranges[0][1]),
+                cols=slice(ranges[1][0], ranges[1][1]),
+            )
+        )[0]
+
+        # pixel coordinates in the blurred image, as in `be.grid_sample`
+        x = (grid[..., 0] + 1) * width / 2 - 0.5
+        y = (grid[..., 1] + 1) * height / 2 - 0.5
+        warped = np.zeros(x.shape)
+        r0, r1 = _clip(
+            int(np.floor(np.min(y))) - 1, int(np.floor(np.max(y))) + 3, height
+        )
+        c0, c1 = _clip(
+            int(np.floor(np.min(x))) - 1, int(np.floor(np.max(x))) + 3, width
+        )
+        if r0 < r1 and c0 < c1:
+            warped = map_coordinates(
+                np.asarray(blurred[r0:r1, c0:c1]),
+                [y - r0, x - c0],
+                order=1,
+                mode="constant",
+                cval=0.0,
+            )
+
+        if frame.scale > 1:
+            y, x = np.meshgrid(ranges[0][2], ranges[1][2], indexing="ij")
+            warped = map_coordinates(warped, [y, x], order=1)
+
+        out[rows, cols, channel] = np.maximum(warped, 0.0)
+
+
+class _Frame:
+    """
+    Geometry of the padded and upsampled frame of a source image.
+
+    Args:
+        source (ArrayLike): The source image (H, W).
+        pad (int): Padding in pixels (reflect mode).
+        scale (int): Upsampling factor.
+    """
+
+    def __init__(self, source, pad, scale):
+        self.source = source
+        self.pad = pad
+        self.scale = scale
+        self.padded_shape = tuple(n + 2 * pad for n in source.shape)
+        if scale > 1:
+            self.upsampled_shape = tuple(
+                int(round(n * scale)) for n in self.padded_shape
+            )
+            self.downsampled_shape = tuple(
+                int(round(n / scale)) for n in self.upsampled_shape
+            )
+        else:
+            self.upsampled_shape = self.padded_shape
+            self.downsampled_shape = self.padded_shape
+
+    def _padded(self, rows, cols):
+        """Reads rows and columns of the padded source image."""
+        rows = _reflect_index(rows - self.pad, self.source.shape[0])
+        cols = _reflect_index(cols - self.pad, self.source.shape[1])
+        r0, c0 = rows.min(), cols.min()
+        window = np.asarray(
+            self.source[r0 : rows.max() + 1, c0 : cols.max() + 1], dtype=np.float64
+        )
+        return window[np.ix_(rows - r0, cols - c0)]
+
+    def upsampled(self, rows, cols):
+        """
+        Returns a window of the upsampled image, which is zero outside of the
+        frame.
+
+        Args:
+            rows (tuple[int, int]): Row range [start, stop) of the window.
+            cols (tuple[int, int]): Column range [start, stop) of the window.
+
+        Returns:
+            np.ndarray: The window.
+        """
+        window = np.zeros((rows[1] - rows[0], cols[1] - cols[0]))
+        r0, r1 = _clip(*rows, self.upsampled_shape[0])
+        c0, c1 = _clip(*cols, self.upsampled_shape[1])
+        if r0 >= r1 or c0 >= c1:
+            return window
+
+        if self.scale > 1:
+            coords = []
+            indices = []
+            for start, stop, size, size_out in zip(
+                (r0, c0), (r1, c1), self.padded_shape, self.upsampled_shape, strict=True
+            ):
+                x = _zoom_coordinates(start, stop, size, size_out)
+                first = int(np.floor(x[0]))
+                last = min(int(np.floor(x[-1])) + 1, size - 1)
+                coords.append(x - first)
+                indices.append(np.arange(first, last + 1))
+            padded = self._padded(*indices)
+            y, x = np.meshgrid(*coords, indexing="ij")
+            values = map_coordinates(padded, [y, x], order=1)
+        else:
+            values = self._padded(np.arange(r0, r1), np.arange(c0, c1))
+
+        window[r0 - rows[0] : r1 - rows[0], c0 - cols[0] : c1 - cols[0]] = values
+        return window
+
+    def coefficients(self, coefficient_grid, rows, cols):
+        """
+        Returns a window of the coefficient maps resized to the upsampled
+        frame, as `PSFBasisGenerator.resize_coefficient_map`.
+
+        Args:
+            coefficient_grid (np.ndarray): Coefficient maps on the low
+                resolution grid, shape (K, ny, nx).
+            rows (tuple[int, int]): Row range [start, stop) of the window.
+            cols (tuple[int, int]): Column range [start, stop) of the window.
+
+        Returns:
+            np.ndarray: The window of the coefficient maps, shape (K, h, w).
+        """
+        n_components, ny, nx = coefficient_grid.shape
+        window = np.zeros((n_components, rows[1] - rows[0], cols[1] - cols[0]))
+        r0, r1 = _clip(*rows, self.upsampled_shape[0])
+        c0, c1 = _clip(*cols, self.upsampled_shape[1])
+        if r0 >= r1 or c0 >= c1:
+            return window
+
+        y = _zoom_coordinates(r0, r1, ny, self.upsampled_shape[0])
+        x = _zoom_coordinates(c0, c1, nx, self.upsampled_shape[1])
+        y, x = np.meshgrid(y, x, indexing="ij")
+        for k in range(n_components):
+            window[k, r0 - rows[0] : r1 - rows[0], c0 - cols[0] : c1 - cols[0]] = (
+                map_coordinates(coefficient_grid[k], [y, x], order=1)
+            )
+        return window
@@ -22,6 +22,7 @@ import numpy as _np  # Use _np for plotting logic.
 
 import optiland.backend as be
 from optiland.rays import RealRays
+from optiland.raytrace.executor import get_executor
 
 from .base import BaseAnalysis
 
@@ -250,17 +251,22 @@ class IncoherentIrradiance(BaseAnalysis):
 
     def _generate_data(self):
         """Generates irradiance data for all fields and wavelengths."""
-        data = []
-        for field in self.fields:
-            f_block = []
-            for wp in self.wavelengths:
-                f_block.append(
-                    self._generate_field_data(
-                        field, wp.value, self.distribution, self.user_initial_rays
-                    )
-                )
-            data.append(f_block)
-        return data
+        jobs = [
+            (field, wp.value, self.distribution, self.user_initial_rays)
+            for field in self.fields
+            for wp in self.wavelengths
+        ]
+        if self.skip_trace:
+            # no tracing; all jobs bin the ray data cached on the detector
+            results = [self._generate_field_data(*args) for args in jobs]
+        else:
+            results = get_executor().map(self, "_generate_field_data", jobs)
+
+        num_wavelengths = len(self.wavelengths)
+        return [
+            results[k : k + num_wavelengths]
+            for k in range(0, len(results), num_wavelengths)
+        ]
 
     def _generate_field_data(self, field, wavelength, distribution, user_initial_rays):
         """
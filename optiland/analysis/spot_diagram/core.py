@@ -12,6 +12,7 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING, Literal
 
 import optiland.backend as be
+from optiland.raytrace.executor import get_executor
 from optiland.utils import resolve_fields
 from optiland.visualization.system.utils import transform
 
@@ -423,18 +424,17 @@ class SpotDiagram(BaseAnalysis):
         Returns:
             A nested list of spot intersection data.
         """
-        return [
-            [
-                self._generate_field_data(
-                    fp.coord,
-                    wp.value,
-                    self.num_rings,
-                    self.distribution,
-                    self.coordinates,
-                )
-                for wp in self.wavelengths
-            ]
+        jobs = [
+            (fp.coord, wp.value, self.num_rings, self.distribution, self.coordinates)
             for fp in self.fields
+            for wp in self.wavelengths
+        ]
+        results = get_executor().map(self, "_generate_field_data", jobs)
+
+        num_wavelengths = len(self.wavelengths)
+        return [
+            results[k : k + num_wavelengths]
+            for k in range(0, len(results), num_wavelengths)
         ]
 
     def _generate_field_data(
@@ -458,7 +458,7 @@ class SpotDiagram(BaseAnalysis):
         Returns:
             A SpotData object with the traced ray intersection data.
         """
-        self.optic.trace(*field, wavelength, num_rays, distribution)
+        self.optic.trace(*field, wavelength, num_rays, distribution, record="image")
         surf_group = self.optic.surfaces
         x_g, y_g, z_g, i_g = (
             surf_group.x[-1, :],
@@ -22,6 +22,7 @@ from optiland.thin_film import ThinFilmStack
 
 if TYPE_CHECKING:
     from optiland.rays import RealRays
+    from optiland.thin_film import RTLookupTable
 
 
 class BaseCoating(ABC):
@@ -572,6 +573,33 @@ class ThinFilmCoating(BaseCoatingPolarized):
         """The Jones matrix model associated with the thin-film coating."""
         return self._jones
 
+    def enable_lookup_table(
+        self,
+        wavelength_um: float | be.ndarray,
+        num_aoi: int = 90,
+        tolerance: float | None = None,
+    ) -> RTLookupTable:
+        """Interpolate the coefficients of traced rays from a lookup table.
+
+        See `ThinFilmStack.enable_lookup_table`.
+
+        Args:
+            wavelength_um: Wavelength(s) of the table in microns, e.g., the
+                wavelengths of the optical system.
+            num_aoi: Number of angles of incidence of the grid. Defaults to 90.
+            tolerance: Optional maximum interpolation error of r and t.
+
+        Returns:
+            The lookup table of the stack.
+        """
+        return self.stack.enable_lookup_table(
+            wavelength_um, num_aoi=num_aoi, tolerance=tolerance
+        )
+
+    def disable_lookup_table(self):
+        """Compute the coefficients of traced rays with the TMM."""
+        self.stack.disable_lookup_table()
+
     def to_dict(self) -> dict[str, Any]:  # pragma: no cover
         return {
             "type": self.__class__.__name__,
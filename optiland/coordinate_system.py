@@ -16,6 +16,7 @@ from typing import TYPE_CHECKING
 from scipy.spatial.transform import Rotation as R
 
 import optiland.backend as be
+from optiland._revision import RevisionTracked
 from optiland.rays import RealRays
 
 if TYPE_CHECKING:
@@ -25,7 +26,18 @@ if TYPE_CHECKING:
     from optiland._types import BEArray, ScalarOrArray
 
 
-class CoordinateSystem:
+def _is_rotated(angle: ScalarOrArray) -> bool:
+    """Whether a rotation angle is nonzero.
+
+    Scalar angles are checked directly. Angles holding one value per batched
+    instance (see `BatchedOptic`) are rotated if any of them is nonzero.
+    """
+    if getattr(angle, "ndim", 0) > 0:
+        return bool(be.any(angle != 0))
+    return bool(angle)
+
+
+class CoordinateSystem(RevisionTracked):
     """Represents a coordinate system in 3D space.
 
     Attributes:
@@ -81,11 +93,11 @@ class CoordinateSystem:
             self.reference_cs.localize(rays)
 
         rays.translate(-self.x, -self.y, -self.z)
-        if self.rz:
+        if _is_rotated(self.rz):
             rays.rotate_z(-self.rz)
-        if self.ry:
+        if _is_rotated(self.ry):
             rays.rotate_y(-self.ry)
-        if self.rx:
+        if _is_rotated(self.rx):
             rays.rotate_x(-self.rx)
 
     def globalize(self, rays: RealRays):
@@ -95,11 +107,11 @@ class CoordinateSystem:
             rays: The rays to be globalized.
 
         """
-        if self.rx:
+        if _is_rotated(self.rx):
             rays.rotate_x(self.rx)
-        if self.ry:
+        if _is_rotated(self.ry):
             rays.rotate_y(self.ry)
-        if self.rz:
+        if _is_rotated(self.rz):
             rays.rotate_z(self.rz)
         rays.translate(self.x, self.y, self.z)
 
@@ -11,8 +11,11 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 
+import optiland.backend as be
+from optiland._revision import RevisionTracked
 
-class BaseGeometry(ABC):
+
+class BaseGeometry(RevisionTracked, ABC):
     """Base geometry for all geometries.
 
     Args:
@@ -48,6 +51,57 @@ class BaseGeometry(ABC):
         """
         # pragma: no cover
 
+    def sag_and_gradient(self, x=0, y=0):
+        """Calculate the surface sag and its gradient in a single evaluation.
+
+        Geometries that solve for the ray intersection iteratively use this
+        method to obtain the sag and its partial derivatives at once.
+        Geometries that can share the intermediate terms of both override this
+        method. By default, the gradient is derived from the surface normal
+        (`_surface_normal`).
+
+        Args:
+            x (float or be.ndarray, optional): The x-coordinate(s). Defaults to 0.
+            y (float or be.ndarray, optional): The y-coordinate(s). Defaults to 0.
+
+        Returns:
+            tuple[be.ndarray, be.ndarray, be.ndarray]: The sag and its partial
+            derivatives with respect to x and y.
+
+        """
+        nx, ny, nz = self._surface_normal(x, y)
+
+        # normalized normal components:
+        # fx = -nx / nz and fy = -ny / nz.
+        nz_safe = be.where(be.abs(nz) > 1e-14, nz, 1e-14)
+        return self.sag(x, y), -nx / nz_safe, -ny / nz_safe
+
+    def _surface_normal(self, x, y):
+        """Calculate the surface normal of the geometry at the given x and y
+        position.
+
+        By default, the normal is evaluated by `surface_normal` for rays
+        positioned on the surface at (x, y).
+
+        Args:
+            x (float or be.ndarray): The x-coordinate(s).
+            y (float or be.ndarray): The y-coordinate(s).
+
+        Returns:
+            tuple[be.ndarray, be.ndarray, be.ndarray]: The surface normal
+            components (nx, ny, nz).
+
+        """
+        from optiland.rays import RealRays
+
+        x = be.atleast_1d(be.array(x))
+        y = be.atleast_1d(be.array(y))
+        x, y = x + be.zeros_like(y), y + be.zeros_like(x)
+        zeros = be.zeros_like(x)
+        ones = be.ones_like(x)
+        rays = RealRays(x, y, self.sag(x, y), zeros, zeros, ones, ones, ones)
+        return self.surface_normal(rays)
+
     @abstractmethod
     def distance(self, rays):
         """Find the propagation distance to the geometry.
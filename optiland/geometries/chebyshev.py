@@ -151,17 +151,23 @@ class ChebyshevPolynomialGeometry(NewtonRaphsonGeometry):
 
         return z
 
-    def _surface_normal(self, x, y):
-        """Calculates the surface normal of the Chebyshev polynomial surface at
-        the given x and y position.
+    def sag_and_gradient(self, x=0, y=0):
+        """Calculates the sag of the Chebyshev polynomial surface and its
+        gradient at once.
+
+        The Chebyshev polynomials and their derivatives are evaluated once per
+        degree with the three-term recurrences of T_n and U_n, rather than
+        once per coefficient. The derivatives of the polynomials with respect
+        to the normalized coordinates are scaled by the normalization, such
+        that the gradient is the derivative of the sag.
 
         Args:
-            x (be.ndarray): The x-coordinate(s) at which to calculate the normal.
-            y (be.ndarray): The y-coordinate(s) at which to calculate the normal.
+            x (float or be.ndarray, optional): The x-coordinate(s). Defaults to 0.
+            y (float or be.ndarray, optional): The y-coordinate(s). Defaults to 0.
 
         Returns:
-            tuple[be.ndarray, be.ndarray, be.ndarray]: The surface normal
-            components (nx, ny, nz).
+            tuple[be.ndarray, be.ndarray, be.ndarray]: The sag and its partial
+            derivatives with respect to x and y.
 
         """
         x_norm = x / self.norm_x
@@ -169,24 +175,61 @@ class ChebyshevPolynomialGeometry(NewtonRaphsonGeometry):
 
         self._validate_inputs(x_norm, y_norm)
 
-        r2 = x**2 + y**2
-        denom = self.radius * be.sqrt(1 - (1 + self.k) * r2 / self.radius**2)
-        dzdx = x / denom
-        dzdy = y / denom
+        z, dzdx, dzdy = self._conic_sag_and_gradient(x, y)
+
+        num_x, num_y = self.coefficients.shape
+        tx, dtx = self._chebyshev_series(num_x, x_norm)
+        ty, dty = self._chebyshev_series(num_y, y_norm)
 
         non_zero_indices = be.argwhere(self.coefficients != 0)
         for i, j in non_zero_indices:
-            dzdx = dzdx + (
-                self._chebyshev_derivative(i, x_norm)
-                * self.coefficients[i, j]
-                * self._chebyshev(j, y_norm)
-            )
-            dzdy = dzdy + (
-                self._chebyshev_derivative(j, y_norm)
-                * self.coefficients[i, j]
-                * self._chebyshev(i, x_norm)
-            )
+            c = self.coefficients[i, j]
+            z = z + c * tx[i] * ty[j]
+            dzdx = dzdx + dtx[i] * c * ty[j] / self.norm_x
+            dzdy = dzdy + dty[j] * c * tx[i] / self.norm_y
+
+        return z, dzdx, dzdy
+
+    @staticmethod
+    def _chebyshev_series(num_terms, x):
+        """Evaluates T_n(x) and its derivative for all degrees n < num_terms.
+
+        Uses T_{n+1} = 2x T_n - T_{n-1} and T_n' = n U_{n-1}, where the
+        polynomials of the second kind obey the same recurrence.
+
+        Args:
+            num_terms (int): The number of degrees to evaluate.
+            x (be.ndarray or float): The coordinate value(s) (normalized).
+
+        Returns:
+            tuple[list, list]: The values and derivatives, indexed by degree.
+
+        """
+        t = [be.ones_like(x), x]
+        u = [be.ones_like(x), 2 * x]
+        for _ in range(2, num_terms):
+            t.append(2 * x * t[-1] - t[-2])
+            u.append(2 * x * u[-1] - u[-2])
+        dt = [be.zeros_like(x)] + [n * u[n - 1] for n in range(1, num_terms)]
+        return t[:num_terms], dt
 
+    def _surface_normal(self, x, y):
+        """Calculates the surface normal of the Chebyshev polynomial surface at
+        the given x and y position.
+
+        The normal is derived from the gradient of `sag_and_gradient`, such
+        that ray intersection and refraction use the same derivative.
+
+        Args:
+            x (be.ndarray): The x-coordinate(s) at which to calculate the normal.
+            y (be.ndarray): The y-coordinate(s) at which to calculate the normal.
+
+        Returns:
+            tuple[be.ndarray, be.ndarray, be.ndarray]: The surface normal
+            components (nx, ny, nz).
+
+        """
+        _, dzdx, dzdy = self.sag_and_gradient(x, y)
         norm = be.sqrt(dzdx**2 + dzdy**2 + 1)
         nx = dzdx / norm
         ny = dzdy / norm
@@ -208,22 +251,6 @@ class ChebyshevPolynomialGeometry(NewtonRaphsonGeometry):
         """
         return be.cos(n * be.arccos(x))
 
-    def _chebyshev_derivative(self, n, x):
-        """Calculates the derivative of the Chebyshev polynomial of the first kind
-        of degree n at the given x value.
-
-        Args:
-            n (int): The degree of the Chebyshev polynomial.
-            x (be.ndarray or float): The coordinate value(s) (normalized).
-
-        Returns:
-            be.ndarray or float: The derivative of the Chebyshev polynomial T_n(x)
-            with respect to x, scaled by 1/norm_factor if applicable
-            (handled by caller). Returns 0 for n=0.
-
-        """
-        return n * be.sin(n * be.arccos(x)) / be.sqrt(1 - x**2)
-
     def _validate_inputs(self, x_norm, y_norm):
         """Validates the input coordinates for the Chebyshev polynomial surface.
 
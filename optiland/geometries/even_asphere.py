@@ -108,6 +108,34 @@ class EvenAsphere(NewtonRaphsonGeometry):
 
         return z
 
+    def sag_and_gradient(self, x=0, y=0):
+        """Calculates the sag of the asphere and its gradient at once.
+
+        The aspheric polynomial and its derivative are evaluated together
+        with Horner's scheme in r^2.
+
+        Args:
+            x (float or be.ndarray, optional): The x-coordinate(s). Defaults to 0.
+            y (float or be.ndarray, optional): The y-coordinate(s). Defaults to 0.
+
+        Returns:
+            tuple[be.ndarray, be.ndarray, be.ndarray]: The sag and its partial
+            derivatives with respect to x and y.
+
+        """
+        z, dfdx, dfdy = self._conic_sag_and_gradient(x, y)
+        r2 = x**2 + y**2
+
+        # p(u) = sum_i C_i u^i, sag term u * p(u) and derivative p + u * p'
+        p = 0.0
+        dp = 0.0
+        for Ci in reversed(self.coefficients):
+            dp = dp * r2 + p
+            p = p * r2 + Ci
+        dz_dr2 = p + r2 * dp
+
+        return z + r2 * p, dfdx + 2 * x * dz_dr2, dfdy + 2 * y * dz_dr2
+
     def _surface_normal(self, x, y):
         """Calculates the surface normal of the asphere at the given x and y
         position.
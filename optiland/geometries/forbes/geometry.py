@@ -52,10 +52,13 @@ class ForbesSolverConfig:
     Attributes:
         tol (float): Tolerance for the iterative solver.
         max_iter (int): Maximum number of iterations for the solver.
+        safeguard (bool): If True, Newton steps leaving the root bracket of a
+            ray are replaced by bisection steps.
     """
 
     tol: float = 1e-10
     max_iter: int = 100
+    safeguard: bool = False
 
 
 @dataclass
@@ -110,6 +113,7 @@ class ForbesGeometryBase(NewtonRaphsonGeometry):
             surface_config.conic,
             solver_config.tol,
             solver_config.max_iter,
+            solver_config.safeguard,
         )
         self.surface_config = surface_config
         self.solver_config = solver_config
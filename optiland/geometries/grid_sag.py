@@ -32,8 +32,16 @@ class GridSagGeometry(BaseGeometry):
             Defaults to 1e-6.
         max_iter (int, optional): Maximum number of iterations for the solver.
             Defaults to 100.
+
+    Attributes:
+        iterations (be.ndarray | None): The number of solver iterations taken
+            for each ray in the last call to `distance`, or None before the
+            first call.
     """
 
+    # solver diagnostics do not affect the ray trace
+    _untracked_attributes = frozenset({"iterations"})
+
     def __init__(
         self,
         coordinate_system: CoordinateSystem,
@@ -50,6 +58,7 @@ class GridSagGeometry(BaseGeometry):
         self.tol = tol
         self.max_iter = max_iter
         self.is_symmetric = False
+        self.iterations = None
 
         if self.sag_grid.shape != (len(self.y_grid), len(self.x_grid)):
             raise ValueError(
@@ -106,12 +115,21 @@ class GridSagGeometry(BaseGeometry):
         return sag_val
 
     def distance(self, rays):
-        """Find the propagation distance to the geometry."""
+        """Find the propagation distance to the geometry.
+
+        Rays are removed from the iteration once their step is below the
+        tolerance or not finite, so that only unconverged rays are
+        interpolated.
+        """
         t = be.zeros_like(rays.x)  # Initial guess for distance
+        iterations = be.zeros_like(t)
+        active = be.arange_indices(be.size(t))
         for _ in range(self.max_iter):
-            x_intersect = rays.x + t * rays.L
-            y_intersect = rays.y + t * rays.M
-            z_intersect = rays.z + t * rays.N
+            t_a = t[active]
+            L_a, M_a, N_a = rays.L[active], rays.M[active], rays.N[active]
+            x_intersect = rays.x[active] + t_a * L_a
+            y_intersect = rays.y[active] + t_a * M_a
+            z_intersect = rays.z[active] + t_a * N_a
 
             sag_val, ds_dx, ds_dy = self._interpolate(x_intersect, y_intersect)
 
@@ -119,15 +137,20 @@ class GridSagGeometry(BaseGeometry):
             f = sag_val - z_intersect
 
             # Derivative f'(t) = (ds/dx * dx/dt + ds/dy * dy/dt) - dz/dt
-            f_prime = ds_dx * rays.L + ds_dy * rays.M - rays.N
+            f_prime = ds_dx * L_a + ds_dy * M_a - N_a
 
             # Newton-Raphson step
             dt = -f / f_prime
-            t = t + dt
+            t[active] = t_a + dt
+            iterations[active] = iterations[active] + 1
 
-            if be.max(be.abs(dt)) < self.tol:
+            # keep only the rays that have not converged (NaN steps included)
+            active = active[be.abs(dt) >= self.tol]
+            if be.size(active) == 0:
                 break
 
+        self.iterations = iterations
+
         # Clip rays that miss the grid
         x_final = rays.x + t * rays.L
         y_final = rays.y + t * rays.M
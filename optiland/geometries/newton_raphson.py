@@ -14,6 +14,7 @@ from abc import ABC, abstractmethod
 
 import optiland.backend as be
 from optiland.coordinate_system import CoordinateSystem
+from optiland.geometries.base import BaseGeometry
 from optiland.geometries.standard import StandardGeometry
 
 
@@ -52,13 +53,34 @@ class NewtonRaphsonGeometry(StandardGeometry, ABC):
             Defaults to 1e-10.
         max_iter (int, optional): Maximum iterations for Newton-Raphson.
             Defaults to 100.
+        safeguard (bool, optional): If True, Newton steps that leave the
+            interval bracketing the root of a ray are replaced by bisection
+            steps. Defaults to False.
+
+    Attributes:
+        iterations (be.ndarray | None): The number of Newton steps taken for
+            each ray in the last call to `distance`, or None before the first
+            call.
 
     """
 
-    def __init__(self, coordinate_system, radius, conic=0.0, tol=1e-10, max_iter=100):
+    # solver diagnostics do not affect the ray trace
+    _untracked_attributes = frozenset({"iterations"})
+
+    def __init__(
+        self,
+        coordinate_system,
+        radius,
+        conic=0.0,
+        tol=1e-10,
+        max_iter=100,
+        safeguard=False,
+    ):
         super().__init__(coordinate_system, radius, conic)
         self.tol = tol
         self.max_iter = max_iter
+        self.safeguard = safeguard
+        self.iterations = None
 
     def __str__(self):
         return "Newton Raphson"  # pragma: no cover
@@ -102,6 +124,24 @@ class NewtonRaphsonGeometry(StandardGeometry, ABC):
         """
         # pragma: no cover
 
+    def sag_and_gradient(self, x=0, y=0):
+        """Calculate the surface sag and its gradient.
+
+        The conic gradient of `StandardGeometry` does not describe the full
+        surface, so the gradient is derived from `_surface_normal`, as in
+        `BaseGeometry`.
+
+        Args:
+            x (float or be.ndarray, optional): The x-coordinate(s). Defaults to 0.
+            y (float or be.ndarray, optional): The y-coordinate(s). Defaults to 0.
+
+        Returns:
+            tuple[be.ndarray, be.ndarray, be.ndarray]: The sag and its partial
+            derivatives with respect to x and y.
+
+        """
+        return BaseGeometry.sag_and_gradient(self, x, y)
+
     def surface_normal(self, rays):
         """Calculates the surface normal of the geometry at the given rays.
 
@@ -122,6 +162,11 @@ class NewtonRaphsonGeometry(StandardGeometry, ABC):
         using a robust Newton-Raphson method. This version uses the base conic
         intersection as a strong initial guess.
 
+        The iteration runs on an active set of rays: rays that have converged,
+        or whose error is not finite (e.g., rays that miss the surface), are
+        removed from the set, so that the sag and normal are only evaluated
+        for the rays that still need refinement.
+
         Args:
             rays (RealRays): The rays used for calculating distance.
 
@@ -131,42 +176,78 @@ class NewtonRaphsonGeometry(StandardGeometry, ABC):
         """
         # better initial guess for the propagation distance 't' by
         # intersecting with the base conic surface.
-        t = super().distance(rays)
+        t = be.copy(super().distance(rays))
+
+        iterations = be.zeros_like(t)
+        active = be.arange_indices(be.size(t))
+        if self.safeguard:
+            t_pos = be.full_like(t, be.nan)  # last t with f(t) > 0
+            t_neg = be.full_like(t, be.nan)  # last t with f(t) < 0
 
         # Newton-Raphson method to refine the intersection point
         for _ in range(self.max_iter):
+            t_a = t[active]
+            L_a, M_a, N_a = rays.L[active], rays.M[active], rays.N[active]
+
             # current intersection point P(t) = P0 + t*D
-            x_int = rays.x + t * rays.L
-            y_int = rays.y + t * rays.M
-            z_int = rays.z + t * rays.N
+            x_int = rays.x[active] + t_a * L_a
+            y_int = rays.y[active] + t_a * M_a
+            z_int = rays.z[active] + t_a * N_a
 
             # error function f(t) = sag(x(t), y(t)) - z(t)
             # find the root t such that f(t) = 0
-            f_t = self.sag(x_int, y_int) - z_int
+            sag, fx, fy = self.sag_and_gradient(x_int, y_int)
+            f_t = sag - z_int
 
-            # convergence check
-            if be.max(be.abs(f_t)) < self.tol:
+            # convergence check, per ray (NaN errors are also dropped)
+            keep = be.abs(f_t) >= self.tol
+            if not be.any(keep):
                 break
+            active = active[keep]
+            t_a, f_t = t_a[keep], f_t[keep]
+            L_a, M_a, N_a = L_a[keep], M_a[keep], N_a[keep]
+            fx, fy = fx[keep], fy[keep]
 
             # derivative of the error func at the
             # curr intersection point
             # f'(t) = (d_sag/d_x)*Lx + (d_sag/d_y)*My - Nz
-            nx, ny, nz = self._surface_normal(x_int, y_int)
-
-            # normalized normal components:
-            # fx = -nx / nz and fy = -ny / nz.
-            nz_safe = be.where(be.abs(nz) > 1e-14, nz, 1e-14)
-            fx = -nx / nz_safe
-            fy = -ny / nz_safe
-
-            df_dt = fx * rays.L + fy * rays.M - rays.N
+            df_dt = fx * L_a + fy * M_a - N_a
 
             # update step: t_new = t - f(t) / f'(t).
             safe_df_dt = be.where(be.abs(df_dt) > 1e-14, df_dt, 1e-14)
-            t = t - f_t / safe_df_dt
+            t_new = t_a - f_t / safe_df_dt
+
+            if self.safeguard:
+                t_pos[active] = be.where(f_t > 0, t_a, t_pos[active])
+                t_neg[active] = be.where(f_t < 0, t_a, t_neg[active])
+                t_new = self._bracket_step(t_new, t_pos[active], t_neg[active])
+
+            t[active] = t_new
+            iterations[active] = iterations[active] + 1
 
+        self.iterations = iterations
         return t
 
+    @staticmethod
+    def _bracket_step(t_new, t_pos, t_neg):
+        """Replaces Newton steps outside of the root bracket by bisection.
+
+        Args:
+            t_new (be.ndarray): The Newton estimates of the distances.
+            t_pos (be.ndarray): The last distances with a positive error, NaN
+                if there is none.
+            t_neg (be.ndarray): The last distances with a negative error, NaN
+                if there is none.
+
+        Returns:
+            be.ndarray: The safeguarded estimates of the distances.
+        """
+        lower = be.minimum(t_pos, t_neg)
+        upper = be.maximum(t_pos, t_neg)
+        bracketed = be.isfinite(lower) & be.isfinite(upper)
+        inside = (t_new > lower) & (t_new < upper)
+        return be.where(bracketed & ~inside, 0.5 * (lower + upper), t_new)
+
     def _intersection_plane(self, rays):
         """Calculates the intersection points of the rays with a plane (z=0).
 
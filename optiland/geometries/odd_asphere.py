@@ -102,6 +102,40 @@ class OddAsphere(EvenAsphere):
 
         return z
 
+    def sag_and_gradient(self, x=0, y=0):
+        """Calculates the sag of the asphere and its gradient at once.
+
+        The aspheric polynomial and its derivative are evaluated together
+        with Horner's scheme in r.
+
+        Args:
+            x (float or be.ndarray, optional): The x-coordinate(s). Defaults to 0.
+            y (float or be.ndarray, optional): The y-coordinate(s). Defaults to 0.
+
+        Returns:
+            tuple[be.ndarray, be.ndarray, be.ndarray]: The sag and its partial
+            derivatives with respect to x and y.
+
+        """
+        z, dfdx, dfdy = self._conic_sag_and_gradient(x, y)
+        r = be.sqrt(x**2 + y**2)
+
+        # p(r) = sum_i C_i r^i, sag term r * p(r) and derivative p + r * p'
+        p = 0.0
+        dp = 0.0
+        for Ci in reversed(self.coefficients):
+            dp = dp * r + p
+            p = p * r + Ci
+        dz_dr = p + r * dp
+
+        # the radial derivative is undefined at the vertex, where it is set to 0
+        nonzero = r > 0
+        r_safe = be.where(nonzero, r, 1.0)
+        dfdx = dfdx + be.where(nonzero, x / r_safe * dz_dr, 0.0)
+        dfdy = dfdy + be.where(nonzero, y / r_safe * dz_dr, 0.0)
+
+        return z + r * p, dfdx, dfdy
+
     def _surface_normal(self, x, y):
         """Calculates the surface normal of the asphere at the given x and y
         position.
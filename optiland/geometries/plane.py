@@ -69,6 +69,20 @@ class Plane(BaseGeometry):
             return be.zeros_like(y)
         return 0
 
+    def sag_and_gradient(self, x=0, y=0):
+        """Calculate the sag of the plane and its gradient, which are all 0.
+
+        Args:
+            x (float or be.ndarray, optional): The x-coordinate(s). Defaults to 0.
+            y (float or be.ndarray, optional): The y-coordinate(s). Defaults to 0.
+
+        Returns:
+            tuple: The sag and its partial derivatives with respect to x and y.
+
+        """
+        sag = self.sag(x, y)
+        return sag, sag, sag
+
     def distance(self, rays):
         """Find the propagation distance to the plane geometry.
 
@@ -120,6 +120,43 @@ class PolynomialGeometry(NewtonRaphsonGeometry):
                 z = z + self.coefficients[i][j] * (x**i) * (y**j)
         return z
 
+    def sag_and_gradient(self, x=0, y=0):
+        """Calculates the sag of the polynomial surface and its gradient at once.
+
+        The powers of x and y are computed once and shared by the sag and both
+        partial derivatives.
+
+        Args:
+            x (float or be.ndarray, optional): The x-coordinate(s). Defaults to 0.
+            y (float or be.ndarray, optional): The y-coordinate(s). Defaults to 0.
+
+        Returns:
+            tuple[be.ndarray, be.ndarray, be.ndarray]: The sag and its partial
+            derivatives with respect to x and y.
+
+        """
+        z, dzdx, dzdy = self._conic_sag_and_gradient(x, y)
+
+        num_x = len(self.coefficients)
+        num_y = max(len(row) for row in self.coefficients)
+        x_pow = [be.ones_like(x)]
+        for _ in range(1, num_x):
+            x_pow.append(x_pow[-1] * x)
+        y_pow = [be.ones_like(y)]
+        for _ in range(1, num_y):
+            y_pow.append(y_pow[-1] * y)
+
+        for i in range(num_x):
+            for j in range(len(self.coefficients[i])):
+                c = self.coefficients[i][j]
+                z = z + c * x_pow[i] * y_pow[j]
+                if i > 0:
+                    dzdx = dzdx + i * c * x_pow[i - 1] * y_pow[j]
+                if j > 0:
+                    dzdy = dzdy + j * c * x_pow[i] * y_pow[j - 1]
+
+        return z, dzdx, dzdy
+
     def _surface_normal(self, x, y):
         """Calculates the surface normal of the polynomial surface at the given x
         and y position.
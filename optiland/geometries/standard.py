@@ -94,6 +94,28 @@ class StandardGeometry(BaseGeometry):
             self.radius * (1 + be.sqrt(1 - (1 + self.k) * r2 / self.radius**2))
         )
 
+    def sag_and_gradient(self, x=0, y=0):
+        """Calculate the sag of the conic and its gradient at once.
+
+        Args:
+            x (float or be.ndarray, optional): The x-coordinate(s). Defaults to 0.
+            y (float or be.ndarray, optional): The y-coordinate(s). Defaults to 0.
+
+        Returns:
+            tuple[be.ndarray, be.ndarray, be.ndarray]: The sag and its partial
+            derivatives with respect to x and y.
+
+        """
+        return self._conic_sag_and_gradient(x, y)
+
+    def _conic_sag_and_gradient(self, x, y):
+        """Calculate the sag and gradient of the base conic, sharing the root."""
+        r2 = x**2 + y**2
+        root = be.sqrt(1 - (1 + self.k) * r2 / self.radius**2)
+        sag = r2 / (self.radius * (1 + root))
+        denom = self.radius * root
+        return sag, x / denom, y / denom
+
     def distance(self, rays):
         """Find the propagation distance to the geometry for the given rays.
 
@@ -179,44 +179,35 @@ class ZernikePolynomialGeometry(NewtonRaphsonGeometry):
 
         return z
 
-    def _surface_normal(
-        self,
-        x: NDArray,
-        y: NDArray,
-    ) -> tuple[float, float, float]:
-        """Calculate the surface normal of the full surface (conic + Zernike)
-        in Cartesian coordinates at (x, y).
+    def sag_and_gradient(self, x: NDArray = 0, y: NDArray = 0) -> tuple:
+        """Calculate the sag of the Zernike polynomial surface and its gradient
+        at once.
+
+        The radial polynomial of each term and its derivative are evaluated
+        together, and the azimuthal terms are shared by the sag and the
+        gradient. As in the sag, each term is scaled by its normalization
+        constant, such that the gradient is the derivative of the sag.
 
         Args:
-            x (float or be.ndarray): x-coordinate(s).
-            y (float or be.ndarray): y-coordinate(s).
+            x (float, be.ndarray): The Cartesian x-coordinate(s).
+            y (float, be.ndarray): The Cartesian y-coordinate(s).
 
         Returns:
-            (nx, ny, nz): Normal vector components in Cartesian coords.
-
+            tuple[be.ndarray, be.ndarray, be.ndarray]: The sag and its partial
+            derivatives with respect to x and y.
         """
-        # Conic partial derivatives:
-        r2 = x**2 + y**2
-        denominator = self.radius * be.sqrt(1 - (1 + self.k) * r2 / self.radius**2)
-        dzdx = x / denominator
-        dzdy = y / denominator
-
-        # Protect against divide-by-zero for r=0
-        # or handle small r if needed
-        eps = 1e-14
-        denominator = be.where(be.abs(denominator) < eps, eps, denominator)
-
-        # Now add partial derivatives from the Zernike expansions
         x_norm = x / self.norm_radius
         y_norm = y / self.norm_radius
+
+        self._validate_inputs(x_norm, y_norm)
+
+        z, dzdx, dzdy = self._conic_sag_and_gradient(x, y)
+
         rho = be.sqrt(x_norm**2 + y_norm**2)
         phi = be.arctan2(y_norm, x_norm)
 
-        # Chain rule:
-        # dZ/dx = dZ/drho * d(rho)/dx + dZ/dphi * d(phi)/dx
-        # We'll define the partials of (rho,phi) wrt x:
-        #   drho/dx    = x / (norm_x^2 * rho)
-        #   dphi/dx  = - y / (rho^2 * norm_y * norm_x)
+        # partials of (rho, phi) wrt x and y, as in _surface_normal
+        eps = 1e-14
         drho_dx = (
             be.zeros_like(x)
             if be.all(rho == 0)
@@ -234,22 +225,44 @@ class ZernikePolynomialGeometry(NewtonRaphsonGeometry):
             if c == 0:
                 continue
 
-            dZdrho, dZdphi = self.zernike.get_derivative(n, m, rho, phi)
-            # Partial derivatives w.r.t. x and y
-            dzdx += c * (dZdrho * drho_dx + dZdphi * dphi_dx)
-            dzdy += c * (dZdrho * drho_dy + dZdphi * dphi_dy)
-
-        # Surface normal vector in cartesian coords: (-dzdx, -dzdy, 1)
-        # normalized. Check sign conventions!
-        nx = +dzdx
-        ny = +dzdy
-        norm = be.sqrt(nx**2 + ny**2 + 1)
-        norm = be.where(norm < eps, 1.0, norm)  # Avoid division by zero
-        nx = nx / norm
-        ny = ny / norm
-        nz = -be.ones_like(x) / norm
-
-        return (nx, ny, nz)
+            radial, dradial = self.zernike._radial_term_and_derivative(n, m, rho)
+            if m == 0:
+                azimuthal = 1.0
+                dazimuthal = 0.0
+            elif m > 0:
+                azimuthal = be.cos(m * phi)
+                dazimuthal = -m * be.sin(m * phi)
+            else:
+                azimuthal = be.sin(-m * phi)
+                dazimuthal = -m * be.cos(-m * phi)
+
+            weight = c * self.zernike._norm_constant(n, m)
+            z = z + weight * radial * azimuthal
+            dZdrho = dradial * azimuthal
+            dZdphi = radial * dazimuthal
+            dzdx = dzdx + weight * (dZdrho * drho_dx + dZdphi * dphi_dx)
+            dzdy = dzdy + weight * (dZdrho * drho_dy + dZdphi * dphi_dy)
+
+        return z, dzdx, dzdy
+
+    def _surface_normal(self, x: NDArray, y: NDArray) -> tuple:
+        """Calculate the surface normal of the full surface (conic + Zernike)
+        in Cartesian coordinates at (x, y).
+
+        The normal is derived from the gradient of `sag_and_gradient`, such
+        that ray intersection and refraction use the same derivative.
+
+        Args:
+            x (float or be.ndarray): x-coordinate(s).
+            y (float or be.ndarray): y-coordinate(s).
+
+        Returns:
+            (nx, ny, nz): Normal vector components in Cartesian coords.
+
+        """
+        _, dzdx, dzdy = self.sag_and_gradient(x, y)
+        norm = be.sqrt(dzdx**2 + dzdy**2 + 1)
+        return dzdx / norm, dzdy / norm, -be.ones_like(dzdx) / norm
 
     def _validate_inputs(self, x_norm: float, y_norm: float) -> None:
         """Validate the input coordinates for the Zernike polynomial surface.
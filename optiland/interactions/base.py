@@ -10,6 +10,8 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
 
+from optiland._revision import RevisionTracked
+
 if TYPE_CHECKING:
     # pragma: no cover
     from optiland.coatings import BaseCoating
@@ -18,7 +20,7 @@ if TYPE_CHECKING:
     from optiland.surfaces import Surface
 
 
-class BaseInteractionModel(ABC):
+class BaseInteractionModel(RevisionTracked, ABC):
     """Abstract base class for ray-surface interaction models."""
 
     _registry = {}
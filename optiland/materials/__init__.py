@@ -6,6 +6,8 @@ from __future__ import annotations
 
 from .abbe import AbbeMaterial, AbbeMaterialE
 from .base import BaseMaterial
+from .dispersion import DispersionTable, evaluate_dispersion
+from .glass_map import GlassMap
 from .ideal import IdealMaterial
 from .material import Material
 from .material_file import MaterialFile
@@ -25,6 +27,11 @@ __all__ = [
     "AbbeMaterialE",
     # From base.py
     "BaseMaterial",
+    # From dispersion.py
+    "DispersionTable",
+    "evaluate_dispersion",
+    # From glass_map.py
+    "GlassMap",
     # From ideal.py
     "IdealMaterial",
     # From material.py
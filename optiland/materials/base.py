@@ -15,11 +15,12 @@ from abc import ABC, abstractmethod
 import numpy as np
 
 import optiland.backend as be
+from optiland._revision import RevisionTracked
 from optiland.propagation.base import BasePropagationModel
 from optiland.propagation.homogeneous import HomogeneousPropagation
 
 
-class BaseMaterial(ABC):
+class BaseMaterial(RevisionTracked, ABC):
     """Base class for materials.
 
     This class defines the interface for material properties such as
@@ -46,6 +47,7 @@ class BaseMaterial(ABC):
     """
 
     _registry = {}
+    _dispersion = None
 
     def __init__(self, propagation_model: BasePropagationModel | None = None):
         """Initializes the material and its caches.
@@ -106,6 +108,11 @@ class BaseMaterial(ABC):
         Returns:
             float | be.ndarray: The refractive index at the given wavelength(s).
         """
+        if self._dispersion is not None:
+            result = self._dispersion.lookup(self, wavelength, kwargs)
+            if result is not None:
+                return result
+
         cache_key = self._create_cache_key(wavelength, **kwargs)
 
         if cache_key in self._n_cache:
@@ -148,6 +155,14 @@ class BaseMaterial(ABC):
         self._k_cache[cache_key] = self._detach_if_tensor(result)
         return self._k_cache[cache_key]
 
+    def _attach_dispersion(self, row):
+        """Attach the row of a dispersion table, which then serves the
+        refractive indices at its wavelengths, or detach it with None.
+
+        Attaching a table does not count as a modification of the material.
+        """
+        object.__setattr__(self, "_dispersion", row)
+
     @abstractmethod
     def _calculate_n(
         self, wavelength: float | be.ndarray, **kwargs
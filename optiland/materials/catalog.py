@@ -0,0 +1,282 @@
+"""Material Catalog
+
+This module contains the MaterialCatalog class, a compiled index of the
+material database, which allows materials to be found and loaded without
+reading the catalog CSV file or the YAML material files.
+
+The compiled catalog (`catalog_nk.npz` in the `database` directory) holds the
+rows of `catalog_nk.csv` and, for each material defined by a dispersion
+formula, the formula type, its coefficients, the tabulated extinction
+coefficient, and the thermal dispersion data. Materials defined by tabulated
+refractive indices are indexed, but their data is read from the material file,
+as shipping it would multiply the size of the catalog. The compiled catalog is
+generated from the database with `compile_catalog`, and must be regenerated
+when the database is updated.
+
+Kramer Harrison, 2025
+"""
+
+from __future__ import annotations
+
+from importlib import resources
+from pathlib import Path
+
+import numpy as np
+
+CATALOG_COLUMNS = (
+    "group",
+    "category_name",
+    "category_name_full",
+    "reference",
+    "name",
+    "filename",
+    "filename_no_ext",
+)
+
+_SEPARATOR = "\x00"
+
+
+def _encode_strings(values) -> np.ndarray:
+    """Encode strings as a single UTF-8 byte array."""
+    return np.frombuffer(_SEPARATOR.join(values).encode("utf-8"), dtype=np.uint8)
+
+
+def _decode_strings(data: np.ndarray) -> list[str]:
+    """Decode strings encoded with `_encode_strings`."""
+    return data.tobytes().decode("utf-8").split(_SEPARATOR)
+
+
+def _pack(arrays) -> tuple[np.ndarray, np.ndarray]:
+    """Pack arrays into a flat array and the offsets of each array."""
+    sizes = [len(array) for array in arrays]
+    offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(sizes)
+    flat = np.concatenate([np.asarray(a, dtype=float) for a in arrays] + [[]])
+    return flat, offsets
+
+
+def compile_catalog(output_file=None, database_dir=None):
+    """Compile the material database into a binary catalog.
+
+    Each material file is parsed with `MaterialFile`, so that the compiled data
+    is identical to the data read from the file.
+
+    Args:
+        output_file (str, optional): The path of the compiled catalog.
+            Defaults to None, in which case `catalog_nk.npz` in the database
+            directory is written.
+        database_dir (str, optional): The database directory, containing
+            `catalog_nk.csv` and the `data-nk` directory. Defaults to None, in
+            which case the database of the package is used.
+    """
+    import pandas as pd
+
+    from optiland.materials.material_file import MaterialFile
+
+    database = (
+        resources.files("optiland.database")
+        if database_dir is None
+        else Path(database_dir)
+    )
+    if output_file is None:
+        output_file = str(database.joinpath("catalog_nk.npz"))
+
+    df = pd.read_csv(str(database.joinpath("catalog_nk.csv")))
+
+    formulas = []
+    references = []
+    t0 = []
+    coefficients = []
+    k_wavelengths = []
+    k_values = []
+    has_k = []
+    thermal = []
+    for filename in df["filename"]:
+        try:
+            material = MaterialFile(str(database.joinpath("data-nk", filename)))
+        except Exception:  # invalid files are reported when loaded
+            material = None
+
+        compiled = material is not None and str(material._n_formula).startswith(
+            "formula "
+        )
+        formulas.append(material._n_formula if compiled else "")
+        if not compiled:
+            material = None
+
+        reference = material.reference_data if material is not None else None
+        references.append("" if reference is None else str(reference))
+        t0.append(np.nan if material is None or material._t0 is None else material._t0)
+        coefficients.append(
+            np.ravel(material.coefficients) if material is not None else []
+        )
+        k_found = material is not None and material._k is not None
+        has_k.append(k_found)
+        k_wavelengths.append(np.ravel(material._k_wavelength) if k_found else [])
+        k_values.append(np.ravel(material._k) if k_found else [])
+        thermal.append(np.ravel(material.thermdispcoef) if material is not None else [])
+
+    arrays = {
+        column: _encode_strings(df[column].astype(str)) for column in CATALOG_COLUMNS
+    }
+    arrays["min_wavelength"] = df["min_wavelength"].to_numpy(dtype=float)
+    arrays["max_wavelength"] = df["max_wavelength"].to_numpy(dtype=float)
+    arrays["formula"] = _encode_strings(formulas)
+    arrays["reference_data"] = _encode_strings(references)
+    arrays["t0"] = np.array(t0, dtype=float)
+    arrays["has_k"] = np.array(has_k, dtype=bool)
+    arrays["coefficients"], arrays["coefficient_offsets"] = _pack(coefficients)
+    arrays["k_wavelength"], arrays["k_offsets"] = _pack(k_wavelengths)
+    arrays["k"], _ = _pack(k_values)
+    arrays["thermal"], arrays["thermal_offsets"] = _pack(thermal)
+    np.savez(output_file, **arrays)
+
+
+class MaterialCatalog:
+    """A compiled index of the material database.
+
+    Rows are in the order of `catalog_nk.csv`. Materials are indexed by their
+    lowercase category name, name and filename (without extension), which
+    are the fields compared with the name of a material when searching the
+    catalog.
+
+    Args:
+        data (Mapping[str, np.ndarray]): The arrays of the compiled catalog.
+
+    Attributes:
+        columns (dict[str, list[str]]): The string columns of the catalog.
+        min_wavelength (np.ndarray): The minimum wavelength of each material.
+        max_wavelength (np.ndarray): The maximum wavelength of each material.
+
+    """
+
+    _instance = None
+    _filename = str(resources.files("optiland.database").joinpath("catalog_nk.npz"))
+
+    def __init__(self, data):
+        self.columns = {
+            column: _decode_strings(data[column]) for column in CATALOG_COLUMNS
+        }
+        self.min_wavelength = data["min_wavelength"]
+        self.max_wavelength = data["max_wavelength"]
+        self._formula = _decode_strings(data["formula"])
+        self._reference_data = _decode_strings(data["reference_data"])
+        self._t0 = data["t0"]
+        self._has_k = data["has_k"]
+        self._coefficients = data["coefficients"]
+        self._coefficient_offsets = data["coefficient_offsets"]
+        self._k_wavelength = data["k_wavelength"]
+        self._k = data["k"]
+        self._k_offsets = data["k_offsets"]
+        self._thermal = data["thermal"]
+        self._thermal_offsets = data["thermal_offsets"]
+
+        self._lowercase = {
+            column: [value.lower() for value in values]
+            for column, values in self.columns.items()
+        }
+        index = {}
+        for column in ("category_name", "name", "filename_no_ext"):
+            for row, value in enumerate(self._lowercase[column]):
+                index.setdefault(value, set()).add(row)
+        self._index = {value: sorted(rows) for value, rows in index.items()}
+
+    @classmethod
+    def load(cls) -> MaterialCatalog | None:
+        """Load the compiled catalog of the package once.
+
+        Returns:
+            MaterialCatalog | None: The catalog, or None if the compiled
+            catalog is not available.
+        """
+        if cls._instance is None:
+            try:
+                with np.load(cls._filename) as data:
+                    cls._instance = cls(data)
+            except OSError:
+                return None
+        return cls._instance
+
+    def __len__(self) -> int:
+        return len(self.min_wavelength)
+
+    def exact_matches(self, name: str) -> list[int]:
+        """Return the rows whose category name, name or filename equals a name.
+
+        Args:
+            name (str): The name, compared case-insensitively.
+
+        Returns:
+            list[int]: The matching rows, in catalog order.
+        """
+        return self._index.get(name.lower(), [])
+
+    def matches_reference(self, row: int, reference: str) -> bool:
+        """Whether a row matches a reference, i.e., the lowercase reference
+        is contained in the category name, full category name, reference, name
+        or filename of the row.
+
+        Args:
+            row (int): The row.
+            reference (str): The reference.
+
+        Returns:
+            bool: Whether the row matches the reference.
+        """
+        reference = reference.lower()
+        return any(
+            reference in self._lowercase[column][row]
+            for column in (
+                "category_name",
+                "category_name_full",
+                "reference",
+                "name",
+                "filename",
+            )
+        )
+
+    def row(self, row: int) -> dict:
+        """Return the catalog entry of a row, as in `catalog_nk.csv`.
+
+        Args:
+            row (int): The row.
+
+        Returns:
+            dict: The values of the columns of the row.
+        """
+        entry = {column: values[row] for column, values in self.columns.items()}
+        entry["min_wavelength"] = float(self.min_wavelength[row])
+        entry["max_wavelength"] = float(self.max_wavelength[row])
+        return entry
+
+    def material_data(self, row: int) -> dict | None:
+        """Return the compiled optical data of a row.
+
+        Args:
+            row (int): The row.
+
+        Returns:
+            dict | None: The dispersion formula, its coefficients, the
+            tabulated extinction coefficient, the thermal dispersion data and
+            the reference of the material, or None if the data of the material
+            is not compiled.
+        """
+        formula = self._formula[row]
+        if not formula:
+            return None
+
+        start, end = self._coefficient_offsets[row : row + 2]
+        k_start, k_end = self._k_offsets[row : row + 2]
+        thermal_start, thermal_end = self._thermal_offsets[row : row + 2]
+        t0 = float(self._t0[row])
+        return {
+            "formula": formula,
+            "coefficients": self._coefficients[start:end],
+            "k_wavelength": (
+                self._k_wavelength[k_start:k_end] if self._has_k[row] else None
+            ),
+            "k": self._k[k_start:k_end] if self._has_k[row] else None,
+            "thermal": self._thermal[thermal_start:thermal_end],
+            "t0": None if np.isnan(t0) else t0,
+            "reference": self._reference_data[row] or None,
+        }
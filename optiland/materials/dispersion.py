@@ -0,0 +1,587 @@
+"""Dispersion
+
+This module contains the dispersion formulas of the refractiveindex.info
+database, the temperature and pressure correction of refractive indices, and a
+batched dispersion engine, which evaluates the refractive indices of many
+materials at many wavelengths at once.
+
+The formulas take the coefficients as their first argument. With the
+coefficients of a single material, `c[k]` is a single value. With the
+coefficients of several materials stacked along a second axis, i.e., with
+shape (num_coefficients, num_materials, 1), `c[k]` is a column and the
+formulas evaluate all materials at all wavelengths in one set of array
+operations. `evaluate_dispersion` groups materials by formula type and number
+of coefficients for this purpose.
+
+A `DispersionTable` stores the refractive indices of a set of materials at a
+set of wavelengths and, when attached, serves the `n` calls of the materials
+at these wavelengths (e.g., the calls of every surface during a ray trace)
+from the table.
+
+Kramer Harrison, 2025
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+import optiland.backend as be
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from optiland.materials.base import BaseMaterial
+    from optiland.optic import Optic
+
+
+def sellmeier(c, w):
+    """Dispersion formula 1 from refractiveindex.info (Sellmeier formula).
+
+    Args:
+        c (be.ndarray): The coefficients of the formula.
+        w (float or be.ndarray): The wavelength(s) in microns.
+
+    Returns:
+        float or be.ndarray: The refractive index(s).
+
+    """
+    try:
+        n = 1 + c[0]
+        for k in range(1, len(c), 2):
+            n = n + c[k] * w**2 / (w**2 - c[k + 1] ** 2)
+    except IndexError as err:
+        raise ValueError("Invalid coefficients for dispersion formula 1.") from err
+    return be.sqrt(n)
+
+
+def sellmeier_2(c, w):
+    """Dispersion formula 2 from refractiveindex.info (Sellmeier-2 formula).
+
+    Args:
+        c (be.ndarray): The coefficients of the formula.
+        w (float or be.ndarray): The wavelength(s) in microns.
+
+    Returns:
+        float or be.ndarray: The refractive index(s).
+
+    """
+    try:
+        n = 1 + c[0]
+        for k in range(1, len(c), 2):
+            n = n + c[k] * w**2 / (w**2 - c[k + 1])
+    except IndexError as err:
+        raise ValueError("Invalid coefficients for dispersion formula 2.") from err
+    return be.sqrt(n)
+
+
+def polynomial(c, w):
+    """Dispersion formula 3 from refractiveindex.info (Polynomial formula).
+
+    Args:
+        c (be.ndarray): The coefficients of the formula.
+        w (float or be.ndarray): The wavelength(s) in microns.
+
+    Returns:
+        float or be.ndarray: The refractive index(s).
+
+    """
+    try:
+        n = c[0]
+        for k in range(1, len(c), 2):
+            n = n + c[k] * w ** c[k + 1]
+        return be.sqrt(n)
+    except IndexError as err:
+        raise ValueError("Invalid coefficients for dispersion formula 3.") from err
+
+
+def refractiveindex_info(c, w):
+    """Dispersion formula 4 from refractiveindex.info (RefractiveIndex.INFO
+    formula).
+
+    Args:
+        c (be.ndarray): The coefficients of the formula.
+        w (float or be.ndarray): The wavelength(s) in microns.
+
+    Returns:
+        float or be.ndarray: The refractive index(s).
+
+    """
+    try:
+        n = (
+            c[0]
+            + c[1] * w ** c[2] / (w**2 - c[3] ** c[4])
+            + c[5] * w ** c[6] / (w**2 - c[7] ** c[8])
+        )
+        for k in range(9, len(c), 2):
+            n = n + c[k] * w ** c[k + 1]
+        return be.sqrt(n)
+    except IndexError as err:
+        raise ValueError("Invalid coefficients for dispersion formula 4.") from err
+
+
+def cauchy(c, w):
+    """Dispersion formula 5 from refractiveindex.info (Cauchy formula).
+
+    Args:
+        c (be.ndarray): The coefficients of the formula.
+        w (float or be.ndarray): The wavelength(s) in microns.
+
+    Returns:
+        float or be.ndarray: The refractive index(s).
+
+    """
+    try:
+        n = c[0]
+        for k in range(1, len(c), 2):
+            n = n + c[k] * w ** c[k + 1]
+        return n
+    except IndexError as err:
+        raise ValueError("Invalid coefficients for dispersion formula 5.") from err
+
+
+def gases(c, w):
+    """Dispersion formula 6 from refractiveindex.info (Gases formula).
+
+    Args:
+        c (be.ndarray): The coefficients of the formula.
+        w (float or be.ndarray): The wavelength(s) in microns.
+
+    Returns:
+        float or be.ndarray: The refractive index(s).
+
+    """
+    try:
+        n = 1 + c[0]
+        for k in range(1, len(c), 2):
+            n = n + c[k] / (c[k + 1] - w**-2)
+        return n
+    except IndexError as err:
+        raise ValueError("Invalid coefficients for dispersion formula 6.") from err
+
+
+def herzberger(c, w):
+    """Dispersion formula 7 from refractiveindex.info (Herzberger formula).
+
+    Args:
+        c (be.ndarray): The coefficients of the formula.
+        w (float or be.ndarray): The wavelength(s) in microns.
+
+    Returns:
+        float or be.ndarray: The refractive index(s).
+
+    """
+    try:
+        n = c[0] + c[1] / (w**2 - 0.028) + c[2] * (1 / (w**2 - 0.028)) ** 2
+        for k in range(3, len(c)):
+            n = n + c[k] * w ** (2 * (k - 2))
+        return n
+    except IndexError as err:
+        raise ValueError("Invalid coefficients for dispersion formula 7.") from err
+
+
+def retro(c, w):
+    """Dispersion formula 8 from refractiveindex.info (Retro formula).
+
+    Args:
+        c (be.ndarray): The coefficients of the formula.
+        w (float or be.ndarray): The wavelength(s) in microns.
+
+    Returns:
+        float or be.ndarray: The refractive index(s).
+
+    """
+    if len(c) != 4:
+        raise ValueError("Invalid coefficients for dispersion formula 8.")
+
+    b = c[0] + c[1] * w**2 / (w**2 - c[2]) + c[3] * w**2
+    return be.sqrt((1 + 2 * b) / (1 - b))
+
+
+def exotic(c, w):
+    """Dispersion formula 9 from refractiveindex.info (Exotic formula).
+
+    Args:
+        c (be.ndarray): The coefficients of the formula.
+        w (float or be.ndarray): The wavelength(s) in microns.
+
+    Returns:
+        float or be.ndarray: The refractive index(s).
+
+    """
+    if len(c) != 6:
+        raise ValueError("Invalid coefficients for dispersion formula 9.")
+
+    n = c[0] + c[1] / (w**2 - c[2]) + c[3] * (w - c[4]) / ((w - c[4]) ** 2 + c[5])
+    return be.sqrt(n)
+
+
+FORMULAS = {
+    "formula 1": sellmeier,
+    "formula 2": sellmeier_2,
+    "formula 3": polynomial,
+    "formula 4": refractiveindex_info,
+    "formula 5": cauchy,
+    "formula 6": gases,
+    "formula 7": herzberger,
+    "formula 8": retro,
+    "formula 9": exotic,
+}
+
+
+def air_index(wavelength, temperature, pressure=1.0):
+    """Computes the refractive index of air.
+
+    This formula is a variant of the Edlén equation for the dispersion of air.
+
+    Args:
+        wavelength (float or be.ndarray): The wavelength(s) in microns.
+        temperature (float or be.ndarray): The temperature of air in degrees
+            Celsius.
+        pressure (float): The relative pressure in atmospheres (atm).
+            Defaults to 1.0.
+
+    Returns:
+        float or be.ndarray: The refractive index of air.
+
+    """
+    AIR_REF_TEMP_C = 15.0
+    AIR_THERMAL_COEFF = 0.0034785  # Corresponds to 3.4785 / 1000
+
+    # Calculate (n-1) for air at the reference temperature (15°C)
+    # and 1 atm pressure using the dispersion formula.
+    w2 = wavelength**2
+    n_ref_minus_1 = (
+        6432.8 + (2949810 * w2) / (146 * w2 - 1) + (25540 * w2) / (41 * w2 - 1)
+    ) * 1e-8
+
+    # Adjust for the actual system temperature and pressure.
+    return 1.0 + (n_ref_minus_1 * pressure) / (
+        1.0 + (temperature - AIR_REF_TEMP_C) * AIR_THERMAL_COEFF
+    )
+
+
+def relative_wavelength(wavelength, t0, temperature, pressure):
+    """Scales wavelengths in ambient air to the reference conditions of a
+    material, i.e., air at its reference temperature and 1 atm.
+
+    Args:
+        wavelength (float or be.ndarray): The wavelength(s) in microns.
+        t0 (float or be.ndarray): The reference temperature of the material
+            in Celsius.
+        temperature (float): The system temperature in Celsius.
+        pressure (float): The system pressure in atmospheres.
+
+    Returns:
+        float or be.ndarray: The relative wavelength(s) in microns.
+
+    """
+    return (
+        wavelength
+        * air_index(wavelength, temperature, pressure)
+        / air_index(wavelength, t0, 1.0)
+    )
+
+
+def environmental_correction(
+    base_relative_n, wavelength, t0, coefficients, temperature, pressure
+):
+    """Applies temperature and pressure corrections to a refractive index.
+
+    The index relative to air at the reference temperature of the material is
+    converted to an absolute index, corrected for the temperature change with
+    the Schott formula, and converted back to an index relative to the
+    ambient air.
+
+    Args:
+        base_relative_n (float or be.ndarray): The catalog refractive index
+            relative to air at reference temperature.
+        wavelength (float or be.ndarray): The wavelength(s) in microns.
+        t0 (float or be.ndarray): The reference temperature of the material in
+            Celsius.
+        coefficients (be.ndarray): The six thermal dispersion coefficients of
+            the material (D0, D1, D2, E0, E1, lambda_tk).
+        temperature (float): The system temperature in Celsius.
+        pressure (float): The system pressure in atmospheres.
+
+    Returns:
+        float or be.ndarray: The corrected refractive index relative to the
+        ambient conditions.
+
+    """
+    # Compute the absolute index of the material (relative to vacuum) at its
+    # reference temperature and standard pressure (1 atm)
+    n_absolute_reference = base_relative_n * air_index(wavelength, t0, 1.0)
+
+    # Compute the change in the absolute index due to the temperature difference
+    c = coefficients
+    delta_t = temperature - t0
+
+    # This is the Schott formula for the change in absolute refractive index
+    term1 = c[0] + c[1] * delta_t + c[2] * delta_t**2
+    term2 = (c[3] + c[4] * delta_t) / (wavelength**2 - c[5] ** 2)
+    dn_abs = (
+        (n_absolute_reference**2 - 1.0)
+        / (2.0 * n_absolute_reference)
+        * (term1 + term2)
+        * delta_t
+    )
+
+    n_absolute_corrected = n_absolute_reference + dn_abs
+
+    # Compute the final index of the material relative to the ambient air at the
+    # new system conditions.
+    return n_absolute_corrected / air_index(wavelength, temperature, pressure)
+
+
+def _group_key(material, temperature):
+    """Return the key of the group in which a material is evaluated, or None
+    if the material is evaluated individually."""
+    from optiland.materials.material_file import MaterialFile
+
+    if not isinstance(material, MaterialFile) or material._n_formula not in FORMULAS:
+        return None
+    corrected = (
+        temperature is not None
+        and material._t0 is not None
+        and bool(be.any(be.array(material.thermdispcoef)))
+    )
+    return material._n_formula, len(material.coefficients), corrected
+
+
+def _stack(arrays):
+    """Stack per-material coefficients to shape (num_coefficients,
+    num_materials, 1)."""
+    columns = [be.ravel(be.array(array)) for array in arrays]
+    return be.stack(columns, axis=1)[:, :, None]
+
+
+def evaluate_dispersion(
+    materials: list[BaseMaterial], wavelengths, temperature=None, pressure=None
+):
+    """Evaluate the refractive indices of materials at wavelengths.
+
+    Materials defined by the same dispersion formula with the same number of
+    coefficients are evaluated together, including the temperature and
+    pressure correction. Other materials (e.g., ideal materials or materials
+    defined by tabulated data) are evaluated individually.
+
+    Args:
+        materials (list[BaseMaterial]): The materials.
+        wavelengths (be.ndarray): The wavelengths in microns, with shape
+            (num_wavelengths,).
+        temperature (float, optional): The system temperature in Celsius.
+            Defaults to None, in which case no correction is applied.
+        pressure (float, optional): The system pressure in atmospheres.
+            Defaults to None, i.e., 1 atm if a temperature is given.
+
+    Returns:
+        be.ndarray: The refractive indices, with shape (num_materials,
+        num_wavelengths).
+
+    """
+    wavelengths = be.ravel(be.array(wavelengths))
+    kwargs = {"temperature": temperature, "pressure": pressure}
+    kwargs = {key: value for key, value in kwargs.items() if value is not None}
+
+    groups = {}
+    rows = [None] * len(materials)
+    for index, material in enumerate(materials):
+        key = _group_key(material, temperature)
+        if key is None:
+            n = material.n(wavelengths, **kwargs)
+            rows[index] = be.ravel(be.broadcast_to(n, wavelengths.shape))
+        else:
+            groups.setdefault(key, []).append(index)
+
+    for (formula, _, corrected), indices in groups.items():
+        group = [materials[index] for index in indices]
+        c = _stack([material.coefficients for material in group])
+        if corrected:
+            pressure_atm = 1.0 if pressure is None else pressure
+            t0 = be.array([[material._t0] for material in group])
+            thermal = _stack([material.thermdispcoef for material in group])
+            waverel = relative_wavelength(wavelengths, t0, temperature, pressure_atm)
+            n = environmental_correction(
+                FORMULAS[formula](c, waverel),
+                wavelengths,
+                t0,
+                thermal,
+                temperature,
+                pressure_atm,
+            )
+        else:
+            n = FORMULAS[formula](c, wavelengths)
+        n = be.broadcast_to(n, (len(group), be.size(wavelengths)))
+        for row, index in enumerate(indices):
+            rows[index] = n[row]
+
+    if not rows:
+        return be.zeros((0, be.size(wavelengths)))
+    return be.stack(rows)
+
+
+class _TableRow:
+    """The refractive indices of a material in a dispersion table.
+
+    Args:
+        wavelengths (np.ndarray): The sorted wavelengths of the table.
+        values (be.ndarray): The refractive indices at these wavelengths.
+        kwargs (tuple): The sorted keyword arguments of the table.
+        scalar_shape (tuple): The shape of the refractive index of the
+            material at a single wavelength.
+        revision (int): The revision of the material.
+    """
+
+    def __init__(self, wavelengths, values, kwargs, scalar_shape, revision):
+        self.wavelengths = wavelengths
+        self.values = values
+        self.kwargs = kwargs
+        self.scalar_shape = scalar_shape
+        self.revision = revision
+        self._index = {float(w): index for index, w in enumerate(wavelengths)}
+
+    def lookup(self, material: BaseMaterial, wavelength, kwargs: dict):
+        """Return the refractive index at a wavelength, or None if the
+        wavelength is not in the table or the table is outdated."""
+        if (
+            be.get_backend() != "numpy"
+            or material.revision != self.revision
+            or tuple(sorted(kwargs.items())) != self.kwargs
+        ):
+            return None
+
+        if not be.is_array_like(wavelength):
+            index = self._index.get(float(wavelength))
+            if index is None:
+                return None
+            value = self.values[index]
+            return value if self.scalar_shape == () else np.reshape(value, (1,))
+
+        wavelength = np.asarray(wavelength)
+        index = np.searchsorted(self.wavelengths, wavelength)
+        index = np.minimum(index, len(self.wavelengths) - 1)
+        if not np.array_equal(self.wavelengths[index], wavelength):
+            return None
+        return self.values[index]
+
+
+class DispersionTable:
+    """The refractive indices of a set of materials at a set of wavelengths.
+
+    The table is computed with `evaluate_dispersion`. While it is attached to
+    the materials, their `n` method returns the refractive index from the
+    table for the wavelengths of the table, both for single wavelengths and
+    for arrays of wavelengths (e.g., the wavelengths of traced rays), and
+    for the temperature and pressure of the table. The table of a material is
+    ignored as soon as the material is modified. Tables are only used with
+    the numpy backend, so that gradients are not affected.
+
+    Args:
+        materials (list[BaseMaterial]): The materials.
+        wavelengths (be.ndarray): The wavelengths in microns.
+        temperature (float, optional): The system temperature in Celsius.
+            Defaults to None.
+        pressure (float, optional): The system pressure in atmospheres.
+            Defaults to None.
+
+    Attributes:
+        materials (list[BaseMaterial]): The materials.
+        wavelengths (be.ndarray): The sorted, unique wavelengths.
+        values (be.ndarray): The refractive indices, with shape
+            (num_materials, num_wavelengths).
+
+    """
+
+    def __init__(
+        self,
+        materials: list[BaseMaterial],
+        wavelengths,
+        temperature=None,
+        pressure=None,
+    ):
+        self.materials = list(materials)
+        self.wavelengths = be.array(np.unique(be.to_numpy(wavelengths)))
+        self.temperature = temperature
+        self.pressure = pressure
+        self.values = evaluate_dispersion(
+            self.materials, self.wavelengths, temperature, pressure
+        )
+
+    @classmethod
+    def from_optic(cls, optic: Optic, wavelengths=None) -> DispersionTable:
+        """Create the table of the materials of an optic.
+
+        Args:
+            optic (Optic): The optical system.
+            wavelengths (be.ndarray, optional): The wavelengths in microns.
+                Defaults to None, in which case the wavelengths of the optic
+                are used.
+
+        Returns:
+            DispersionTable: The table.
+
+        """
+        if wavelengths is None:
+            wavelengths = optic.wavelengths.get_wavelengths()
+
+        materials = {}
+        for surface in optic.surfaces:
+            for material in (surface.material_pre, surface.material_post):
+                if material is not None:
+                    materials.setdefault(id(material), material)
+        return cls(list(materials.values()), wavelengths)
+
+    def n(self, material: BaseMaterial):
+        """Return the refractive indices of a material.
+
+        Args:
+            material (BaseMaterial): A material of the table.
+
+        Returns:
+            be.ndarray: The refractive indices of the material at the
+            wavelengths of the table.
+
+        Raises:
+            ValueError: If the material is not in the table.
+
+        """
+        for index, candidate in enumerate(self.materials):
+            if candidate is material:
+                return self.values[index]
+        raise ValueError("Material is not in the dispersion table.")
+
+    def attach(self):
+        """Serve the `n` calls of the materials from the table."""
+        kwargs = {"temperature": self.temperature, "pressure": self.pressure}
+        kwargs = tuple(
+            sorted((key, value) for key, value in kwargs.items() if value is not None)
+        )
+        wavelengths = be.to_numpy(self.wavelengths)
+        values = be.to_numpy(self.values)
+        for material, row in zip(self.materials, values, strict=True):
+            scalar = material.n(float(wavelengths[0]), **dict(kwargs))
+            material._attach_dispersion(
+                _TableRow(wavelengths, row, kwargs, np.shape(scalar), material.revision)
+            )
+
+    def detach(self):
+        """Stop serving the `n` calls of the materials from the table."""
+        for material in self.materials:
+            material._attach_dispersion(None)
+
+    @contextmanager
+    def activate(self) -> Iterator[DispersionTable]:
+        """Serve the `n` calls of the materials from the table within the
+        context.
+
+        Yields:
+            DispersionTable: This table.
+        """
+        self.attach()
+        try:
+            yield self
+        finally:
+            self.detach()
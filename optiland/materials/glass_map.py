@@ -0,0 +1,355 @@
+"""Glass Map
+
+This module contains the GlassMap class, a spatial index of optical glasses in
+(n_d, V_d) space, and optionally partial dispersion (P_g,F), used to find
+candidate glasses for glass substitution.
+
+The glass map of the material database (`glass_map.npz` in the `database`
+directory) holds the catalog filename, name, manufacturer, n_d, V_d and P_g,F
+of every glass, so that glass data is available without reading the material
+files. It is generated with `compile_glass_map`, and must be regenerated when
+the database is updated. Queries use a k-d tree, built when a map is created.
+
+Kramer Harrison, 2025
+"""
+
+from __future__ import annotations
+
+import os
+from importlib import resources
+from pathlib import Path
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from optiland.materials.catalog import _decode_strings, _encode_strings
+
+# Fraunhofer g, F and C lines, in microns
+_WAVELENGTH_G = 0.4358343
+_WAVELENGTH_F = 0.4861327
+_WAVELENGTH_C = 0.6562725
+
+
+def compile_glass_map(output_file=None, database_dir=None):
+    """Compile the glass map of the material database.
+
+    n_d and V_d are read from the specifications of each glass file, as in
+    `get_nd_vd`. P_g,F is computed from the dispersion formula of the glass,
+    if its wavelength range covers the g and C lines. Missing values are
+    stored as NaN.
+
+    Args:
+        output_file (str, optional): The path of the compiled glass map.
+            Defaults to None, in which case `glass_map.npz` in the database
+            directory is written.
+        database_dir (str, optional): The database directory, containing
+            `catalog_nk.csv` and the `data-nk` directory. Defaults to None, in
+            which case the database of the package is used.
+    """
+    import pandas as pd
+    import yaml
+
+    from optiland.materials.dispersion import evaluate_dispersion
+    from optiland.materials.material_file import MaterialFile
+
+    database = (
+        resources.files("optiland.database")
+        if database_dir is None
+        else Path(database_dir)
+    )
+    if output_file is None:
+        output_file = str(database.joinpath("glass_map.npz"))
+
+    df = pd.read_csv(str(database.joinpath("catalog_nk.csv")))
+    df = df[df["group"] == "glass"].drop_duplicates("filename")
+
+    nd, vd, pgf = [], [], []
+    for filename, min_wavelength, max_wavelength in zip(
+        df["filename"], df["min_wavelength"], df["max_wavelength"], strict=True
+    ):
+        path = str(database.joinpath("data-nk", filename))
+        with open(path, encoding="utf-8") as stream:
+            specs = yaml.safe_load(stream).get("SPECS") or {}
+        try:
+            nd.append(float(specs["nd"]))
+            vd.append(float(specs["Vd"]))
+        except (KeyError, TypeError, ValueError):
+            nd.append(np.nan)
+            vd.append(np.nan)
+
+        pgf.append(np.nan)
+        if min_wavelength <= _WAVELENGTH_G and max_wavelength >= _WAVELENGTH_C:
+            try:
+                n_g, n_f, n_c = evaluate_dispersion(
+                    [MaterialFile(path)], [_WAVELENGTH_G, _WAVELENGTH_F, _WAVELENGTH_C]
+                )[0]
+                pgf[-1] = float((n_g - n_f) / (n_f - n_c))
+            except Exception:  # invalid files are reported when loaded
+                pass
+
+    np.savez(
+        output_file,
+        filename=_encode_strings(df["filename"]),
+        name=_encode_strings(df["filename_no_ext"]),
+        manufacturer=_encode_strings(
+            filename.split("/")[1] for filename in df["filename"]
+        ),
+        nd=np.array(nd, dtype=float),
+        vd=np.array(vd, dtype=float),
+        pgf=np.array(pgf, dtype=float),
+    )
+
+
+class GlassMap:
+    """A spatial index of glasses in (n_d, V_d) space.
+
+    Distances are Euclidean, with optional weights per coordinate. Glasses
+    without n_d and V_d data are not indexed. Partial dispersion can be
+    included in queries, in which case glasses without P_g,F data are
+    ignored.
+
+    Args:
+        names (list[str]): The names of the glasses.
+        nd (np.ndarray): The refractive index n_d of each glass.
+        vd (np.ndarray): The Abbe number V_d of each glass.
+        pgf (np.ndarray, optional): The partial dispersion P_g,F of each glass.
+            Defaults to None, i.e., not available.
+        manufacturers (list[str], optional): The manufacturer (catalog) of
+            each glass. Defaults to None, i.e., unknown.
+        filenames (list[str], optional): The catalog filename of each glass.
+            Defaults to None, i.e., unknown.
+
+    Attributes:
+        names (list[str]): The names of the indexed glasses.
+        nd (np.ndarray): The refractive index n_d of the indexed glasses.
+        vd (np.ndarray): The Abbe number V_d of the indexed glasses.
+        pgf (np.ndarray): The partial dispersion P_g,F of the indexed glasses,
+            NaN if not available.
+        manufacturers (list[str]): The manufacturers of the indexed glasses.
+        filenames (list[str]): The catalog filenames of the indexed glasses.
+
+    """
+
+    _instance = None
+    _filename = str(resources.files("optiland.database").joinpath("glass_map.npz"))
+
+    def __init__(self, names, nd, vd, pgf=None, manufacturers=None, filenames=None):
+        nd = np.asarray(nd, dtype=float)
+        vd = np.asarray(vd, dtype=float)
+        size = len(names)
+        pgf = np.full(size, np.nan) if pgf is None else np.asarray(pgf, dtype=float)
+        manufacturers = [""] * size if manufacturers is None else list(manufacturers)
+        filenames = [""] * size if filenames is None else list(filenames)
+
+        valid = np.flatnonzero(np.isfinite(nd) & np.isfinite(vd))
+        self.names = [names[i] for i in valid]
+        self.nd = nd[valid]
+        self.vd = vd[valid]
+        self.pgf = pgf[valid]
+        self.manufacturers = [manufacturers[i] for i in valid]
+        self.filenames = [filenames[i] for i in valid]
+        self._file_index = {
+            filename: i for i, filename in enumerate(self.filenames) if filename
+        }
+        self._trees = {}
+
+    @classmethod
+    def load(cls) -> GlassMap | None:
+        """Load the glass map of the material database once.
+
+        Returns:
+            GlassMap | None: The glass map, or None if the compiled glass map
+            is not available.
+        """
+        if cls._instance is None:
+            try:
+                with np.load(cls._filename) as data:
+                    cls._instance = cls(
+                        _decode_strings(data["name"]),
+                        data["nd"],
+                        data["vd"],
+                        data["pgf"],
+                        _decode_strings(data["manufacturer"]),
+                        _decode_strings(data["filename"]),
+                    )
+            except OSError:
+                return None
+        return cls._instance
+
+    @classmethod
+    def from_dict(cls, glass_dict: dict[str, tuple[float, float]]) -> GlassMap:
+        """Create a glass map from a glass dictionary.
+
+        Args:
+            glass_dict (dict[str, tuple[float, float]]): The (n_d, V_d) of
+                each glass, e.g., {'S-BSM22': (1.62, 53.16), ...}.
+
+        Returns:
+            GlassMap: The glass map.
+        """
+        names = list(glass_dict)
+        values = np.array([glass_dict[name] for name in names], dtype=float)
+        values = np.reshape(values, (-1, 2))
+        return cls(names, values[:, 0], values[:, 1])
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def find(self, filename: str) -> int | None:
+        """Return the index of a glass from its catalog filename.
+
+        Args:
+            filename (str): The filename, relative to the `data-nk` directory
+                of the database, e.g., 'glass/schott/N-BK7.yml'.
+
+        Returns:
+            int | None: The index of the glass, or None if it is not indexed.
+        """
+        return self._file_index.get(Path(filename).as_posix())
+
+    def find_path(self, path: str) -> int | None:
+        """Return the index of a glass from the path of its material file in
+        the material database of the package.
+
+        Args:
+            path (str): The path of the material file.
+
+        Returns:
+            int | None: The index of the glass, or None if it is not indexed.
+        """
+        data_dir = str(resources.files("optiland.database").joinpath("data-nk"))
+        try:
+            filename = os.path.relpath(path, data_dir)
+        except (TypeError, ValueError):
+            return None
+        return self.find(filename)
+
+    def subset(self, names=None, manufacturers=None) -> GlassMap:
+        """Return the glass map of a subset of the glasses.
+
+        Args:
+            names (list[str], optional): The names of the glasses to keep.
+                Defaults to None, i.e., all names.
+            manufacturers (list[str], optional): The manufacturers of the
+                glasses to keep, case-insensitive. Defaults to None, i.e., all
+                manufacturers.
+
+        Returns:
+            GlassMap: The glass map of the subset.
+        """
+        keep = np.ones(len(self), dtype=bool)
+        if names is not None:
+            names = set(names)
+            keep &= np.array([name in names for name in self.names], dtype=bool)
+        if manufacturers is not None:
+            manufacturers = {manufacturer.lower() for manufacturer in manufacturers}
+            keep &= np.array(
+                [m.lower() in manufacturers for m in self.manufacturers], dtype=bool
+            )
+        indices = np.flatnonzero(keep)
+        return GlassMap(
+            [self.names[i] for i in indices],
+            self.nd[indices],
+            self.vd[indices],
+            self.pgf[indices],
+            [self.manufacturers[i] for i in indices],
+            [self.filenames[i] for i in indices],
+        )
+
+    def nearest(
+        self,
+        nd: float,
+        vd: float,
+        k: int = 1,
+        pgf: float | None = None,
+        weights: tuple[float, ...] = (1.0, 1.0, 1.0),
+        exclude=(),
+    ) -> list[str]:
+        """Return the names of the glasses closest to a point.
+
+        Args:
+            nd (float): The refractive index n_d of the point.
+            vd (float): The Abbe number V_d of the point.
+            k (int, optional): The number of glasses. Defaults to 1.
+            pgf (float, optional): The partial dispersion P_g,F of the point.
+                Defaults to None, in which case the distance is computed in
+                (n_d, V_d) space only.
+            weights (tuple[float, ...], optional): The weights of n_d, V_d
+                and P_g,F in the distance. Defaults to (1.0, 1.0, 1.0).
+            exclude (Iterable[str], optional): The names of glasses to
+                exclude, e.g., the current glass. Defaults to ().
+
+        Returns:
+            list[str]: The names of up to k glasses, sorted by increasing
+            distance. Glasses at equal distance are sorted in the order of
+            the map.
+        """
+        distances, indices = self._query(nd, vd, pgf, weights, k, exclude)
+        order = np.lexsort((indices, distances))[:k]
+        return [self.names[i] for i in indices[order]]
+
+    def within(
+        self,
+        nd: float,
+        vd: float,
+        radius: float,
+        pgf: float | None = None,
+        weights: tuple[float, ...] = (1.0, 1.0, 1.0),
+    ) -> list[str]:
+        """Return the names of the glasses within a distance of a point.
+
+        Args:
+            nd (float): The refractive index n_d of the point.
+            vd (float): The Abbe number V_d of the point.
+            radius (float): The maximum distance.
+            pgf (float, optional): The partial dispersion P_g,F of the point.
+                Defaults to None, in which case the distance is computed in
+                (n_d, V_d) space only.
+            weights (tuple[float, ...], optional): The weights of n_d, V_d
+                and P_g,F in the distance. Defaults to (1.0, 1.0, 1.0).
+
+        Returns:
+            list[str]: The names of the glasses, sorted by increasing distance.
+        """
+        tree, indices, point = self._tree(nd, vd, pgf, weights)
+        if tree is None:
+            return []
+        found = np.array(tree.query_ball_point(point, radius), dtype=int)
+        distances = np.linalg.norm(tree.data[found] - point, axis=1)
+        found = indices[found]
+        order = np.lexsort((found, distances))
+        return [self.names[i] for i in found[order]]
+
+    def _query(self, nd, vd, pgf, weights, k, exclude):
+        """Return the distances and indices of the k nearest glasses that are
+        not excluded."""
+        tree, indices, point = self._tree(nd, vd, pgf, weights)
+        if tree is None or k < 1:
+            return np.zeros(0), np.zeros(0, dtype=int)
+
+        exclude = set(exclude)
+        num_excluded = sum(name in exclude for name in self.names)
+        # query extra glasses to resolve exclusions and ties at the k-th glass
+        num_query = min(len(indices), k + num_excluded + 1)
+        distances, found = tree.query(point, k=num_query)
+        distances = np.atleast_1d(distances)
+        found = indices[np.atleast_1d(found)]
+        keep = np.array([self.names[i] not in exclude for i in found], dtype=bool)
+        return distances[keep], found[keep]
+
+    def _tree(self, nd, vd, pgf, weights):
+        """Return the k-d tree of the requested coordinates, the indices of its
+        glasses and the weighted query point."""
+        use_pgf = pgf is not None
+        scale = np.asarray(weights[: 3 if use_pgf else 2], dtype=float)
+        key = (use_pgf, tuple(scale))
+        if key not in self._trees:
+            columns = [self.nd, self.vd] + ([self.pgf] if use_pgf else [])
+            points = np.stack(columns, axis=1) * scale
+            indices = np.flatnonzero(np.all(np.isfinite(points), axis=1))
+            tree = cKDTree(points[indices]) if len(indices) else None
+            self._trees[key] = (tree, indices)
+
+        tree, indices = self._trees[key]
+        point = np.array([nd, vd] + ([pgf] if use_pgf else []), dtype=float) * scale
+        return tree, indices, point
@@ -12,10 +12,13 @@ Kramer Harrison, 2024
 # import pkg_resources
 from __future__ import annotations
 
+import os
 from importlib import resources
 
 import pandas as pd
 
+import optiland.backend as be
+from optiland.materials.catalog import MaterialCatalog
 from optiland.materials.material_file import MaterialFile
 
 
@@ -28,7 +31,11 @@ class Material(MaterialFile):
     Note:
         The material database is stored in the file `catalog_nk.csv` in the
         `database` directory. This contains the names, references, and
-        filenames of the materials.
+        filenames of the materials. Materials whose name matches a name in the
+        database exactly are looked up in the compiled catalog
+        (`catalog_nk.npz`, see `MaterialCatalog`), which also holds the data
+        of materials defined by dispersion formulas, so that their material
+        files are not read.
 
     Args:
         name (str): The name of the material to search for.
@@ -51,7 +58,9 @@ class Material(MaterialFile):
     """
 
     _df = None
+    _df_lowercase = None
     _filename = str(resources.files("optiland.database").joinpath("catalog_nk.csv"))
+    _data_directory = str(resources.files("optiland.database").joinpath("data-nk"))
 
     def __init__(
         self,
@@ -67,6 +76,7 @@ class Material(MaterialFile):
         self.robust = robust_search
         self.min_wavelength = min_wavelength
         self.max_wavelength = max_wavelength
+        self._compiled_data = None
         file, self.material_data = self._retrieve_file()
         super().__init__(file, propagation_model=propagation_model)
 
@@ -77,6 +87,17 @@ class Material(MaterialFile):
             cls._df = pd.read_csv(cls._filename)
         return cls._df
 
+    @classmethod
+    def _lowercase_column(cls, df, column):
+        """Return a lowercase column of the catalog DataFrame, computed once."""
+        if df is not cls._df:
+            return df[column].str.lower()
+        if cls._df_lowercase is None:
+            cls._df_lowercase = {}
+        if column not in cls._df_lowercase:
+            cls._df_lowercase[column] = df[column].str.lower()
+        return cls._df_lowercase[column]
+
     @staticmethod
     def _levenshtein_distance(s1, s2):
         """Calculates the Levenshtein distance between two strings.
@@ -89,28 +110,21 @@ class Material(MaterialFile):
             int: The Levenshtein distance between the two strings.
 
         """
-        # Initialize matrix of zeros
-        rows = len(s1) + 1
-        cols = len(s2) + 1
-        distance_matrix = [[0 for _ in range(cols)] for _ in range(rows)]
-
-        # Populate matrix with initial values
-        for i in range(1, rows):
-            distance_matrix[i][0] = i
-        for j in range(1, cols):
-            distance_matrix[0][j] = j
-
-        # Calculate the distance
-        for i in range(1, rows):
-            for j in range(1, cols):
-                cost = 0 if s1[i - 1] == s2[j - 1] else 1
-                distance_matrix[i][j] = min(
-                    distance_matrix[i - 1][j] + 1,
-                    distance_matrix[i][j - 1] + 1,
-                    distance_matrix[i - 1][j - 1] + cost,
+        # Only the previous row of the distance matrix is kept
+        previous = list(range(len(s2) + 1))
+        for i, c1 in enumerate(s1, start=1):
+            current = [i]
+            for j, c2 in enumerate(s2, start=1):
+                current.append(
+                    min(
+                        previous[j] + 1,
+                        current[j - 1] + 1,
+                        previous[j - 1] + (c1 != c2),
+                    )
                 )
+            previous = current
 
-        return distance_matrix[-1][-1]
+        return previous[-1]
 
     def _find_material_matches(self, df):
         """Finds material matches in a DataFrame based on the given name and
@@ -128,23 +142,30 @@ class Material(MaterialFile):
         # Make input name lowercase
         name = self.name.lower()
 
+        def lower(column):
+            return self._lowercase_column(df, column)
+
         # Filter rows where input string is substring of category_name or name
         dfi = df[
-            df["category_name"].str.lower().str.contains(name)
-            | df["name"].str.lower().str.contains(name)
-            | df["filename_no_ext"].str.lower().str.contains(name)
+            lower("category_name").str.contains(name)
+            | lower("name").str.contains(name)
+            | lower("filename_no_ext").str.contains(name)
         ].copy()
 
         # If reference given, filter rows non-matching rows
         if self.reference:
             reference = self.reference.lower()
-            dfi = dfi[
-                dfi["category_name"].str.lower().str.contains(reference)
-                | dfi["category_name_full"].str.lower().str.contains(reference)
-                | dfi["reference"].str.lower().str.contains(reference)
-                | dfi["name"].str.lower().str.contains(reference)
-                | dfi["filename"].str.lower().str.contains(reference)
+            columns = [
+                "category_name",
+                "category_name_full",
+                "reference",
+                "name",
+                "filename",
             ]
+            matches = lower(columns[0]).str.contains(reference)
+            for column in columns[1:]:
+                matches |= lower(column).str.contains(reference)
+            dfi = dfi[matches.loc[dfi.index]]
 
         # Filter rows based on wavelength range
         if self.min_wavelength:
@@ -173,7 +194,9 @@ class Material(MaterialFile):
         )
 
         # Sort by similarity score in ascending order
-        dfi = dfi.sort_values(by="similarity_score").reset_index(drop=True)
+        dfi = dfi.sort_values(by="similarity_score", kind="stable").reset_index(
+            drop=True
+        )
 
         # Warning if no exact matches found
         if dfi["similarity_score"].iloc[0] > 0:
@@ -226,6 +249,10 @@ class Material(MaterialFile):
             ValueError: If multiple matches are found for the material.
 
         """
+        match = self._find_exact_match()
+        if match is not None:
+            return match
+
         df = self._load_dataframe()
         filtered_df = self._find_material_matches(df)
 
@@ -244,6 +271,68 @@ class Material(MaterialFile):
 
         return full_filename, material_data
 
+    def _find_exact_match(self):
+        """Finds an exact match of the material in the compiled catalog.
+
+        The category name, name or filename of an exact match equals the
+        name of the material, which is looked up in the index of the catalog.
+        As exact matches come first in the results of the full search, the
+        first exact match (in catalog order) that also matches the reference
+        and wavelength range is the material found by the full search. The
+        full search is still required without robust search, as it raises an
+        error for multiple (also inexact) matches.
+
+        Returns:
+            tuple[str, dict] | None: The full file path and metadata of the
+            material, as returned by `_retrieve_file`, or None if no exact
+            match is found or robust search is disabled.
+
+        """
+        catalog = MaterialCatalog.load()
+        if catalog is None or not self.robust:
+            return None
+
+        for row in catalog.exact_matches(self.name):
+            if self.reference and not catalog.matches_reference(row, self.reference):
+                continue
+            min_wavelength = catalog.min_wavelength[row]
+            max_wavelength = catalog.max_wavelength[row]
+            if self.min_wavelength and not (
+                min_wavelength <= self.min_wavelength <= max_wavelength
+            ):
+                continue
+            if self.max_wavelength and not (
+                min_wavelength <= self.max_wavelength <= max_wavelength
+            ):
+                continue
+
+            material_data = catalog.row(row)
+            material_data["similarity_score"] = 0
+            self._compiled_data = catalog.material_data(row)
+            full_filename = os.path.join(
+                self._data_directory, material_data["filename"]
+            )
+            return full_filename, material_data
+        return None
+
+    def _load_data(self):
+        """Load the material data from the compiled catalog, if available,
+        otherwise from the material file."""
+        data = self._compiled_data
+        if data is None:
+            super()._load_data()
+            return
+
+        self.coefficients = be.reshape(be.array(data["coefficients"]), (-1, 1))
+        self._set_formula_type(data["formula"])
+        if data["k"] is not None:
+            self._k_wavelength = be.asarray(data["k_wavelength"])
+            self._k = be.asarray(data["k"])
+        if len(data["thermal"]):
+            self.thermdispcoef = be.reshape(be.array(data["thermal"]), (-1, 1))
+        self._t0 = data["t0"]
+        self.reference_data = data["reference"]
+
     def to_dict(self):
         """Converts the material to a dictionary.
 
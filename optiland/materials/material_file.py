@@ -17,6 +17,20 @@ import yaml
 
 import optiland.backend as be
 from optiland.materials.base import BaseMaterial
+from optiland.materials.dispersion import (
+    air_index,
+    cauchy,
+    environmental_correction,
+    exotic,
+    gases,
+    herzberger,
+    polynomial,
+    refractiveindex_info,
+    relative_wavelength,
+    retro,
+    sellmeier,
+    sellmeier_2,
+)
 
 
 class MaterialFile(BaseMaterial):
@@ -48,6 +62,8 @@ class MaterialFile(BaseMaterial):
 
     """
 
+    _untracked_attributes = frozenset({"_k_warning_printed"})
+
     def __init__(self, filename, propagation_model=None):
         super().__init__(propagation_model)
         self.filename = filename
@@ -76,6 +92,10 @@ class MaterialFile(BaseMaterial):
             "tabulated nk": self._tabulated_n,
         }
 
+        self._load_data()
+
+    def _load_data(self):
+        """Read and parse the material file."""
         data = self._read_file()
         self._parse_file(data)
 
@@ -109,11 +129,7 @@ class MaterialFile(BaseMaterial):
 
             # Calculate the 'relative' wavelength which is input wavelength scaled
             # to reference temperature and pressure
-            waverel = (
-                wavelength
-                * self._nair(wavelength, temperature, pressure)
-                / self._nair(wavelength, self._t0, 1.0)
-            )
+            waverel = relative_wavelength(wavelength, self._t0, temperature, pressure)
             # Calculate the baseline refractive index. This is relative to air at the
             # reference temperature (self._t0) and for 'relative' wavelength.
             base_relative_n = self.formula_map[self._n_formula](waverel)
@@ -152,39 +168,15 @@ class MaterialFile(BaseMaterial):
         if pressure_atm is None:
             pressure_atm = 1.0
 
-        # Compute the index of air at the material's reference temperature and standard
-        # pressure (1 atm)
-        n_air_reference = self._nair(wavelength, self._t0, 1.0)
-
-        # Compute the absolute index of the material (relative to vacuum) at its
-        # reference temperature
-        n_absolute_reference = base_relative_n * n_air_reference
-
-        # Compute the change in the absolute index due to the temperature difference
-        c = self.thermdispcoef
-        delta_t = temp_c - self._t0
-
-        # This is the Schott formula for the change in absolute refractive index
-        term1 = c[0] + c[1] * delta_t + c[2] * delta_t**2
-        term2 = (c[3] + c[4] * delta_t) / (wavelength**2 - c[5] ** 2)
-        dn_abs = (
-            (n_absolute_reference**2 - 1.0)
-            / (2.0 * n_absolute_reference)
-            * (term1 + term2)
-            * delta_t
+        return environmental_correction(
+            base_relative_n,
+            wavelength,
+            self._t0,
+            self.thermdispcoef,
+            temp_c,
+            pressure_atm,
         )
 
-        n_absolute_corrected = n_absolute_reference + dn_abs
-
-        # Compute the index of air at the new system temperature and pressure.
-        n_air_system = self._nair(wavelength, temp_c, pressure_atm)
-
-        # Compute the final index of the material relative to the ambient air at the
-        # new system conditions.
-        final_relative_n = n_absolute_corrected / n_air_system
-
-        return final_relative_n
-
     def _nair(self, wavelength_um, temp_c, pressure_atm=1.0):
         """Computes the refractive index of air
 
@@ -199,22 +191,7 @@ class MaterialFile(BaseMaterial):
         Returns:
             float or be.ndarray: The refractive index of air.
         """
-        AIR_REF_TEMP_C = 15.0
-        AIR_THERMAL_COEFF = 0.0034785  # Corresponds to 3.4785 / 1000
-
-        # Calculate (n-1) for air at the reference temperature (15°C)
-        # and 1 atm pressure using the dispersion formula.
-        w2 = wavelength_um**2
-        n_ref_minus_1 = (
-            6432.8 + (2949810 * w2) / (146 * w2 - 1) + (25540 * w2) / (41 * w2 - 1)
-        ) * 1e-8
-
-        # Adjust for the actual system temperature and pressure.
-        n_air = 1.0 + (n_ref_minus_1 * pressure_atm) / (
-            1.0 + (temp_c - AIR_REF_TEMP_C) * AIR_THERMAL_COEFF
-        )
-
-        return n_air
+        return air_index(wavelength_um, temp_c, pressure_atm)
 
     def _calculate_k(self, wavelength, **kwargs):
         """Retrieves the extinction coefficient of the material at a
@@ -258,14 +235,7 @@ class MaterialFile(BaseMaterial):
             float or be.ndarray: The refractive index(s) of the material.
 
         """
-        c = self.coefficients
-        try:
-            n = 1 + c[0]
-            for k in range(1, len(c), 2):
-                n = n + c[k] * w**2 / (w**2 - c[k + 1] ** 2)
-        except IndexError as err:
-            raise ValueError("Invalid coefficients for dispersion formula 1.") from err
-        return be.sqrt(n)
+        return sellmeier(self.coefficients, w)
 
     def _formula_2(self, w):
         """Calculate the refractive index using dispersion formula 2 from
@@ -278,14 +248,7 @@ class MaterialFile(BaseMaterial):
             float or be.ndarray: The refractive index(s) of the material.
 
         """
-        c = self.coefficients
-        try:
-            n = 1 + c[0]
-            for k in range(1, len(c), 2):
-                n = n + c[k] * w**2 / (w**2 - c[k + 1])
-        except IndexError as err:
-            raise ValueError("Invalid coefficients for dispersion formula 2.") from err
-        return be.sqrt(n)
+        return sellmeier_2(self.coefficients, w)
 
     def _formula_3(self, w):
         """Calculate the refractive index using dispersion formula 3 from
@@ -298,14 +261,7 @@ class MaterialFile(BaseMaterial):
             float or be.ndarray: The refractive index(s) of the material.
 
         """
-        c = self.coefficients
-        try:
-            n = c[0]
-            for k in range(1, len(c), 2):
-                n = n + c[k] * w ** c[k + 1]
-            return be.sqrt(n)
-        except IndexError as err:
-            raise ValueError("Invalid coefficients for dispersion formula 3.") from err
+        return polynomial(self.coefficients, w)
 
     def _formula_4(self, w):
         """Calculate the refractive index using dispersion formula 4 from
@@ -318,18 +274,7 @@ class MaterialFile(BaseMaterial):
             float or be.ndarray: The refractive index(s) of the material.
 
         """
-        c = self.coefficients
-        try:
-            n = (
-                c[0]
-                + c[1] * w ** c[2] / (w**2 - c[3] ** c[4])
-                + c[5] * w ** c[6] / (w**2 - c[7] ** c[8])
-            )
-            for k in range(9, len(c), 2):
-                n = n + c[k] * w ** c[k + 1]
-            return be.sqrt(n)
-        except IndexError as err:
-            raise ValueError("Invalid coefficients for dispersion formula 4.") from err
+        return refractiveindex_info(self.coefficients, w)
 
     def _formula_5(self, w):
         """Calculate the refractive index using dispersion formula 5 from
@@ -342,14 +287,7 @@ class MaterialFile(BaseMaterial):
             float or be.ndarray: The refractive index(s) of the material.
 
         """
-        c = self.coefficients
-        try:
-            n = c[0]
-            for k in range(1, len(c), 2):
-                n = n + c[k] * w ** c[k + 1]
-            return n
-        except IndexError as err:
-            raise ValueError("Invalid coefficients for dispersion formula 5.") from err
+        return cauchy(self.coefficients, w)
 
     def _formula_6(self, w):
         """Calculate the refractive index using dispersion formula 6 from
@@ -362,14 +300,7 @@ class MaterialFile(BaseMaterial):
             float or be.ndarray: The refractive index(s) of the material.
 
         """
-        c = self.coefficients
-        try:
-            n = 1 + c[0]
-            for k in range(1, len(c), 2):
-                n = n + c[k] / (c[k + 1] - w**-2)
-            return n
-        except IndexError as err:
-            raise ValueError("Invalid coefficients for dispersion formula 6.") from err
+        return gases(self.coefficients, w)
 
     def _formula_7(self, w):
         """Calculate the refractive index using dispersion formula 7 from
@@ -382,14 +313,7 @@ class MaterialFile(BaseMaterial):
             float or be.ndarray: The refractive index(s) of the material.
 
         """
-        c = self.coefficients
-        try:
-            n = c[0] + c[1] / (w**2 - 0.028) + c[2] * (1 / (w**2 - 0.028)) ** 2
-            for k in range(3, len(c)):
-                n = n + c[k] * w ** (2 * (k - 2))
-            return n
-        except IndexError as err:
-            raise ValueError("Invalid coefficients for dispersion formula 7.") from err
+        return herzberger(self.coefficients, w)
 
     def _formula_8(self, w):
         """Calculate the refractive index using dispersion formula 8 from
@@ -402,12 +326,7 @@ class MaterialFile(BaseMaterial):
             float or be.ndarray: The refractive index(s) of the material.
 
         """
-        c = self.coefficients
-        if len(c) != 4:
-            raise ValueError("Invalid coefficients for dispersion formula 8.")
-
-        b = c[0] + c[1] * w**2 / (w**2 - c[2]) + c[3] * w**2
-        return be.sqrt((1 + 2 * b) / (1 - b))
+        return retro(self.coefficients, w)
 
     def _formula_9(self, w):
         """Calculate the refractive index using dispersion formula 9 from
@@ -420,12 +339,7 @@ class MaterialFile(BaseMaterial):
             float or be.ndarray: The refractive index(s) of the material.
 
         """
-        c = self.coefficients
-        if len(c) != 6:
-            raise ValueError("Invalid coefficients for dispersion formula 9.")
-
-        n = c[0] + c[1] / (w**2 - c[2]) + c[3] * (w - c[4]) / ((w - c[4]) ** 2 + c[5])
-        return be.sqrt(n)
+        return exotic(self.coefficients, w)
 
     def _tabulated_n(self, w):
         """Calculate the refractive index using tabulated data.
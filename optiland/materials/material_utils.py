@@ -12,6 +12,8 @@ from matplotlib.axes import Axes
 from scipy.cluster.vq import kmeans2
 
 import optiland.backend as be
+from optiland.materials.catalog import MaterialCatalog
+from optiland.materials.glass_map import GlassMap
 from optiland.materials.material import Material
 
 if TYPE_CHECKING:
@@ -74,9 +76,10 @@ def get_nd_vd(glass: str) -> tuple[float, float]:
     """
     Retrieve the refractive index (n_d) and Abbe number (V_d) for a given glass.
 
-    This function loads the material data associated with the specified glass name,
-    reads its YAML specification file, and extracts the n_d and V_d values from the
-    "SPECS" section. If either value is missing, defaults to (0, 0).
+    This function finds the material file associated with the specified glass name
+    and returns its n_d and V_d values from the glass map of the database or,
+    for glasses that are not indexed, from the "SPECS" section of the YAML file.
+    If either value is missing, defaults to (0, 0).
 
     Args:
         glass (str): Name of the glass material.
@@ -86,8 +89,24 @@ def get_nd_vd(glass: str) -> tuple[float, float]:
         the refractive index and Abbe number, in the form:
         glass_dict = {'S-BSM22': (1.62, 53.16), 'LF5G19': (1.59, 39.89), ...}
     """
+    glass_map = GlassMap.load()
+
+    # An exact match of the name in the compiled catalog is the file found by
+    # Material, which is looked up in the glass map without loading the glass
+    catalog = MaterialCatalog.load()
+    rows = [] if catalog is None else catalog.exact_matches(glass)
+    if rows and glass_map is not None:
+        index = glass_map.find(catalog.columns["filename"][rows[0]])
+        if index is not None:
+            return float(glass_map.nd[index]), float(glass_map.vd[index])
+
     material = Material(glass)
     yml_path, _ = material._retrieve_file()
+
+    index = None if glass_map is None else glass_map.find_path(yml_path)
+    if index is not None:
+        return float(glass_map.nd[index]), float(glass_map.vd[index])
+
     with Path(yml_path).open("r", encoding="utf-8") as f:
         data = yaml.safe_load(f)
 
@@ -193,6 +212,7 @@ def get_neighbour_glasses(
     glass_dict: dict[str, tuple[float, float]] = None,
     num_neighbours: int = 3,
     plot: bool = False,
+    glass_map: GlassMap | None = None,
 ) -> list[str]:
     """
     Return the `num_neighbours` closest glasses
@@ -206,6 +226,9 @@ def get_neighbour_glasses(
         num_neighbours (int): Number of closest glasses to return.
         plot (bool): If True, plot the selected glass map
                      and highlight neighbors.
+        glass_map (GlassMap, optional): The glass map of `glass_dict`, to
+            reuse across queries. Defaults to None, in which case it is built
+            from `glass_dict`.
 
     Returns:
         list[str]: List of `num_neighbours` closest glasses
@@ -223,23 +246,10 @@ def get_neighbour_glasses(
 
     nd0, vd0 = glass_dict[glass]
 
-    # Compute Euclidean distance in (nd, vd) space. Weighting can be added.
-    # For each glass in the catalogue:
-    # - Skip the current glass (it should not be a neighbor of itself)
-    # - Calculate the Euclidean distance in (nd, vd) space
-    #   between the candidate and the current glass
-    # - Store the distance and the corresponding glass name
-    #   in a list for sorting
-    distances: list[tuple[float, str]] = []
-    for g, (nd, vd) in glass_dict.items():
-        if g == glass:
-            continue
-        w_nd, w_vd = 1.0, 1.0  # For future weighting
-        distance = be.hypot(w_nd * (nd - nd0), w_vd * (vd - vd0))
-        distances.append((distance, g))
-
-    distances.sort(key=lambda t: t[0])
-    neighbours: list[str] = [g for _, g in distances[:num_neighbours]]
+    # Find the closest glasses in (nd, vd) space, except the current glass.
+    if glass_map is None:
+        glass_map = GlassMap.from_dict(glass_dict)
+    neighbours = glass_map.nearest(nd0, vd0, k=num_neighbours, exclude=[glass])
 
     # Optional plotting
     if plot:
@@ -364,11 +374,8 @@ def find_closest_glass(nd_vd: tuple, catalog: list[str], plot_map: bool = False)
     # Create a mapping of glass name to (nd, vd)
     glass_dict = {g: get_nd_vd(g) for g in catalog}
 
-    # Find the glass with the minimum squared Euclidean distance
-    closest_glass = min(
-        glass_dict.items(),
-        key=lambda item: (item[1][0] - nd_vd[0]) ** 2 + (item[1][1] - nd_vd[1]) ** 2,
-    )[0]
+    # Find the glass with the minimum Euclidean distance
+    closest_glass = GlassMap.from_dict(glass_dict).nearest(*nd_vd)[0]
 
     if plot_map:
         plot_glass_map(
@@ -11,6 +11,7 @@ from __future__ import annotations
 from .fft import FFTMTF, ScalarFFTMTF
 from .geometric import GeometricMTF
 from .huygens_fresnel import HuygensMTF, ScalarHuygensMTF, VectorialHuygensMTF
+from .pupil import PupilMTF
 from .sampled import SampledMTF
 from .vectorial_fft import VectorialFFTMTF
 
@@ -22,5 +23,6 @@ __all__ = [
     "HuygensMTF",
     "ScalarHuygensMTF",
     "VectorialHuygensMTF",
+    "PupilMTF",
     "SampledMTF",
 ]
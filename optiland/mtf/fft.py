@@ -10,7 +10,8 @@ Kramer Harrison, 2025
 from __future__ import annotations
 
 import optiland.backend as be
-from optiland.psf.fft import ScalarFFTPSF, calculate_grid_size
+from optiland.psf.batched_fft import BatchedFFTPSF
+from optiland.psf.fft import calculate_grid_size
 from optiland.utils import get_working_FNO
 
 from .base import BaseMTF
@@ -102,21 +103,20 @@ class ScalarFFTMTF(BaseMTF):
         """Calculates and stores the Point Spread Function (PSF).
 
         This method uses the resolved field points and wavelength from BaseMTF,
-        and explicitly uses the scalar FFT PSF implementation.
+        and explicitly uses the scalar FFT PSF implementation. The PSFs of all
+        fields are computed at once with `BatchedFFTPSF`.
         """
-        self.psf = [
-            ScalarFFTPSF(
-                self.optic,
-                field,
-                self.resolved_wavelength,
-                self.num_rays,
-                self.grid_size,
-                self.strategy,
-                self.remove_tilt,
-                **self.strategy_kwargs,
-            ).psf
-            for field in self.resolved_fields
-        ]
+        psf_cube = BatchedFFTPSF(
+            self.optic,
+            fields=self.resolved_fields,
+            wavelengths=[self.resolved_wavelength],
+            num_rays=self.num_rays,
+            grid_size=self.grid_size,
+            strategy=self.strategy,
+            remove_tilt=self.remove_tilt,
+            **self.strategy_kwargs,
+        ).psf
+        self.psf = [psf_cube[k, 0] for k in range(len(self.resolved_fields))]
 
     def _plot_field_mtf(self, ax, field_index, mtf_field_data, color):
         """Plots the MTF data for a single field for ScalarFFTMTF.
@@ -156,29 +156,30 @@ class ScalarFFTMTF(BaseMTF):
     def _generate_mtf_data(self):
         """Generates the MTF data for each field.
 
-        The OTF is computed as the 2D FFT of the PSF. The DC component (zero
-        spatial frequency) is located at index ``(grid_size // 2, grid_size // 2)``
-        after ``fftshift``. The tangential and sagittal MTF slices are extracted
-        from that center outward and normalized by the DC value so that MTF(0) = 1,
-        consistent with the incoherent imaging convention used by OpticStudio.
+        The OTF is computed as the 2D FFT of the PSF. As the PSF is real, a
+        real-input FFT is used, which only computes the non-negative
+        frequencies along the sagittal axis. The tangential and sagittal MTF
+        slices are extracted from the DC component (zero spatial frequency)
+        outward and normalized by the DC value so that MTF(0) = 1, consistent
+        with the incoherent imaging convention used by OpticStudio.
 
         Returns:
             list: A list of MTF data for each field. Each element is a list
                 ``[tangential_mtf, sagittal_mtf]`` where each is a 1-D array of
                 length ``grid_size // 2`` with values in ``[0, 1]``.
         """
-        mtf_data = [be.abs(be.fft.fftshift(be.fft.fft2(psf))) for psf in self.psf]
         mtf = []
-        center = self.grid_size // 2
-        for data in mtf_data:
+        half = self.grid_size // 2
+        for psf in self.psf:
+            data = be.abs(be.fft.rfft2(psf))
             # Extract 1-D slices from the DC bin outward, clipped to grid_size // 2
-            tangential = data[center:, center][:center]
-            sagittal = data[center, center:][:center]
+            tangential = data[:half, 0]
+            sagittal = data[0, :half]
 
             # Normalize by the DC value (OTF at zero frequency = total PSF power).
             # Physical MTF must satisfy MTF(0) = 1; the DC bin is always the maximum
             # for a well-behaved incoherent system.
-            dc_value = data[center, center]
+            dc_value = data[0, 0]
             if dc_value == 0:
                 norm_tangential = be.zeros_like(tangential)
                 norm_sagittal = be.zeros_like(sagittal)
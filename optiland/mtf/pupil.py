@@ -0,0 +1,299 @@
+"""Pupil Autocorrelation Modulation Transfer Function (PupilMTF) Module.
+
+This module provides the PupilMTF class, which computes the MTF of an optical
+system directly as the autocorrelation of the complex pupil function along a
+set of azimuths, without computing the PSF. Through-focus MTF curves are
+obtained by adding a defocus term to the pupil phase.
+
+Kramer Harrison, 2025
+"""
+
+from __future__ import annotations
+
+import optiland.backend as be
+from optiland.distribution import BaseDistribution
+from optiland.utils import get_working_FNO
+from optiland.wavefront import Wavefront
+
+from .base import BaseMTF
+
+
+class _RotatedGridDistribution(BaseDistribution):
+    """Square grid of points masked to the unit disk and rotated by an angle.
+
+    The grid matches the 'uniform' distribution, with its axes rotated by
+    `angle` radians. The mask of the grid points within the unit disk is
+    stored in row-major order, with rows along the rotated y-axis.
+
+    Args:
+        angle (float): The rotation angle of the grid in radians.
+    """
+
+    def __init__(self, angle: float = 0.0):
+        super().__init__()
+        self.angle = angle
+        self.mask = None
+
+    def generate_points(self, num_points: int):
+        """Generates the rotated grid of points within the unit disk.
+
+        Args:
+            num_points (int): The number of points along each axis.
+        """
+        u = be.linspace(-1, 1, num_points)
+        u, v = be.meshgrid(u, u)
+        u = be.reshape(u, (-1,))
+        v = be.reshape(v, (-1,))
+        self.mask = u**2 + v**2 <= 1
+        u = u[self.mask]
+        v = v[self.mask]
+        cos, sin = be.cos(self.angle), be.sin(self.angle)
+        self.x = cos * u - sin * v
+        self.y = sin * u + cos * v
+
+
+class PupilMTF(BaseMTF):
+    """Pupil autocorrelation Modulation Transfer Function class.
+
+    The OTF is the autocorrelation of the complex pupil function. For each
+    azimuth, the pupil is sampled on a square grid aligned with the azimuth,
+    so that the autocorrelation along the azimuth is a sum of 1D
+    autocorrelations of the grid rows, computed with 1D FFTs. This avoids
+    the two 2D FFTs of the padded pupil and the PSF of `ScalarFFTMTF`, whose
+    tangential and sagittal curves are reproduced with the same pupil
+    sampling.
+
+    Azimuths are measured in degrees from the x-axis of the pupil, such that
+    90 degrees is the tangential direction and 0 degrees the sagittal
+    direction. Azimuths that differ by a multiple of 90 degrees share the
+    same pupil sampling.
+
+    Args:
+        optic (Optic): The optic for which to calculate the MTF.
+        fields (str or list, optional): The field coordinates for which to
+            calculate the MTF. Defaults to 'all'.
+        wavelength (str or float, optional): The wavelength of light to use
+            for the MTF calculation. Defaults to 'primary'.
+        num_rays (int, optional): The number of rays across the pupil in 1D.
+            This is the effective pupil sampling of `ScalarFFTMTF`. Defaults
+            to 64.
+        azimuths (list, optional): The azimuths of the MTF curves in degrees.
+            Defaults to (90, 0), i.e., tangential and sagittal.
+        defocus (float or list, optional): The image plane defocus values in
+            mm at which to compute the MTF. Defaults to None, i.e., a single
+            curve at the nominal focus.
+        max_freq (str or float, optional): The maximum frequency for the MTF
+            calculation. Defaults to 'cutoff'.
+        strategy (str): The calculation strategy to use. Supported options are
+            "chief_ray", "centroid_sphere", and "best_fit_sphere".
+            Defaults to "chief_ray".
+        remove_tilt (bool): If True, removes tilt and piston from the OPD data.
+            Defaults to False.
+        **kwargs: Additional keyword arguments passed to the strategy.
+
+    Attributes:
+        num_rays (int): The number of rays across the pupil.
+        azimuths (list): The azimuths of the MTF curves in degrees.
+        defocus (be.ndarray | None): The defocus values in mm.
+        max_freq (float): The maximum frequency for the MTF calculation.
+        FNO (list): The working F-number of each field.
+        mtf (list): List of MTF data for each field, with one curve per
+            azimuth. Each curve has length `num_rays`, or shape
+            (num_defocus, num_rays) if `defocus` is a list.
+        freq (list): List of frequency arrays for each field, with one array
+            per azimuth, in cycles/mm.
+    """
+
+    def __init__(
+        self,
+        optic,
+        fields: str | list = "all",
+        wavelength: str | float = "primary",
+        num_rays=64,
+        azimuths=(90, 0),
+        defocus=None,
+        max_freq="cutoff",
+        strategy="chief_ray",
+        remove_tilt=False,
+        **kwargs,
+    ):
+        if num_rays < 2:
+            raise ValueError("num_rays must be at least 2.")
+        self.num_rays = num_rays
+        self.azimuths = [
+            float(azimuth) for azimuth in be.to_numpy(be.atleast_1d(be.array(azimuths)))
+        ]
+        if not self.azimuths:
+            raise ValueError("At least one azimuth must be specified.")
+        self.defocus = None if defocus is None else be.atleast_1d(be.array(defocus))
+
+        super().__init__(optic, fields, wavelength, strategy, remove_tilt, **kwargs)
+
+        if max_freq == "cutoff":
+            on_axis_fno = self._get_fno()
+            self.max_freq = 1 / (self.resolved_wavelength * 1e-3 * on_axis_fno)
+        else:
+            self.max_freq = max_freq
+
+        self.freq = [
+            [
+                be.arange(self.num_rays) * self._get_mtf_units(k, azimuth)
+                for azimuth in self.azimuths
+            ]
+            for k in range(len(self.resolved_fields))
+        ]
+
+    def _calculate_psf(self):
+        """Samples the complex pupil functions used for the MTF.
+
+        The PSF is not computed. For each group of azimuths that share a pupil
+        sampling, the pupil of each field is stored as a 2D array in
+        `self.pupils`, and the working F-number and image space index of each
+        field are stored for the frequency axes and defocus terms.
+        """
+        self.FNO = [
+            get_working_FNO(self.optic, field, self.resolved_wavelength)
+            for field in self.resolved_fields
+        ]
+        self._n_image = self.optic.image_surface.material_post.n(
+            self.resolved_wavelength
+        )
+
+        self.pupils = {}
+        for angle in sorted({azimuth % 90.0 for azimuth in self.azimuths}):
+            distribution = _RotatedGridDistribution(be.deg2rad(be.array(angle)))
+            distribution.generate_points(self.num_rays)
+            wavefront = Wavefront(
+                self.optic,
+                fields=self.resolved_fields,
+                wavelengths=[self.resolved_wavelength],
+                num_rays=self.num_rays,
+                distribution=distribution,
+                strategy=self.strategy,
+                remove_tilt=self.remove_tilt,
+                **self.strategy_kwargs,
+            )
+            self.pupils[angle] = []
+            for k, field in enumerate(self.resolved_fields):
+                data = wavefront.get_data(field, self.resolved_wavelength)
+                phase = 2 * be.pi * data.opd
+                if self.defocus is not None:
+                    phase = phase + self._defocus_phase(k, distribution)
+                values = be.sqrt(data.intensity) * be.exp(-1j * phase)
+
+                pupil = be.to_complex(be.zeros(values.shape[:-1] + (self.num_rays**2,)))
+                pupil[..., distribution.mask] = values
+                self.pupils[angle].append(
+                    be.reshape(pupil, values.shape[:-1] + (self.num_rays,) * 2)
+                )
+
+    def _defocus_phase(self, k, distribution):
+        """Pupil phase of an image plane defocus for field k.
+
+        The defocus of the image plane changes the optical path of a ray by
+        the path difference along the ray of the defocus, relative to the
+        chief ray. The ray angle relative to the chief ray is obtained from
+        the normalized pupil radius and the working F-number of the field.
+
+        Args:
+            k (int): The field index.
+            distribution (BaseDistribution): The pupil sampling.
+
+        Returns:
+            be.ndarray: The defocus phase in radians, with shape
+            (num_defocus, num_points).
+        """
+        na = 1 / (2 * self.FNO[k])
+        rho2 = distribution.x**2 + distribution.y**2
+        n = self._n_image
+        path = n - be.sqrt(n**2 - na**2 * rho2)
+        wavelength_mm = self.resolved_wavelength * 1e-3
+        return 2 * be.pi * self.defocus[:, None] * path[None, :] / wavelength_mm
+
+    def _generate_mtf_data(self):
+        """Generates the MTF data for each field and azimuth.
+
+        For an azimuth along the rows of the pupil grid, the OTF at a shift of
+        `m` samples is the sum over the rows of the autocorrelation of the
+        row. Padding the rows to `2 * num_rays` avoids circular wrapping, so
+        that the autocorrelation of all rows is obtained from one FFT and one
+        inverse FFT per row. The MTF is normalized by the value at zero
+        frequency, which is the total pupil intensity.
+
+        Returns:
+            list: A list of MTF data for each field. Each element is a list
+                with one MTF curve per azimuth.
+        """
+        n = self.num_rays
+        mtf = []
+        for k in range(len(self.resolved_fields)):
+            curves = []
+            for azimuth in self.azimuths:
+                angle = azimuth % 90.0
+                pupil = self.pupils[angle][k]
+                # the grid rows (axis -2) index the rotated y-axis, and the
+                # grid columns (axis -1) the rotated x-axis
+                axis = -2 if round((azimuth - angle) / 90.0) % 2 else -1
+                spectrum = be.fft.fft(pupil, 2 * n, axis)
+                power = be.sum(be.real(spectrum * be.conj(spectrum)), axis=-3 - axis)
+                otf = be.abs(be.fft.ifft(power)[..., :n])
+
+                # Normalize by the DC value, such that MTF(0) = 1
+                dc_value = otf[..., :1]
+                curve = otf / be.where(dc_value == 0, 1.0, dc_value)
+                curves.append(be.clip(curve, 0.0, 1.0))
+            mtf.append(curves)
+        return mtf
+
+    def _get_mtf_units(self, k, azimuth):
+        """Frequency step (cycles/mm) of a pupil shift of one sample.
+
+        The frequency step in the chief ray frame follows from the working
+        F-number of the field. As in `ScalarFFTMTF`, the tangential component
+        of the frequency is scaled by FNO_on / FNO_off to account for the
+        projection onto the image plane.
+
+        Args:
+            k (int): Field index.
+            azimuth (float): The azimuth in degrees.
+
+        Returns:
+            float: Frequency step in cycles/mm.
+        """
+        on_axis_fno = self._get_fno()
+        off_axis_fno = self.FNO[k]
+        df_chief = 1 / (
+            (self.num_rays - 1) * self.resolved_wavelength * 1e-3 * off_axis_fno
+        )
+        theta = be.deg2rad(be.array(azimuth))
+        scale = on_axis_fno / off_axis_fno
+        return df_chief * be.sqrt(be.cos(theta) ** 2 + (scale * be.sin(theta)) ** 2)
+
+    def _plot_field_mtf(self, ax, field_index, mtf_field_data, color):
+        """Plots the MTF data for a single field for PupilMTF.
+
+        Curves at the nominal focus are plotted for each azimuth. For a
+        through-focus calculation, the curves at the defocus closest to zero
+        are plotted.
+
+        Args:
+            ax (matplotlib.axes.Axes): The matplotlib axes object.
+            field_index (int): The index of the current field in self.resolved_fields.
+            mtf_field_data (list): A list of MTF curves (be.ndarray), one per
+                azimuth.
+            color (str): The color to use for plotting this field.
+        """
+        Hx, Hy = self.resolved_fields[field_index]
+        linestyles = ["-", "--", "-.", ":"]
+        for i, (azimuth, curve) in enumerate(
+            zip(self.azimuths, mtf_field_data, strict=True)
+        ):
+            if self.defocus is not None:
+                curve = curve[int(be.argmin(be.abs(self.defocus)))]
+            ax.plot(
+                be.to_numpy(self.freq[field_index][i]),
+                be.to_numpy(curve),
+                label=f"Hx: {Hx:.1f}, Hy: {Hy:.1f}, Azimuth: {azimuth:g}°",
+                color=color,
+                linestyle=linestyles[i % len(linestyles)],
+            )
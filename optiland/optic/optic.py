@@ -18,6 +18,7 @@ from copy import deepcopy
 from typing import TYPE_CHECKING, Any, Literal
 
 from optiland._deprecation import deprecated
+from optiland._revision import latest_revision, next_revision
 from optiland.aberrations import Aberrations
 from optiland.aperture import BaseSystemAperture, make_system_aperture
 from optiland.fields import (
@@ -30,10 +31,13 @@ from optiland.pickup import PickupManager
 from optiland.rays import PolarizationState
 from optiland.raytrace.real_ray_tracer import RealRayTracer
 from optiland.solves import SolveManager
+from optiland.state_cache import StateCache
 from optiland.surfaces import ObjectSurface, SurfaceGroup
 from optiland.wavelength import WavelengthGroup
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from matplotlib.axes import Axes
     from matplotlib.figure import Figure
 
@@ -42,6 +46,7 @@ if TYPE_CHECKING:
         BEArray,
         DistributionType,
         FieldType,
+        RecordPolicy,
         ReferenceRay,
         ScalarOrArray,
         SurfaceParameters,
@@ -93,6 +98,13 @@ class Optic:
             surface properties to meet certain constraints.
         obj_space_telecentric (bool): If True, the system is object-space
             telecentric. Defaults to False.
+        state_version (int): The version of the state of the optical system.
+            It is the latest revision of the objects defining its surfaces
+            (see `Surface.tracked_objects`) or of a modification marked with
+            `mark_dirty` (e.g., by the updater), so it increases whenever the
+            optic is modified.
+        state_cache (StateCache): Memoizes paraxial and aberration results
+            for the current state version while active.
 
 
     """
@@ -128,6 +140,30 @@ class Optic:
         self.obj_space_telecentric: bool = False
         self.updater: OpticUpdater = OpticUpdater(self)
 
+        self._state_revision: int = next_revision()
+        self.state_cache: StateCache = StateCache(self)
+
+    @property
+    def state_version(self) -> int:
+        """int: The version of the state of the optical system."""
+        return latest_revision(
+            (
+                obj
+                for surface in self.surfaces.surfaces
+                for obj in surface.tracked_objects()
+            ),
+            floor=self._state_revision,
+        )
+
+    def mark_dirty(self):
+        """Mark the optical system as modified.
+
+        Modifications of the surfaces are tracked by their revisions. This
+        marks modifications of other state, such as fields, wavelengths or
+        the system aperture.
+        """
+        self._state_revision = next_revision(self._state_revision)
+
     @property
     def surface_group(self) -> SurfaceGroup:
         warnings.warn(
@@ -719,6 +755,7 @@ class Optic:
         wavelength: float,
         num_rays: int | None = 100,
         distribution: DistributionType | BaseDistribution | None = "hexapolar",
+        record: RecordPolicy = "all",
     ) -> RealRays:
         """Trace a distribution of rays through the optical system.
 
@@ -732,12 +769,48 @@ class Optic:
                 The distribution of rays. Can be a string identifier (e.g.,
                 'hexapolar', 'uniform') or a `BaseDistribution` object.
                 Defaults to 'hexapolar'.
+            record: The surfaces on which ray data is recorded: 'all', 'image',
+                'none', or a sequence of surface indices. Defaults to 'all'.
 
         Returns:
             RealRays: A `RealRays` object containing the traced rays.
 
         """
-        return self.ray_tracer.trace(Hx, Hy, wavelength, num_rays, distribution)
+        return self.ray_tracer.trace(
+            Hx, Hy, wavelength, num_rays, distribution, record=record
+        )
+
+    def trace_stream(
+        self,
+        Hx: ScalarOrArray,
+        Hy: ScalarOrArray,
+        wavelength: float,
+        num_rays: int | None = 100,
+        distribution: DistributionType | BaseDistribution | None = "hexapolar",
+        chunk_size: int = 65536,
+    ) -> Iterator[RealRays]:
+        """Trace a distribution of rays in chunks of bounded size.
+
+        Args:
+            Hx: The normalized x field coordinate(s).
+            Hy: The normalized y field coordinate(s).
+            wavelength (float): The wavelength of the rays in microns.
+            num_rays: The number of rays to trace.
+                Defaults to 100.
+            distribution:
+                The distribution of rays. Can be a string identifier (e.g.,
+                'hexapolar', 'uniform') or a `BaseDistribution` object.
+                Defaults to 'hexapolar'.
+            chunk_size: The maximum number of rays traced per chunk.
+                Defaults to 65536.
+
+        Yields:
+            RealRays: The rays of each chunk on the image plane.
+
+        """
+        return self.ray_tracer.trace_stream(
+            Hx, Hy, wavelength, num_rays, distribution, chunk_size=chunk_size
+        )
 
     def trace_generic(
         self,
@@ -746,6 +819,7 @@ class Optic:
         Px: ScalarOrArray,
         Py: ScalarOrArray,
         wavelength: float,
+        record: RecordPolicy = "all",
     ):
         """Trace generic rays through the optical system.
 
@@ -755,12 +829,14 @@ class Optic:
             Px: The normalized x pupil coordinate(s).
             Py: The normalized y pupil coordinate(s).
             wavelength (float): The wavelength of the rays in microns.
+            record: The surfaces on which ray data is recorded: 'all', 'image',
+                'none', or a sequence of surface indices. Defaults to 'all'.
 
         Returns:
             RealRays: A `RealRays` object containing the traced rays.
 
         """
-        return self.ray_tracer.trace_generic(Hx, Hy, Px, Py, wavelength)
+        return self.ray_tracer.trace_generic(Hx, Hy, Px, Py, wavelength, record=record)
 
     def plot_surface_sag(
         self,
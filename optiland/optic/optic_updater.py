@@ -4,11 +4,16 @@ This module contains the OpticModifier class, which is responsible for updating
 optical system properties, such as the surface radii of curvature, thicknesses,
 materials, conic constants, polarization, etc.
 
+Every modification made through the updater increases the state version of
+the optic, which invalidates the paraxial and aberration results memoized for
+the previous state (see `optiland.state_cache`).
+
 Kramer Harrison, 2024
 """
 
 from __future__ import annotations
 
+import functools
 from typing import TYPE_CHECKING
 
 import optiland.backend as be
@@ -21,6 +26,23 @@ if TYPE_CHECKING:
     from optiland.rays import PolarizationState
 
 
+def _modifies_state(method):
+    """Mark the optic as modified after the method is called.
+
+    The optic is also marked if the method raises, as it may have been
+    partially modified.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.optic.mark_dirty()
+
+    return wrapper
+
+
 class OpticUpdater:
     """Class to update or modify an optical system
 
@@ -35,6 +57,7 @@ class OpticUpdater:
     def __init__(self, optic):
         self.optic = optic
 
+    @_modifies_state
     def set_radius(self, value, surface_number):
         """Set the radius of curvature of a surface.
 
@@ -53,6 +76,7 @@ class OpticUpdater:
         else:
             surface.geometry.radius = value
 
+    @_modifies_state
     def set_conic(self, value, surface_number):
         """Set the conic constant of a surface.
 
@@ -64,6 +88,7 @@ class OpticUpdater:
         surface = self.optic.surfaces[surface_number]
         surface.geometry.k = value
 
+    @_modifies_state
     def set_thickness(self, value, surface_number):
         """Set the thickness of a surface.
 
@@ -96,6 +121,7 @@ class OpticUpdater:
         if surface_number < len(self.optic.surfaces):
             self.optic.surfaces[surface_number].thickness = value
 
+    @_modifies_state
     def set_index(self, value: float, surface_number: int) -> None:
         """Set the index of refraction of a surface.
 
@@ -109,6 +135,7 @@ class OpticUpdater:
         new_material = IdealMaterial(n=value, k=0)
         self.set_material(new_material, surface_number)
 
+    @_modifies_state
     def set_material(self, material: BaseMaterial, surface_number: int) -> None:
         """Set the material of a surface.
 
@@ -122,6 +149,7 @@ class OpticUpdater:
         surface = self.optic.surfaces[surface_number]
         surface.material_post = material
 
+    @_modifies_state
     def set_norm_radius(self, value, surface_number, is_fixed=True):
         """Set the normalization radius on a surface.
 
@@ -143,6 +171,7 @@ class OpticUpdater:
                 "'norm_radius' attribute."
             )
 
+    @_modifies_state
     def set_asphere_coeff(self, value, surface_number, aspher_coeff_idx):
         """Set the asphere coefficient on a surface
 
@@ -155,7 +184,9 @@ class OpticUpdater:
         """
         surface = self.optic.surfaces[surface_number]
         surface.geometry.coefficients[aspher_coeff_idx] = value
+        surface.geometry.mark_dirty()
 
+    @_modifies_state
     def set_polarization(self, polarization: PolarizationState | str):
         """Set the polarization state of the optic.
 
@@ -172,6 +203,7 @@ class OpticUpdater:
             )
         self.optic.polarization = polarization
 
+    @_modifies_state
     def scale_system(self, scale_factor):
         """Scales the optical system by a given scale factor.
 
@@ -203,6 +235,7 @@ class OpticUpdater:
             if surface.aperture is not None:
                 surface.aperture.scale(scale_factor)
 
+    @_modifies_state
     def update_paraxial(self):
         """Update the semi-aperture of all surfaces based on paraxial marginal
         and chief ray heights. Also updates normalization radii for relevant
@@ -222,6 +255,7 @@ class OpticUpdater:
             surface.set_semi_aperture(r_max=r_max)
             self.update_normalization(surface)
 
+    @_modifies_state
     def update_normalization(self, surface) -> None:
         """Update the normalization radius/factors of a given non-spherical surface.
 
@@ -236,6 +270,7 @@ class OpticUpdater:
         # Delegate updating normalization directly to the geometry
         surface.geometry.update_normalization(surface.semi_aperture)
 
+    @_modifies_state
     def update(self) -> None:
         """Update the optical system by applying all defined pickups and solves.
         If certain surface types requiring paraxial updates are present,
@@ -251,6 +286,7 @@ class OpticUpdater:
         ):
             self.update_paraxial()
 
+    @_modifies_state
     def image_solve(self):
         """Adjusts the position of the image surface (last surface) such that
         the paraxial marginal ray crosses the optical axis at this new location.
@@ -264,6 +300,7 @@ class OpticUpdater:
             self.optic.surfaces[-1].geometry.cs.z - surfaces[-2].geometry.cs.z
         )
 
+    @_modifies_state
     def flip(self):
         """Flips the optical system, reversing the order of surfaces (excluding
         object and image planes), their geometries, and materials. Pickups and
@@ -304,6 +341,7 @@ class OpticUpdater:
         # 5. Update Optic instance
         self.update()
 
+    @_modifies_state
     def set_apodization(
         self, apodization: BaseApodization | str | dict = None, **kwargs
     ):
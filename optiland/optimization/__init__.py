@@ -13,6 +13,8 @@ from .variable import (
 )
 from .operand import ParaxialOperand, AberrationOperand, RayOperand, Operand
 from .problem import OptimizationProblem
+from .jacobian import JacobianProvider
+from .population import PopulationEvaluator
 from .optimizer.scipy import (
     OptimizerGeneric,
     LeastSquares,
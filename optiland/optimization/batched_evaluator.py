@@ -8,6 +8,19 @@ The evaluator analyzes optimization problems to group operands that require
 ray tracing with the same optic and wavelength, then executes a minimal number
 of traces. Each operand extracts its value from the shared trace results.
 
+All rays traced at one wavelength of an optic are merged into a single
+``optic.trace_generic`` call: the single rays of the intercept, direction
+cosine, AOI and clearance operands, and the pupil distributions of the
+``rms_spot_size`` operands of all fields (including the per-wavelength traces
+of ``rms_spot_size(wavelength="all")``). Distribution traces can only be
+merged when the fields they are traced at are not vignetted, as
+``trace_generic`` scales pupil coordinates by the vignetting factors while
+``trace`` does not; otherwise they are traced with one ``optic.trace`` call
+per sampling, covering all fields. Wavefront operands (``OPD_difference``)
+with the same field, wavelength and sampling share a single wavefront
+computation. The number of traces and wavefront computations of the last
+evaluation is reported by ``BatchedRayEvaluator.trace_count``.
+
 This approach works with both NumPy and PyTorch backends and preserves
 automatic differentiation (autograd) by indexing directly into the traced
 tensor data.
@@ -20,6 +33,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 
 import optiland.backend as be
+from optiland.distribution import create_distribution
 from optiland.optimization.operand.operand import operand_registry
 
 if TYPE_CHECKING:
@@ -49,6 +63,16 @@ _TRACE_OPERANDS = frozenset(
     }
 )
 
+# Operand types that compute a wavefront
+_WAVEFRONT_OPERANDS = frozenset(
+    {
+        "OPD_difference",
+    }
+)
+
+# Ray attributes recorded for each surface read by the operands
+_RAY_ATTRS = ("x", "y", "z", "L", "M", "N")
+
 
 def _make_generic_trace_key(optic, wavelength):
     """Create a grouping key for trace_generic operands.
@@ -63,7 +87,7 @@ def _make_trace_key(optic, Hx, Hy, wavelength, num_rays, distribution):
     """Create a grouping key for trace (distribution) operands.
 
     ``rms_spot_size`` operands with identical parameters share a single
-    ``optic.trace`` call.
+    block of rays.
     """
     return (
         id(optic),
@@ -78,48 +102,57 @@ def _make_trace_key(optic, Hx, Hy, wavelength, num_rays, distribution):
 class _GenericTraceJob:
     """Batched trace_generic job for single-ray operands.
 
-    Accumulates (Hx, Hy, Px, Py) pairs and traces them all in one call.
-    After execution, operands extract their values by ray index.
+    Accumulates (Hx, Hy, Px, Py) pairs which are traced together with the
+    other rays of the same optic and wavelength. Ray data is only recorded on
+    the surfaces referenced by the operands. After execution, operands
+    extract their values by ray index.
     """
 
-    __slots__ = ("optic", "wavelength", "ray_params", "operand_indices")
+    __slots__ = (
+        "optic",
+        "wavelength",
+        "ray_params",
+        "operand_indices",
+        "record_surfaces",
+    )
 
     def __init__(self, optic, wavelength):
         self.optic = optic
         self.wavelength = wavelength
         self.ray_params: list[dict[str, float]] = []
         self.operand_indices: list[int] = []
-
-    def add_operand(self, operand_idx: int, Hx: float, Hy: float, Px: float, Py: float):
-        """Register an operand and its ray parameters."""
+        self.record_surfaces: set[int] = set()
+
+    def add_operand(
+        self,
+        operand_idx: int,
+        Hx: float,
+        Hy: float,
+        Px: float,
+        Py: float,
+        surfaces: tuple[int, ...] = (),
+    ):
+        """Register an operand, its ray parameters and the surfaces it reads."""
         ray_index = len(self.ray_params)
         self.ray_params.append({"Hx": Hx, "Hy": Hy, "Px": Px, "Py": Py})
         self.operand_indices.append(operand_idx)
+        self.record_surfaces.update(surfaces)
         return ray_index
 
-    def execute(self):
-        """Execute the batched trace_generic call.
-
-        Returns the optic's surface_group (with traced data stored on
-        surfaces).
-        """
-        if not self.ray_params:
-            return None
-
-        Hx = be.array([p["Hx"] for p in self.ray_params])
-        Hy = be.array([p["Hy"] for p in self.ray_params])
-        Px = be.array([p["Px"] for p in self.ray_params])
-        Py = be.array([p["Py"] for p in self.ray_params])
-
-        self.optic.trace_generic(Hx, Hy, Px, Py, self.wavelength)
-        return self.optic.surface_group
+    def rays(self):
+        """Return the field and pupil coordinates of the rays."""
+        return tuple(
+            be.array([p[name] for p in self.ray_params])
+            for name in ("Hx", "Hy", "Px", "Py")
+        )
 
 
 class _DistributionTraceJob:
-    """Shared trace job for distribution-based operands (``rms_spot_size``).
+    """Block of rays for distribution-based operands (``rms_spot_size``).
 
-    Operands with identical trace parameters share a single ``optic.trace``
-    call.
+    Operands with identical trace parameters share a single block, i.e., one
+    pupil distribution traced at one field point. The blocks of an optic and
+    wavelength are traced together.
     """
 
     __slots__ = (
@@ -130,6 +163,8 @@ class _DistributionTraceJob:
         "num_rays",
         "distribution",
         "operand_indices",
+        "record_surfaces",
+        "_pupil",
     )
 
     def __init__(self, optic, Hx, Hy, wavelength, num_rays, distribution):
@@ -140,40 +175,239 @@ class _DistributionTraceJob:
         self.num_rays = num_rays
         self.distribution = distribution
         self.operand_indices: list[int] = []
+        self.record_surfaces: set[int] = set()
+        self._pupil = None
 
-    def add_operand(self, operand_idx: int):
-        """Register an operand that uses this trace."""
+    def add_operand(self, operand_idx: int, surfaces: tuple[int, ...] = ()):
+        """Register an operand that uses this block and the surfaces it reads."""
         self.operand_indices.append(operand_idx)
+        self.record_surfaces.update(surfaces)
+
+    @property
+    def sampling(self):
+        """The key of the pupil sampling of the block."""
+        return (int(self.num_rays), str(self.distribution))
+
+    def pupil(self):
+        """Return the pupil coordinates of the block, as used by `optic.trace`."""
+        if self._pupil is None:
+            distribution = self.distribution
+            if isinstance(distribution, str):
+                distribution = create_distribution(distribution)
+                distribution.generate_points(self.num_rays)
+            self._pupil = (distribution.x, distribution.y)
+        return self._pupil
+
+
+class _TraceGroup:
+    """All rays traced at one wavelength of an optic.
+
+    The rays of the generic job come first, followed by the rays of each
+    distribution block, in the order the blocks were registered. After
+    execution, the recorded ray data of all rays is available in ``data``,
+    keyed by surface number and ray attribute, regardless of whether the
+    rays were traced in a single call or not.
+    """
 
-    def execute(self):
-        """Execute the trace call.
+    __slots__ = (
+        "optic",
+        "wavelength",
+        "generic_job",
+        "blocks",
+        "block_offsets",
+        "data",
+    )
 
-        Returns the optic's surface_group.
+    def __init__(self, optic, wavelength):
+        self.optic = optic
+        self.wavelength = wavelength
+        self.generic_job: _GenericTraceJob | None = None
+        self.blocks: list[_DistributionTraceJob] = []
+        self.block_offsets: list[int] = []
+        self.data: dict[int, dict[str, Any]] = {}
+
+    @property
+    def record_surfaces(self) -> list[int]:
+        """The surfaces on which ray data is recorded."""
+        surfaces = set()
+        if self.generic_job is not None:
+            surfaces.update(self.generic_job.record_surfaces)
+        for block in self.blocks:
+            surfaces.update(block.record_surfaces)
+        return sorted(surfaces)
+
+    def block_slice(self, block_idx: int) -> slice:
+        """Return the rays of a distribution block."""
+        start = self.block_offsets[block_idx]
+        return slice(start, start + len(self.blocks[block_idx].pupil()[0]))
+
+    def execute(self) -> int:
+        """Trace the rays and record their data.
+
+        Returns:
+            int: The number of traces.
         """
-        if self.wavelength == "all":
-            # Multi-wavelength rms_spot_size — let the operand handle it
-            # directly since it does multiple traces internally.
-            return None
+        record = self.record_surfaces
+        num_generic = 0
+        rays = []
+        if self.generic_job is not None and self.generic_job.ray_params:
+            rays.append(self.generic_job.rays())
+            num_generic = len(self.generic_job.ray_params)
+
+        offset = num_generic
+        self.block_offsets = []
+        for block in self.blocks:
+            self.block_offsets.append(offset)
+            offset += len(block.pupil()[0])
+
+        if not self.blocks or self._blocks_unvignetted():
+            # a single trace of all rays
+            for block in self.blocks:
+                Px, Py = block.pupil()
+                num_points = len(Px)
+                rays.append(
+                    (
+                        be.full((num_points,), float(block.Hx)),
+                        be.full((num_points,), float(block.Hy)),
+                        Px,
+                        Py,
+                    )
+                )
+            Hx, Hy, Px, Py = (
+                be.concatenate(values) for values in zip(*rays, strict=True)
+            )
+            self.optic.trace_generic(Hx, Hy, Px, Py, self.wavelength, record=record)
+            self.data = self._capture(record)
+            return 1
+
+        # vignetted fields: trace_generic for the single rays and one
+        # optic.trace per pupil sampling, covering the fields of all blocks
+        captures = []
+        if rays:
+            Hx, Hy, Px, Py = rays[0]
+            self.optic.trace_generic(Hx, Hy, Px, Py, self.wavelength, record=record)
+            captures.append(self._capture(record))
+
+        samplings = {}
+        for block_idx, block in enumerate(self.blocks):
+            samplings.setdefault(block.sampling, []).append(block_idx)
+
+        order = []
+        for block_indices in samplings.values():
+            first = self.blocks[block_indices[0]]
+            self.optic.trace(
+                be.array([float(self.blocks[k].Hx) for k in block_indices]),
+                be.array([float(self.blocks[k].Hy) for k in block_indices]),
+                self.wavelength,
+                first.num_rays,
+                first.distribution,
+                record=record,
+            )
+            captures.append(self._capture(record))
+            order.extend(block_indices)
+
+        # rays of each block are contiguous, in the order of the traces
+        offset = num_generic
+        for block_idx in order:
+            self.block_offsets[block_idx] = offset
+            offset += len(self.blocks[block_idx].pupil()[0])
+
+        self.data = {
+            surface: {
+                attr: be.concatenate([capture[surface][attr] for capture in captures])
+                for attr in _RAY_ATTRS
+            }
+            for surface in record
+        }
+        return len(captures)
+
+    def _blocks_unvignetted(self) -> bool:
+        """Whether the fields of all blocks have zero vignetting factors."""
+        Hx = be.array([float(block.Hx) for block in self.blocks])
+        Hy = be.array([float(block.Hy) for block in self.blocks])
+        vx, vy = self.optic.fields.get_vig_factor(Hx, Hy)
+        return bool(be.all(vx == 0)) and bool(be.all(vy == 0))
+
+    def _capture(self, record):
+        """Read the recorded ray data from the surfaces of the optic."""
+        surfaces = self.optic.surfaces.surfaces
+        return {
+            surface: {
+                attr: be.ravel(getattr(surfaces[surface], attr)) for attr in _RAY_ATTRS
+            }
+            for surface in record
+        }
 
-        self.optic.trace(
-            self.Hx,
-            self.Hy,
-            self.wavelength,
-            self.num_rays,
-            self.distribution,
-        )
-        return self.optic.surface_group
+
+class _WavefrontJob:
+    """Shared wavefront computation for wavefront operands.
+
+    Operands with identical optic, field, wavelength and sampling share a
+    single wavefront, and hence a single value.
+    """
+
+    __slots__ = ("input_data", "operand_indices")
+
+    def __init__(self, input_data):
+        self.input_data = input_data
+        self.operand_indices: list[int] = []
+
+    def execute(self, operand_type):
+        """Compute the operand value from the wavefront."""
+        return operand_registry.get(operand_type)(**self.input_data)
+
+
+def _gather_surface_data(surface_group, attr, surface_numbers, ray_indices):
+    """Gather recorded ray data for (surface, ray) index pairs.
+
+    Only the surfaces referenced by the operands are recorded during a batched
+    trace, so the data is read from the individual surfaces rather than the
+    stacked ``surface_group`` arrays. Indexing into the stacked rows preserves
+    the autograd computation graph.
+
+    Args:
+        surface_group: The optic's surface group (post-trace), or the
+            recorded data of a trace group.
+        attr: The recorded ray attribute, e.g. ``"x"`` or ``"L"``.
+        surface_numbers: The surface index of each value.
+        ray_indices: The ray index of each value.
+
+    Returns:
+        An array with one value per (surface, ray) pair.
+    """
+    unique_surfaces = list(dict.fromkeys(surface_numbers))
+    data = be.stack([_surface_data(surface_group, attr, s) for s in unique_surfaces])
+    rows = [unique_surfaces.index(s) for s in surface_numbers]
+    return data[rows, ray_indices]
+
+
+def _surface_data(surface_group, attr, surface_number):
+    """Read the recorded data of a ray attribute on a surface."""
+    if isinstance(surface_group, dict):
+        return surface_group[surface_number][attr]
+    return getattr(surface_group.surfaces[surface_number], attr)
+
+
+def _surface_value(surface_group, attr, surface_number, ray_index):
+    """Read a single recorded ray value from a surface."""
+    return _surface_data(surface_group, attr, surface_number)[ray_index]
+
+
+def _geometry(optic, surface_number):
+    """Return the geometry of a surface of an optic."""
+    return optic.surfaces.surfaces[surface_number].geometry
 
 
 def _extract_value_generic(operand_type, surface_group, input_data, ray_index):
     """Extract a single operand value from a batched trace_generic result.
 
-    This reads from the surface_group arrays at the correct ``ray_index``
+    This reads from the recorded ray data at the correct ``ray_index``
     position, preserving the autograd computation graph.
 
     Args:
         operand_type: The type string of the operand.
-        surface_group: The optic's surface group (post-trace).
+        surface_group: The optic's surface group (post-trace), or the
+            recorded data of a trace group.
         input_data: The operand's ``input_data`` dict.
         ray_index: The index of this operand's ray in the batch.
 
@@ -183,39 +417,39 @@ def _extract_value_generic(operand_type, surface_group, input_data, ray_index):
     surface_number = input_data["surface_number"]
 
     if operand_type == "real_x_intercept":
-        return surface_group.x[surface_number, ray_index]
+        return _surface_value(surface_group, "x", surface_number, ray_index)
 
     if operand_type == "real_y_intercept":
-        return surface_group.y[surface_number, ray_index]
+        return _surface_value(surface_group, "y", surface_number, ray_index)
 
     if operand_type == "real_z_intercept":
-        return surface_group.z[surface_number, ray_index]
+        return _surface_value(surface_group, "z", surface_number, ray_index)
 
     if operand_type == "real_x_intercept_lcs":
-        intercept = surface_group.x[surface_number, ray_index]
-        decenter = surface_group.surfaces[surface_number].geometry.cs.x
+        intercept = _surface_value(surface_group, "x", surface_number, ray_index)
+        decenter = _geometry(input_data["optic"], surface_number).cs.x
         return intercept - decenter
 
     if operand_type == "real_y_intercept_lcs":
-        intercept = surface_group.y[surface_number, ray_index]
-        decenter = surface_group.surfaces[surface_number].geometry.cs.y
+        intercept = _surface_value(surface_group, "y", surface_number, ray_index)
+        decenter = _geometry(input_data["optic"], surface_number).cs.y
         return intercept - decenter
 
     if operand_type == "real_z_intercept_lcs":
-        intercept = surface_group.z[surface_number, ray_index]
-        decenter = surface_group.surfaces[surface_number].geometry.cs.z
+        intercept = _surface_value(surface_group, "z", surface_number, ray_index)
+        decenter = _geometry(input_data["optic"], surface_number).cs.z
         if be.is_array_like(decenter):
             decenter = decenter.item()
         return intercept - decenter
 
     if operand_type == "real_L":
-        return surface_group.L[surface_number, ray_index]
+        return _surface_value(surface_group, "L", surface_number, ray_index)
 
     if operand_type == "real_M":
-        return surface_group.M[surface_number, ray_index]
+        return _surface_value(surface_group, "M", surface_number, ray_index)
 
     if operand_type == "real_N":
-        return surface_group.N[surface_number, ray_index]
+        return _surface_value(surface_group, "N", surface_number, ray_index)
 
     if operand_type == "AOI":
         return _extract_aoi(surface_group, input_data, ray_index)
@@ -230,18 +464,17 @@ def _extract_aoi(surface_group, input_data, ray_index):
     surface_number = input_data["surface_number"]
     wavelength = input_data["wavelength"]
 
-    surface = surface_group.surfaces[surface_number]
-    geometry = surface.geometry
+    geometry = _geometry(input_data["optic"], surface_number)
 
     # Incident direction cosines (from previous surface)
-    L_inc = surface_group.L[surface_number - 1, ray_index]
-    M_inc = surface_group.M[surface_number - 1, ray_index]
-    N_inc = surface_group.N[surface_number - 1, ray_index]
+    L_inc = _surface_value(surface_group, "L", surface_number - 1, ray_index)
+    M_inc = _surface_value(surface_group, "M", surface_number - 1, ray_index)
+    N_inc = _surface_value(surface_group, "N", surface_number - 1, ray_index)
 
     rays_at_surface = RealRays(
-        x=surface_group.x[surface_number, ray_index],
-        y=surface_group.y[surface_number, ray_index],
-        z=surface_group.z[surface_number, ray_index],
+        x=_surface_value(surface_group, "x", surface_number, ray_index),
+        y=_surface_value(surface_group, "y", surface_number, ray_index),
+        z=_surface_value(surface_group, "z", surface_number, ray_index),
         L=L_inc,
         M=M_inc,
         N=N_inc,
@@ -261,19 +494,59 @@ def _extract_aoi(surface_group, input_data, ray_index):
     return angle_deg
 
 
-def _extract_rms_spot(surface_group, input_data):
+def _extract_clearance(data, input_data, ray_indices):
+    """Extract the clearance from a batched trace_generic result.
+
+    This replicates the calculation from ``RayOperand.clearance``, where
+    ``ray_indices`` are the indices of the rays defining Line A and Point B.
+    """
+    ray_a, ray_b = ray_indices
+    surface_a = input_data["line_ray_surface_idx"]
+    surface_b = input_data["point_ray_surface_idx"]
+
+    yA = _surface_value(data, "y", surface_a, ray_a)
+    zA = _surface_value(data, "z", surface_a, ray_a)
+    mA = _surface_value(data, "M", surface_a, ray_a)
+    nA = _surface_value(data, "N", surface_a, ray_a)
+    yB = _surface_value(data, "y", surface_b, ray_b)
+    zB = _surface_value(data, "z", surface_b, ray_b)
+
+    denominator = be.sqrt(mA**2 + nA**2)
+    if be.abs(denominator) < 1e-9:
+        return 0.0
+
+    d = (nA * (yB - yA) - mA * (zB - zA)) / denominator
+    if nA < 0:
+        d = -d
+    return d
+
+
+def _extract_rms_spot(surface_group, input_data, rays=slice(None)):
     """Extract rms_spot_size from a shared trace result.
 
     This replicates the calculation from ``RayOperand.rms_spot_size`` but
-    reads from the already-traced surface_group data, preserving autograd.
+    reads from the already-traced data, preserving autograd.
     """
     surface_number = input_data["surface_number"]
-    x = surface_group.x[surface_number, :].flatten()
-    y = surface_group.y[surface_number, :].flatten()
+    x = be.ravel(_surface_data(surface_group, "x", surface_number))[rays]
+    y = be.ravel(_surface_data(surface_group, "y", surface_number))[rays]
     r2 = (x - be.mean(x)) ** 2 + (y - be.mean(y)) ** 2
     return be.sqrt(be.mean(r2))
 
 
+def _extract_rms_spot_all(spots, primary_index):
+    """Extract the polychromatic rms_spot_size from per-wavelength spots.
+
+    This replicates ``RayOperand.rms_spot_size(wavelength="all")``: the
+    spots of all wavelengths are referenced to the centroid of the spot at
+    the primary wavelength.
+    """
+    mean_x = be.mean(spots[primary_index][0])
+    mean_y = be.mean(spots[primary_index][1])
+    r2 = [(x - mean_x) ** 2 + (y - mean_y) ** 2 for x, y in spots]
+    return be.sqrt(be.mean(be.concatenate(r2)))
+
+
 class BatchedRayEvaluator:
     """High-performance evaluator for optimization problems using batched
     ray tracing.
@@ -300,21 +573,36 @@ class BatchedRayEvaluator:
 
     Args:
         problem: The optimization problem to evaluate.
+
+    Attributes:
+        trace_count (int): The number of ray traces and wavefront
+            computations of the last evaluation. Traces done by operands
+            that are evaluated directly are not included.
     """
 
     def __init__(self, problem: OptimizationProblem):
         self.problem = problem
+        self.trace_count = 0
 
         # Jobs populated by _analyze
         self._generic_jobs: list[_GenericTraceJob] = []
         self._distribution_jobs: list[_DistributionTraceJob] = []
+        self._wavefront_jobs: list[_WavefrontJob] = []
+        self._trace_groups: list[_TraceGroup] = []
 
         # Per-operand evaluation strategy:
         #   ("generic", job_idx, ray_index)
+        #   ("clearance", job_idx, (ray_index_a, ray_index_b))
         #   ("distribution", job_idx, None)
+        #   ("distribution_all", [job_idx per wavelength], primary_index)
+        #   ("wavefront", job_idx, None)
         #   ("direct", None, None)   -- fallback to standard evaluation
         self._operand_plan: list[tuple[str, Any, Any]] = []
 
+        # trace group of each generic / distribution job
+        self._generic_groups: list[int] = []
+        self._distribution_groups: list[int] = []
+
         self._analyze()
 
     # ------------------------------------------------------------------
@@ -325,76 +613,130 @@ class BatchedRayEvaluator:
         """Analyse the problem and create batching plan."""
         self._generic_jobs.clear()
         self._distribution_jobs.clear()
+        self._wavefront_jobs.clear()
+        self._trace_groups.clear()
         self._operand_plan.clear()
+        self._generic_groups.clear()
+        self._distribution_groups.clear()
 
-        # ---- trace_generic grouping ----
-        # key -> job index
+        # key -> index of the group, generic job, distribution or
+        # wavefront job
+        group_key_to_idx: dict[tuple, int] = {}
         generic_key_to_idx: dict[tuple, int] = {}
-
-        # ---- distribution trace grouping ----
         dist_key_to_idx: dict[tuple, int] = {}
+        wavefront_key_to_idx: dict[tuple, int] = {}
+
+        def trace_group(optic, wl):
+            key = _make_generic_trace_key(optic, wl)
+            if key not in group_key_to_idx:
+                group_key_to_idx[key] = len(self._trace_groups)
+                self._trace_groups.append(_TraceGroup(optic, wl))
+            return group_key_to_idx[key]
+
+        def generic_job(optic, wl):
+            key = _make_generic_trace_key(optic, wl)
+            if key not in generic_key_to_idx:
+                group_idx = trace_group(optic, wl)
+                job = _GenericTraceJob(optic, wl)
+                self._trace_groups[group_idx].generic_job = job
+                generic_key_to_idx[key] = len(self._generic_jobs)
+                self._generic_jobs.append(job)
+                self._generic_groups.append(group_idx)
+            return generic_key_to_idx[key]
+
+        def distribution_job(optic, Hx, Hy, wl, num_rays, dist):
+            key = _make_trace_key(optic, Hx, Hy, wl, num_rays, dist)
+            if key not in dist_key_to_idx:
+                group_idx = trace_group(optic, wl)
+                job = _DistributionTraceJob(optic, Hx, Hy, wl, num_rays, dist)
+                self._trace_groups[group_idx].blocks.append(job)
+                dist_key_to_idx[key] = len(self._distribution_jobs)
+                self._distribution_jobs.append(job)
+                self._distribution_groups.append(group_idx)
+            return dist_key_to_idx[key]
 
         for i, operand in enumerate(self.problem.operands):
             op_type = operand.operand_type
             data = operand.input_data
 
             if op_type in _TRACE_GENERIC_OPERANDS:
-                wl = data["wavelength"]
-                optic = data["optic"]
-                key = _make_generic_trace_key(optic, wl)
-
-                if key not in generic_key_to_idx:
-                    job = _GenericTraceJob(optic, wl)
-                    generic_key_to_idx[key] = len(self._generic_jobs)
-                    self._generic_jobs.append(job)
-
-                job_idx = generic_key_to_idx[key]
-                job = self._generic_jobs[job_idx]
-                ray_idx = job.add_operand(
+                job_idx = generic_job(data["optic"], data["wavelength"])
+                surface_number = data["surface_number"]
+                surfaces = (surface_number,)
+                if op_type == "AOI":
+                    # AOI also reads the incident direction cosines
+                    surfaces = (surface_number, surface_number - 1)
+                ray_idx = self._generic_jobs[job_idx].add_operand(
                     i,
                     data["Hx"],
                     data["Hy"],
                     data["Px"],
                     data["Py"],
+                    surfaces,
                 )
                 self._operand_plan.append(("generic", job_idx, ray_idx))
 
+            elif op_type == "clearance":
+                job_idx = generic_job(data["optic"], data["wavelength"])
+                job = self._generic_jobs[job_idx]
+                ray_a = job.add_operand(
+                    i,
+                    *data["line_ray_field_coords"],
+                    *data["line_ray_pupil_coords"],
+                    (data["line_ray_surface_idx"],),
+                )
+                ray_b = job.add_operand(
+                    i,
+                    *data["point_ray_field_coords"],
+                    *data["point_ray_pupil_coords"],
+                    (data["point_ray_surface_idx"],),
+                )
+                self._operand_plan.append(("clearance", job_idx, (ray_a, ray_b)))
+
             elif op_type in _TRACE_OPERANDS:
                 wl = data.get("wavelength", 0.587)
                 optic = data["optic"]
-
-                # Multi-wavelength rms_spot_size must be evaluated directly
-                if wl == "all":
-                    self._operand_plan.append(("direct", None, None))
-                    continue
-
                 num_rays = data.get("num_rays", 100)
                 dist = data.get("distribution", "hexapolar")
-                key = _make_trace_key(
-                    optic,
-                    data["Hx"],
-                    data["Hy"],
-                    wl,
-                    num_rays,
-                    dist,
-                )
 
-                if key not in dist_key_to_idx:
-                    job = _DistributionTraceJob(
-                        optic,
-                        data["Hx"],
-                        data["Hy"],
-                        wl,
-                        num_rays,
-                        dist,
+                if wl == "all":
+                    # one block per wavelength of the optic
+                    job_indices = []
+                    for wave in optic.wavelengths.get_wavelengths():
+                        job_idx = distribution_job(
+                            optic, data["Hx"], data["Hy"], wave, num_rays, dist
+                        )
+                        self._distribution_jobs[job_idx].add_operand(
+                            i, (data["surface_number"],)
+                        )
+                        job_indices.append(job_idx)
+                    primary_index = optic.wavelengths.primary_index
+                    self._operand_plan.append(
+                        ("distribution_all", job_indices, primary_index)
                     )
-                    dist_key_to_idx[key] = len(self._distribution_jobs)
-                    self._distribution_jobs.append(job)
+                    continue
 
-                job_idx = dist_key_to_idx[key]
-                self._distribution_jobs[job_idx].add_operand(i)
+                job_idx = distribution_job(
+                    optic, data["Hx"], data["Hy"], wl, num_rays, dist
+                )
+                self._distribution_jobs[job_idx].add_operand(
+                    i, (data["surface_number"],)
+                )
                 self._operand_plan.append(("distribution", job_idx, None))
 
+            elif op_type in _WAVEFRONT_OPERANDS:
+                key = (op_type, id(data["optic"])) + tuple(
+                    (name, str(value))
+                    for name, value in sorted(data.items())
+                    if name != "optic"
+                )
+                if key not in wavefront_key_to_idx:
+                    wavefront_key_to_idx[key] = len(self._wavefront_jobs)
+                    self._wavefront_jobs.append(_WavefrontJob(data))
+                job_idx = wavefront_key_to_idx[key]
+                self._wavefront_jobs[job_idx].operand_indices.append(i)
+                self._operand_plan.append(("wavefront", job_idx, None))
+
             else:
                 # Non-ray operand (paraxial, aberration, lens, etc.)
                 self._operand_plan.append(("direct", None, None))
@@ -407,7 +749,8 @@ class BatchedRayEvaluator:
         """Re-analyse the problem.
 
         Call this if operands or variables have been added/removed since
-        the evaluator was created.
+        the evaluator was created, or if the wavelengths of an optic used by
+        an ``rms_spot_size(wavelength="all")`` operand have changed.
         """
         self._analyze()
 
@@ -424,61 +767,146 @@ class BatchedRayEvaluator:
         except Exception:
             return None
 
-    def _evaluate_generic_jobs(self, raw_values: list[Any]) -> None:
-        """Populate values for operands covered by ``trace_generic`` jobs."""
-        num_operands = len(self.problem.operands)
+    def _execute_trace_groups(self) -> list[bool]:
+        """Trace all trace groups and return whether each succeeded."""
+        succeeded = []
+        for group in self._trace_groups:
+            num_traces = self._safe_execute(group)
+            succeeded.append(num_traces is not None)
+            self.trace_count += num_traces or 0
+        return succeeded
+
+    def _evaluate_trace_operands(self, raw_values: list[Any]) -> None:
+        """Populate values for operands covered by the trace groups.
+
+        Single-ray attribute operands are extracted with one vectorized
+        gather per attribute and trace group. Operands of trace groups that
+        could not be traced are left unevaluated, to be evaluated directly.
+        """
+        succeeded = self._execute_trace_groups()
+        operands = self.problem.operands
+
+        attr_map = {
+            "real_x_intercept": "x",
+            "real_y_intercept": "y",
+            "real_z_intercept": "z",
+            "real_L": "L",
+            "real_M": "M",
+            "real_N": "N",
+        }
+
         for job_idx, job in enumerate(self._generic_jobs):
-            sg = self._safe_execute(job)
-            if sg is None:
+            group_idx = self._generic_groups[job_idx]
+            if not succeeded[group_idx]:
                 continue
+            data = self._trace_groups[group_idx].data
 
-            for i in range(num_operands):
-                plan_type, pj, ray_idx = self._operand_plan[i]
-                if plan_type == "generic" and pj == job_idx:
-                    raw_values[i] = _extract_value_generic(
-                        self.problem.operands[i].operand_type,
-                        sg,
-                        self.problem.operands[i].input_data,
-                        ray_idx,
+            # vectorized extraction, grouping operands of the same type
+            for op_type, attr in attr_map.items():
+                matches = [
+                    (op_idx, ray_idx)
+                    for ray_idx, op_idx in enumerate(job.operand_indices)
+                    if operands[op_idx].operand_type == op_type
+                    and self._operand_plan[op_idx][0] == "generic"
+                ]
+                if not matches:
+                    continue
+                surfaces = [
+                    operands[op_idx].input_data["surface_number"]
+                    for op_idx, _ in matches
+                ]
+                ray_indices = [ray_idx for _, ray_idx in matches]
+                values = _gather_surface_data(data, attr, surfaces, ray_indices)
+                for local_idx, (op_idx, _) in enumerate(matches):
+                    raw_values[op_idx] = values[local_idx]
+
+            # scalar extraction for the remaining operands of the job
+            for op_idx in dict.fromkeys(job.operand_indices):
+                if raw_values[op_idx] is not None:
+                    continue
+                operand = operands[op_idx]
+                plan_type, _, rays = self._operand_plan[op_idx]
+                if plan_type == "clearance":
+                    raw_values[op_idx] = _extract_clearance(
+                        data, operand.input_data, rays
+                    )
+                else:
+                    raw_values[op_idx] = _extract_value_generic(
+                        operand.operand_type, data, operand.input_data, rays
                     )
 
-    def _evaluate_distribution_jobs(self, raw_values: list[Any]) -> None:
-        """Populate values for operands covered by distribution trace jobs."""
-        num_operands = len(self.problem.operands)
-        for job_idx, job in enumerate(self._distribution_jobs):
-            sg = self._safe_execute(job)
-
-            for i in range(num_operands):
-                plan_type, pj, _ = self._operand_plan[i]
-                if plan_type == "distribution" and pj == job_idx:
-                    operand = self.problem.operands[i]
-                    if sg is not None:
-                        raw_values[i] = _extract_rms_spot(
-                            sg,
-                            operand.input_data,
-                        )
-                    else:
-                        # Fallback (e.g. multi-wavelength)
-                        metric_fn = operand_registry.get(operand.operand_type)
-                        raw_values[i] = metric_fn(**operand.input_data)
+        for i, (plan_type, job_idx, primary_index) in enumerate(self._operand_plan):
+            if plan_type == "distribution":
+                group_idx = self._distribution_groups[job_idx]
+                if succeeded[group_idx]:
+                    raw_values[i] = _extract_rms_spot(
+                        self._trace_groups[group_idx].data,
+                        operands[i].input_data,
+                        self._block_rays(job_idx),
+                    )
 
-    def _evaluate_direct_operands(self, raw_values: list[Any]) -> None:
-        """Populate values for non-ray operands evaluated directly."""
+            elif plan_type == "distribution_all":
+                group_indices = [self._distribution_groups[k] for k in job_idx]
+                if all(succeeded[k] for k in group_indices):
+                    surface_number = operands[i].input_data["surface_number"]
+                    spots = []
+                    for k, group_idx in zip(job_idx, group_indices, strict=True):
+                        data = self._trace_groups[group_idx].data[surface_number]
+                        rays = self._block_rays(k)
+                        spots.append((data["x"][rays], data["y"][rays]))
+                    raw_values[i] = _extract_rms_spot_all(spots, primary_index)
+
+    def _block_rays(self, job_idx: int) -> slice:
+        """Return the rays of a distribution job within its trace group."""
+        group = self._trace_groups[self._distribution_groups[job_idx]]
+        return group.block_slice(group.blocks.index(self._distribution_jobs[job_idx]))
+
+    def _evaluate_wavefront_operands(self, raw_values: list[Any]) -> None:
+        """Populate values for wavefront operands, one wavefront per job."""
+        for job in self._wavefront_jobs:
+            operand = self.problem.operands[job.operand_indices[0]]
+            value = job.execute(operand.operand_type)
+            self.trace_count += 1
+            for i in job.operand_indices:
+                raw_values[i] = value
+
+    def _evaluate_direct_operands(
+        self, raw_values: list[Any], skip_zero_weight: bool = True
+    ) -> None:
+        """Populate values for operands that are evaluated directly.
+
+        These are the non-ray operands and the ray operands of trace groups
+        that could not be traced.
+        """
         num_operands = len(self.problem.operands)
         for i in range(num_operands):
             if raw_values[i] is not None:
                 continue
-            plan_type, _, _ = self._operand_plan[i]
-            if plan_type == "direct":
-                operand = self.problem.operands[i]
-                # Match OptimizationProblem.fun_array semantics: zero-effective-
-                # weight operands are excluded and should not be evaluated.
-                if operand.effective_weight() == 0.0:
-                    continue
-                metric_fn = operand_registry.get(operand.operand_type)
-                if metric_fn is None:
-                    raise ValueError(f"Unknown operand type: {operand.operand_type}")
-                raw_values[i] = metric_fn(**operand.input_data)
+            operand = self.problem.operands[i]
+            # Match OptimizationProblem.fun_array semantics: zero-effective-
+            # weight operands are excluded and should not be evaluated.
+            if skip_zero_weight and operand.effective_weight() == 0.0:
+                continue
+            metric_fn = operand_registry.get(operand.operand_type)
+            if metric_fn is None:
+                raise ValueError(f"Unknown operand type: {operand.operand_type}")
+            raw_values[i] = metric_fn(**operand.input_data)
+
+    def _evaluate(self, skip_zero_weight: bool = True) -> list[Any]:
+        """Compute the raw value of each operand.
+
+        Trace groups are executed one at a time and their ray data is
+        recorded immediately after each trace, before the next trace
+        overwrites the shared surface state.
+        """
+        self._ensure_plan_current()
+        self.trace_count = 0
+
+        raw_values: list[Any] = [None] * len(self.problem.operands)
+        self._evaluate_trace_operands(raw_values)
+        self._evaluate_wavefront_operands(raw_values)
+        self._evaluate_direct_operands(raw_values, skip_zero_weight)
+        return raw_values
 
     def _build_contribution_terms(self, raw_values: list[Any]) -> list[Any]:
         """Convert raw operand values into merit contribution terms."""
@@ -505,25 +933,8 @@ class BatchedRayEvaluator:
 
         This is the batched equivalent of
         ``OptimizationProblem.fun_array()``.
-
-        Trace jobs are executed one at a time and operand values are
-        extracted immediately after each trace, before the next trace
-        overwrites the shared ``surface_group`` state.
         """
-        self._ensure_plan_current()
-
-        num_operands = len(self.problem.operands)
-
-        # Pre-allocate operand values — None means "not yet computed"
-        raw_values: list[Any] = [None] * num_operands
-
-        # Three-stage evaluation: generic traces, distribution traces, and
-        # direct/non-ray metrics.
-        self._evaluate_generic_jobs(raw_values)
-        self._evaluate_distribution_jobs(raw_values)
-        self._evaluate_direct_operands(raw_values)
-
-        terms = self._build_contribution_terms(raw_values)
+        terms = self._build_contribution_terms(self._evaluate())
 
         if not terms:
             return be.array([0.0])
@@ -535,125 +946,16 @@ class BatchedRayEvaluator:
         Returns a 1-D array whose *i*-th element is ``weight_i * delta_i``
         for each operand. This is the residual vector **r** needed by
         least-squares algorithms such as Levenberg-Marquardt.
-
-        Trace jobs are executed one at a time and operand values are
-        extracted immediately after each trace, before the next trace
-        overwrites the shared ``surface_group`` state.
         """
-        self._ensure_plan_current()
-
-        num_operands = len(self.problem.operands)
+        raw_values = self._evaluate(skip_zero_weight=False)
 
         # Use a list to hold the computed tensor node for EACH operand.
         # This avoids PyTorch in-place modification errors, allowing us
         # to safely use be.stack() at the end to fuse the graph.
-        computed_residuals = [None] * num_operands
-
-        # --- 1. Process Batched Ray Traces (Vectorized) ---
-        for _job_idx, job in enumerate(self._generic_jobs):
-            sg = self._safe_execute(job)
-
-            if sg is None:
-                continue
-
-            op_indices = job.operand_indices
-
-            # Map operand types to surface_group tensor attributes
-            attr_map = {
-                "real_x_intercept": "x",
-                "real_y_intercept": "y",
-                "real_z_intercept": "z",
-                "real_L": "L",
-                "real_M": "M",
-                "real_N": "N",
-            }
-
-            # Vectorize extraction by grouping operands of the same type
-            for op_type, attr in attr_map.items():
-                mask = [
-                    self.problem.operands[i].operand_type == op_type for i in op_indices
-                ]
-                if not any(mask):
-                    continue
-
-                matching_op_indices = [
-                    op_indices[idx] for idx, is_match in enumerate(mask) if is_match
-                ]
-                ray_indices = [idx for idx, is_match in enumerate(mask) if is_match]
-                surfs = [
-                    self.problem.operands[i].input_data["surface_number"]
-                    for i in matching_op_indices
-                ]
-
-                # THE VECTORIZED EXTRACTION —
-                # Pulls all needed ray data in ONE clean autograd operation
-                data_tensor = getattr(sg, attr)
-                extracted_vals = data_tensor[surfs, ray_indices]
-
-                # Vectorized target and weight arrays
-                targets = be.array(
-                    [self.problem.operands[i].target for i in matching_op_indices]
-                )
-                weights = be.array(
-                    [self.problem.operands[i].weight for i in matching_op_indices]
-                )
-
-                # Compute all deltas for this group simultaneously
-                deltas = weights * (extracted_vals - targets)
-
-                # Assign the resulting scalar tensors to our list
-                for local_idx, global_op_idx in enumerate(matching_op_indices):
-                    computed_residuals[global_op_idx] = deltas[local_idx]
-
-            # Handle non-vectorizable generic operands (AOI, local coords) via
-            # scalar fallback
-            for local_idx, global_op_idx in enumerate(op_indices):
-                if computed_residuals[global_op_idx] is not None:
-                    continue  # Already processed vectorially above
-
-                operand = self.problem.operands[global_op_idx]
-                val = _extract_value_generic(
-                    operand.operand_type, sg, operand.input_data, local_idx
-                )
-                delta = self._compute_delta(operand, val)
-                computed_residuals[global_op_idx] = operand.weight * delta
-
-        # --- 2. Process Distribution Jobs ---
-        for job_idx, job in enumerate(self._distribution_jobs):
-            sg = self._safe_execute(job)
-            for i in range(num_operands):
-                plan_type, pj, _ = self._operand_plan[i]
-                if plan_type == "distribution" and pj == job_idx:
-                    operand = self.problem.operands[i]
-                    if sg is not None:
-                        val = _extract_rms_spot(sg, operand.input_data)
-                    else:
-                        metric_fn = operand_registry.get(operand.operand_type)
-                        val = metric_fn(**operand.input_data)
-
-                    delta = self._compute_delta(operand, val)
-                    computed_residuals[i] = operand.weight * delta
-
-        # --- 3. Process Direct Jobs ---
-        for i in range(num_operands):
-            if computed_residuals[i] is not None:
-                continue
-            plan_type, _, _ = self._operand_plan[i]
-            if plan_type == "direct":
-                operand = self.problem.operands[i]
-                metric_fn = operand_registry.get(operand.operand_type)
-                val = metric_fn(**operand.input_data)
-
-                delta = self._compute_delta(operand, val)
-                computed_residuals[i] = operand.weight * delta
-
-        # --- Final Graph Assembly ---
-        for i, res in enumerate(computed_residuals):
-            if res is None:
-                raise RuntimeError(
-                    f"Operand {i} ({self.problem.operands[i].operand_type}) "
-                    "was not evaluated"
-                )
+        computed_residuals = []
+        for operand, value in zip(self.problem.operands, raw_values, strict=True):
+            delta = self._compute_delta(operand, value)
+            computed_residuals.append(operand.weight * delta)
 
         if not computed_residuals:
             return be.array([])
@@ -0,0 +1,526 @@
+"""Jacobian Module
+
+This module contains the JacobianProvider class, which computes the Jacobian
+of the residual vector and the gradient of the merit function of an
+optimization problem with respect to its (scaled) variables.
+
+With the torch backend, derivatives are obtained by automatic
+differentiation, i.e., a single forward evaluation of the merit function
+followed by one backward pass per residual. With the NumPy backend, they are
+obtained by forward finite differences. Where the variables allow it, the
+perturbed systems, one per variable, are traced at once with a `BatchedOptic`,
+such that all ray operands on the image surface are evaluated from one trace
+per wavelength. Otherwise, the evaluation at the current point is shared by all
+columns and reused from the last call of `residuals` or `merit` at the same
+point, e.g., by the optimizer, and the perturbed evaluations are independent
+jobs that are dispatched through the trace executor (see
+`optiland.raytrace.set_executor`), so they can run on threads or processes.
+
+Kramer Harrison, 2025
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Literal
+
+import numpy as np
+
+import optiland.backend as be
+from optiland.distribution import create_distribution
+from optiland.optimization.batched_evaluator import BatchedRayEvaluator
+from optiland.raytrace.executor import get_executor
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from optiland.optic import Optic
+    from optiland.optimization.problem import OptimizationProblem
+
+JacobianMethod = Literal["auto", "autograd", "finite_difference"]
+
+# value returned for failed merit function evaluations, as in OptimizerGeneric
+_FAILED_MERIT = 1e10
+
+
+def _forward_steps(variables, x, rel_step):
+    """Return the signed forward difference step of each variable.
+
+    The step of each variable is ``rel_step * max(1, |x|)``. Steps that would
+    cross an upper bound are taken backwards.
+
+    Args:
+        variables (list): The variables of the problem.
+        x (np.ndarray): The scaled variable values.
+        rel_step (float): The relative step.
+
+    Returns:
+        np.ndarray: The step of each variable.
+    """
+    steps = rel_step * np.maximum(1.0, np.abs(x))
+    for k, var in enumerate(variables):
+        upper = var.bounds[1]
+        if upper is not None and x[k] + steps[k] > be.to_numpy(upper):
+            steps[k] = -steps[k]
+    return steps
+
+
+def _failed_residuals(num_operands):
+    """Return the residual vector of a failed evaluation.
+
+    Every residual is set to the same penalty value, as in `LeastSquares`,
+    such that the sum of squares is the failed merit value.
+    """
+    return np.full(num_operands, np.sqrt(_FAILED_MERIT / max(num_operands, 1)))
+
+
+# operands read from a single ray on the image surface, with the ray attribute
+_IMAGE_RAY_OPERANDS = {
+    "real_x_intercept": "x",
+    "real_y_intercept": "y",
+    "real_z_intercept": "z",
+    "real_L": "L",
+    "real_M": "M",
+    "real_N": "N",
+}
+
+
+class _BatchedDifferences:
+    """Evaluates the operands at all points of a forward difference Jacobian.
+
+    The perturbed instances of the optic, one per variable, and the nominal
+    instance are traced at once with a `BatchedOptic`: the rays of the ray
+    operands on the image surface (intercepts, direction cosines and the
+    `rms_spot_size` of unvignetted fields) at one wavelength are tiled per
+    instance and traced in a single call, from which all of these operands
+    are read. The other operands, e.g., paraxial operands, are evaluated
+    directly at each point.
+
+    The rays of a `BatchedOptic` are generated by the nominal system, so the
+    variables must not change the rays entering the system. This holds for
+    radius, conic, decenter and tilt variables behind the stop and thickness
+    variables from the stop onwards, in an optic without pickups or solves
+    whose aperture and fields are not defined in image space. Use
+    `from_problem` to check a problem.
+
+    Args:
+        problem (OptimizationProblem): The optimization problem.
+        optic (Optic): The optic of the variables.
+    """
+
+    variable_types = ("radius", "conic", "thickness", "decenter", "tilt")
+    aperture_types = ("EPD", "float_by_stop_size", "objectNA")
+
+    def __init__(self, problem: OptimizationProblem, optic: Optic):
+        self.problem = problem
+        self.optic = optic
+        # ray operands per wavelength, as (operand index, operand)
+        self.ray_operands = {}
+        self.direct_operands = []
+        for index, operand in enumerate(problem.operands):
+            if self._is_ray_operand(operand):
+                wavelength = float(be.to_numpy(operand.input_data["wavelength"]))
+                self.ray_operands.setdefault(wavelength, []).append((index, operand))
+            else:
+                self.direct_operands.append(index)
+
+    @classmethod
+    def from_problem(cls, problem: OptimizationProblem):
+        """Return the batched evaluation of a problem, if it is supported.
+
+        Args:
+            problem (OptimizationProblem): The optimization problem.
+
+        Returns:
+            _BatchedDifferences | None: The batched evaluation, or None if the
+            variables of the problem cannot be batched or if no operand is
+            read from a batched trace.
+        """
+        from optiland.fields.field_types import AngleField, ObjectHeightField
+
+        optics = {id(var.optic): var.optic for var in problem.variables}
+        if len(optics) != 1:
+            return None
+        optic = next(iter(optics.values()))
+        if (
+            len(optic.pickups) > 0
+            or len(optic.solves) > 0
+            or optic.polarization != "ignore"
+            or optic.aperture is None
+            or optic.aperture.ap_type not in cls.aperture_types
+            or not isinstance(
+                optic.fields.field_definition, AngleField | ObjectHeightField
+            )
+        ):
+            return None
+
+        stop = optic.surfaces.stop_index
+        num_surfaces = optic.surfaces.num_surfaces
+        for var in problem.variables:
+            surface_number = var.kwargs.get("surface_number")
+            if var.type not in cls.variable_types or surface_number is None:
+                return None
+            first = stop if var.type == "thickness" else stop + 1
+            if surface_number % num_surfaces < first:
+                return None
+
+        batched = cls(problem, optic)
+        return batched if batched.ray_operands else None
+
+    def _is_ray_operand(self, operand):
+        """Whether the value of an operand can be read from a batched trace."""
+        data = operand.input_data or {}
+        if data.get("optic") is not self.optic:
+            return False
+        image = self.optic.surfaces.num_surfaces - 1
+        surface_number = data.get("surface_number")
+        if surface_number is None or surface_number % (image + 1) != image:
+            return False
+        if isinstance(data.get("wavelength"), str):
+            return False
+        if operand.operand_type in _IMAGE_RAY_OPERANDS:
+            return True
+        if operand.operand_type != "rms_spot_size":
+            return False
+        # optic.trace does not scale the pupil by the vignetting factors
+        vx, vy = self.optic.fields.get_vig_factor(
+            be.atleast_1d(data["Hx"]), be.atleast_1d(data["Hy"])
+        )
+        return bool(be.all(vx == 0)) and bool(be.all(vy == 0))
+
+    def values(self, provider: JacobianProvider, x, steps):
+        """Return the operand values at x and at each perturbed point.
+
+        Args:
+            provider (JacobianProvider): The provider, used to update the
+                variables for the directly evaluated operands.
+            x (np.ndarray): The scaled variable values.
+            steps (np.ndarray): The step of each variable.
+
+        Returns:
+            np.ndarray: The (num_variables + 1, num_operands) operand values.
+            Row 0 holds the values at x and row k + 1 the values with
+            variable k perturbed. Values that cannot be evaluated are NaN.
+
+        Raises:
+            ValueError: If the perturbations cannot be batched.
+        """
+        from optiland.tolerancing.batched_optic import BatchedOptic
+
+        num_points = x.size + 1
+        values = np.full((num_points, len(self.problem.operands)), np.nan)
+
+        provider._update_variables(x)
+        batch = BatchedOptic(self.optic, num_points)
+        for k, var in enumerate(self.problem.variables):
+            instances = np.full(num_points, be.to_numpy(var.variable.get_value()))
+            instances[k + 1] = be.to_numpy(var.variable.inverse_scale(x[k] + steps[k]))
+            kwargs = {"axis": var.kwargs["axis"]} if "axis" in var.kwargs else {}
+            batch.add_perturbation(
+                var.type, be.array(instances), var.kwargs["surface_number"], **kwargs
+            )
+
+        for wavelength, operands in self.ray_operands.items():
+            self._trace_operands(batch, wavelength, operands, values)
+
+        for k in range(num_points):
+            x_k = x.copy()
+            if k > 0:
+                x_k[k - 1] += steps[k - 1]
+            provider._update_variables(x_k)
+            with self.problem._state_caches():
+                for index in self.direct_operands:
+                    try:
+                        value = self.problem.operands[index].value
+                    except ValueError:
+                        continue
+                    values[k, index] = be.to_numpy(value).item()
+        return values
+
+    @staticmethod
+    def _trace_operands(batch, wavelength, operands, values):
+        """Trace the rays of the ray operands of a wavelength in one call."""
+        rays = []
+        slices = []
+        num_rays = 0
+        for _, operand in operands:
+            data = operand.input_data
+            if operand.operand_type in _IMAGE_RAY_OPERANDS:
+                pupil = (be.atleast_1d(data["Px"]), be.atleast_1d(data["Py"]))
+            else:
+                distribution = data.get("distribution", "hexapolar")
+                if isinstance(distribution, str):
+                    distribution = create_distribution(distribution)
+                    distribution.generate_points(data["num_rays"])
+                pupil = (be.array(distribution.x), be.array(distribution.y))
+            count = be.size(pupil[0])
+            rays.append(
+                (
+                    be.full((count,), float(be.to_numpy(data["Hx"]))),
+                    be.full((count,), float(be.to_numpy(data["Hy"]))),
+                    *pupil,
+                )
+            )
+            slices.append(slice(num_rays, num_rays + count))
+            num_rays += count
+
+        Hx, Hy, Px, Py = (be.concatenate(value) for value in zip(*rays, strict=True))
+        traced = batch.trace_generic(Hx, Hy, Px, Py, wavelength)
+
+        for (index, operand), rays_slice in zip(operands, slices, strict=True):
+            attr = _IMAGE_RAY_OPERANDS.get(operand.operand_type)
+            if attr is not None:
+                value = batch.split(getattr(traced, attr))[:, rays_slice.start]
+            else:
+                # as RayOperand.rms_spot_size, vignetted rays are included
+                x = batch.split(traced.x)[:, rays_slice]
+                y = batch.split(traced.y)[:, rays_slice]
+                r2 = (x - be.mean(x, axis=1)[:, None]) ** 2 + (
+                    y - be.mean(y, axis=1)[:, None]
+                ) ** 2
+                value = be.sqrt(be.mean(r2, axis=1))
+            values[:, index] = be.to_numpy(value)
+
+
+class JacobianProvider:
+    """Computes derivatives of an optimization problem w.r.t. its variables.
+
+    The variables are the scaled variable values used by the optimizers,
+    i.e., `var.value` for each variable of the problem.
+
+    Args:
+        problem (OptimizationProblem): The optimization problem.
+        method (str, optional): The differentiation method. Options are
+            'autograd' (requires the torch backend), 'finite_difference' and
+            'auto', which selects 'autograd' for the torch backend and
+            'finite_difference' otherwise. Defaults to 'auto'.
+        rel_step (float, optional): The relative finite difference step. The
+            step of each variable is ``rel_step * max(1, |x|)``. Defaults to
+            1e-6.
+
+    Raises:
+        ValueError: If the method is invalid, or if 'autograd' is requested
+            without the torch backend.
+    """
+
+    _methods = ("auto", "autograd", "finite_difference")
+
+    def __init__(
+        self,
+        problem: OptimizationProblem,
+        method: JacobianMethod = "auto",
+        rel_step: float = 1e-6,
+    ):
+        if method not in self._methods:
+            raise ValueError(
+                f"Invalid Jacobian method '{method}'. Must be one of {self._methods}."
+            )
+        if method == "auto":
+            method = "autograd" if be.get_backend() == "torch" else "finite_difference"
+        if method == "autograd" and be.get_backend() != "torch":
+            raise ValueError("Autograd Jacobians require the 'torch' backend.")
+
+        self.problem = problem
+        self.method = method
+        self.rel_step = rel_step
+        # last evaluation of each function, as (x, value)
+        self._last = {}
+
+    def residuals(self, x: Sequence[float]) -> np.ndarray:
+        """Evaluate the residual vector at the given variable values.
+
+        Args:
+            x (Sequence[float]): The scaled variable values.
+
+        Returns:
+            np.ndarray: The residual vector, see
+            `OptimizationProblem.residual_vector`. If the evaluation fails,
+            every residual is set to a large penalty value, as in
+            `LeastSquares`, such that the sum of squares is the failed merit
+            value.
+        """
+        value = self._evaluate(x, self.problem.residual_vector)
+        if value is None:
+            value = _failed_residuals(len(self.problem.operands))
+        return self._remember("residuals", x, value)
+
+    def merit(self, x: Sequence[float]) -> float:
+        """Evaluate the merit function at the given variable values.
+
+        Args:
+            x (Sequence[float]): The scaled variable values.
+
+        Returns:
+            float: The sum of squared operand contributions, or a large
+            penalty value if the evaluation fails.
+        """
+        value = self._evaluate(x, self.problem.sum_squared)
+        value = _FAILED_MERIT if value is None else value.item()
+        return self._remember("merit", x, value)
+
+    def jacobian(self, x: Sequence[float]) -> np.ndarray:
+        """Compute the Jacobian of the residual vector.
+
+        Args:
+            x (Sequence[float]): The scaled variable values.
+
+        Returns:
+            np.ndarray: The (num_residuals, num_variables) Jacobian. Entries
+            that cannot be evaluated (NaN) are set to zero.
+        """
+        if self.method == "autograd":
+            jac = self._autograd(x, self.problem.residual_vector)
+        else:
+            jac = self._finite_difference(x, "residuals")
+        return np.nan_to_num(np.atleast_2d(jac), nan=0.0, posinf=0.0, neginf=0.0)
+
+    def gradient(self, x: Sequence[float]) -> np.ndarray:
+        """Compute the gradient of the merit function.
+
+        Args:
+            x (Sequence[float]): The scaled variable values.
+
+        Returns:
+            np.ndarray: The gradient of `OptimizationProblem.sum_squared` with
+            respect to each variable.
+        """
+        if self.method == "autograd":
+            grad = self._autograd(x, self.problem.sum_squared)
+        else:
+            grad = self._finite_difference(x, "merit")
+        return np.nan_to_num(np.ravel(grad), nan=0.0, posinf=0.0, neginf=0.0)
+
+    def _evaluate(self, x, func):
+        """Evaluate a problem function at x, or return None if it fails.
+
+        An evaluation fails if it raises a ValueError, e.g., if rays miss a
+        surface, or if it returns NaN values, as in `OptimizerGeneric`.
+        """
+        self._update_variables(x)
+        try:
+            value = np.asarray(be.to_numpy(func()), dtype=float)
+        except ValueError:
+            return None
+        if np.any(np.isnan(value)):
+            return None
+        return value
+
+    def _remember(self, func_name, x, value):
+        """Store the value of a function at x, to be reused by the Jacobian."""
+        self._last[func_name] = (np.array(be.to_numpy(x), dtype=float).ravel(), value)
+        return value
+
+    def _value_at(self, x, func_name):
+        """Return the value of a function at x, evaluated only if required."""
+        last = self._last.get(func_name)
+        if last is not None and np.array_equal(last[0], x):
+            return last[1]
+        return getattr(self, func_name)(x)
+
+    def _update_variables(self, x):
+        """Set the variables to the given values and update the optics."""
+        for var, value in zip(self.problem.variables, x, strict=True):
+            var.update(value)
+        self.problem.update_optics()
+
+    def _steps(self, x):
+        """Return the signed forward difference step of each variable."""
+        return _forward_steps(self.problem.variables, x, self.rel_step)
+
+    def _finite_difference(self, x, func_name):
+        """Compute forward finite differences of a method of this provider.
+
+        If the problem supports it (see `_BatchedDifferences`), the ray
+        operands at all perturbed points are evaluated from a single batched
+        trace per wavelength. Otherwise, the value at `x` is reused from the
+        last evaluation at `x`, such that only the perturbed points, one per
+        variable, are evaluated. These are dispatched through the trace
+        executor. The variables are restored to `x` afterwards.
+        """
+        x = np.asarray(be.to_numpy(x), dtype=float).ravel()
+        steps = self._steps(x)
+
+        values = None
+        batched = _BatchedDifferences.from_problem(self.problem)
+        if batched is not None:
+            try:
+                operand_values = batched.values(self, x, steps)
+            except ValueError:
+                pass  # e.g., a perturbation that cannot be batched
+            else:
+                values = [
+                    self._from_operand_values(row, func_name) for row in operand_values
+                ]
+                f0, values = values[0], values[1:]
+
+        if values is None:
+            f0 = np.asarray(self._value_at(x, func_name), dtype=float)
+            jobs = []
+            for k in range(x.size):
+                x_k = x.copy()
+                x_k[k] += steps[k]
+                jobs.append((x_k,))
+            values = get_executor().map(self, func_name, jobs)
+
+        columns = [
+            (np.asarray(f_k, dtype=float) - f0) / step
+            for f_k, step in zip(values, steps, strict=True)
+        ]
+
+        # restore the current point (serial evaluations modify the optics)
+        self._update_variables(x)
+        return np.stack(columns, axis=-1)
+
+    def _from_operand_values(self, values, func_name):
+        """Return the residuals or merit function for given operand values.
+
+        The values are combined as in `OptimizationProblem.residual_vector`
+        and `OptimizationProblem.sum_squared`, and failed evaluations (NaN)
+        are penalized as in `residuals` and `merit`.
+        """
+        operands = self.problem.operands
+        if func_name == "residuals":
+            residuals = np.array(
+                [
+                    be.to_numpy(
+                        operand.weight
+                        * BatchedRayEvaluator._compute_delta(operand, value)
+                    )
+                    for operand, value in zip(operands, values, strict=True)
+                ],
+                dtype=float,
+            )
+            if np.any(np.isnan(residuals)):
+                return _failed_residuals(len(operands))
+            return residuals
+
+        merit = 0.0
+        for operand, value in zip(operands, values, strict=True):
+            weight = operand.effective_weight()
+            if weight != 0.0:
+                delta = BatchedRayEvaluator._compute_delta(operand, value)
+                merit += float(be.to_numpy(weight * delta**2))
+        return _FAILED_MERIT if np.isnan(merit) else merit
+
+    def _autograd(self, x, func):
+        """Compute the derivatives of a problem function by backpropagation.
+
+        The variables are restored to detached values of `x` afterwards.
+        """
+        import torch
+
+        x = np.asarray(be.to_numpy(x), dtype=float).ravel()
+        with be.grad_mode.temporary_enable():
+            params = [torch.nn.Parameter(be.array(value)) for value in x]
+            self._update_variables(params)
+            output = be.atleast_1d(func())
+            rows = []
+            for i in range(output.shape[0]):
+                grads = torch.autograd.grad(
+                    output[i], params, retain_graph=True, allow_unused=True
+                )
+                rows.append(
+                    [0.0 if g is None else be.to_numpy(g).item() for g in grads]
+                )
+
+        self._update_variables([be.array(value) for value in x])
+        return np.array(rows, dtype=float)
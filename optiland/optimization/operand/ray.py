@@ -325,17 +325,19 @@ class RayOperand:
             x = []
             y = []
             for wave in optic.wavelengths.get_wavelengths():
-                optic.trace(Hx, Hy, wave, num_rays, distribution)
-                x.append(optic.surfaces.x[surface_number, :].flatten())
-                y.append(optic.surfaces.y[surface_number, :].flatten())
+                optic.trace(
+                    Hx, Hy, wave, num_rays, distribution, record=[surface_number]
+                )
+                x.append(optic.surfaces[surface_number].x.flatten())
+                y.append(optic.surfaces[surface_number].y.flatten())
             wave_idx = optic.wavelengths.primary_index
             mean_x = be.mean(x[wave_idx])
             mean_y = be.mean(y[wave_idx])
             r2 = [(x[i] - mean_x) ** 2 + (y[i] - mean_y) ** 2 for i in range(len(x))]
             return be.sqrt(be.mean(be.concatenate(r2)))
-        optic.trace(Hx, Hy, wavelength, num_rays, distribution)
-        x = optic.surfaces.x[surface_number, :].flatten()
-        y = optic.surfaces.y[surface_number, :].flatten()
+        optic.trace(Hx, Hy, wavelength, num_rays, distribution, record=[surface_number])
+        x = optic.surfaces[surface_number].x.flatten()
+        y = optic.surfaces[surface_number].y.flatten()
         r2 = (x - be.mean(x)) ** 2 + (y - be.mean(y)) ** 2
         return be.sqrt(be.mean(r2))
 
@@ -11,11 +11,14 @@ Kramer Harrison, 2024
 from __future__ import annotations
 
 import warnings
+from contextlib import contextmanager
 from typing import TYPE_CHECKING
 
 import optiland.backend as be
 from scipy import optimize
 
+from ...jacobian import JacobianProvider
+from ...population import PopulationEvaluator
 from ..base import BaseOptimizer
 
 if TYPE_CHECKING:
@@ -53,7 +56,15 @@ class OptimizerGeneric(BaseOptimizer):
         if self.problem.initial_value == 0.0:
             self.problem.initial_value = self.problem.sum_squared()
 
-    def optimize(self, method=None, maxiter=1000, disp=True, tol=1e-3, callback=None):
+    def optimize(
+        self,
+        method=None,
+        maxiter=1000,
+        disp=True,
+        tol=1e-3,
+        callback=None,
+        jac=None,
+    ):
         """Optimize the problem using the specified parameters.
 
         Args:
@@ -67,6 +78,10 @@ class OptimizerGeneric(BaseOptimizer):
                 Default is True.
             tol (float, optional): Tolerance for convergence. Default is 1e-3.
             callback (callable): A callable called after each iteration.
+            jac (str or JacobianProvider, optional): The provider of the merit
+                function gradient, or the method of a new provider ('auto',
+                'autograd' or 'finite_difference'). Defaults to None, in which
+                case SciPy estimates the gradient, if required by the method.
 
         Returns:
             result (OptimizeResult): The optimization result.
@@ -81,13 +96,16 @@ class OptimizerGeneric(BaseOptimizer):
         bounds = tuple([var.bounds for var in self.problem.variables])
 
         options = {"maxiter": maxiter, "disp": disp}
+        provider = self._jacobian_provider(jac)
 
         with warnings.catch_warnings():
             warnings.simplefilter("ignore", category=RuntimeWarning)
+            # the provider reuses the merit value at x for the gradient at x
             result = optimize.minimize(
-                self._fun,
+                provider.merit if provider is not None else self._fun,
                 x0,
                 method=method,
+                jac=provider.gradient if provider is not None else None,
                 bounds=bounds,
                 options=options,
                 tol=tol,
@@ -102,6 +120,50 @@ class OptimizerGeneric(BaseOptimizer):
 
         return result
 
+    def _jacobian_provider(self, jac):
+        """Return the Jacobian provider for the given jac argument.
+
+        Args:
+            jac (str, JacobianProvider or None): The provider, or the method
+                of a new provider.
+
+        Returns:
+            JacobianProvider | None: The provider, or None if jac is None.
+        """
+        if jac is None or isinstance(jac, JacobianProvider):
+            return jac
+        return JacobianProvider(self.problem, method=jac)
+
+    @contextmanager
+    def _population_evaluator(self, workers):
+        """Provide the population evaluator for the given workers argument.
+
+        An evaluator created here is closed when the context exits, while a
+        given evaluator is left open, so that its pool can be reused.
+
+        Args:
+            workers (int or PopulationEvaluator): The evaluator, or the number
+                of worker processes of a new evaluator (-1 for all available
+                processors, 1 for serial evaluation).
+
+        Yields:
+            PopulationEvaluator | None: The evaluator, or None for serial
+            evaluation.
+        """
+        if isinstance(workers, PopulationEvaluator):
+            yield workers
+            return
+        if workers == 1:
+            yield None
+            return
+
+        max_workers = None if workers == -1 else workers
+        evaluator = PopulationEvaluator(self.problem, max_workers=max_workers)
+        try:
+            yield evaluator
+        finally:
+            evaluator.close()
+
     def undo(self):
         """Undo the last optimization step."""
         if len(self._x) > 0:
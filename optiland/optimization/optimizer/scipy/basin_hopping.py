@@ -19,7 +19,7 @@ class BasinHopping(OptimizerGeneric):
         problem (OptimizationProblem): The optimization problem to be solved.
 
     Methods:
-        optimize(maxiter=1000, disp=True, workers=-1): Runs the basin-hopping
+        optimize(niter=100, callback=None, workers=1): Runs the basin-hopping
             optimization algorithm.
 
     """
@@ -34,7 +34,7 @@ class BasinHopping(OptimizerGeneric):
         """
         super().__init__(problem)
 
-    def optimize(self, niter=100, callback=None, *args, **kwargs):
+    def optimize(self, niter=100, callback=None, workers=1, *args, **kwargs):
         """Runs the basin-hopping algorithm. Note that the basin-hopping
         algorithm accepts the same arguments as the
         scipy.optimize.basinhopping function.
@@ -42,6 +42,11 @@ class BasinHopping(OptimizerGeneric):
         Args:
             niter (int): Number of iterations to perform. Default is 100.
             callback (callable): A callable called after each iteration.
+            workers (int or PopulationEvaluator): Number of parallel worker
+                processes used to evaluate the finite difference gradient of
+                the local minimizations, or a population evaluator whose pool
+                is reused. Set to -1 to use all available processors. Default
+                is 1, i.e., serial evaluation.
             *args: Variable length argument list.
             **kwargs: Arbitrary keyword arguments.
 
@@ -61,9 +66,17 @@ class BasinHopping(OptimizerGeneric):
         if not all(x is None for pair in bounds for x in pair):
             raise ValueError("Basin-hopping does not accept bounds.")
 
-        with warnings.catch_warnings():
+        with (
+            self._population_evaluator(workers) as evaluator,
+            warnings.catch_warnings(),
+        ):
             warnings.simplefilter("ignore", category=RuntimeWarning)
 
+            if evaluator is not None:
+                minimizer_kwargs = dict(kwargs.pop("minimizer_kwargs", None) or {})
+                minimizer_kwargs.setdefault("jac", evaluator.gradient)
+                kwargs["minimizer_kwargs"] = minimizer_kwargs
+
             result = optimize.basinhopping(
                 self._fun,
                 x0=x0_numpy,
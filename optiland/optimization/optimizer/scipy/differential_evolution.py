@@ -40,8 +40,11 @@ class DifferentialEvolution(OptimizerGeneric):
         Args:
             maxiter (int): Maximum number of iterations.
             disp (bool): Set to True to display status messages.
-            workers (int): Number of parallel workers to use. Set to -1 to use
-                all available processors.
+            workers (int or PopulationEvaluator): Number of parallel worker
+                processes to use, or a population evaluator whose pool is
+                reused. Set to -1 to use all available processors. Each
+                worker process keeps its own copy of the problem, see
+                `optiland.optimization.population`.
             callback (callable): A callable called after each iteration.
 
         Returns:
@@ -61,19 +64,22 @@ class DifferentialEvolution(OptimizerGeneric):
             raise ValueError(
                 "Differential evolution requires all variables have bounds.",
             )
-        with warnings.catch_warnings():
+        with (
+            self._population_evaluator(workers) as evaluator,
+            warnings.catch_warnings(),
+        ):
             warnings.simplefilter("ignore", category=RuntimeWarning)
 
-            updating = "deferred" if workers == -1 else "immediate"
-
+            # the population is evaluated in batches by the worker processes
+            parallel = evaluator is not None
             result = optimize.differential_evolution(
-                self._fun,
+                evaluator.merit if parallel else self._fun,
                 bounds=bounds,
                 maxiter=maxiter,
                 x0=x0_numpy,
                 disp=disp,
-                updating=updating,
-                workers=workers,
+                updating="deferred" if parallel else "immediate",
+                workers=evaluator if parallel else 1,
                 callback=callback,
             )
 
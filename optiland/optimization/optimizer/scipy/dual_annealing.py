@@ -20,21 +20,26 @@ class DualAnnealing(OptimizerGeneric):
         problem (OptimizationProblem): The optimization problem to be solved.
 
     Methods:
-        optimize(maxiter=1000, disp=True): Runs the dual annealing algorithm
-            to optimize the problem and returns the result.
+        optimize(maxiter=1000, disp=True, workers=1): Runs the dual annealing
+            algorithm to optimize the problem and returns the result.
 
     """
 
     def __init__(self, problem: OptimizationProblem):
         super().__init__(problem)
 
-    def optimize(self, maxiter=1000, disp=True, callback=None):
+    def optimize(self, maxiter=1000, disp=True, callback=None, workers=1):
         """Runs the dual annealing algorithm to optimize the problem.
 
         Args:
             maxiter (int): Maximum number of iterations.
             disp (bool): Whether to display the optimization process.
             callback (callable): A callable called after each iteration.
+            workers (int or PopulationEvaluator): Number of parallel worker
+                processes used to evaluate the finite difference gradient of
+                the local searches, or a population evaluator whose pool is
+                reused. Set to -1 to use all available processors. Default
+                is 1, i.e., serial evaluation.
 
         Returns:
             result: The result of the optimization.
@@ -48,14 +53,30 @@ class DualAnnealing(OptimizerGeneric):
         bounds = tuple([var.bounds for var in self.problem.variables])
         if any(None in bound for bound in bounds):
             raise ValueError("Dual annealing requires all variables have bounds.")
-        with warnings.catch_warnings():
+        with (
+            self._population_evaluator(workers) as evaluator,
+            warnings.catch_warnings(),
+        ):
             warnings.simplefilter("ignore", category=RuntimeWarning)
+
+            minimizer_kwargs = None
+            if evaluator is not None:
+                # local search as in SciPy, with a batched gradient
+                num_vars = len(bounds)
+                minimizer_kwargs = {
+                    "method": "L-BFGS-B",
+                    "jac": evaluator.gradient,
+                    "bounds": list(bounds),
+                    "options": {"maxiter": min(max(6 * num_vars, 100), 1000)},
+                }
+
             result = optimize.dual_annealing(
                 self._fun,
                 bounds=bounds,
                 maxiter=maxiter,
                 x0=x0_numpy,
                 callback=callback,
+                minimizer_kwargs=minimizer_kwargs,
             )
 
         for idvar, var in enumerate(self.problem.variables):
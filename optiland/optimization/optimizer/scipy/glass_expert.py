@@ -23,6 +23,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from optiland.materials import (
+    GlassMap,
     downsample_glass_map,
     get_nd_vd,
     get_neighbour_glasses,
@@ -73,6 +74,7 @@ class GlassExpert(OptimizerGeneric):
         self.opt_params = dict()
 
         self._nd_vd_cache: dict[str, tuple[float, float]] = {}
+        self._glass_maps: dict[tuple[str, ...], GlassMap] = {}
 
         if self.problem.initial_value == 0.0:
             self.problem.initial_value = self.problem.sum_squared()
@@ -94,6 +96,17 @@ class GlassExpert(OptimizerGeneric):
             self._nd_vd_cache.update(fetched)
         return {g: self._nd_vd_cache[g] for g in glasses}
 
+    def _get_glass_map(self, glasses: list[str]) -> GlassMap:
+        """
+        Return the glass map of a glass selection.
+
+        The map, and its spatial index, is built once per selection.
+        """
+        key = tuple(glasses)
+        if key not in self._glass_maps:
+            self._glass_maps[key] = GlassMap.from_dict(self._get_nd_vd(glasses))
+        return self._glass_maps[key]
+
     def _save_state(self):
         # Store current values of all problem variables for later restoration
         self._state = [var.value for var in self.problem.variables]
@@ -182,6 +195,7 @@ class GlassExpert(OptimizerGeneric):
                 glass_dict=glass_dict,
                 num_neighbours=num_neighbours,
                 plot=self.plot_glass_map,
+                glass_map=self._get_glass_map(variable.glass_selection),
             )
 
             # Evaluate each neighbouring material
@@ -57,7 +57,7 @@ class LeastSquares(OptimizerGeneric):
             return be.to_numpy(be.full(num_operands, error_value))
 
     def optimize(
-        self, maxiter=None, disp=False, tol=1e-3, method_choice="lm"
+        self, maxiter=None, disp=False, tol=1e-3, method_choice="lm", jac=None
     ):  # Default to 'lm' for DLS
         """
         Optimize the problem using a SciPy least squares method.
@@ -76,6 +76,12 @@ class LeastSquares(OptimizerGeneric):
                                          'dogbox': Dogleg algorithm
                                          (supports bounds).
                                          Defaults to 'lm'.
+            jac (str or JacobianProvider, optional): The provider of the
+                                         residual Jacobian, or the method of a
+                                         new provider ('auto', 'autograd' or
+                                         'finite_difference'). Defaults to
+                                         None, i.e., SciPy's '2-point' finite
+                                         differences.
         """
 
         x0_scaled_values = [var.value for var in self.problem.variables]
@@ -146,12 +152,17 @@ class LeastSquares(OptimizerGeneric):
                     x0_numpy[i] = lower_bounds_np[i]
 
         scipy_verbose_level = 1 if disp else 0
+        provider = self._jacobian_provider(jac)
 
         with warnings.catch_warnings():
             warnings.simplefilter("ignore", category=RuntimeWarning)
+            # the provider reuses the residuals at x for the Jacobian at x
             result = optimize.least_squares(
-                self._compute_residuals_vector,
+                provider.residuals
+                if provider is not None
+                else self._compute_residuals_vector,
                 x0_numpy,
+                jac=provider.jacobian if provider is not None else "2-point",
                 method=method_choice,
                 bounds=actual_bounds_for_scipy,
                 max_nfev=maxiter,
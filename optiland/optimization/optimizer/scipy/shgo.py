@@ -37,8 +37,10 @@ class SHGO(OptimizerGeneric):
         arguments as the scipy.optimize.shgo function.
 
         Args:
-            workers (int): Number of parallel workers to use. Set to -1 to use
-                all available CPU processors. Default is -1.
+            workers (int or PopulationEvaluator): Number of parallel worker
+                processes to use, or a population evaluator whose pool is
+                reused. Set to -1 to use all available CPU processors.
+                Default is -1.
             callback (callable): A callable called after each iteration.
             *args: Variable length argument list.
             **kwargs: Arbitrary keyword arguments.
@@ -56,13 +58,17 @@ class SHGO(OptimizerGeneric):
         if any(None in bound for bound in bounds):
             raise ValueError("SHGO requires all variables have bounds.")
 
-        with warnings.catch_warnings():
+        with (
+            self._population_evaluator(workers) as evaluator,
+            warnings.catch_warnings(),
+        ):
             warnings.simplefilter("ignore", category=RuntimeWarning)
 
+            parallel = evaluator is not None
             result = optimize.shgo(
-                self._fun,
+                evaluator.merit if parallel else self._fun,
                 bounds=bounds,
-                workers=workers,
+                workers=evaluator if parallel else 1,
                 callback=callback,
                 **kwargs,
             )
@@ -0,0 +1,218 @@
+"""Population Module
+
+This module contains the PopulationEvaluator class, which evaluates the merit
+function of an optimization problem for batches of candidate variable vectors
+on a persistent pool of worker processes.
+
+The problem, together with its optics, is pickled once when the pool is
+started, and every worker process keeps its own deserialized replica. The
+merit function handed to SciPy (`PopulationEvaluator.merit`) only pickles a
+small key identifying the replica, so the evaluation of a population does not
+ship the optical system to the workers again. Since the state of a replica is
+fully defined by the candidate variable values, replicas never need to be
+synchronized with the original problem while the pool is alive.
+
+The evaluator is a map-like callable, i.e., it can be passed as the `workers`
+argument of SciPy's global optimizers, and provides a batched finite
+difference gradient for the local searches of the other global optimizers.
+When using the 'spawn' start method (the default on Windows and macOS), the
+calling script must be guarded by ``if __name__ == "__main__":``.
+
+Kramer Harrison, 2025
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import pickle
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+import optiland.backend as be
+from optiland.optimization.jacobian import _FAILED_MERIT, _forward_steps
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+
+    from optiland.optimization.problem import OptimizationProblem
+
+# replica of the problem held by each worker process, keyed by evaluator
+_worker_key = None
+_worker_problem = None
+
+
+def _init_worker(key: str, payload: bytes, backend: str):
+    """Unpickle the problem replica once per worker process."""
+    global _worker_key, _worker_problem
+    be.set_backend(backend)
+    _worker_key = key
+    _worker_problem = pickle.loads(payload)
+
+
+def evaluate_merit(problem: OptimizationProblem, x: Sequence[float]) -> float:
+    """Evaluate the merit function of a problem at the given variable values.
+
+    Args:
+        problem (OptimizationProblem): The optimization problem.
+        x (Sequence[float]): The scaled variable values.
+
+    Returns:
+        float: The sum of squared operand contributions, or a large penalty
+        value if the evaluation fails.
+    """
+    for var, value in zip(problem.variables, x, strict=True):
+        var.update(be.array(value))
+    problem.update_optics()
+
+    try:
+        rss = problem.sum_squared()
+        if be.isnan(rss):
+            return _FAILED_MERIT
+        return be.to_numpy(rss).item()
+    except ValueError:
+        return _FAILED_MERIT
+
+
+class ReplicaMerit:
+    """Picklable merit function evaluated on the problem replica of a worker.
+
+    In the process that created it, the merit function is evaluated on the
+    original problem. Pickling only retains the key of the evaluator, so that
+    in a worker process the merit function is evaluated on the replica of the
+    problem that was shipped to the worker when the pool was started.
+
+    Args:
+        key (str): The key identifying the evaluator.
+        problem (OptimizationProblem): The original optimization problem.
+    """
+
+    def __init__(self, key: str, problem: OptimizationProblem):
+        self.key = key
+        self.problem = problem
+
+    def __call__(self, x: Sequence[float]) -> float:
+        problem = self.problem
+        if problem is None:
+            if _worker_key != self.key:
+                raise RuntimeError(
+                    "The problem replica is not available in this process."
+                )
+            problem = _worker_problem
+        return evaluate_merit(problem, x)
+
+    def __getstate__(self):
+        return {"key": self.key, "problem": None}
+
+
+class PopulationEvaluator:
+    """Evaluates the merit function of candidate vectors on worker processes.
+
+    The pool of worker processes is started on first use and persists until
+    `close` is called, so that it can serve all generations of a global
+    search, or several searches. The replicas are snapshots of the problem at
+    the time the pool is started; after structural changes to the problem
+    (e.g., adding operands or variables), call `close` so that the next
+    evaluation starts a pool with fresh replicas.
+
+    Args:
+        problem (OptimizationProblem): The optimization problem.
+        max_workers (int, optional): The number of worker processes. Defaults
+            to None, i.e., the number of CPUs. With a single worker, the
+            candidates are evaluated in the calling process.
+
+    Raises:
+        ValueError: If max_workers is not positive.
+    """
+
+    def __init__(self, problem: OptimizationProblem, max_workers: int | None = None):
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be a positive integer.")
+        self.problem = problem
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.merit = ReplicaMerit(uuid.uuid4().hex, problem)
+        self._pool = None
+
+    def __call__(self, func: Callable, iterable: Iterable) -> list:
+        """Map a function over an iterable on the worker processes.
+
+        This makes the evaluator usable as the `workers` argument of SciPy
+        optimizers. The function is pickled for each chunk of items, so it
+        should be cheap to pickle, such as `merit` or a SciPy wrapper of it.
+
+        Args:
+            func (Callable): The function to evaluate.
+            iterable (Iterable): The arguments of each call.
+
+        Returns:
+            list: The result of each call, in order.
+        """
+        items = list(iterable)
+        if self.max_workers == 1 or len(items) <= 1:
+            return [func(item) for item in items]
+
+        chunksize = max(1, math.ceil(len(items) / (4 * self.max_workers)))
+        return list(self._get_pool().map(func, items, chunksize=chunksize))
+
+    def evaluate(self, population: Sequence[Sequence[float]]) -> np.ndarray:
+        """Evaluate the merit function for a batch of candidate vectors.
+
+        Args:
+            population (Sequence[Sequence[float]]): The candidate vectors of
+                scaled variable values, one per row.
+
+        Returns:
+            np.ndarray: The merit function value of each candidate.
+        """
+        population = np.atleast_2d(np.asarray(be.to_numpy(population), dtype=float))
+        return np.asarray(self(self.merit, list(population)), dtype=float)
+
+    def gradient(self, x: Sequence[float], rel_step: float = 1e-6) -> np.ndarray:
+        """Compute the merit function gradient by forward finite differences.
+
+        The current point and the perturbed points are evaluated as a single
+        batch. Steps that would cross an upper bound are taken backwards.
+
+        Args:
+            x (Sequence[float]): The scaled variable values.
+            rel_step (float, optional): The relative step. The step of each
+                variable is ``rel_step * max(1, |x|)``. Defaults to 1e-6.
+
+        Returns:
+            np.ndarray: The gradient of the merit function.
+        """
+        x = np.asarray(be.to_numpy(x), dtype=float).ravel()
+        steps = _forward_steps(self.problem.variables, x, rel_step)
+
+        # the current point is evaluated last, so that a serial evaluation
+        # leaves the problem at the current point
+        population = np.tile(x, (x.size + 1, 1))
+        population[:-1] += np.diag(steps)
+        values = self.evaluate(population)
+        return (values[:-1] - values[-1]) / steps
+
+    def close(self):
+        """Shut down the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Return the pool, starting it with fresh replicas if required."""
+        if self._pool is None:
+            payload = pickle.dumps(self.problem)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self.merit.key, payload, be.get_backend()),
+            )
+        return self._pool
@@ -11,6 +11,7 @@ Kramer Harrison, 2025
 from __future__ import annotations
 
 import warnings
+from contextlib import ExitStack
 from typing import TYPE_CHECKING
 
 import pandas as pd
@@ -105,6 +106,14 @@ class OptimizationProblem:
         """Whether batched evaluation is currently active."""
         return self._batched_evaluator is not None
 
+    @property
+    def trace_count(self) -> int | None:
+        """The number of ray traces and wavefront computations of the last
+        batched evaluation, or None if batching is disabled."""
+        if self._batched_evaluator is None:
+            return None
+        return self._batched_evaluator.trace_count
+
     def add_operand(
         self,
         operand_type=None,
@@ -158,6 +167,11 @@ class OptimizationProblem:
             be.ndarray: 1-D array of per-operand contribution values. Returns
             ``[0.0]`` when there are no active operands.
         """
+        with self._state_caches():
+            return self._fun_array()
+
+    def _fun_array(self):
+        """Array of operand contribution terms, see `fun_array`."""
         if self._batched_evaluator is not None:
             return self._batched_evaluator.fun_array()
 
@@ -189,9 +203,10 @@ class OptimizationProblem:
         Returns:
             be.ndarray: A 1-D array of length ``len(self.operands)``.
         """
-        if self._batched_evaluator is not None:
-            return self._batched_evaluator.residual_vector()
-        terms = [op.fun() for op in self.operands]
+        with self._state_caches():
+            if self._batched_evaluator is not None:
+                return self._batched_evaluator.residual_vector()
+            terms = [op.fun() for op in self.operands]
         if not terms:
             return be.array([])
         return be.stack(terms)
@@ -203,14 +218,35 @@ class OptimizationProblem:
         :class:`~optiland.optimization.batched_evaluator.BatchedRayEvaluator`
         which minimises redundant ray traces.
         """
-        if self._batched_evaluator is not None:
-            return self._batched_evaluator.sum_squared()
-        return be.sum(self.fun_array())
+        with self._state_caches():
+            if self._batched_evaluator is not None:
+                return self._batched_evaluator.sum_squared()
+            return be.sum(self._fun_array())
 
     def rss(self):
         """RSS of current merit function"""
         return be.sqrt(self.sum_squared())
 
+    def _state_caches(self) -> ExitStack:
+        """Activate the state caches of all optics of the problem.
+
+        Within the returned context, the paraxial and aberration results of
+        each optic are computed once per optic state and shared by all
+        operands, see `optiland.state_cache`.
+        """
+        optics = {id(var.optic): var.optic for var in self.variables}
+        for op in self.operands:
+            optic = op.input_data.get("optic") if op.input_data else None
+            if optic is not None:
+                optics[id(optic)] = optic
+
+        stack = ExitStack()
+        for optic in optics.values():
+            state_cache = getattr(optic, "state_cache", None)
+            if state_cache is not None:
+                stack.enter_context(state_cache.activate())
+        return stack
+
     def update_optics(self):
         """Update all optics considered in the optimization problem"""
         unique_optics = set()
@@ -187,6 +187,11 @@ class Variable:
         unscaled_value = self.variable.inverse_scale(new_value)
         self.variable.update_value(unscaled_value)
 
+        # coefficient variables modify the geometry in place
+        surface_number = getattr(self.variable, "surface_number", None)
+        if surface_number is not None:
+            self.optic.surfaces[surface_number].geometry.mark_dirty()
+
     def reset(self):
         """Reset the variable to its initial value."""
         self.update(self.initial_value)
@@ -11,6 +11,9 @@ planes (N1anti & N2anti). In the Optiland convention, the 1 denotes object space
 the 2 denotes image space. For example, P1 is the object space principle plane and F2
 is the back focal point.
 
+The paraxial properties are memoized per state of the optic while its state
+cache is active, see `optiland.state_cache`.
+
 Kramer Harrison, 2024
 """
 
@@ -20,6 +23,7 @@ from typing import TYPE_CHECKING
 
 from optiland.fields import ParaxialImageHeightField
 from optiland.raytrace.paraxial_ray_tracer import ParaxialRayTracer
+from optiland.state_cache import state_cached
 
 if TYPE_CHECKING:
     from numpy.typing import ArrayLike
@@ -58,6 +62,7 @@ class Paraxial:
         """SurfaceGroup: the surface group of the optical system."""
         return self.optic.surfaces
 
+    @state_cached
     def f1(self) -> ScalarOrArray:
         """Calculate the front focal length (f1).
 
@@ -71,6 +76,7 @@ class Paraxial:
         f1 = y[0] / u[-1]
         return f1[0]
 
+    @state_cached
     def f2(self) -> ScalarOrArray:
         """Calculate the back focal length (f2), also known as effective focal length.
 
@@ -85,6 +91,7 @@ class Paraxial:
         f2 = -y[0] / u[-1]
         return f2[0]
 
+    @state_cached
     def F1(self) -> ScalarOrArray:
         """Calculate the front focal point (F1) location.
 
@@ -101,6 +108,7 @@ class Paraxial:
         F1 = y[-1] / u[-1]
         return F1[0]
 
+    @state_cached
     def F2(self) -> ScalarOrArray:
         """Calculate the back focal point (F2) location.
 
@@ -203,6 +211,7 @@ class Paraxial:
         """
         return self.F2() - self.f1()
 
+    @state_cached
     def EPL(self) -> ScalarOrArray:
         """Calculate the entrance pupil location (EPL) in global coordinates.
 
@@ -228,6 +237,7 @@ class Paraxial:
         loc_relative = y[-1] / u[-1]
         return loc_relative[0]
 
+    @state_cached
     def EPD(self) -> ScalarOrArray:
         """Calculate the entrance pupil diameter (EPD).
 
@@ -241,6 +251,7 @@ class Paraxial:
         wavelength = self.optic.primary_wavelength
         return self.optic.aperture.compute_epd(self, wavelength)
 
+    @state_cached
     def XPL(self) -> ScalarOrArray:
         """Calculate the exit pupil location (XPL).
 
@@ -255,6 +266,7 @@ class Paraxial:
         loc_relative = -y[-1] / u[-1]
         return loc_relative[0]
 
+    @state_cached
     def XPD(self) -> ScalarOrArray:
         """Calculate the exit pupil diameter (XPD).
 
@@ -274,6 +286,7 @@ class Paraxial:
         yxp = yi + ui * xpl
         return 2 * yxp[0]
 
+    @state_cached
     def FNO(self) -> ScalarOrArray:
         """Calculate the image-space F-number (FNO).
 
@@ -288,6 +301,7 @@ class Paraxial:
             return fno
         return self.f2() / self.EPD()
 
+    @state_cached
     def magnification(self) -> ScalarOrArray:
         """Calculate the transverse magnification.
 
@@ -300,6 +314,7 @@ class Paraxial:
         mag = n[0] * ua[0] / (n[-1] * ua[-1])
         return mag[0]
 
+    @state_cached
     def invariant(self) -> ScalarOrArray:
         """Calculate the Lagrange invariant.
 
@@ -313,6 +328,7 @@ class Paraxial:
         inv = yb[1] * n[1] * ua[1] - ya[1] * n[1] * ub[1]
         return inv[0]
 
+    @state_cached
     def marginal_ray(self) -> tuple[BEArray, BEArray]:
         """Calculates the marginal ray heights and angles at each surface.
 
@@ -344,6 +360,7 @@ class Paraxial:
         wavelength = self.optic.primary_wavelength
         return self.trace_generic(ya, ua, obj_z, wavelength)
 
+    @state_cached
     def chief_ray(self) -> tuple[BEArray, BEArray]:
         """Calculates the chief ray heights and angles at each surface.
 
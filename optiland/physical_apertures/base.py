@@ -18,6 +18,7 @@ from typing import TYPE_CHECKING
 import matplotlib.pyplot as plt
 
 import optiland.backend as be
+from optiland._revision import RevisionTracked
 
 if TYPE_CHECKING:
     from matplotlib.axes import Axes
@@ -27,7 +28,7 @@ if TYPE_CHECKING:
     from optiland.rays import RealRays
 
 
-class BaseAperture(ABC):
+class BaseAperture(RevisionTracked, ABC):
     """Base class for physical apertures.
 
     Methods:
@@ -37,9 +37,7 @@ class HomogeneousPropagation(BasePropagationModel):
             rays: The rays object to be propagated.
             t: The distance to propagate.
         """
-        rays.x = rays.x + t * rays.L
-        rays.y = rays.y + t * rays.M
-        rays.z = rays.z + t * rays.N
+        rays.propagate(t)
 
         # Handle absorption based on the material's extinction coefficient k
         k = self.material.k(rays.w)
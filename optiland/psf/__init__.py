@@ -1,6 +1,7 @@
 # flake8: noqa
 
 from .fft import FFTPSF, ScalarFFTPSF
+from .batched_fft import BatchedFFTPSF
 from .vectorial_fft import VectorialFFTPSF
 from .mmdft import MMDFTPSF
 from .huygens_fresnel import HuygensPSF, ScalarHuygensPSF
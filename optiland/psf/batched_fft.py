@@ -0,0 +1,227 @@
+"""Batched FFT Point Spread Function (PSF) Module
+
+This module provides the computation of the scalar FFT PSF of an optical
+system for many field points and wavelengths at once. The pupil functions of
+all field and wavelength pairs are stacked and transformed together, which
+results in a single PSF cube.
+
+Kramer Harrison, 2025
+"""
+
+from __future__ import annotations
+
+from scipy import fft as scipy_fft
+
+import optiland.backend as be
+from optiland.psf.fft import calculate_grid_size
+from optiland.wavefront import Wavefront
+
+# default maximum number of elements of the complex FFT output of a chunk
+MAX_BATCH_ELEMENTS = 2**20
+
+
+class BatchedFFTPSF:
+    """Scalar FFT PSF of an optical system for a set of fields and wavelengths.
+
+    The pupil functions of all (field, wavelength) pairs are computed from a
+    single wavefront analysis and stacked in one array. The PSFs are computed
+    with one batched 2D FFT, in chunks of `batch_size` pupils. The zero-padding
+    to `grid_size` is done by the FFT itself, and with the numpy backend, the
+    FFT is computed by `scipy.fft` using `workers` threads, such that the FFT
+    plan is shared by all pupils of a chunk.
+
+    Each PSF is identical to the PSF of `ScalarFFTPSF` for the same field,
+    wavelength and sampling, i.e., it is normalized such that a
+    diffraction-limited system has a peak of 100.
+
+    Args:
+        optic (Optic): The optical system.
+        fields (str | list, optional): The fields at which to compute the PSF.
+            Can be "all" to use all fields of the optic, or a list of field
+            coordinates (Hx, Hy). Defaults to "all".
+        wavelengths (str | list, optional): The wavelengths at which to compute
+            the PSF. Can be "all", "primary" or a list of wavelengths in
+            micrometers. Defaults to "all".
+        num_rays (int, optional): The number of rays used to sample the pupil
+            along one dimension. Defaults to 128.
+        grid_size (int, optional): The size of the FFT grid. If not specified,
+            it is calculated from `num_rays` as in `ScalarFFTPSF`. Defaults to
+            None.
+        strategy (str): The calculation strategy to use. Supported options are
+            "chief_ray", "centroid_sphere", and "best_fit_sphere".
+            Defaults to "chief_ray".
+        remove_tilt (bool): If True, removes tilt and piston from the OPD data.
+            Defaults to False.
+        workers (int, optional): The number of threads used by `scipy.fft`
+            with the numpy backend. Negative values count from the number of
+            CPUs. Defaults to -1, i.e., all CPUs.
+        batch_size (int, optional): The maximum number of pupils transformed
+            at once, which bounds the memory of the complex FFT output. If
+            None, the chunks are limited to `MAX_BATCH_ELEMENTS` elements of
+            the FFT output, i.e., 16 MiB. Defaults to None.
+        **kwargs: Additional keyword arguments passed to the strategy.
+
+    Attributes:
+        fields (list[tuple]): The field coordinates of the PSF cube.
+        wavelengths (list[float]): The wavelengths of the PSF cube.
+        num_rays (int): The number of rays across the pupil.
+        grid_size (int): The size of the FFT grid.
+        pupils (be.ndarray): The complex pupil functions, with shape
+            (num_fields, num_wavelengths, num_rays, num_rays).
+        psf (be.ndarray): The PSF cube, with shape
+            (num_fields, num_wavelengths, grid_size, grid_size).
+    """
+
+    def __init__(
+        self,
+        optic,
+        fields: str | list = "all",
+        wavelengths: str | list = "all",
+        num_rays=128,
+        grid_size=None,
+        strategy="chief_ray",
+        remove_tilt=False,
+        workers=-1,
+        batch_size=None,
+        **kwargs,
+    ):
+        if grid_size is None:
+            if num_rays < 32:
+                raise ValueError(
+                    "num_rays must be at least 32 if grid_size is not specified."
+                )
+            num_rays, grid_size = calculate_grid_size(num_rays)
+        elif grid_size < num_rays:
+            raise ValueError(
+                f"Grid size ({grid_size}) must be greater than or equal to the "
+                f"number of rays ({num_rays})."
+            )
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+
+        self.optic = optic
+        self.num_rays = int(num_rays)
+        self.grid_size = int(grid_size)
+        self.workers = workers
+        self.batch_size = batch_size
+
+        self._wavefront = Wavefront(
+            optic,
+            fields=fields,
+            wavelengths=wavelengths,
+            num_rays=self.num_rays,
+            distribution="uniform",
+            strategy=strategy,
+            remove_tilt=remove_tilt,
+            **kwargs,
+        )
+        self.fields = [fp.coord for fp in self._wavefront.fields]
+        self.wavelengths = [wp.value for wp in self._wavefront.wavelengths]
+
+        self.pupils = self._generate_pupils()
+        self.psf = self._compute_psf()
+
+    def _generate_pupils(self):
+        """Generates the stack of complex pupil functions.
+
+        The pupil of each (field, wavelength) pair is sampled on the same
+        `num_rays` x `num_rays` grid as in `ScalarFFTPSF`.
+
+        Returns:
+            be.ndarray: The complex pupils, with shape
+            (num_fields, num_wavelengths, num_rays, num_rays).
+        """
+        x = be.linspace(-1, 1, self.num_rays)
+        x, y = be.meshgrid(x, x)
+        x = be.reshape(x, (-1,))
+        y = be.reshape(y, (-1,))
+        mask = x**2 + y**2 <= 1
+
+        values = []
+        for field in self.fields:
+            for wl in self.wavelengths:
+                data = self._wavefront.get_data(field, wl)
+                amplitude = be.sqrt(data.intensity)
+                values.append(amplitude * be.exp(-1j * 2 * be.pi * data.opd))
+
+        num_pupils = len(self.fields) * len(self.wavelengths)
+        pupils = be.to_complex(be.zeros((num_pupils, self.num_rays**2)))
+        pupils[:, mask] = be.to_complex(be.stack(values))
+
+        shape = (len(self.fields), len(self.wavelengths), self.num_rays, self.num_rays)
+        return be.reshape(pupils, shape)
+
+    def _fft2(self, pupils):
+        """Zero-padded 2D FFT of a stack of pupils over the last two axes.
+
+        The pupils are padded at the end of each axis rather than centered, as
+        in `ScalarFFTPSF`, which only adds a linear phase to the FFT and does
+        not change the PSF.
+
+        Args:
+            pupils (be.ndarray): The stack of pupils, with shape
+                (num_pupils, num_rays, num_rays).
+
+        Returns:
+            be.ndarray: The FFT, with shape (num_pupils, grid_size, grid_size).
+        """
+        shape = (self.grid_size, self.grid_size)
+        if be.get_backend() == "numpy":
+            return scipy_fft.fft2(pupils, s=shape, workers=self.workers)
+        return be.fft.fft2(pupils, shape)
+
+    def _compute_psf(self):
+        """Computes the PSF cube from the stack of pupil functions.
+
+        For an even grid size, the PSFs are centered by modulating the pupils
+        with a (-1)^(m + n) checkerboard before the FFT, which is equivalent
+        to an `fftshift` of the PSFs, but is applied to the small pupil arrays.
+        The PSFs of each chunk are normalized and written in place into the
+        output cube.
+
+        Returns:
+            be.ndarray: The PSF cube, with shape
+            (num_fields, num_wavelengths, grid_size, grid_size).
+        """
+        num_fields, num_wavelengths = self.pupils.shape[:2]
+        pupils = be.reshape(self.pupils, (-1, self.num_rays, self.num_rays))
+        num_pupils = pupils.shape[0]
+        batch_size = self.batch_size or max(1, MAX_BATCH_ELEMENTS // self.grid_size**2)
+
+        # normalization of each PSF to a diffraction-limited peak of 100
+        norm_factor = be.sum(be.abs(pupils) > 0, axis=(-2, -1)) ** 2
+        scale = 100 / norm_factor
+
+        centered = self.grid_size % 2 == 0
+        if centered:
+            index = be.arange(self.num_rays)
+            checkerboard = 1 - 2 * ((index[:, None] + index[None, :]) % 2)
+            pupils = pupils * checkerboard
+
+        psf = be.zeros((num_pupils, self.grid_size, self.grid_size))
+        for start in range(0, num_pupils, batch_size):
+            stop = min(start + batch_size, num_pupils)
+            amp = self._fft2(pupils[start:stop])
+            power = be.real(amp) ** 2 + be.imag(amp) ** 2
+            psf[start:stop] = power * scale[start:stop, None, None]
+
+        if not centered:
+            psf = be.fft.fftshift(psf, axes=(-2, -1))
+
+        shape = (num_fields, num_wavelengths, self.grid_size, self.grid_size)
+        return be.reshape(psf, shape)
+
+    def otf(self):
+        """Computes the OTF of each PSF of the cube.
+
+        As the PSFs are real, the OTF is computed with a real-input FFT and
+        only the non-negative frequencies of the last axis are returned. The
+        zero frequency is at index 0 of the last two axes.
+
+        Returns:
+            be.ndarray: The complex OTF cube, with shape
+            (num_fields, num_wavelengths, grid_size, grid_size // 2 + 1).
+        """
+        if be.get_backend() == "numpy":
+            return scipy_fft.rfft2(self.psf, workers=self.workers)
+        return be.fft.rfft2(self.psf)
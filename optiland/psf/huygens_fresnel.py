@@ -21,6 +21,8 @@ from __future__ import annotations
 import optiland.backend as be
 from optiland.psf.base import BasePSF
 from optiland.psf.huygens_fresnel_strategies import (
+    HuygensFresnelSummation,
+    NUFFTSummation,
     NumbaSummation,
     TorchSummation,
 )
@@ -63,6 +65,14 @@ class ScalarHuygensPSF(BasePSF):
         pixel_pitch (float, optional): The pixel pitch of the image plane in mm.
             If provided, this will override the automatic extent calculation.
             Defaults to None.
+        summation (str | HuygensFresnelSummation, optional): The summation
+            used to evaluate the Huygens-Fresnel integral. "direct" sums the
+            contributions of all pupil points for each image point with the
+            backend-specific implementation. "nufft" uses the faster
+            `NUFFTSummation` with its default tolerance. A
+            `HuygensFresnelSummation` instance may also be given, e.g., to
+            set the tolerance or validation of `NUFFTSummation`. Defaults to
+            "direct".
         **kwargs: Additional keyword arguments passed to the strategy.
     """
 
@@ -78,6 +88,7 @@ class ScalarHuygensPSF(BasePSF):
         oversample: float = None,
         pixel_pitch: float = None,
         normalization: float = None,
+        summation: str | HuygensFresnelSummation = "direct",
         **kwargs,
     ):
         super().__init__(
@@ -98,11 +109,18 @@ class ScalarHuygensPSF(BasePSF):
         self.oversample = oversample
         self.normalization = normalization
 
-        self._summation_strategy = self._create_summation_strategy()
+        self._summation_strategy = self._create_summation_strategy(summation)
         self.psf = self._compute_psf()
 
-    def _create_summation_strategy(self):
+    def _create_summation_strategy(self, summation="direct"):
         """Factory method to create the appropriate summation strategy."""
+        if isinstance(summation, HuygensFresnelSummation):
+            return summation
+        if summation == "nufft":
+            return NUFFTSummation()
+        if summation != "direct":
+            raise ValueError(f"Unsupported Huygens-Fresnel summation: {summation}")
+
         backend = be.get_backend()
         if backend == "numpy":
             return NumbaSummation()
@@ -4,7 +4,8 @@ This module provides different strategies for computing the Huygens-Fresnel
 diffraction integral, optimized for different computation backends (NumPy with
 Numba, and PyTorch). This allows the main `HuygensPSF` class to remain
 backend-agnostic, delegating the computationally intensive summation to the
-appropriate strategy.
+appropriate strategy. A fast strategy based on non-uniform FFTs is also
+provided for large image grids.
 
 Each strategy is encapsulated in a class that inherits from the abstract base
 class `HuygensFresnelSummation`, ensuring a consistent interface.
@@ -15,9 +16,11 @@ Kramer Harrison, 2025
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from warnings import warn
 
 import numpy as np
 from numba import njit, prange
+from scipy import fft as scipy_fft
 
 import optiland.backend as be
 
@@ -272,3 +275,371 @@ class TorchSummation(HuygensFresnelSummation):
         psf = torch.abs(field) ** 2
 
         return psf
+
+
+def _direct_field(points, pupil, weights, k, Rp, chunk_size=2**22):
+    """Evaluate the Huygens-Fresnel field by direct summation.
+
+    Args:
+        points (np.ndarray): Image points of shape (M, 3).
+        pupil (np.ndarray): Pupil points of shape (N, 3).
+        weights (np.ndarray): Complex pupil weights of shape (N,), i.e., the
+            amplitudes times the phase of the optical path difference.
+        k (float): Wavenumber in 1/mm.
+        Rp (float): Radius of the exit pupil reference sphere in mm.
+        chunk_size (int, optional): Maximum number of (image, pupil) pairs
+            evaluated at once. Defaults to 2**22.
+
+    Returns:
+        np.ndarray: Complex field of shape (M,).
+    """
+    normal = pupil / Rp
+    field = np.empty(len(points), dtype=np.complex128)
+    step = max(1, chunk_size // max(len(pupil), 1))
+    for start in range(0, len(points), step):
+        d = points[start : start + step, None, :] - pupil[None, :, :]
+        R = np.sqrt(np.sum(d * d, axis=-1))
+        cos_theta = np.sum(d * normal, axis=-1) / R
+        kernel = np.exp(1j * k * R) / R * 0.5 * (1.0 + cos_theta)
+        field[start : start + step] = kernel @ weights
+    return field
+
+
+def _nufft_type1(x1, x2, c, modes1, modes2, msp):
+    """Type-1 2D non-uniform FFT with Gaussian gridding.
+
+    Computes f[l, m, n] = sum_j c[l, j] exp(i (m x1_j + n x2_j)) for the
+    integer modes m in `modes1` and n in `modes2`, following Greengard & Lee,
+    "Accelerating the Nonuniform Fast Fourier Transform", SIAM Review (2004).
+
+    Args:
+        x1, x2 (np.ndarray): Non-uniform frequencies of shape (N,) in radians.
+        c (np.ndarray): Complex strengths of shape (L, N).
+        modes1, modes2 (np.ndarray): Integer modes of the output.
+        msp (int): Half-width of the Gaussian spreading kernel in grid points,
+            which sets the accuracy of the transform.
+
+    Returns:
+        np.ndarray: Complex array of shape (L, len(modes1), len(modes2)).
+    """
+    oversampling = 2
+    spread = np.arange(-msp + 1, msp + 1)
+    axes = []
+    for x, modes in ((x1, modes1), (x2, modes2)):
+        M = max(len(modes), 2)
+        Mr = oversampling * M
+        tau = np.pi * msp / (M**2 * oversampling * (oversampling - 0.5))
+        # spread at -x to obtain exp(+i m x) from the forward FFT
+        position = np.mod(-x, 2 * np.pi) * (Mr / (2 * np.pi))
+        index = np.floor(position).astype(np.int64)[:, None] + spread
+        distance = (index - position[:, None]) * (2 * np.pi / Mr)
+        weight = np.exp(-(distance**2) / (4 * tau))
+        deconvolution = np.exp(modes**2 * tau) * np.sqrt(np.pi / tau) / Mr
+        axes.append((np.mod(index, Mr), weight, Mr, np.mod(modes, Mr), deconvolution))
+
+    (i1, w1, Mr1, k1, d1), (i2, w2, Mr2, k2, d2) = axes
+    index = (i1[:, :, None] * Mr2 + i2[:, None, :]).ravel()
+    weight = w1[:, :, None] * w2[:, None, :]
+
+    grid = np.empty((len(c), Mr1 * Mr2), dtype=np.complex128)
+    for channel, strength in enumerate(c):
+        grid[channel].real = np.bincount(
+            index, (weight * strength.real[:, None, None]).ravel(), Mr1 * Mr2
+        )
+        grid[channel].imag = np.bincount(
+            index, (weight * strength.imag[:, None, None]).ravel(), Mr1 * Mr2
+        )
+
+    spectrum = scipy_fft.fft2(grid.reshape(-1, Mr1, Mr2), workers=-1)
+    return spectrum[:, k1][:, :, k2] * d1[:, None] * d2[None, :]
+
+
+class _TileExpansion:
+    """Expansion of the Huygens-Fresnel kernel about the center of a tile.
+
+    For an image point P = C + p near the tile center C, the kernel
+    exp(ikR) Q / R of each pupil point is approximated by
+
+        exp(ik R0) exp(ik s . a) E(p) [A0 + g . p + i k / 2 A0 dR2(p)],
+
+    where R0 and s are the distance and direction from the pupil point to C,
+    a is the affine part of p on the image grid and E(p) is the exact phase
+    of a reference pupil point that is not linear in a. A0 + g . p linearizes
+    the obliquity factor over the distance, and dR2(p) is the difference of
+    the second-order (Fresnel) distance terms between the pupil point and the
+    reference point. Each term is a product of a pupil factor and an image
+    factor, so that the sum over the pupil is a non-uniform FFT per term.
+    """
+
+    _pairs = ((0, 0), (1, 1), (2, 2), (0, 1), (0, 2), (1, 2))
+
+    def __init__(self, center, pupil, weights, k, Rp):
+        self.center = center
+        self.pupil = pupil
+        self.weights = weights
+        self.k = k
+        self.normal = pupil / Rp
+
+        d = center - pupil
+        R0 = np.linalg.norm(d, axis=-1)
+        self.s = d / R0[:, None]
+        cos_theta = np.sum(self.s * self.normal, axis=-1)
+        A0 = 0.5 * (1.0 + cos_theta) / R0
+        gradient = (
+            0.5 * (self.normal - cos_theta[:, None] * self.s) / R0[:, None] ** 2
+            - (A0 / R0)[:, None] * self.s
+        )
+
+        # amplitude-weighted mean pupil point as reference for the Fresnel phase
+        amplitude = np.abs(weights)
+        mean_pupil = amplitude @ pupil / np.sum(amplitude)
+        self.reference = center - mean_pupil
+        self.R_ref = np.linalg.norm(self.reference)
+        self.s_ref = self.reference / self.R_ref
+
+        # pupil factors: amplitude, its gradient and the Fresnel terms
+        quadratic = [
+            -(1.0 if a == b else 2.0) * A0 * self.s[:, a] * self.s[:, b] / R0
+            for a, b in self._pairs
+        ]
+        self.channels = (weights * np.exp(1j * k * R0)) * np.stack(
+            [A0, *gradient.T, A0 * (1.0 / R0 - 1.0 / self.R_ref), *quadratic]
+        )
+
+    def _image_factors(self, p, affine):
+        """Phase E(p) and the image factors of each term, for offsets p."""
+        R = np.linalg.norm(self.reference + p, axis=-1)
+        phase = np.exp(1j * self.k * (R - self.R_ref - affine @ self.s_ref))
+        fresnel = 0.5j * self.k
+        reference = fresnel * (p @ self.s_ref) ** 2 / self.R_ref
+        factors = np.stack(
+            [
+                1.0 + reference,
+                *np.moveaxis(p, -1, 0),
+                fresnel * np.sum(p * p, axis=-1),
+                *[fresnel * p[..., a] * p[..., b] for a, b in self._pairs],
+            ]
+        )
+        return phase, factors
+
+    def error(self, points, affine):
+        """Upper bound of the absolute field error at the given points."""
+        p = points - self.center
+        d = points[:, None, :] - self.pupil[None, :, :]
+        R = np.linalg.norm(d, axis=-1)
+        cos_theta = np.sum(d * self.normal, axis=-1) / R
+        exact = self.weights * np.exp(1j * self.k * R) / R * 0.5 * (1.0 + cos_theta)
+
+        phase, factors = self._image_factors(p, affine)
+        linear = np.exp(1j * self.k * (affine @ self.s.T))
+        approximate = phase[:, None] * linear * (factors.T @ self.channels)
+        return np.max(np.sum(np.abs(exact - approximate), axis=-1))
+
+    def field(self, points, affine, rows, cols, step_row, step_col, msp):
+        """Field on a tile of the image grid using non-uniform FFTs.
+
+        Args:
+            points (np.ndarray): Image points of the tile, shape (h, w, 3).
+            affine (np.ndarray): Affine offsets of the points from the tile
+                center, shape (h, w, 3).
+            rows, cols (np.ndarray): Row and column offsets of the tile points
+                from the tile center in pixels.
+            step_row, step_col (np.ndarray): Affine steps of the image grid.
+            msp (int): Spreading half-width of the non-uniform FFT.
+
+        Returns:
+            np.ndarray: Complex field of shape (h, w).
+        """
+        spectra = _nufft_type1(
+            self.k * (self.s @ step_row),
+            self.k * (self.s @ step_col),
+            self.channels,
+            rows,
+            cols,
+            msp,
+        )
+        phase, factors = self._image_factors(points - self.center, affine)
+        return phase * np.sum(factors * spectra, axis=0)
+
+
+class NUFFTSummation(HuygensFresnelSummation):
+    """Fast Huygens-Fresnel summation using non-uniform FFTs.
+
+    The image grid is split into tiles. Within a tile, the distance from each
+    pupil point to an image point is expanded about the tile center: the phase
+    that is linear in the image grid indices is summed over the pupil with
+    type-1 non-uniform FFTs, the remaining (Fresnel) phase is evaluated
+    exactly for a reference pupil point and corrected to first order for the
+    other pupil points, and the obliquity factor over the distance is
+    linearized. Tiles are subdivided until the error of this expansion,
+    evaluated against the exact kernel on a subset of the tile points, is
+    below the tolerance. Tiles smaller than `min_tile_size` that still exceed
+    the tolerance are computed by direct summation.
+
+    The cost scales with the number of pupil points times the number of tiles
+    rather than the number of image points, so this strategy is much faster
+    than the direct summation for large image grids. The image grid may lie
+    on a tilted or curved image surface.
+
+    Args:
+        tol (float, optional): Target error of the field relative to the
+            field of an ideal pupil, i.e., the sum of the pupil amplitudes
+            over the distance to the image. The error of the PSF relative to
+            the ideal peak is approximately twice this value. Defaults to
+            1e-6.
+        min_tile_size (int, optional): Minimum tile size in pixels. Defaults
+            to 8.
+        validate (int, optional): Number of randomly chosen image points at
+            which the field is also computed by direct summation. The maximum
+            relative error is stored in `validation_error` and a warning is
+            issued if it exceeds the tolerance. Defaults to 0 (no validation).
+
+    Attributes:
+        num_tiles (int): The number of tiles of the last tiled computation.
+        validation_error (float): The error of the last tiled computation
+            against the direct summation, if validated.
+    """
+
+    _num_samples = 5  # samples per tile axis used to estimate the tile error
+
+    def __init__(self, tol=1e-6, min_tile_size=8, validate=0):
+        if tol <= 0:
+            raise ValueError("tol must be positive.")
+        self.tol = tol
+        self.min_tile_size = min_tile_size
+        self.validate = validate
+        # Gaussian gridding error is ~exp(-2 pi msp / 3) with 2x oversampling
+        self.msp = int(np.clip(np.ceil(-np.log(tol / 10) * 3 / (2 * np.pi)), 2, 16))
+        self.num_tiles = None
+        self.validation_error = None
+
+    def compute(
+        self,
+        image_x,
+        image_y,
+        image_z,
+        pupil_x,
+        pupil_y,
+        pupil_z,
+        pupil_amp,
+        pupil_opd,
+        wavelength,
+        Rp,
+    ):
+        """
+        Compute the PSF using the non-uniform FFT Huygens-Fresnel summation.
+        """
+        points = np.stack(
+            [be.to_numpy(v) for v in (image_x, image_y, image_z)], axis=-1
+        ).astype(float)
+        pupil = np.stack(
+            [be.to_numpy(v) for v in (pupil_x, pupil_y, pupil_z)], axis=-1
+        ).astype(float)
+        k = 2.0 * np.pi / float(be.to_numpy(wavelength))
+        Rp = float(be.to_numpy(Rp))
+        weights = be.to_numpy(pupil_amp) * np.exp(
+            -1j * k * be.to_numpy(pupil_opd).astype(float)
+        )
+
+        # only pupil points with non-zero amplitude contribute
+        valid = weights != 0
+        pupil, weights = pupil[valid], weights[valid]
+
+        shape = points.shape[:2]
+        if min(shape) < 2 or len(pupil) == 0:
+            # too small to be tiled, e.g., the PSF normalization point
+            field = _direct_field(points.reshape(-1, 3), pupil, weights, k, Rp)
+            return be.array(np.abs(field.reshape(shape)) ** 2)
+
+        field = self._tiled_field(points, pupil, weights, k, Rp)
+        if self.validate > 0:
+            self._validate(field, points, pupil, weights, k, Rp)
+        return be.array(np.abs(field) ** 2)
+
+    @staticmethod
+    def _reference_field(points, pupil, weights):
+        """Field magnitude of an ideal pupil, used to scale the errors."""
+        distance = np.linalg.norm(np.mean(points, axis=0) - pupil, axis=-1)
+        return np.sum(np.abs(weights) / distance)
+
+    def _tiled_field(self, points, pupil, weights, k, Rp):
+        """Compute the field on the image grid tile by tile."""
+        rows, cols = points.shape[:2]
+        step_row = np.mean(points[1:] - points[:-1], axis=(0, 1))
+        step_col = np.mean(points[:, 1:] - points[:, :-1], axis=(0, 1))
+        origin = np.mean(
+            points
+            - np.arange(rows)[:, None, None] * step_row
+            - np.arange(cols)[None, :, None] * step_col,
+            axis=(0, 1),
+        )
+        max_error = 0.5 * self.tol  # half of the budget for the expansion
+        max_error *= self._reference_field(points.reshape(-1, 3), pupil, weights)
+
+        field = np.empty((rows, cols), dtype=np.complex128)
+        tiles = [(0, rows, 0, cols)]
+        self.num_tiles = 0
+        while tiles:
+            r0, r1, c0, c1 = tiles.pop()
+            rc, cc = (r0 + r1) // 2, (c0 + c1) // 2
+            center = origin + rc * step_row + cc * step_col
+            expansion = _TileExpansion(center, pupil, weights, k, Rp)
+
+            def affine(r, c, rc=rc, cc=cc):
+                dr, dc = np.meshgrid(r - rc, c - cc, indexing="ij")
+                return dr[..., None] * step_row + dc[..., None] * step_col
+
+            sample_rows = np.unique(np.linspace(r0, r1 - 1, self._num_samples))
+            sample_cols = np.unique(np.linspace(c0, c1 - 1, self._num_samples))
+            sample_rows = sample_rows.astype(int)
+            sample_cols = sample_cols.astype(int)
+            error = expansion.error(
+                points[np.ix_(sample_rows, sample_cols)].reshape(-1, 3),
+                affine(sample_rows, sample_cols).reshape(-1, 3),
+            )
+
+            tile = points[r0:r1, c0:c1]
+            tile_rows, tile_cols = np.arange(r0, r1), np.arange(c0, c1)
+            if error <= max_error:
+                field[r0:r1, c0:c1] = expansion.field(
+                    tile,
+                    affine(tile_rows, tile_cols),
+                    tile_rows - rc,
+                    tile_cols - cc,
+                    step_row,
+                    step_col,
+                    self.msp,
+                )
+            elif min(r1 - r0, c1 - c0) < 2 * self.min_tile_size:
+                field[r0:r1, c0:c1] = _direct_field(
+                    tile.reshape(-1, 3), pupil, weights, k, Rp
+                ).reshape(tile.shape[:2])
+            else:
+                tiles.extend(
+                    [
+                        (r0, rc, c0, cc),
+                        (r0, rc, cc, c1),
+                        (rc, r1, c0, cc),
+                        (rc, r1, cc, c1),
+                    ]
+                )
+                continue
+            self.num_tiles += 1
+        return field
+
+    def _validate(self, field, points, pupil, weights, k, Rp):
+        """Compare the field with the direct summation at random points."""
+        points = points.reshape(-1, 3)
+        rng = np.random.default_rng(0)
+        index = rng.choice(len(points), min(self.validate, len(points)), replace=False)
+        exact = _direct_field(points[index], pupil, weights, k, Rp)
+        error = np.max(np.abs(field.reshape(-1)[index] - exact))
+        self.validation_error = float(
+            error / self._reference_field(points, pupil, weights)
+        )
+        if self.validation_error > self.tol:
+            warn(
+                f"Huygens-Fresnel NUFFT summation error {self.validation_error:.3g} "
+                f"exceeds the tolerance {self.tol:.3g}.",
+                stacklevel=3,
+            )
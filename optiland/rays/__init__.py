@@ -2,6 +2,7 @@
 
 from .base import BaseRays
 from .real_rays import RealRays
+from .buffered_rays import BufferedRealRays
 from .paraxial_rays import ParaxialRays
 from .polarized_rays import PolarizedRays
 from .ray_generator import RayGenerator
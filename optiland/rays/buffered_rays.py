@@ -0,0 +1,350 @@
+"""Buffered Rays
+
+This module contains the BufferedRealRays class, a variant of RealRays whose
+per-ray properties live in a single preallocated, contiguous buffer. Rotation,
+translation, propagation, refraction and reflection are evaluated with
+in-place ``out=`` kernels, so tracing through a surface group does not
+allocate fresh arrays for every ray property at every surface.
+
+Buffered rays are only supported for the NumPy backend, as in-place updates
+are incompatible with autograd on the torch backend.
+
+Kramer Harrison, 2025
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+import optiland.backend as be
+from optiland.backend.utils import to_numpy
+from optiland.rays.real_rays import RealRays
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike, NDArray
+
+    from optiland._types import ScalarOrArray
+    from optiland.surfaces.standard_surface import Surface
+
+# row indices of the ray properties within the buffer
+_FIELDS = ("x", "y", "z", "L", "M", "N", "i", "w", "opd", "L0", "M0", "N0")
+_INDEX = {name: idx for idx, name in enumerate(_FIELDS)}
+_NUM_SCRATCH = 6
+# buffer rows copied to a surface when ray data is recorded, in the order of
+# the surface attributes x, y, z, L, M, N, intensity, opd
+_RECORD_ROWS = [_INDEX[name] for name in ("x", "y", "z", "L", "M", "N", "i", "opd")]
+
+
+def _buffer_property(name: str) -> property:
+    """Create a property that exposes one row of the ray buffer as a view.
+
+    Assigning to the property copies the value into the buffer row rather than
+    rebinding the attribute, so code written for `RealRays` (e.g.,
+    ``rays.x = rays.x + dx``) keeps the buffer as the single source of truth.
+    """
+    idx = _INDEX[name]
+
+    def getter(self):
+        return self._buffer[idx]
+
+    def setter(self, value):
+        self._buffer[idx] = to_numpy(value)
+
+    return property(getter, setter, doc=f"View of the '{name}' row of the buffer.")
+
+
+def _pre_surface_property(name: str) -> property:
+    """Create a property for the pre-surface direction cosines (L0, M0, N0).
+
+    These mirror `RealRays`, where the attributes are None until the first
+    surface interaction.
+    """
+    idx = _INDEX[name]
+
+    def getter(self):
+        return self._buffer[idx] if self._has_pre_surface else None
+
+    def setter(self, value):
+        if value is None:
+            self._has_pre_surface = False
+            return
+        self._buffer[idx] = to_numpy(value)
+        self._has_pre_surface = True
+
+    return property(getter, setter, doc=f"View of the '{name}' row of the buffer.")
+
+
+class BufferedRealRays(RealRays):
+    """Real rays backed by a single contiguous, preallocated buffer.
+
+    The buffer has shape (k, n_rays), with one C-contiguous row per ray
+    property (x, y, z, L, M, N, i, w, opd, L0, M0, N0). Each property is
+    exposed as a view of its row, so the structure-of-arrays layout is
+    retained while the complete ray state occupies one allocation. A small
+    set of scratch rows is allocated alongside the buffer and reused by the
+    in-place kernels for temporaries.
+
+    The buffer bounds the working set of the trace itself. Ray data recorded
+    on the surfaces is not part of it: each recorded surface receives one new
+    (8, n_rays) array, whose rows back the recorded attributes, as recorded
+    data must outlive later traces. A trace therefore only runs in a fixed
+    working set with ``record="none"``; with ``record="image"`` a single
+    record array is added, and with ``record="all"`` one per surface.
+
+    Args:
+        x: The x-coordinates of the ray starting positions.
+        y: The y-coordinates of the ray starting positions.
+        z: The z-coordinates of the ray starting positions.
+        L: The x-components of the ray direction cosines.
+        M: The y-components of the ray direction cosines.
+        N: The z-components of the ray direction cosines.
+        intensity: The intensity values of the rays.
+        wavelength: The wavelength values of the rays.
+
+    Raises:
+        ValueError: If the active backend is not NumPy.
+    """
+
+    x = _buffer_property("x")
+    y = _buffer_property("y")
+    z = _buffer_property("z")
+    L = _buffer_property("L")
+    M = _buffer_property("M")
+    N = _buffer_property("N")
+    i = _buffer_property("i")
+    w = _buffer_property("w")
+    opd = _buffer_property("opd")
+    L0 = _pre_surface_property("L0")
+    M0 = _pre_surface_property("M0")
+    N0 = _pre_surface_property("N0")
+
+    def __init__(
+        self,
+        x: ArrayLike,
+        y: ArrayLike,
+        z: ArrayLike,
+        L: ArrayLike,
+        M: ArrayLike,
+        N: ArrayLike,
+        intensity: ArrayLike,
+        wavelength: ArrayLike,
+    ):
+        if be.get_backend() != "numpy":
+            raise ValueError("Buffered rays are only supported for the numpy backend.")
+
+        num_rays = max(
+            np.size(to_numpy(v)) for v in (x, y, z, L, M, N, intensity, wavelength)
+        )
+        dtype = np.float32 if be.get_precision() == 32 else np.float64
+        self._buffer = np.zeros((len(_FIELDS), num_rays), dtype=dtype)
+        self._scratch = np.empty((_NUM_SCRATCH, num_rays), dtype=dtype)
+        self._has_pre_surface = False
+
+        super().__init__(x, y, z, L, M, N, intensity, wavelength)
+
+    @classmethod
+    def from_rays(cls, rays: RealRays) -> BufferedRealRays:
+        """Create buffered rays holding a copy of the state of existing rays.
+
+        Args:
+            rays (RealRays): The rays to copy into a new buffer.
+
+        Returns:
+            BufferedRealRays: The buffered rays.
+        """
+        buffered = cls(rays.x, rays.y, rays.z, rays.L, rays.M, rays.N, rays.i, rays.w)
+        buffered.opd = rays.opd
+        if rays.L0 is not None:
+            buffered.L0 = rays.L0
+            buffered.M0 = rays.M0
+            buffered.N0 = rays.N0
+        buffered.is_normalized = rays.is_normalized
+        return buffered
+
+    @property
+    def buffer(self) -> NDArray:
+        """np.ndarray: The (k, n_rays) buffer holding the ray properties."""
+        return self._buffer
+
+    @property
+    def num_rays(self) -> int:
+        """int: The number of rays held by the buffer."""
+        return self._buffer.shape[1]
+
+    def record_on_surface(self, surface: Surface) -> None:
+        """Record the ray data on a surface with a single copy of the buffer.
+
+        The recorded properties are gathered into one (8, n_rays) array and
+        the surface attributes are set to its rows, instead of allocating a
+        separate copy per property.
+
+        Args:
+            surface (Surface): The surface to record onto.
+        """
+        (
+            surface.x,
+            surface.y,
+            surface.z,
+            surface.L,
+            surface.M,
+            surface.N,
+            surface.intensity,
+            surface.opd,
+        ) = self._buffer[_RECORD_ROWS]
+
+    def translate(self, dx: ArrayLike, dy: ArrayLike, dz: ArrayLike):
+        """Shifts the rays in the x, y, and z directions in-place.
+
+        Args:
+            dx: The amount to shift the rays in the x direction.
+            dy: The amount to shift the rays in the y direction.
+            dz: The amount to shift the rays in the z direction.
+        """
+        for pos, shift in ((self.x, dx), (self.y, dy), (self.z, dz)):
+            np.add(pos, to_numpy(shift), out=pos)
+
+    def propagate(self, t: ScalarOrArray):
+        """Propagate the rays a distance t along their directions in-place.
+
+        Args:
+            t: The distance to propagate.
+        """
+        t = to_numpy(t)
+        tmp = self._scratch[0]
+        for pos, cos in ((self.x, self.L), (self.y, self.M), (self.z, self.N)):
+            np.multiply(cos, t, out=tmp)
+            pos += tmp
+
+    def _rotate(self, a, b, c, d, angle):
+        """Rotate the (a, b) position and (c, d) direction pairs in-place.
+
+        Applies a' = a cos - b sin, b' = a sin + b cos to both pairs.
+        """
+        angle = to_numpy(angle)
+        cos = np.cos(angle)
+        sin = np.sin(angle)
+        t0, t1 = self._scratch[0], self._scratch[1]
+        for u, v in ((a, b), (c, d)):
+            np.multiply(u, cos, out=t0)
+            np.multiply(v, sin, out=t1)
+            t0 -= t1
+            np.multiply(u, sin, out=t1)
+            v *= cos
+            v += t1
+            u[...] = t0
+
+    def rotate_x(self, rx: ScalarOrArray):
+        """Rotate the rays about the x-axis in-place.
+
+        Args:
+            rx: Rotation angle around x-axis in radians.
+        """
+        self._rotate(self.y, self.z, self.M, self.N, rx)
+
+    def rotate_y(self, ry: ScalarOrArray):
+        """Rotate the rays about the y-axis in-place.
+
+        Args:
+            ry: Rotation angle around y-axis in radians.
+        """
+        self._rotate(self.z, self.x, self.N, self.L, ry)
+
+    def rotate_z(self, rz: ScalarOrArray):
+        """Rotate the rays about the z-axis in-place.
+
+        Args:
+            rz: Rotation angle around z-axis in radians.
+        """
+        self._rotate(self.x, self.y, self.L, self.M, rz)
+
+    def clip(self, condition):
+        """Clip the rays based on a condition by zeroing their intensity."""
+        cond = to_numpy(condition).astype(bool)
+        self.i[np.broadcast_to(cond, self.i.shape)] = 0.0
+
+    def _store_pre_surface(self):
+        """Copy the current direction cosines into the L0, M0, N0 rows."""
+        self._buffer[_INDEX["L0"] : _INDEX["N0"] + 1] = self._buffer[
+            _INDEX["L"] : _INDEX["N"] + 1
+        ]
+        self._has_pre_surface = True
+
+    def _aligned_normal(self, nx, ny, nz):
+        """Align the surface normal with the incident rays using scratch rows.
+
+        Returns:
+            tuple: Views of the aligned normal components and |cos(AOI)|,
+            stored in scratch rows 2 to 5.
+        """
+        anx, any_, anz, dot = self._scratch[2:6]
+        np.multiply(self.L0, nx, out=dot)
+        np.multiply(self.M0, ny, out=anx)
+        dot += anx
+        np.multiply(self.N0, nz, out=anx)
+        dot += anx
+        for out, n in ((anx, nx), (any_, ny), (anz, nz)):
+            np.sign(dot, out=out)
+            out *= n
+        np.abs(dot, out=dot)
+        return anx, any_, anz, dot
+
+    def refract(self, nx: float, ny: float, nz: float, n1: float, n2: float):
+        """Refract rays on the surface in-place.
+
+        Args:
+            nx: The x-component of the surface normals.
+            ny: The y-component of the surface normals.
+            nz: The z-component of the surface normals.
+            n1: The refractive index before the surface.
+            n2: The refractive index after the surface.
+        """
+        self._store_pre_surface()
+        u = to_numpy(n1) / to_numpy(n2)
+        nx, ny, nz, dot = self._aligned_normal(to_numpy(nx), to_numpy(ny), to_numpy(nz))
+
+        # coef = sqrt(1 - u^2 (1 - dot^2)) - u * dot
+        coef, tmp = self._scratch[0], self._scratch[1]
+        np.multiply(dot, dot, out=coef)
+        np.subtract(1.0, coef, out=coef)
+        coef *= u**2
+        np.subtract(1.0, coef, out=coef)
+        with np.errstate(invalid="ignore"):  # total internal reflection
+            np.sqrt(coef, out=coef)
+        np.multiply(dot, u, out=tmp)
+        coef -= tmp
+
+        for cos, n in ((self.L, nx), (self.M, ny), (self.N, nz)):
+            cos *= u
+            np.multiply(n, coef, out=tmp)
+            cos += tmp
+
+    def reflect(self, nx: float, ny: float, nz: float):
+        """Reflect rays on the surface in-place.
+
+        Args:
+            nx: The x-component of the surface normal.
+            ny: The y-component of the surface normal.
+            nz: The z-component of the surface normal.
+        """
+        self._store_pre_surface()
+        nx, ny, nz, dot = self._aligned_normal(to_numpy(nx), to_numpy(ny), to_numpy(nz))
+        dot *= 2.0
+        tmp = self._scratch[0]
+        for cos, n in ((self.L, nx), (self.M, ny), (self.N, nz)):
+            np.multiply(dot, n, out=tmp)
+            cos -= tmp
+
+    def normalize(self):
+        """Normalize the direction vectors of the rays in-place."""
+        mag, tmp = self._scratch[0], self._scratch[1]
+        np.multiply(self.L, self.L, out=mag)
+        np.multiply(self.M, self.M, out=tmp)
+        mag += tmp
+        np.multiply(self.N, self.N, out=tmp)
+        mag += tmp
+        np.sqrt(mag, out=mag)
+        for cos in (self.L, self.M, self.N):
+            np.divide(cos, mag, out=cos)
+        self.is_normalized = True
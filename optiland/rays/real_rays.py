@@ -109,6 +109,16 @@ class RealRays(BaseRays):
         """
         surface._record_real(self)
 
+    def propagate(self, t: ScalarOrArray):
+        """Propagate the rays a distance t along their direction cosines.
+
+        Args:
+            t: The distance to propagate.
+        """
+        self.x = self.x + t * self.L
+        self.y = self.y + t * self.M
+        self.z = self.z + t * self.N
+
     def rotate_x(self, rx: ScalarOrArray):
         """Rotate the rays about the x-axis.
 
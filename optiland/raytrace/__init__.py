@@ -2,3 +2,14 @@
 
 from .real_ray_tracer import RealRayTracer
 from .paraxial_ray_tracer import ParaxialRayTracer
+from .reducers import (
+    BaseRayReducer,
+    IrradianceReducer,
+    OPDReducer,
+    OPLReducer,
+    SpotReducer,
+    reduce_stream,
+)
+from .executor import TraceExecutor, get_executor, set_executor
+from .trace_plan import TracePlan
+from .incremental_trace import IncrementalTrace
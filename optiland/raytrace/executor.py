@@ -0,0 +1,216 @@
+"""Trace Executor Module
+
+This module contains the TraceExecutor class, which fans out independent
+analysis jobs, typically one per (field, wavelength) pair, to a pool of
+threads or processes and gathers their results in order.
+
+The object whose method is executed (usually an analysis, holding a reference
+to its optic) is replicated once per worker and call: deep-copied for each
+thread, or pickled once and unpickled in each worker process, which also
+adopts the backend, precision and device of the calling process. The workers
+themselves persist between calls. Every worker therefore
+traces its own copy of the optical system, so the ray data recorded on the
+surfaces of the original optic is not modified by a parallel run.
+
+Threads are well suited to NumPy-heavy jobs, which release the GIL for most
+of their runtime, while processes also parallelize the Python-level work. When
+using processes with the 'spawn' start method (the default on Windows and
+macOS), the calling script must be guarded by ``if __name__ == "__main__":``.
+
+Kramer Harrison, 2025
+"""
+
+from __future__ import annotations
+
+import copy
+import math
+import os
+import pickle
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Literal
+
+import optiland.backend as be
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+ExecutorMode = Literal["serial", "thread", "process"]
+
+# replica of the target object held by each worker process, keyed by map call
+_worker_key = None
+_worker_target = None
+
+
+def _backend_config() -> tuple[str, str, str | None]:
+    """Return the backend, precision and device of the calling process."""
+    backend = be.get_backend()
+    precision = f"float{be.get_precision()}"
+    device = be.get_device() if backend == "torch" else None
+    return backend, precision, device
+
+
+def _set_backend_config(config: tuple[str, str, str | None]):
+    """Apply the backend, precision and device of the calling process."""
+    backend, precision, device = config
+    be.set_backend(backend)
+    be.set_precision(precision)
+    if device is not None:
+        be.set_device(device)
+
+
+def _run_worker_job(
+    key: str, config: tuple, payload: bytes, method_name: str, args: tuple
+):
+    """Run a single job on the target replica of the worker process.
+
+    The target is unpickled once per worker and map call. The payload of a
+    chunk of jobs is pickled only once, as the jobs share the same object.
+    """
+    global _worker_key, _worker_target
+    if _worker_key != key:
+        _set_backend_config(config)
+        _worker_target = pickle.loads(payload)
+        _worker_key = key
+    return getattr(_worker_target, method_name)(*args)
+
+
+class TraceExecutor:
+    """Executes independent trace jobs serially, on threads or on processes.
+
+    The pool of threads or processes is started on first use and persists
+    until `close` is called, so that repeated calls to `map` (e.g., one per
+    Jacobian evaluation) do not start new workers. The target is replicated
+    for every call, so the workers always trace the current state of the
+    target. The executor can be used as a context manager, which closes the
+    pool on exit.
+
+    Args:
+        mode (str, optional): The execution mode. Options are 'serial' (run
+            jobs in the calling thread on the original object), 'thread' and
+            'process'. Defaults to 'serial'.
+        max_workers (int, optional): The maximum number of workers. Defaults
+            to None, i.e., the number of CPUs.
+
+    Raises:
+        ValueError: If the mode is invalid or max_workers is not positive.
+    """
+
+    _modes = ("serial", "thread", "process")
+
+    def __init__(self, mode: ExecutorMode = "serial", max_workers: int | None = None):
+        if mode not in self._modes:
+            raise ValueError(
+                f"Invalid executor mode '{mode}'. Must be one of {self._modes}."
+            )
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be a positive integer.")
+        self.mode = mode
+        self.max_workers = max_workers
+        self._pool = None
+
+    def map(self, target: Any, method_name: str, jobs: Sequence[tuple]) -> list:
+        """Call a method of the target object once per job.
+
+        Args:
+            target: The object whose method is called, e.g. an analysis.
+            method_name (str): The name of the method to call.
+            jobs (Sequence[tuple]): The positional arguments of each call.
+
+        Returns:
+            list: The result of each call, in the order of the jobs.
+        """
+        jobs = list(jobs)
+        num_workers = min(self._num_workers(), len(jobs))
+
+        if self.mode == "serial" or num_workers <= 1:
+            method = getattr(target, method_name)
+            return [method(*args) for args in jobs]
+
+        if self.mode == "thread":
+            return self._map_threads(target, method_name, jobs)
+
+        return self._map_processes(target, method_name, jobs, num_workers)
+
+    def close(self):
+        """Shut down the worker threads or processes."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _num_workers(self) -> int:
+        """Return the maximum number of workers."""
+        return self.max_workers or os.cpu_count() or 1
+
+    def _get_pool(self) -> ThreadPoolExecutor | ProcessPoolExecutor:
+        """Return the pool, starting it if required."""
+        if self._pool is None:
+            pool_class = (
+                ThreadPoolExecutor if self.mode == "thread" else ProcessPoolExecutor
+            )
+            self._pool = pool_class(max_workers=self._num_workers())
+        return self._pool
+
+    def _map_threads(self, target, method_name, jobs):
+        """Run jobs on the thread pool, with one target replica per thread."""
+        local = threading.local()
+
+        def run(args):
+            if not hasattr(local, "target"):
+                local.target = copy.deepcopy(target)
+            return getattr(local.target, method_name)(*args)
+
+        return list(self._get_pool().map(run, jobs))
+
+    def _map_processes(self, target, method_name, jobs, num_workers):
+        """Run jobs on the process pool, shipping the target once per chunk."""
+        payload = pickle.dumps(target)
+        key = uuid.uuid4().hex
+        num = len(jobs)
+        return list(
+            self._get_pool().map(
+                _run_worker_job,
+                [key] * num,
+                [_backend_config()] * num,
+                [payload] * num,
+                [method_name] * num,
+                jobs,
+                chunksize=math.ceil(num / num_workers),
+            )
+        )
+
+
+_default_executor = TraceExecutor()
+
+
+def get_executor() -> TraceExecutor:
+    """Return the executor used by analyses to run trace jobs.
+
+    Returns:
+        TraceExecutor: The current default executor.
+    """
+    return _default_executor
+
+
+def set_executor(
+    executor: TraceExecutor | ExecutorMode, max_workers: int | None = None
+):
+    """Set the executor used by analyses to run trace jobs.
+
+    Args:
+        executor (TraceExecutor or str): The executor, or the mode of a new
+            executor ('serial', 'thread' or 'process').
+        max_workers (int, optional): The maximum number of workers if a mode
+            is given. Defaults to None, i.e., the number of CPUs.
+    """
+    global _default_executor
+    if isinstance(executor, str):
+        executor = TraceExecutor(executor, max_workers)
+    _default_executor = executor
@@ -0,0 +1,208 @@
+"""Incremental Trace Module
+
+This module contains the IncrementalTrace class, which re-traces rays through a
+surface group starting from the first surface that was modified since the
+previous trace.
+
+During optimization, most variable changes only affect one or a few surfaces,
+while the rays entering the unchanged leading surfaces are identical between
+evaluations. The incremental trace stores the ray state after each surface.
+When the same rays are traced again, the surfaces before the first modified
+surface are skipped, and the trace resumes from the stored ray state just
+before it. Surfaces, geometries, coordinate systems, materials, interaction
+models and physical apertures track their modifications (see
+`optiland._revision`), so that modified surfaces are detected without comparing
+surface parameters.
+
+Kramer Harrison, 2025
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+import optiland.backend as be
+from optiland.rays import RealRays
+
+if TYPE_CHECKING:
+    from optiland._types import RecordPolicy
+    from optiland.surfaces import SurfaceGroup
+    from optiland.surfaces.standard_surface import Surface
+
+
+def _surface_state(surface: Surface) -> tuple:
+    """Return the objects defining the trace through a surface and their
+    revisions."""
+    return tuple((obj, obj.revision) for obj in surface.tracked_objects())
+
+
+def _same_surface_state(state: tuple, other: tuple) -> bool:
+    """Whether two surface states refer to the same unmodified objects."""
+    return len(state) == len(other) and all(
+        obj is other_obj and revision == other_revision
+        for (obj, revision), (other_obj, other_revision) in zip(
+            state, other, strict=True
+        )
+    )
+
+
+def _snapshot(rays: RealRays) -> dict:
+    """Copy the state of rays."""
+    return {
+        name: be.copy(value) if be.is_array_like(value) else value
+        for name, value in vars(rays).items()
+    }
+
+
+def _nbytes(state: dict) -> int:
+    """Return the number of bytes of the arrays of a ray state."""
+    return sum(
+        value.nbytes for value in state.values() if isinstance(value, np.ndarray)
+    )
+
+
+def _restore(rays: RealRays, snapshot: dict):
+    """Restore the state of rays from a snapshot."""
+    for name, value in snapshot.items():
+        setattr(rays, name, be.copy(value) if be.is_array_like(value) else value)
+
+
+def _same_rays(snapshot: dict, other: dict) -> bool:
+    """Whether two ray snapshots hold identical ray data."""
+    if snapshot.keys() != other.keys():
+        return False
+    for name, value in snapshot.items():
+        other_value = other[name]
+        if be.is_array_like(value) or be.is_array_like(other_value):
+            value = np.asarray(value)
+            equal_nan = np.issubdtype(value.dtype, np.inexact)
+            if not np.array_equal(value, other_value, equal_nan=equal_nan):
+                return False
+        elif value != other_value:
+            return False
+    return True
+
+
+class IncrementalTrace:
+    """Traces rays from the first surface modified since the previous trace.
+
+    The ray state after each surface is stored for rays with at most
+    `max_rays` rays, from the first surface on, until the stored states
+    reach `max_bytes`. The trace resumes from the last stored state if the
+    first modified surface lies beyond it. Only real rays (not polarized or
+    buffered rays) of the numpy backend are supported.
+
+    Args:
+        max_rays (int, optional): The maximum number of rays for which the
+            ray state is stored. Defaults to 100_000.
+        max_bytes (int, optional): The maximum number of bytes of the stored
+            ray states. Defaults to 256 MiB.
+
+    Attributes:
+        last_start_index (int | None): The index of the surface the previous
+            trace started from, or None before the first trace.
+    """
+
+    def __init__(self, max_rays: int = 100_000, max_bytes: int = 256 * 2**20):
+        self.max_rays = max_rays
+        self.max_bytes = max_bytes
+        self.last_start_index = None
+        self._inputs = None
+        self._states = []
+        self._snapshots = []
+
+    @staticmethod
+    def supports_rays(rays) -> bool:
+        """Check whether rays can be traced incrementally.
+
+        Args:
+            rays (BaseRays): The rays to trace.
+
+        Returns:
+            bool: True for real rays of the numpy backend.
+        """
+        return type(rays) is RealRays and be.get_backend() == "numpy"
+
+    def clear(self):
+        """Discard the stored ray states."""
+        self._inputs = None
+        self._states = []
+        self._snapshots = []
+
+    def trace(
+        self,
+        rays: RealRays,
+        surfaces: SurfaceGroup,
+        record: RecordPolicy = "all",
+        fused: bool = False,
+    ) -> RealRays:
+        """Trace rays through a surface group.
+
+        The rays and the ray data recorded on the surfaces are updated as for
+        `SurfaceGroup.trace`.
+
+        Args:
+            rays (RealRays): The rays to trace, before the first surface.
+            surfaces (SurfaceGroup): The surface group.
+            record (str or Sequence[int], optional): The surfaces on which ray
+                data is recorded. See `SurfaceGroup.trace`. Defaults to 'all'.
+            fused (bool, optional): Whether to use the fused conic kernel. See
+                `SurfaceGroup.trace`. Defaults to False.
+
+        Returns:
+            RealRays: The traced rays.
+        """
+        record_indices = surfaces.resolve_record_indices(record)
+        surface_list = surfaces.surfaces
+        states = [_surface_state(surface) for surface in surface_list]
+
+        if rays.x.shape[0] > self.max_rays:
+            self.clear()
+            self.last_start_index = 0
+            return surfaces.trace(rays, record=record, fused=fused)
+
+        inputs = _snapshot(rays)
+        start = 0
+        if self._inputs is not None and _same_rays(inputs, self._inputs):
+            start = min(self._first_modified(states), len(self._snapshots))
+
+        surfaces.reset()
+        if start > 0:
+            # record the stored rays on the skipped surfaces
+            for index in range(start):
+                if record_indices is None or index in record_indices:
+                    _restore(rays, self._snapshots[index])
+                    rays.record_on_surface(surface_list[index])
+            _restore(rays, self._snapshots[start - 1])
+
+        snapshots = self._snapshots[:start]
+        nbytes = sum(_nbytes(snapshot) for snapshot in snapshots)
+        for index in range(start, len(surface_list)):
+            surface_list[index].trace(
+                rays,
+                record=record_indices is None or index in record_indices,
+                fused=fused,
+            )
+            if len(snapshots) == index:
+                size = _nbytes(vars(rays))
+                if nbytes + size <= self.max_bytes:
+                    snapshots.append(_snapshot(rays))
+                    nbytes += size
+
+        self._inputs = inputs
+        self._states = states
+        self._snapshots = snapshots
+        self.last_start_index = start
+        return rays
+
+    def _first_modified(self, states: list[tuple]) -> int:
+        """Return the index of the first surface modified since the stored
+        trace, or the number of surfaces if none was modified."""
+        for index, state in enumerate(states):
+            if index >= len(self._states) or not _same_surface_state(
+                state, self._states[index]
+            ):
+                return index
+        return len(states)
@@ -13,11 +13,16 @@ from typing import TYPE_CHECKING
 
 import optiland.backend as be
 from optiland.distribution import create_distribution
-from optiland.rays import PolarizedRays, RayGenerator
+from optiland.rays import BufferedRealRays, PolarizedRays, RayGenerator
+from optiland.raytrace.incremental_trace import IncrementalTrace
+from optiland.raytrace.trace_plan import TracePlan
 
 if TYPE_CHECKING:
-    from optiland._types import DistributionType
+    from collections.abc import Iterator
+
+    from optiland._types import DistributionType, RecordPolicy
     from optiland.distribution import BaseDistribution
+    from optiland.rays import RealRays
 
 
 class RealRayTracer:
@@ -28,11 +33,39 @@ class RealRayTracer:
 
     Args:
         optic (Optic): The optical system to be traced.
+
+    Attributes:
+        use_ray_buffer (bool): If True, unpolarized rays are traced as
+            `BufferedRealRays`, i.e., backed by a single preallocated buffer and
+            updated with in-place kernels. Only supported for the numpy backend.
+            Defaults to False.
+        use_fused_kernels (bool): If True, real rays are traced through
+            standard conic surfaces with a fused, compiled kernel. Surfaces or
+            rays not supported by the kernel use the generic trace. Defaults
+            to False.
+        use_trace_plan (bool): If True, real rays are traced through
+            rotationally symmetric systems with a compiled `TracePlan`, which
+            is rebuilt automatically when the surfaces change. Systems or rays
+            not supported by the plan use the surface-by-surface trace.
+            Defaults to False.
+        use_incremental_trace (bool): If True, real rays are re-traced from
+            the first surface modified since the previous trace of the same
+            rays, using an `IncrementalTrace`. This takes precedence over
+            `use_trace_plan`. Only supported for the numpy backend. Surface
+            parameters modified in place (e.g., an element of a coefficient
+            array) must be followed by a call to `mark_dirty` of the modified
+            object. Defaults to False.
     """
 
     def __init__(self, optic):
         self.optic = optic
         self.ray_generator = RayGenerator(optic)
+        self.use_ray_buffer = False
+        self.use_fused_kernels = False
+        self.use_trace_plan = False
+        self.use_incremental_trace = False
+        self._trace_plan = None
+        self.incremental_trace = IncrementalTrace()
         self.ray_aiming_config = {
             "mode": "paraxial",
             "max_iter": 10,
@@ -62,6 +95,7 @@ class RealRayTracer:
         wavelength,
         num_rays: int | None = 100,
         distribution: DistributionType | BaseDistribution | None = "hexapolar",
+        record: RecordPolicy = "all",
     ):
         """Trace a distribution of rays through the optical system.
 
@@ -73,15 +107,15 @@ class RealRayTracer:
                 to 100.
             distribution (str or Distribution, optional): The distribution of
                 the rays. Defaults to 'hexapolar'.
+            record (str or Sequence[int], optional): The surfaces on which ray
+                data is recorded. See `SurfaceGroup.trace`. Defaults to 'all'.
 
         Returns:
             RealRays: The RealRays object containing the traced rays."
         """
         self._validate_normalized_coordinates(Hx, Hy, "field")
 
-        if isinstance(distribution, str):
-            distribution = create_distribution(distribution)
-            distribution.generate_points(num_rays)
+        distribution = self._resolve_distribution(distribution, num_rays)
         Px = distribution.x
         Py = distribution.y
 
@@ -100,24 +134,83 @@ class RealRayTracer:
         rays = self.ray_generator.generate_rays(
             Hx_full, Hy_full, Px_full, Py_full, wavelength
         )
-        self.optic.surfaces.trace(rays)
-
-        # Propagate to the image surface
-        if self.optic.image_surface:
-            last_surface = self.optic.surfaces[-1]
-            last_surface.material_post.propagation_model.propagate(
-                rays, last_surface.thickness
-            )
-
-        if isinstance(rays, PolarizedRays):
-            rays.update_intensity(self.optic.polarization_state)
+        rays = self._maybe_buffer(rays)
+        self._trace_to_image(rays, record)
 
         # update ray intensity
-        self.optic.surfaces.intensity[-1, :] = rays.i
+        self._update_image_intensity(rays)
 
         return rays
 
-    def trace_generic(self, Hx, Hy, Px, Py, wavelength):
+    def trace_stream(
+        self,
+        Hx,
+        Hy,
+        wavelength,
+        num_rays: int | None = 100,
+        distribution: DistributionType | BaseDistribution | None = "hexapolar",
+        chunk_size: int = 65536,
+    ) -> Iterator[RealRays]:
+        """Trace a distribution of rays in chunks, yielding image-plane rays.
+
+        The rays of `trace` (each field point at each pupil point) are
+        generated and traced `chunk_size` rays at a time, so peak memory is
+        bounded by the chunk size rather than the total ray count. No ray data
+        is recorded on the surfaces; each yielded `RealRays` object holds the
+        ray data on the image plane. Use the reducers in
+        `optiland.raytrace.reducers` to accumulate results over the stream.
+
+        Args:
+            Hx (float or numpy.ndarray): The normalized x field coordinate.
+            Hy (float or numpy.ndarray): The normalized y field coordinate.
+            wavelength (float): The wavelength of the rays.
+            num_rays (int, optional): The number of rays to be traced. Defaults
+                to 100.
+            distribution (str or Distribution, optional): The distribution of
+                the rays. Defaults to 'hexapolar'.
+            chunk_size (int, optional): The maximum number of rays traced per
+                chunk. Defaults to 65536.
+
+        Yields:
+            RealRays: The traced rays of each chunk.
+
+        Raises:
+            ValueError: If `chunk_size` is not a positive integer.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer.")
+
+        self._validate_normalized_coordinates(Hx, Hy, "field")
+
+        distribution = self._resolve_distribution(distribution, num_rays)
+        Px = distribution.x
+        Py = distribution.y
+
+        Hx = be.atleast_1d(Hx)
+        Hy = be.atleast_1d(Hy)
+
+        # the field/pupil cross product is indexed per chunk, never expanded
+        num_pupil_points = len(Px)
+        total_rays = len(Hx) * num_pupil_points
+
+        for start in range(0, total_rays, chunk_size):
+            stop = min(start + chunk_size, total_rays)
+            ray_index = be.arange_indices(start, stop)
+            field_index = ray_index // num_pupil_points
+            pupil_index = ray_index % num_pupil_points
+
+            rays = self.ray_generator.generate_rays(
+                Hx[field_index],
+                Hy[field_index],
+                Px[pupil_index],
+                Py[pupil_index],
+                wavelength,
+            )
+            rays = self._maybe_buffer(rays)
+            self._trace_to_image(rays, record="none")
+            yield rays
+
+    def trace_generic(self, Hx, Hy, Px, Py, wavelength, record: RecordPolicy = "all"):
         """Trace generic rays through the optical system.
 
         Args:
@@ -126,6 +219,8 @@ class RealRayTracer:
             Px (float or numpy.ndarray): The normalized x pupil coordinate.
             Py (float or numpy.ndarray): The normalized y pupil coordinate
             wavelength (float): The wavelength of the rays.
+            record (str or Sequence[int], optional): The surfaces on which ray
+                data is recorded. See `SurfaceGroup.trace`. Defaults to 'all'.
 
         """
         self._validate_normalized_coordinates(Hx, Hy, "field")
@@ -140,7 +235,8 @@ class RealRayTracer:
         Hx, Hy, Px, Py = self._validate_array_size(Hx, Hy, Px, Py)
 
         rays = self.ray_generator.generate_rays(Hx, Hy, Px, Py, wavelength)
-        self.optic.surfaces.trace(rays)
+        rays = self._maybe_buffer(rays)
+        self._trace_surfaces(rays, record)
 
         # Propagate to the image surface
         last_surface = self.optic.surfaces[-1]
@@ -149,8 +245,108 @@ class RealRayTracer:
         )
 
         # update intensity
-        self.optic.surfaces.intensity[-1, :] = rays.i
+        self._update_image_intensity(rays)
+
+        return rays
+
+    def _resolve_distribution(self, distribution, num_rays):
+        """Create the pupil distribution if given by name.
+
+        Args:
+            distribution (str or Distribution): The distribution of the rays.
+            num_rays (int): The number of rays used to generate the points of a
+                named distribution.
+
+        Returns:
+            BaseDistribution: The distribution with generated points.
+        """
+        if isinstance(distribution, str):
+            distribution = create_distribution(distribution)
+            distribution.generate_points(num_rays)
+        return distribution
+
+    def _trace_to_image(self, rays, record: RecordPolicy):
+        """Trace rays through the surface group and on to the image surface.
+
+        Args:
+            rays (RealRays): The rays to be traced.
+            record (str or Sequence[int]): The surfaces on which ray data is
+                recorded. See `SurfaceGroup.trace`.
+        """
+        self._trace_surfaces(rays, record)
+
+        # Propagate to the image surface
+        if self.optic.image_surface:
+            last_surface = self.optic.surfaces[-1]
+            last_surface.material_post.propagation_model.propagate(
+                rays, last_surface.thickness
+            )
 
+        if isinstance(rays, PolarizedRays):
+            rays.update_intensity(self.optic.polarization_state)
+
+    def _trace_surfaces(self, rays, record: RecordPolicy):
+        """Trace rays through the surface group.
+
+        The incremental trace or the compiled trace plan is used if enabled
+        and supported, otherwise the rays are traced surface by surface.
+
+        Args:
+            rays (RealRays): The rays to be traced.
+            record (str or Sequence[int]): The surfaces on which ray data is
+                recorded. See `SurfaceGroup.trace`.
+        """
+        surfaces = self.optic.surfaces
+        if self.use_incremental_trace and IncrementalTrace.supports_rays(rays):
+            self.incremental_trace.trace(
+                rays, surfaces, record=record, fused=self.use_fused_kernels
+            )
+            return
+        if self.use_trace_plan and TracePlan.supports_rays(rays):
+            plan = self._get_trace_plan()
+            if plan is not None:
+                plan.trace(rays, surfaces, record=record)
+                return
+        surfaces.trace(rays, record=record, fused=self.use_fused_kernels)
+
+    def _get_trace_plan(self):
+        """Return the trace plan for the current surfaces, rebuilt if stale.
+
+        Returns:
+            TracePlan | None: The trace plan, or None if the surfaces are not
+            supported by a trace plan.
+        """
+        surfaces = self.optic.surfaces
+        if self._trace_plan is not None and self._trace_plan.is_valid(surfaces):
+            return self._trace_plan
+        if TracePlan.signature(surfaces) is None:
+            self._trace_plan = None
+        else:
+            self._trace_plan = TracePlan(surfaces)
+        return self._trace_plan
+
+    def _update_image_intensity(self, rays):
+        """Update the intensity recorded on the image surface, if recorded.
+
+        Args:
+            rays (RealRays): The traced rays.
+        """
+        if be.size(self.optic.surfaces[-1].intensity) > 0:
+            self.optic.surfaces.intensity[-1, :] = rays.i
+
+    def _maybe_buffer(self, rays):
+        """Convert rays to buffered rays if the ray buffer is enabled.
+
+        Polarized rays carry additional per-ray state and are never buffered.
+
+        Args:
+            rays (RealRays): The generated rays.
+
+        Returns:
+            RealRays: The rays to be traced.
+        """
+        if self.use_ray_buffer and not isinstance(rays, PolarizedRays):
+            return BufferedRealRays.from_rays(rays)
         return rays
 
     def _validate_normalized_coordinates(self, x, y, coord_type="field"):
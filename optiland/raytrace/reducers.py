@@ -0,0 +1,371 @@
+"""Ray Stream Reducers Module
+
+This module contains reducers that accumulate results over a stream of traced
+ray chunks, e.g. as produced by `RealRayTracer.trace_stream`. Each reducer
+keeps a fixed-size running state, so results for arbitrarily large ray counts
+are computed with memory bounded by the chunk size.
+
+Only rays with non-zero intensity (i.e., rays that are not vignetted) are
+accumulated, consistent with the spot diagram and irradiance analyses.
+
+Kramer Harrison, 2025
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+import numpy as _np
+
+import optiland.backend as be
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from numpy.typing import ArrayLike
+
+    from optiland.distribution import BaseDistribution
+    from optiland.optic import Optic
+    from optiland.rays import RealRays
+    from optiland.surfaces.standard_surface import Surface
+
+
+class _RunningMoments:
+    """Running count, mean, second central moment, minimum and maximum.
+
+    Chunks are merged with the parallel update of Chan et al., which avoids the
+    cancellation error of accumulating raw sums of squares.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = _np.inf
+        self.max = -_np.inf
+
+    def update(self, values):
+        n = values.size
+        if n == 0:
+            return
+        mean = _np.mean(values)
+        m2 = _np.sum((values - mean) ** 2)
+
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta**2 * self.count * n / total
+        self.count = total
+        self.min = min(self.min, _np.min(values))
+        self.max = max(self.max, _np.max(values))
+
+    @property
+    def variance(self):
+        if self.count == 0:
+            return _np.nan
+        return self.m2 / self.count
+
+
+class BaseRayReducer(ABC):
+    """Base class for reducers that accumulate results over ray chunks."""
+
+    @abstractmethod
+    def update(self, rays: RealRays):
+        """Accumulate a chunk of traced rays.
+
+        Args:
+            rays (RealRays): The traced rays of one chunk.
+        """
+
+    @abstractmethod
+    def result(self):
+        """Return the result accumulated so far."""
+
+    def consume(self, stream: Iterable[RealRays]):
+        """Accumulate all chunks of a ray stream.
+
+        Args:
+            stream (Iterable[RealRays]): The stream of traced ray chunks.
+
+        Returns:
+            The accumulated result.
+        """
+        for rays in stream:
+            self.update(rays)
+        return self.result()
+
+    @staticmethod
+    def _valid_rays(rays: RealRays):
+        """Return a mask selecting rays with non-zero intensity."""
+        return be.to_numpy(rays.i) > 0.0
+
+
+class IrradianceReducer(BaseRayReducer):
+    """Accumulates ray power in a 2-D histogram on the image plane.
+
+    Args:
+        x_edges (ArrayLike): The bin edges along x in mm.
+        y_edges (ArrayLike): The bin edges along y in mm.
+        surface (Surface, optional): If given, ray coordinates are transformed
+            into the local coordinate system of this surface before binning.
+            Defaults to None, i.e., global coordinates are binned.
+
+    Attributes:
+        power (numpy.ndarray): The accumulated power per bin, with shape
+            (len(x_edges) - 1, len(y_edges) - 1) and x as the row index.
+        num_rays (int): The number of rays accumulated.
+    """
+
+    def __init__(
+        self,
+        x_edges: ArrayLike,
+        y_edges: ArrayLike,
+        surface: Surface | None = None,
+    ):
+        self.x_edges = _np.asarray(be.to_numpy(x_edges), dtype=float)
+        self.y_edges = _np.asarray(be.to_numpy(y_edges), dtype=float)
+        self.surface = surface
+        self.power = _np.zeros((len(self.x_edges) - 1, len(self.y_edges) - 1))
+        self.num_rays = 0
+
+    def update(self, rays: RealRays):
+        """Bin the power of a chunk of traced rays.
+
+        Args:
+            rays (RealRays): The traced rays of one chunk.
+        """
+        x, y = rays.x, rays.y
+        if self.surface is not None:
+            from optiland.visualization.system.utils import transform
+
+            x, y, _ = transform(rays.x, rays.y, rays.z, self.surface)
+
+        valid = self._valid_rays(rays)
+        x = be.to_numpy(x)[valid]
+        y = be.to_numpy(y)[valid]
+        power = be.to_numpy(rays.i)[valid]
+
+        hist, _, _ = _np.histogram2d(
+            x, y, bins=[self.x_edges, self.y_edges], weights=power
+        )
+        self.power += hist
+        self.num_rays += int(valid.sum())
+
+    def result(self):
+        """Return the irradiance, i.e., the accumulated power per unit area.
+
+        Returns:
+            be.ndarray: The irradiance per bin in W/mm^2.
+        """
+        pixel_area = _np.outer(_np.diff(self.x_edges), _np.diff(self.y_edges))
+        return be.array(self.power / pixel_area)
+
+
+class SpotReducer(BaseRayReducer):
+    """Accumulates the centroid and RMS spot radius on the image plane.
+
+    Attributes:
+        num_rays (int): The number of rays accumulated.
+    """
+
+    def __init__(self):
+        self._x = _RunningMoments()
+        self._y = _RunningMoments()
+
+    @property
+    def num_rays(self):
+        return self._x.count
+
+    def update(self, rays: RealRays):
+        """Accumulate the intersection points of a chunk of traced rays.
+
+        Args:
+            rays (RealRays): The traced rays of one chunk.
+        """
+        valid = self._valid_rays(rays)
+        self._x.update(be.to_numpy(rays.x)[valid])
+        self._y.update(be.to_numpy(rays.y)[valid])
+
+    def centroid(self):
+        """Return the centroid of the accumulated rays.
+
+        Returns:
+            tuple[float, float]: The (x, y) centroid in mm.
+        """
+        return float(self._x.mean), float(self._y.mean)
+
+    def rms_spot_radius(self):
+        """Return the RMS spot radius about the centroid.
+
+        Returns:
+            float: The RMS spot radius in mm.
+        """
+        return float(_np.sqrt(self._x.variance + self._y.variance))
+
+    def result(self):
+        """Return the centroid and RMS spot radius.
+
+        Returns:
+            dict: The 'centroid' (x, y) and 'rms_spot_radius' in mm.
+        """
+        return {
+            "centroid": self.centroid(),
+            "rms_spot_radius": self.rms_spot_radius(),
+        }
+
+
+class OPLReducer(BaseRayReducer):
+    """Accumulates statistics of the optical path length of the rays.
+
+    The optical path length is the accumulated `rays.opd` of the traced rays,
+    i.e., measured up to the surface at which the trace ends, e.g., the flat
+    image plane. It is not referenced to the exit pupil reference sphere nor
+    to the chief ray, so its spread is not the wavefront error of `OPD` or
+    `Wavefront`; use `OPDReducer` for the optical path difference. The spread is
+    taken relative to the mean over all accumulated rays, i.e., piston is
+    removed.
+
+    Args:
+        wavelength (float, optional): If given, results are expressed in waves
+            of this wavelength (in µm). Defaults to None, i.e., results are
+            expressed in mm.
+    """
+
+    def __init__(self, wavelength: float | None = None):
+        self.wavelength = wavelength
+        self._opl = _RunningMoments()
+
+    @property
+    def num_rays(self):
+        return self._opl.count
+
+    def update(self, rays: RealRays):
+        """Accumulate the optical path lengths of a chunk of traced rays.
+
+        Args:
+            rays (RealRays): The traced rays of one chunk.
+        """
+        valid = self._valid_rays(rays)
+        self._opl.update(be.to_numpy(rays.opd)[valid])
+
+    def result(self):
+        """Return the mean, RMS and peak-to-valley optical path length.
+
+        Returns:
+            dict: The 'mean' optical path length, and the 'rms' and
+            'peak_to_valley' deviation of the optical path length from the
+            mean.
+        """
+        scale = 1.0 if self.wavelength is None else 1.0 / (self.wavelength * 1e-3)
+        return {
+            "mean": float(self._opl.mean * scale),
+            "rms": float(_np.sqrt(self._opl.variance) * scale),
+            "peak_to_valley": float((self._opl.max - self._opl.min) * scale),
+        }
+
+
+class OPDReducer(BaseRayReducer):
+    """Accumulates statistics of the optical path difference (OPD) in waves.
+
+    The OPD is computed as in the 'chief_ray' strategy of `Wavefront`: the
+    chief ray is traced once on construction to define the reference sphere
+    (or plane, for afocal systems) and the reference optical path, and the
+    OPD of each streamed ray is taken relative to these. The stream must
+    trace the given field with the given distribution, e.g.,
+    `optic.trace_stream(*field, wavelength, distribution=distribution)`, as
+    the pupil coordinates of the rays are needed to remove the tilt of the
+    launch plane for angular fields.
+
+    Args:
+        optic (Optic): The optical system being traced.
+        field (tuple[float, float]): The normalized field coordinates (Hx, Hy).
+        wavelength (float): The wavelength of the rays in µm.
+        distribution (BaseDistribution): The pupil distribution of the stream.
+        afocal (bool, optional): If True, the OPD is referenced to a plane
+            instead of a sphere. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        optic: Optic,
+        field: tuple[float, float],
+        wavelength: float,
+        distribution: BaseDistribution,
+        afocal: bool = False,
+    ):
+        from optiland.wavefront.strategy import ChiefRayStrategy
+
+        self.field = field
+        self.wavelength = wavelength
+        self._strategy = ChiefRayStrategy(
+            optic,
+            distribution,
+            reference_type="plane" if afocal else "sphere",
+        )
+        self._px = be.array(distribution.x)
+        self._py = be.array(distribution.y)
+        self._num_streamed = 0
+        self._opd = _RunningMoments()
+
+        chief_ray = optic.trace_generic(*field, Px=0.0, Py=0.0, wavelength=wavelength)
+        self._geometry = self._strategy._create_reference_geometry(chief_ray)
+        opd_ref = chief_ray.opd - self._geometry.path_length(
+            chief_ray, self._strategy.n_image
+        )
+        self._opd_ref = self._strategy._correct_tilt(field, opd_ref, x=0, y=0)
+
+    @property
+    def num_rays(self):
+        return self._opd.count
+
+    def update(self, rays: RealRays):
+        """Accumulate the optical path differences of a chunk of traced rays.
+
+        Args:
+            rays (RealRays): The traced rays of one chunk.
+        """
+        num = be.size(rays.x)
+        pupil_index = be.arange_indices(
+            self._num_streamed, self._num_streamed + num
+        ) % be.size(self._px)
+        self._num_streamed += num
+
+        opd = rays.opd - self._geometry.path_length(rays, self._strategy.n_image)
+        opd = self._strategy._correct_tilt(
+            self.field, opd, x=self._px[pupil_index], y=self._py[pupil_index]
+        )
+        opd_wv = (self._opd_ref - opd) / (self.wavelength * 1e-3)
+
+        valid = self._valid_rays(rays)
+        self._opd.update(be.to_numpy(opd_wv)[valid])
+
+    def result(self):
+        """Return the mean, RMS and peak-to-valley optical path difference.
+
+        Returns:
+            dict: The 'mean', 'rms' and 'peak_to_valley' optical path
+            difference in waves. As in `OPD.rms`, the RMS is taken about zero,
+            i.e., piston is not removed.
+        """
+        return {
+            "mean": float(self._opd.mean),
+            "rms": float(_np.sqrt(self._opd.variance + self._opd.mean**2)),
+            "peak_to_valley": float(self._opd.max - self._opd.min),
+        }
+
+
+def reduce_stream(stream: Iterable[RealRays], *reducers: BaseRayReducer) -> list:
+    """Feed each chunk of a ray stream to several reducers in a single pass.
+
+    Args:
+        stream (Iterable[RealRays]): The stream of traced ray chunks.
+        *reducers (BaseRayReducer): The reducers to accumulate.
+
+    Returns:
+        list: The result of each reducer, in order.
+    """
+    for rays in stream:
+        for reducer in reducers:
+            reducer.update(rays)
+    return [reducer.result() for reducer in reducers]
@@ -0,0 +1,538 @@
+"""Trace Plan Module
+
+This module contains the TracePlan class, a compiled trace plan for
+sequential, rotationally symmetric systems of planes, spheres, conics and
+even aspheres in homogeneous media.
+
+The plan walks the surface group once and flattens it into packed arrays
+(surface kind, radii, conic constants, aspheric coefficients, vertex
+positions, apertures and reflection flags). A single compiled kernel then
+traces every ray through all surfaces in one pass, so there is no Python-level
+dispatch per surface. Refractive indices and absorption are evaluated per
+trace, for the wavelengths of the rays, from the materials of the optic.
+
+The plan stores a signature of the surface parameters it was built from and
+is rebuilt automatically by `RealRayTracer` whenever the signature changes.
+
+Kramer Harrison, 2025
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numba import njit, prange
+
+import optiland.backend as be
+from optiland.geometries.even_asphere import EvenAsphere
+from optiland.geometries.plane import Plane
+from optiland.geometries.standard import StandardGeometry
+from optiland.interactions.refractive_reflective_model import RefractiveReflectiveModel
+from optiland.physical_apertures.radial import RadialAperture
+from optiland.propagation.homogeneous import HomogeneousPropagation
+from optiland.surfaces.image_surface import ImageSurface
+from optiland.surfaces.standard_surface import Surface
+
+if TYPE_CHECKING:
+    from optiland._types import RecordPolicy
+    from optiland.rays import RealRays
+    from optiland.surfaces import SurfaceGroup
+
+# surface kinds of the packed plan
+_PLANE = 0
+_CONIC = 1
+_EVEN_ASPHERE = 2
+
+_GEOMETRY_KINDS = {Plane: _PLANE, StandardGeometry: _CONIC, EvenAsphere: _EVEN_ASPHERE}
+
+
+@njit(cache=True, error_model="numpy")
+def _sag_gradient(x, y, kind, radius, k, coefficients, num_coefficients):
+    """Return the sag and its x and y derivatives of a conic or asphere."""
+    r2 = x**2 + y**2
+    sag = 0.0
+    dfdx = 0.0
+    dfdy = 0.0
+    if not np.isinf(radius):
+        root = np.sqrt(1 - (1 + k) * r2 / radius**2)
+        sag = r2 / (radius * (1 + root))
+        dfdx = x / (radius * root)
+        dfdy = y / (radius * root)
+    if kind == _EVEN_ASPHERE:
+        r2_power = 1.0
+        for i in range(num_coefficients):
+            ci = coefficients[i]
+            dfdx += 2 * (i + 1) * x * ci * r2_power
+            dfdy += 2 * (i + 1) * y * ci * r2_power
+            r2_power *= r2
+            sag += ci * r2_power
+    return sag, dfdx, dfdy
+
+
+@njit(cache=True, error_model="numpy")
+def _plane_distance(z, N):
+    """Return the propagation distance to the plane z = 0."""
+    N_safe = N if abs(N) > 1e-14 else 1e-14
+    return -z / N_safe
+
+
+@njit(cache=True, error_model="numpy")
+def _conic_distance(x, y, z, L, M, N, radius, k):
+    """Return the propagation distance to a conic surface at the origin."""
+    if np.isinf(radius):
+        return _plane_distance(z, N)
+    a = k * N**2 + L**2 + M**2 + N**2
+    b = 2 * k * N * z + 2 * L * x + 2 * M * y - 2 * N * radius + 2 * N * z
+    c = k * z**2 - 2 * radius * z + x**2 + y**2 + z**2
+    if a == 0:
+        return -c / b
+    sqrt_d = np.sqrt(b**2 - 4 * a * c)
+    t1 = (-b + sqrt_d) / (2 * a)
+    t2 = (-b - sqrt_d) / (2 * a)
+    if abs(z + t1 * N) <= abs(z + t2 * N):
+        return t1
+    return t2
+
+
+@njit(parallel=True, cache=True, error_model="numpy")
+def _trace_plan_kernel(
+    x,
+    y,
+    z,
+    L,
+    M,
+    N,
+    i,
+    opd,
+    L0,
+    M0,
+    N0,
+    kinds,
+    vertex_z,
+    radii,
+    conics,
+    coefficients,
+    num_coefficients,
+    tolerances,
+    max_iters,
+    is_reflective,
+    has_aperture,
+    r_min2,
+    r_max2,
+    n_pre,
+    n_post,
+    alpha,
+    record_rows,
+    rec_x,
+    rec_y,
+    rec_z,
+    rec_L,
+    rec_M,
+    rec_N,
+    rec_i,
+    rec_opd,
+):  # pragma: no cover
+    """Trace each ray through all surfaces of the plan, in-place."""
+    num_surfaces = kinds.shape[0]
+    num_n = n_pre.shape[1]
+    for j in prange(x.shape[0]):
+        xj = x[j]
+        yj = y[j]
+        zj = z[j]
+        Lj = L[j]
+        Mj = M[j]
+        Nj = N[j]
+        ij = i[j]
+        opd_j = opd[j]
+        L0j = L0[j]
+        M0j = M0[j]
+        N0j = N0[j]
+        jn = j % num_n
+
+        for s in range(num_surfaces):
+            kind = kinds[s]
+            radius = radii[s]
+            k = conics[s]
+            coeffs = coefficients[s]
+            num_coeffs = num_coefficients[s]
+
+            # localize
+            zj -= vertex_z[s]
+
+            # distance to the surface
+            if kind == _PLANE:
+                t = _plane_distance(zj, Nj)
+            else:
+                t = _conic_distance(xj, yj, zj, Lj, Mj, Nj, radius, k)
+                if kind == _EVEN_ASPHERE:
+                    for _ in range(max_iters[s]):
+                        x_int = xj + t * Lj
+                        y_int = yj + t * Mj
+                        sag, fx, fy = _sag_gradient(
+                            x_int, y_int, kind, radius, k, coeffs, num_coeffs
+                        )
+                        f_t = sag - (zj + t * Nj)
+                        if abs(f_t) < tolerances[s]:
+                            break
+                        df_dt = fx * Lj + fy * Mj - Nj
+                        if abs(df_dt) <= 1e-14:
+                            df_dt = 1e-14
+                        t -= f_t / df_dt
+
+            # propagate, with absorption and optical path
+            xj += t * Lj
+            yj += t * Mj
+            zj += t * Nj
+            alpha_j = alpha[s, jn]
+            if alpha_j > 0:
+                ij *= np.exp(-alpha_j * t * 1e3)
+            n1 = n_pre[s, jn]
+            opd_j += abs(t * n1)
+
+            # clip with the physical aperture
+            if has_aperture[s]:
+                r2 = xj**2 + yj**2
+                if not (r2 <= r_max2[s] and r2 >= r_min2[s]):
+                    ij = 0.0
+
+            # surface normal
+            if kind == _PLANE:
+                nx = 0.0
+                ny = 0.0
+                nz = 1.0
+            else:
+                _, dfdx, dfdy = _sag_gradient(
+                    xj, yj, kind, radius, k, coeffs, num_coeffs
+                )
+                mag = np.sqrt(dfdx**2 + dfdy**2 + 1.0)
+                nx = dfdx / mag
+                ny = dfdy / mag
+                nz = -1.0 / mag
+
+            # align the normal with the incident rays
+            L0j = Lj
+            M0j = Mj
+            N0j = Nj
+            dot = Lj * nx + Mj * ny + Nj * nz
+            sgn = np.sign(dot)
+            nx *= sgn
+            ny *= sgn
+            nz *= sgn
+            dot = abs(dot)
+
+            # reflect or refract
+            if is_reflective[s]:
+                Lj = Lj - 2 * dot * nx
+                Mj = Mj - 2 * dot * ny
+                Nj = Nj - 2 * dot * nz
+            else:
+                u = n1 / n_post[s, jn]
+                root = np.sqrt(1 - u**2 * (1 - dot**2))
+                Lj = u * Lj + nx * root - u * nx * dot
+                Mj = u * Mj + ny * root - u * ny * dot
+                Nj = u * Nj + nz * root - u * nz * dot
+
+            # globalize
+            zj += vertex_z[s]
+
+            row = record_rows[s]
+            if row >= 0:
+                rec_x[row, j] = xj
+                rec_y[row, j] = yj
+                rec_z[row, j] = zj
+                rec_L[row, j] = Lj
+                rec_M[row, j] = Mj
+                rec_N[row, j] = Nj
+                rec_i[row, j] = ij
+                rec_opd[row, j] = opd_j
+
+        x[j] = xj
+        y[j] = yj
+        z[j] = zj
+        L[j] = Lj
+        M[j] = Mj
+        N[j] = Nj
+        i[j] = ij
+        opd[j] = opd_j
+        L0[j] = L0j
+        M0[j] = M0j
+        N0[j] = N0j
+
+
+def _to_float(value):
+    """Convert a backend scalar to a Python float."""
+    return float(be.to_numpy(value))
+
+
+def _surface_signature(surface):
+    """Return the parameters of a surface that define the packed plan.
+
+    Returns:
+        tuple | None: The signature, or None if the plan does not support the
+        surface.
+    """
+    geometry = surface.geometry
+    kind = _GEOMETRY_KINDS.get(type(geometry))
+    if type(surface) not in (Surface, ImageSurface) or kind is None:
+        return None
+
+    cs = geometry.cs
+    if cs.reference_cs is not None:
+        return None
+    if any(_to_float(v) != 0 for v in (cs.x, cs.y, cs.rx, cs.ry, cs.rz)):
+        return None
+
+    model = surface.interaction_model
+    if type(model) is not RefractiveReflectiveModel or model.coating or model.bsdf:
+        return None
+
+    aperture = surface.aperture
+    if aperture is not None and type(aperture) is not RadialAperture:
+        return None
+
+    propagation = surface.material_pre.propagation_model
+    if not isinstance(propagation, HomogeneousPropagation):
+        return None
+
+    signature = (kind, _to_float(cs.z), bool(model.is_reflective))
+    if kind != _PLANE:
+        signature += (_to_float(geometry.radius), _to_float(geometry.k))
+    if kind == _EVEN_ASPHERE:
+        signature += (
+            geometry.tol,
+            geometry.max_iter,
+            tuple(_to_float(c) for c in geometry.coefficients),
+        )
+    if aperture is not None:
+        signature += (_to_float(aperture.r_min), _to_float(aperture.r_max))
+    return signature
+
+
+class TracePlan:
+    """Compiled trace plan for rotationally symmetric sequential systems.
+
+    Args:
+        surfaces (SurfaceGroup): The surface group to flatten. Surfaces after
+            the object surface must be supported, see `signature`.
+
+    Raises:
+        ValueError: If the surface group is not supported by a trace plan.
+    """
+
+    def __init__(self, surfaces: SurfaceGroup):
+        signature = self.signature(surfaces)
+        if signature is None:
+            raise ValueError("Surface group is not supported by a trace plan.")
+        self._signature = signature
+        self._pack(surfaces)
+
+    @staticmethod
+    def signature(surfaces: SurfaceGroup) -> tuple | None:
+        """Return the signature of the surface parameters of a surface group.
+
+        Supported are surfaces whose geometry is a `Plane`, `StandardGeometry`
+        or `EvenAsphere` positioned on the optical axis without rotation, with
+        the `RefractiveReflectiveModel` without coating or BSDF, no physical
+        aperture or a `RadialAperture`, and homogeneous propagation.
+
+        Args:
+            surfaces (SurfaceGroup): The surface group.
+
+        Returns:
+            tuple | None: The signature, or None if any surface after the
+            object surface is not supported.
+        """
+        signatures = tuple(
+            _surface_signature(surface) for surface in surfaces.surfaces[1:]
+        )
+        if not signatures or any(sig is None for sig in signatures):
+            return None
+        return signatures
+
+    def is_valid(self, surfaces: SurfaceGroup) -> bool:
+        """Check whether the plan still matches a surface group.
+
+        Args:
+            surfaces (SurfaceGroup): The surface group.
+
+        Returns:
+            bool: True if the surface parameters are unchanged.
+        """
+        return self.signature(surfaces) == self._signature
+
+    @staticmethod
+    def supports_rays(rays: RealRays) -> bool:
+        """Check whether rays can be traced with a trace plan.
+
+        Args:
+            rays (RealRays): The rays to trace.
+
+        Returns:
+            bool: True for unpolarized, normalized rays on the numpy backend.
+        """
+        from optiland.rays import BufferedRealRays, RealRays
+
+        if be.get_backend() != "numpy":
+            return False
+        if type(rays) not in (RealRays, BufferedRealRays) or not rays.is_normalized:
+            return False
+        num_rays = rays.x.shape[0]
+        return all(
+            np.shape(getattr(rays, name)) == (num_rays,)
+            for name in ("y", "z", "L", "M", "N", "i", "w", "opd")
+        )
+
+    def _pack(self, surfaces):
+        """Flatten the surface parameters into packed arrays."""
+        plan_surfaces = surfaces.surfaces[1:]
+        num_surfaces = len(plan_surfaces)
+        max_coefficients = max(
+            [len(s.geometry.coefficients) for s in plan_surfaces if _is_asphere(s)]
+            + [1]
+        )
+
+        self.kinds = np.zeros(num_surfaces, dtype=np.int64)
+        self.vertex_z = np.zeros(num_surfaces)
+        self.radii = np.full(num_surfaces, np.inf)
+        self.conics = np.zeros(num_surfaces)
+        self.coefficients = np.zeros((num_surfaces, max_coefficients))
+        self.num_coefficients = np.zeros(num_surfaces, dtype=np.int64)
+        self.tolerances = np.zeros(num_surfaces)
+        self.max_iters = np.zeros(num_surfaces, dtype=np.int64)
+        self.is_reflective = np.zeros(num_surfaces, dtype=np.bool_)
+        self.has_aperture = np.zeros(num_surfaces, dtype=np.bool_)
+        self.r_min2 = np.zeros(num_surfaces)
+        self.r_max2 = np.zeros(num_surfaces)
+
+        for s, surface in enumerate(plan_surfaces):
+            geometry = surface.geometry
+            self.kinds[s] = _GEOMETRY_KINDS[type(geometry)]
+            self.vertex_z[s] = _to_float(geometry.cs.z)
+            self.is_reflective[s] = surface.interaction_model.is_reflective
+            if self.kinds[s] != _PLANE:
+                self.radii[s] = _to_float(geometry.radius)
+                self.conics[s] = _to_float(geometry.k)
+            if self.kinds[s] == _EVEN_ASPHERE:
+                coefficients = [_to_float(c) for c in geometry.coefficients]
+                self.coefficients[s, : len(coefficients)] = coefficients
+                self.num_coefficients[s] = len(coefficients)
+                self.tolerances[s] = geometry.tol
+                self.max_iters[s] = geometry.max_iter
+            if surface.aperture is not None:
+                self.has_aperture[s] = True
+                self.r_min2[s] = _to_float(surface.aperture.r_min) ** 2
+                self.r_max2[s] = _to_float(surface.aperture.r_max) ** 2
+
+    def _material_arrays(self, surfaces, wavelength):
+        """Evaluate the refractive indices and absorption for the rays.
+
+        Returns:
+            tuple: The (num_surfaces, num_w) arrays of the index before and
+            after each surface and of the absorption coefficient before each
+            surface, where num_w is 1 if all rays share one wavelength.
+        """
+        w = be.to_numpy(wavelength)
+        if w.size and np.all(w == w[0]):
+            w = w[:1]
+
+        def evaluate(func):
+            return np.broadcast_to(
+                np.asarray(be.to_numpy(func(be.array(w))), dtype=float), w.shape
+            )
+
+        plan_surfaces = surfaces.surfaces[1:]
+        n_pre = np.stack([evaluate(s.material_pre.n) for s in plan_surfaces])
+        n_post = np.stack([evaluate(s.material_post.n) for s in plan_surfaces])
+        k_pre = np.stack([evaluate(s.material_pre.k) for s in plan_surfaces])
+        alpha = 4 * np.pi * k_pre / w
+        return n_pre, n_post, alpha
+
+    def trace(
+        self, rays: RealRays, surfaces: SurfaceGroup, record: RecordPolicy = "all"
+    ) -> RealRays:
+        """Trace rays through all surfaces of the plan.
+
+        The rays and the ray data recorded on the surfaces are updated as for
+        `SurfaceGroup.trace`.
+
+        Args:
+            rays (RealRays): The rays to trace, before the first surface.
+            surfaces (SurfaceGroup): The surface group the plan was built from.
+            record (str or Sequence[int], optional): The surfaces on which ray
+                data is recorded. See `SurfaceGroup.trace`. Defaults to 'all'.
+
+        Returns:
+            RealRays: The traced rays.
+        """
+        from optiland.rays import BufferedRealRays
+
+        surfaces.reset()
+        record_indices = surfaces.resolve_record_indices(record)
+        num_rays = rays.x.shape[0]
+        num_surfaces = surfaces.num_surfaces
+        if record_indices is None:
+            record_indices = set(range(num_surfaces))
+
+        # the object surface does not interact with the rays
+        if 0 in record_indices:
+            rays.record_on_surface(surfaces.surfaces[0])
+
+        recorded = sorted(index for index in record_indices if index > 0)
+        record_rows = np.full(num_surfaces - 1, -1, dtype=np.int64)
+        for row, index in enumerate(recorded):
+            record_rows[index - 1] = row
+        records = [np.empty((len(recorded), num_rays)) for _ in range(8)]
+
+        names = ["x", "y", "z", "L", "M", "N", "i", "opd"]
+        if isinstance(rays, BufferedRealRays):
+            rays.L0, rays.M0, rays.N0 = rays.L, rays.M, rays.N
+            arrays = [getattr(rays, name) for name in names]
+            arrays += [rays.L0, rays.M0, rays.N0]
+        else:
+            arrays = [
+                np.array(be.to_numpy(getattr(rays, name)), dtype=float)
+                for name in names
+            ]
+            arrays += [np.copy(arrays[3]), np.copy(arrays[4]), np.copy(arrays[5])]
+
+        n_pre, n_post, alpha = self._material_arrays(surfaces, rays.w)
+        _trace_plan_kernel(
+            *arrays,
+            self.kinds,
+            self.vertex_z,
+            self.radii,
+            self.conics,
+            self.coefficients,
+            self.num_coefficients,
+            self.tolerances,
+            self.max_iters,
+            self.is_reflective,
+            self.has_aperture,
+            self.r_min2,
+            self.r_max2,
+            n_pre,
+            n_post,
+            alpha,
+            record_rows,
+            *records,
+        )
+
+        if not isinstance(rays, BufferedRealRays):
+            for name, array in zip(names, arrays[:8], strict=True):
+                setattr(rays, name, array)
+            rays.L0, rays.M0, rays.N0 = arrays[8:]
+        rays.update()
+
+        for row, index in enumerate(recorded):
+            surface = surfaces.surfaces[index]
+            surface.x, surface.y, surface.z = (r[row] for r in records[:3])
+            surface.L, surface.M, surface.N = (r[row] for r in records[3:6])
+            surface.intensity = records[6][row]
+            surface.opd = records[7][row]
+        return rays
+
+
+def _is_asphere(surface):
+    """Check whether a surface has an even asphere geometry."""
+    return type(surface.geometry) is EvenAsphere
@@ -0,0 +1,137 @@
+"""State Cache Module
+
+This module contains the StateCache class, which memoizes results computed
+from the state of an optical system, such as paraxial properties and
+aberrations, and the `state_cached` decorator used to memoize methods of the
+analysis helpers of an optic (`Optic.paraxial`, `Optic.aberrations`).
+
+Memoized results are keyed on the state version of the optic
+(`Optic.state_version`), which is derived from the revisions of its surfaces
+(see `optiland._revision`) and increases whenever a surface is modified or
+the optic is modified through its updater. As other state can also be
+modified directly (e.g., by adding a field), which does not change the
+version, results are only memoized while the cache is active, i.e., within
+`Optic.state_cache.activate()`. The optimization problem
+activates the cache of its optics for each merit function evaluation, during
+which the optics are only read, so that each state of an optic costs a single
+paraxial and aberration analysis, regardless of the number of operands.
+
+Kramer Harrison, 2025
+"""
+
+from __future__ import annotations
+
+import functools
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from optiland.optic import Optic
+
+
+def _copy_result(value: Any) -> Any:
+    """Copy the arrays of a memoized result, so that callers cannot modify it.
+
+    Arrays nested in tuples, lists and dicts are copied as well. Tensors are
+    cloned, which keeps them in the autograd graph.
+    """
+    if type(value) in (tuple, list):
+        return type(value)(_copy_result(item) for item in value)
+    if type(value) is dict:
+        return {name: _copy_result(item) for name, item in value.items()}
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    if hasattr(value, "clone"):
+        return value.clone()
+    return value
+
+
+class StateCache:
+    """Memoizes results computed from the current state of an optic.
+
+    Args:
+        optic (Optic): The optical system whose state the results depend on.
+    """
+
+    def __init__(self, optic: Optic):
+        self.optic = optic
+        self._depth = 0
+        self._version = None
+        self._values = {}
+
+    @property
+    def active(self) -> bool:
+        """bool: Whether results are currently memoized."""
+        return self._depth > 0
+
+    @contextmanager
+    def activate(self) -> Iterator[StateCache]:
+        """Memoize results within the context.
+
+        Contexts can be nested. The memoized results are discarded when the
+        outermost context exits.
+
+        Yields:
+            StateCache: This cache.
+        """
+        self._depth += 1
+        try:
+            yield self
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self.clear()
+
+    def get(self, key: Any, compute: Callable[[], Any]) -> Any:
+        """Return the memoized result for a key, computing it if required.
+
+        Args:
+            key: The key of the result.
+            compute (Callable): Computes the result.
+
+        Returns:
+            The result. If the cache is not active, the result is always
+            computed and not memoized. Otherwise, arrays in the result are
+            copies of the memoized arrays, so that modifying them in place
+            does not affect later calls.
+        """
+        if not self.active:
+            return compute()
+
+        version = self.optic.state_version
+        if version != self._version:
+            self._values.clear()
+            self._version = version
+
+        if key not in self._values:
+            self._values[key] = compute()
+        return _copy_result(self._values[key])
+
+    def clear(self):
+        """Discard all memoized results."""
+        self._values.clear()
+        self._version = None
+
+
+def state_cached(method: Callable) -> Callable:
+    """Memoize a method without arguments in the state cache of the optic.
+
+    The decorated method must belong to a class with an `optic` attribute.
+
+    Args:
+        method (Callable): The method to memoize.
+
+    Returns:
+        Callable: The memoized method.
+    """
+    key = method.__qualname__
+
+    @functools.wraps(method)
+    def wrapper(self):
+        return self.optic.state_cache.get(key, lambda: method(self))
+
+    return wrapper
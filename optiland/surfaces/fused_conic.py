@@ -0,0 +1,283 @@
+"""Fused Conic Surface Kernel
+
+This module contains a compiled kernel that traces real rays through a
+standard (spherical or conic) surface in a single pass over the rays. The
+kernel fuses the steps of the generic surface trace, i.e., transformation to
+the local coordinate system, intersection, propagation with absorption, the
+optical path update, aperture clipping, surface normal, refraction or
+reflection and the transformation back to the global coordinate system, so
+that no full-length temporary arrays are created.
+
+The fused path only applies to the combinations it supports and returns False
+otherwise, in which case the caller falls back to the generic trace. It
+requires the NumPy backend, unpolarized rays, a `StandardGeometry` whose
+coordinate system is at most decentered (no rotation or reference coordinate
+system), the `RefractiveReflectiveModel` without coating or BSDF,
+homogeneous propagation in the incident medium and either no physical
+aperture or a `RadialAperture`.
+
+Kramer Harrison, 2025
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numba import njit
+
+import optiland.backend as be
+from optiland.geometries.standard import StandardGeometry
+from optiland.interactions.refractive_reflective_model import RefractiveReflectiveModel
+from optiland.physical_apertures.radial import RadialAperture
+from optiland.propagation.homogeneous import HomogeneousPropagation
+
+if TYPE_CHECKING:
+    from optiland.rays import RealRays
+    from optiland.surfaces.standard_surface import Surface
+
+
+@njit(cache=True, error_model="numpy")
+def _trace_conic_kernel(
+    x,
+    y,
+    z,
+    L,
+    M,
+    N,
+    i,
+    opd,
+    out_x,
+    out_y,
+    out_z,
+    out_L,
+    out_M,
+    out_N,
+    out_i,
+    out_opd,
+    dx,
+    dy,
+    dz,
+    radius,
+    k,
+    n1,
+    n2,
+    alpha,
+    is_plane,
+    is_reflective,
+    has_aperture,
+    r_min2,
+    r_max2,
+):  # pragma: no cover
+    """Trace rays through a decentered conic surface.
+
+    The output arrays may be the input arrays, i.e., the trace may be done
+    in-place, as each ray is read completely before it is written.
+    """
+    num_n1 = n1.shape[0]
+    num_n2 = n2.shape[0]
+    num_alpha = alpha.shape[0]
+    for j in range(x.shape[0]):
+        # localize
+        xj = x[j] - dx
+        yj = y[j] - dy
+        zj = z[j] - dz
+        Lj = L[j]
+        Mj = M[j]
+        Nj = N[j]
+        ij = i[j]
+        n1j = n1[j % num_n1]
+        n2j = n2[j % num_n2]
+
+        # distance to the surface
+        if is_plane:
+            N_safe = Nj if abs(Nj) > 1e-14 else 1e-14
+            t = -zj / N_safe
+        else:
+            a = k * Nj**2 + Lj**2 + Mj**2 + Nj**2
+            b = (
+                2 * k * Nj * zj
+                + 2 * Lj * xj
+                + 2 * Mj * yj
+                - 2 * Nj * radius
+                + 2 * Nj * zj
+            )
+            c = k * zj**2 - 2 * radius * zj + xj**2 + yj**2 + zj**2
+            if a == 0:
+                t = -c / b
+            else:
+                sqrt_d = np.sqrt(b**2 - 4 * a * c)
+                t1 = (-b + sqrt_d) / (2 * a)
+                t2 = (-b - sqrt_d) / (2 * a)
+                z1 = zj + t1 * Nj
+                z2 = zj + t2 * Nj
+                t = t1 if abs(z1) <= abs(z2) else t2
+
+        # propagate, with absorption and optical path
+        xj += t * Lj
+        yj += t * Mj
+        zj += t * Nj
+        alpha_j = alpha[j % num_alpha]
+        if alpha_j > 0:
+            ij *= np.exp(-alpha_j * t * 1e3)
+        opd_j = opd[j] + abs(t * n1j)
+
+        # clip with the physical aperture
+        if has_aperture:
+            r2 = xj**2 + yj**2
+            if not (r2 <= r_max2 and r2 >= r_min2):
+                ij = 0.0
+
+        # surface normal
+        if is_plane:
+            nx = 0.0
+            ny = 0.0
+            nz = -1.0
+        else:
+            denom = radius * np.sqrt(1 - (1 + k) * (xj**2 + yj**2) / radius**2)
+            dfdx = xj / denom
+            dfdy = yj / denom
+            mag = np.sqrt(dfdx**2 + dfdy**2 + 1.0)
+            nx = dfdx / mag
+            ny = dfdy / mag
+            nz = -1.0 / mag
+
+        # align the normal with the incident rays
+        dot = Lj * nx + Mj * ny + Nj * nz
+        sgn = np.sign(dot)
+        nx *= sgn
+        ny *= sgn
+        nz *= sgn
+        dot = abs(dot)
+
+        # reflect or refract
+        if is_reflective:
+            Lj = Lj - 2 * dot * nx
+            Mj = Mj - 2 * dot * ny
+            Nj = Nj - 2 * dot * nz
+        else:
+            u = n1j / n2j
+            root = np.sqrt(1 - u**2 * (1 - dot**2))
+            Lj = u * Lj + nx * root - u * nx * dot
+            Mj = u * Mj + ny * root - u * ny * dot
+            Nj = u * Nj + nz * root - u * nz * dot
+
+        # globalize
+        out_x[j] = xj + dx
+        out_y[j] = yj + dy
+        out_z[j] = zj + dz
+        out_L[j] = Lj
+        out_M[j] = Mj
+        out_N[j] = Nj
+        out_i[j] = ij
+        out_opd[j] = opd_j
+
+
+def _as_float_array(value):
+    """Return a value as a 1D float array."""
+    return np.atleast_1d(np.asarray(be.to_numpy(value), dtype=float))
+
+
+def supports_fused_trace(surface: Surface, rays: RealRays) -> bool:
+    """Check whether the fused conic kernel supports a surface and rays.
+
+    Args:
+        surface (Surface): The surface to trace through.
+        rays (RealRays): The rays to trace.
+
+    Returns:
+        bool: True if the fused kernel can trace the rays through the surface.
+    """
+    from optiland.rays import BufferedRealRays, RealRays
+
+    if be.get_backend() != "numpy":
+        return False
+    if type(rays) not in (RealRays, BufferedRealRays) or not rays.is_normalized:
+        return False
+
+    num_rays = rays.x.shape[0]
+    if any(
+        np.shape(getattr(rays, name)) != (num_rays,)
+        for name in ("y", "z", "L", "M", "N", "i", "w", "opd")
+    ):
+        return False
+
+    geometry = surface.geometry
+    cs = geometry.cs
+    if type(geometry) is not StandardGeometry or cs.reference_cs is not None:
+        return False
+    if cs.rx != 0 or cs.ry != 0 or cs.rz != 0:
+        return False
+
+    model = surface.interaction_model
+    if type(model) is not RefractiveReflectiveModel or model.coating or model.bsdf:
+        return False
+
+    if surface.aperture is not None and type(surface.aperture) is not RadialAperture:
+        return False
+
+    return isinstance(surface.material_pre.propagation_model, HomogeneousPropagation)
+
+
+def trace_fused(surface: Surface, rays: RealRays) -> bool:
+    """Trace rays through a standard surface with the fused conic kernel.
+
+    The rays are updated to their state after the surface, in the global
+    coordinate system, exactly as for the generic trace. Buffered rays are
+    updated in-place.
+
+    Args:
+        surface (Surface): The surface to trace through.
+        rays (RealRays): The rays to trace.
+
+    Returns:
+        bool: True if the rays were traced, False if the fused kernel does not
+        support the surface or rays and the generic trace must be used.
+    """
+    from optiland.rays import BufferedRealRays
+
+    if not supports_fused_trace(surface, rays):
+        return False
+
+    geometry = surface.geometry
+    cs = geometry.cs
+    radius = float(be.to_numpy(geometry.radius))
+    aperture = surface.aperture
+    material_pre = surface.material_pre
+
+    n1 = _as_float_array(material_pre.n(rays.w))
+    n2 = _as_float_array(surface.material_post.n(rays.w))
+    k_pre = _as_float_array(material_pre.k(rays.w))
+    alpha = 4 * np.pi * k_pre / _as_float_array(rays.w)
+
+    inputs = [rays.x, rays.y, rays.z, rays.L, rays.M, rays.N, rays.i, rays.opd]
+    if isinstance(rays, BufferedRealRays):
+        rays.L0, rays.M0, rays.N0 = rays.L, rays.M, rays.N
+        outputs = inputs
+    else:
+        inputs = [_as_float_array(arr) for arr in inputs]
+        outputs = [np.empty_like(arr) for arr in inputs]
+        rays.L0, rays.M0, rays.N0 = inputs[3], inputs[4], inputs[5]
+
+    _trace_conic_kernel(
+        *inputs,
+        *outputs,
+        float(be.to_numpy(cs.x)),
+        float(be.to_numpy(cs.y)),
+        float(be.to_numpy(cs.z)),
+        radius,
+        float(be.to_numpy(geometry.k)),
+        n1,
+        n2,
+        alpha,
+        np.isinf(radius),
+        bool(surface.interaction_model.is_reflective),
+        aperture is not None,
+        float(aperture.r_min) ** 2 if aperture is not None else 0.0,
+        float(aperture.r_max) ** 2 if aperture is not None else 0.0,
+    )
+
+    if not isinstance(rays, BufferedRealRays):
+        rays.x, rays.y, rays.z, rays.L, rays.M, rays.N, rays.i, rays.opd = outputs
+    rays.update()
+    return True
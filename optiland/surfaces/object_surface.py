@@ -53,11 +53,17 @@ class ObjectSurface(Surface):
     def set_aperture(self):
         """Sets the aperture of the surface."""
 
-    def trace(self, rays: BaseRays) -> BaseRays:
+    def trace(
+        self, rays: BaseRays, record: bool = True, fused: bool = False
+    ) -> BaseRays:
         """Traces the given rays through the surface.
 
         Args:
             rays (BaseRays): The rays to be traced.
+            record (bool, optional): Whether to record the ray data on the
+                surface after tracing. Defaults to True.
+            fused (bool, optional): Unused, as the object surface does not
+                interact with the rays. Defaults to False.
 
         Returns:
             BaseRays: The traced rays.
@@ -65,7 +71,8 @@ class ObjectSurface(Surface):
         """
         self.reset()
         rays.trace_on_surface(self)
-        rays.record_on_surface(self)
+        if record:
+            rays.record_on_surface(self)
         return rays
 
     def _trace_paraxial(self, rays: ParaxialRays) -> ParaxialRays:
@@ -16,6 +16,7 @@ from typing import TYPE_CHECKING
 from weakref import WeakMethod
 
 import optiland.backend as be
+from optiland._revision import RevisionTracked
 from optiland.coatings import BaseCoating, FresnelCoating, ThinFilmCoating
 from optiland.geometries import BaseGeometry
 from optiland.interactions.base import BaseInteractionModel
@@ -24,6 +25,7 @@ from optiland.materials import BaseMaterial
 from optiland.physical_apertures import BaseAperture
 from optiland.physical_apertures.radial import configure_aperture
 from optiland.scatter import BaseBSDF
+from optiland.surfaces.fused_conic import trace_fused
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -31,7 +33,7 @@ if TYPE_CHECKING:
     from optiland.rays import BaseRays, ParaxialRays, RealRays
 
 
-class Surface:
+class Surface(RevisionTracked):
     """Represents a standard refractice surface in an optical system.
 
     Args:
@@ -52,6 +54,25 @@ class Surface:
 
     _registry = {}  # registry for all surfaces
 
+    # recorded ray data and attributes that do not affect the ray trace
+    _untracked_attributes = frozenset(
+        {
+            "x",
+            "y",
+            "z",
+            "L",
+            "M",
+            "N",
+            "u",
+            "intensity",
+            "aoi",
+            "opd",
+            "semi_aperture",
+            "comment",
+            "_listeners",
+        }
+    )
+
     def __init__(
         self,
         previous_surface: Surface | None,
@@ -197,21 +218,30 @@ class Surface:
         super().__init_subclass__(**kwargs)
         Surface._registry[cls.__name__] = cls
 
-    def trace(self, rays: BaseRays) -> BaseRays:
+    def trace(
+        self, rays: BaseRays, record: bool = True, fused: bool = False
+    ) -> BaseRays:
         """Traces the given rays through the surface.
 
         Args:
             rays (BaseRays): The rays to be traced.
+            record (bool, optional): Whether to record the ray data on the
+                surface after tracing. Defaults to True.
+            fused (bool, optional): Whether to trace real rays with the fused
+                conic kernel, if it supports this surface. Otherwise, the
+                generic trace is used. Defaults to False.
 
         Returns:
             BaseRays: The traced rays.
 
         """
         self.reset()
-        self.geometry.localize(rays)
-        rays = rays.trace_on_surface(self)
-        self.geometry.globalize(rays)
-        rays.record_on_surface(self)
+        if not (fused and trace_fused(self, rays)):
+            self.geometry.localize(rays)
+            rays = rays.trace_on_surface(self)
+            self.geometry.globalize(rays)
+        if record:
+            rays.record_on_surface(self)
         return rays
 
     def _trace_paraxial(self, rays: ParaxialRays) -> ParaxialRays:
@@ -273,6 +303,32 @@ class Surface:
         self.intensity = be.copy(be.atleast_1d(rays.i))
         self.opd = be.copy(be.atleast_1d(rays.opd))
 
+    def tracked_objects(self) -> list[RevisionTracked]:
+        """Return the objects defining the trace through the surface.
+
+        These are the surface, its geometry and the coordinate systems the
+        geometry is positioned in, the material after the surface, the
+        interaction model and the physical aperture, if any. The material
+        before the surface is the material after the previous surface.
+
+        Returns:
+            list[RevisionTracked]: The objects, whose revisions change when
+            they are modified.
+        """
+        objects = [
+            self,
+            self.geometry,
+            self.material_post,
+            self.interaction_model,
+        ]
+        if self.aperture is not None:
+            objects.append(self.aperture)
+        cs = self.geometry.cs
+        while cs is not None:
+            objects.append(cs)
+            cs = cs.reference_cs
+        return objects
+
     def set_semi_aperture(self, r_max: float):
         """Sets the physical semi-aperture of the surface.
 
@@ -20,7 +20,7 @@ from optiland.surfaces.factories.surface_factory import SurfaceFactory
 from optiland.surfaces.standard_surface import Surface
 
 if TYPE_CHECKING:
-    from optiland._types import SurfaceType
+    from optiland._types import RecordPolicy, SurfaceType
     from optiland.materials import BaseMaterial
 
 
@@ -105,52 +105,77 @@ class SurfaceGroup:
         self._surfaces = []
         self._update_surface_links()
 
+    def _stack_recorded(self, name):
+        """Stack a recorded ray property of all surfaces.
+
+        Row k always holds the data of surface k. Surfaces on which the
+        property was not recorded (e.g., excluded by the record policy of the
+        last trace) hold rows of NaN.
+
+        Args:
+            name (str): The name of the recorded property, e.g. 'x'.
+
+        Returns:
+            be.ndarray: The stacked property, with one row per surface.
+
+        Raises:
+            ValueError: If the property is not recorded on any surface.
+        """
+        values = [getattr(surf, name) for surf in self.surfaces]
+        recorded = next((value for value in values if be.size(value) > 0), None)
+        if recorded is None:
+            raise ValueError(f"No ray data '{name}' is recorded on the surfaces.")
+        return be.stack(
+            [
+                value if be.size(value) > 0 else be.full_like(recorded, be.nan)
+                for value in values
+            ]
+        )
+
     @property
     def x(self):
         """np.array: x intersection points on all surfaces"""
-        return be.stack([surf.x for surf in self.surfaces if be.size(surf.x) > 0])
+        return self._stack_recorded("x")
 
     @property
     def y(self):
         """np.array: y intersection points on all surfaces"""
-        return be.stack([surf.y for surf in self.surfaces if be.size(surf.y) > 0])
+        return self._stack_recorded("y")
 
     @property
     def z(self):
         """np.array: z intersection points on all surfaces"""
-        return be.stack([surf.z for surf in self.surfaces if be.size(surf.z) > 0])
+        return self._stack_recorded("z")
 
     @property
     def L(self):
         """np.array: x direction cosines on all surfaces"""
-        return be.stack([surf.L for surf in self.surfaces if be.size(surf.L) > 0])
+        return self._stack_recorded("L")
 
     @property
     def M(self):
         """np.array: y direction cosines on all surfaces"""
-        return be.stack([surf.M for surf in self.surfaces if be.size(surf.M) > 0])
+        return self._stack_recorded("M")
 
     @property
     def N(self):
         """np.array: z direction cosines on all surfaces"""
-        return be.stack([surf.N for surf in self.surfaces if be.size(surf.N) > 0])
+        return self._stack_recorded("N")
 
     @property
     def opd(self):
         """np.array: optical path difference recorded on all surfaces"""
-        return be.stack([surf.opd for surf in self.surfaces if be.size(surf.opd) > 0])
+        return self._stack_recorded("opd")
 
     @property
     def u(self):
         """np.array: paraxial ray angles on all surfaces"""
-        return be.stack([surf.u for surf in self.surfaces if be.size(surf.u) > 0])
+        return self._stack_recorded("u")
 
     @property
     def intensity(self):
         """np.array: ray intensities on all surfaces"""
-        return be.stack(
-            [surf.intensity for surf in self.surfaces if be.size(surf.intensity) > 0]
-        )
+        return self._stack_recorded("intensity")
 
     @property
     def positions(self):
@@ -242,20 +267,73 @@ class SurfaceGroup:
         t = self.positions
         return t[surface_number + 1] - t[surface_number]
 
-    def trace(self, rays, skip=0):
+    def trace(self, rays, skip=0, record: RecordPolicy = "all", fused=False):
         """Trace the given rays through the surfaces.
 
         Args:
             rays (BaseRays): List of rays to be traced.
             skip (int, optional): Number of surfaces to skip before tracing.
                 Defaults to 0.
+            record (str or Sequence[int], optional): The surfaces on which ray
+                data is recorded. Options are 'all' (every surface), 'image'
+                (the last surface only), 'none', or a sequence of surface
+                indices. Surfaces that are not recorded hold empty arrays after
+                the trace. Defaults to 'all'.
+            fused (bool, optional): Whether to trace real rays through standard
+                conic surfaces with the fused compiled kernel. Surfaces that
+                the kernel does not support use the generic trace. Defaults to
+                False.
 
         """
         self.reset()
-        for surface in self.surfaces[skip:]:
-            surface.trace(rays)
+        record_indices = self.resolve_record_indices(record)
+        for index, surface in enumerate(self.surfaces[skip:], start=skip):
+            surface.trace(
+                rays,
+                record=record_indices is None or index in record_indices,
+                fused=fused,
+            )
         return rays
 
+    def resolve_record_indices(self, record: RecordPolicy) -> set[int] | None:
+        """Convert a recording policy to the set of surface indices to record.
+
+        Args:
+            record (str or Sequence[int]): The recording policy. See `trace`.
+
+        Returns:
+            set[int] | None: The non-negative indices of the surfaces to record,
+            or None if all surfaces are recorded.
+
+        Raises:
+            ValueError: If the policy is an unknown string.
+            IndexError: If a surface index is out of range.
+
+        """
+        num_surfaces = self.num_surfaces
+        if isinstance(record, str):
+            if record == "all":
+                return None
+            if record == "image":
+                return {num_surfaces - 1}
+            if record == "none":
+                return set()
+            raise ValueError(
+                f"Invalid record policy '{record}'. Must be 'all', 'image', "
+                "'none' or a sequence of surface indices."
+            )
+
+        indices = set()
+        for index in record:
+            index = int(index)
+            if not -num_surfaces <= index < num_surfaces:
+                raise IndexError(
+                    f"Surface index {index} is out of range for {num_surfaces} "
+                    "surfaces."
+                )
+            indices.add(index % num_surfaces)
+        return indices
+
     def add(
         self,
         new_surface=None,
@@ -3,6 +3,7 @@
 Public API:
 - ``Layer``: one thin-film layer (material + thickness)
 - ``ThinFilmStack``: stack structure and TMM computations (r, t, R, T, A)
+- ``RTLookupTable``: tabulated coefficients of a stack for ray tracing
 
 Units: wavelength in µm, thickness in µm (nm helpers), AOI in radians (deg helpers).
 """
@@ -15,6 +16,7 @@ import importlib
 
 from .analysis import SpectralAnalyzer
 from .layer import Layer
+from .lookup import RTLookupTable
 from .stack import ThinFilmStack
 
 
@@ -29,6 +31,7 @@ def __getattr__(name):
 __all__ = [
     "SpectralAnalyzer",
     "Layer",
+    "RTLookupTable",
     "ThinFilmStack",
     "optimization",
     "tolerancing",
@@ -0,0 +1,203 @@
+"""Thin film lookup table.
+
+This module provides a lookup table of the coefficients of a thin film stack,
+which replaces the per-ray transfer matrix calculation during ray tracing by an
+interpolation.
+
+The complex amplitude coefficients (r, t) and the power coefficients (R, T, A)
+are computed with the TMM for s and p polarizations on a grid of wavelengths
+and angles of incidence. The wavelengths of the grid are the discrete
+wavelengths of the traced rays (e.g., the wavelengths of an optical system),
+and the coefficients are interpolated linearly in angle of incidence. The
+interpolation error is estimated at the midpoints of the angle grid, where it
+is largest, and the grid can be refined until a tolerance is met. Rays at other
+wavelengths or angles are computed with the TMM.
+
+Corentin Nannini, 2025
+"""
+
+from __future__ import annotations
+
+import warnings
+from typing import TYPE_CHECKING, Any, Literal
+
+import numpy as np
+
+import optiland.backend as be
+
+from .core import _tmm_coh
+
+if TYPE_CHECKING:
+    from .stack import ThinFilmStack
+
+PolSP = Literal["s", "p"]
+
+_KEYS = ("r", "t", "R", "T", "A")
+
+# the coefficients are undefined at grazing incidence
+MAX_AOI_RAD = float(np.deg2rad(89.0))
+
+
+class RTLookupTable:
+    """Tabulated r, t, R, T, A of a thin film stack.
+
+    The table is rebuilt automatically when the stack changes, i.e., when a
+    layer is added, removed or replaced, when a layer thickness changes, or
+    when a material of the stack is modified. Tables are only used with the
+    numpy backend.
+
+    Args:
+        stack (ThinFilmStack): The thin film stack.
+        wavelength_um (float | Array): The wavelength(s) of the table in
+            microns.
+        num_aoi (int, optional): The number of angles of incidence of the
+            grid, uniformly spaced from 0 to `max_aoi_rad`. Defaults to 90.
+        max_aoi_rad (float, optional): The maximum angle of incidence of the
+            grid in radians. Defaults to 89 degrees, as the coefficients are
+            undefined at grazing incidence.
+        tolerance (float | None, optional): The maximum estimated
+            interpolation error of the complex coefficients r and t. If set,
+            the angle grid is refined until the error is below the tolerance.
+            Defaults to None.
+        max_num_aoi (int, optional): The maximum number of angles of incidence
+            when refining the grid. Defaults to 16385.
+
+    Attributes:
+        wavelengths (np.ndarray): The sorted wavelengths of the table.
+        aoi (np.ndarray): The angles of incidence of the table.
+        max_error (float): The estimated maximum interpolation error of r and
+            t, over both polarizations.
+    """
+
+    def __init__(
+        self,
+        stack: ThinFilmStack,
+        wavelength_um,
+        num_aoi: int = 90,
+        max_aoi_rad: float = MAX_AOI_RAD,
+        tolerance: float | None = None,
+        max_num_aoi: int = 16385,
+    ):
+        if num_aoi < 2:
+            raise ValueError("num_aoi must be at least 2.")
+        self.stack = stack
+        self.wavelengths = np.unique(np.ravel(be.to_numpy(wavelength_um)))
+        self.num_aoi = num_aoi
+        self.max_aoi_rad = float(max_aoi_rad)
+        self.tolerance = tolerance
+        self.max_num_aoi = max_num_aoi
+        self.aoi = None
+        self.max_error = None
+        self._values = {}
+        self._materials = None
+        self._signature = None
+        self.build()
+
+    def _stack_signature(self) -> tuple:
+        """Return the state of the stack the table depends on."""
+        materials = [
+            self.stack.incident_material,
+            self.stack.substrate_material,
+        ] + [layer.material for layer in self.stack.layers]
+        return (
+            tuple((id(material), material.revision) for material in materials),
+            tuple(float(layer.thickness_um) for layer in self.stack.layers),
+        ), materials
+
+    def _compute(self, num_aoi: int):
+        """Compute the table and its estimated error on a grid of angles."""
+        aoi = np.linspace(0.0, self.max_aoi_rad, num_aoi)
+        midpoints = 0.5 * (aoi[1:] + aoi[:-1])
+        wavelengths = self.wavelengths[:, None]
+        values = {}
+        max_error = 0.0
+        for pol in ("s", "p"):
+            grid = _tmm_coh(self.stack, wavelengths, aoi[None, :], pol)
+            values[pol] = {
+                key: be.to_numpy(value) for key, value in zip(_KEYS, grid, strict=True)
+            }
+            r_mid, t_mid, *_ = _tmm_coh(
+                self.stack, wavelengths, midpoints[None, :], pol
+            )
+            for key, exact in (("r", r_mid), ("t", t_mid)):
+                table = values[pol][key]
+                interpolated = 0.5 * (table[:, 1:] + table[:, :-1])
+                error = np.max(np.abs(interpolated - be.to_numpy(exact)))
+                max_error = max(max_error, float(error))
+        return aoi, values, max_error
+
+    def build(self):
+        """Compute the table for the current state of the stack."""
+        num_aoi = self.num_aoi
+        aoi, values, max_error = self._compute(num_aoi)
+        while self.tolerance is not None and max_error > self.tolerance:
+            if 2 * num_aoi - 1 > self.max_num_aoi:
+                warnings.warn(
+                    f"Thin film lookup table error {max_error:.3g} exceeds the "
+                    f"tolerance {self.tolerance:.3g} with {num_aoi} angles.",
+                    stacklevel=2,
+                )
+                break
+            num_aoi = 2 * num_aoi - 1
+            aoi, values, max_error = self._compute(num_aoi)
+
+        self.aoi = aoi
+        self._values = values
+        self.max_error = max_error
+        self._signature, self._materials = self._stack_signature()
+
+    @property
+    def is_valid(self) -> bool:
+        """bool: Whether the table matches the current state of the stack."""
+        return self._stack_signature()[0] == self._signature
+
+    def compute(
+        self, wavelength_um, aoi_rad, polarization: PolSP
+    ) -> dict[str, Any] | None:
+        """Compute r, t, R, T, A element-wise from the table.
+
+        Args:
+            wavelength_um (float | Array): Wavelength(s) in microns.
+            aoi_rad (float | Array): Angle(s) of incidence in radians,
+                broadcastable with the wavelengths.
+            polarization (PolSP): Polarization state ('s' or 'p').
+
+        Returns:
+            dict[str, Any] | None: The coefficients, with keys 'r', 't', 'R',
+            'T' and 'A', or None if the table cannot be used with the current
+            backend.
+        """
+        if be.get_backend() != "numpy":
+            return None
+        if not self.is_valid:
+            self.build()
+
+        wl, th = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(wavelength_um, dtype=float)),
+            np.atleast_1d(np.asarray(aoi_rad, dtype=float)),
+        )
+        step = self.aoi[1] - self.aoi[0]
+        iw = np.minimum(
+            np.searchsorted(self.wavelengths, wl), len(self.wavelengths) - 1
+        )
+        position = th / step
+        ia = np.clip(np.floor(position).astype(int), 0, len(self.aoi) - 2)
+        fraction = position - ia
+        tabulated = (
+            (self.wavelengths[iw] == wl) & (th >= 0.0) & (th <= self.max_aoi_rad)
+        )
+
+        values = self._values[polarization]
+        out = {
+            key: (1.0 - fraction) * values[key][iw, ia]
+            + fraction * values[key][iw, ia + 1]
+            for key in _KEYS
+        }
+
+        # rays outside of the table are computed with the TMM
+        if not np.all(tabulated):
+            missing = ~tabulated
+            exact = _tmm_coh(self.stack, wl[missing], th[missing], polarization)
+            for key, value in zip(_KEYS, exact, strict=True):
+                out[key][missing] = be.to_numpy(value)
+        return out
@@ -18,6 +18,7 @@ from optiland.materials import IdealMaterial
 
 from .core import _tmm_coh
 from .layer import Layer
+from .lookup import MAX_AOI_RAD, RTLookupTable
 
 if TYPE_CHECKING:
     from optiland.materials import BaseMaterial
@@ -73,6 +74,9 @@ class ThinFilmStack:
     layers: list[Layer] = field(default_factory=list)
     reference_wl_um: float | None = None
     reference_AOI_deg: float | None = 0
+    lookup_table: RTLookupTable | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __str__(self):
         """Return a concise summary of the stack structure."""
@@ -122,6 +126,42 @@ class ThinFilmStack:
             reference_AOI_deg=self.reference_AOI_deg,
         )
 
+    # ----- lookup table -----
+    def enable_lookup_table(
+        self,
+        wavelength_um: float | Array,
+        num_aoi: int = 90,
+        max_aoi_rad: float = MAX_AOI_RAD,
+        tolerance: float | None = None,
+    ) -> RTLookupTable:
+        """Tabulate the coefficients used by the element-wise computation.
+
+        Once enabled, `compute_rtRTA_elementwise` interpolates the coefficients
+        of rays at the tabulated wavelengths instead of running the TMM for
+        every ray. The table is rebuilt automatically when the stack changes.
+
+        Args:
+            wavelength_um: Wavelength(s) of the table in microns, e.g., the
+                wavelengths of the optical system.
+            num_aoi: Number of angles of incidence of the grid. Defaults to 90.
+            max_aoi_rad: Maximum angle of incidence of the grid in radians.
+                Defaults to 89 degrees.
+            tolerance: Optional maximum interpolation error of r and t. The
+                angle grid is refined until the estimated error is below it.
+
+        Returns:
+            The lookup table, whose `max_error` attribute gives the estimated
+            interpolation error.
+        """
+        self.lookup_table = RTLookupTable(
+            self, wavelength_um, num_aoi, max_aoi_rad, tolerance
+        )
+        return self.lookup_table
+
+    def disable_lookup_table(self):
+        """Remove the lookup table and compute all coefficients with the TMM."""
+        self.lookup_table = None
+
     # ----- structure helpers -----
     def add_layer(
         self, material: BaseMaterial, thickness_um: float, name: str | None = None
@@ -237,15 +277,17 @@ class ThinFilmStack:
         """Compute complex and power coefficients element-wise (no grid).
 
         Use this when wavelength and aoi have matching shapes (e.g. per-ray).
+        If a lookup table is enabled, the coefficients are interpolated from
+        the table (see `enable_lookup_table`).
         """
         wl = be.atleast_1d(wavelength_um)
         th = be.atleast_1d(aoi_rad)
         if polarization in ("s", "p"):
-            r, t, R, T, A = _tmm_coh(self, wl, th, polarization)
+            r, t, R, T, A = self._elementwise(wl, th, polarization)
             return {"r": r, "t": t, "R": R, "T": T, "A": A}
         elif polarization == "u":
-            rs, ts, Rs, Ts, As = _tmm_coh(self, wl, th, "s")
-            rp, tp, Rp, Tp, Ap = _tmm_coh(self, wl, th, "p")
+            rs, ts, Rs, Ts, As = self._elementwise(wl, th, "s")
+            rp, tp, Rp, Tp, Ap = self._elementwise(wl, th, "p")
             R = 0.5 * (Rs + Rp)
             T = 0.5 * (Ts + Tp)
             A = 0.5 * (As + Ap)
@@ -253,6 +295,14 @@ class ThinFilmStack:
         else:
             raise ValueError("polarization must be 's', 'p' or 'u'")
 
+    def _elementwise(self, wl: Array, th: Array, polarization: str) -> tuple:
+        """Element-wise coefficients, from the lookup table if available."""
+        if self.lookup_table is not None:
+            out = self.lookup_table.compute(wl, th, polarization)
+            if out is not None:
+                return out["r"], out["t"], out["R"], out["T"], out["A"]
+        return _tmm_coh(self, wl, th, polarization)
+
     def compute_rtRAT_nm_deg(
         self,
         wavelength_nm: float | Array,
@@ -1,5 +1,7 @@
 # flake8: noqa
 
+from .batched_optic import BatchedOptic
 from .core import Tolerancing
+from .linearized_monte_carlo import LinearizedMonteCarlo
 from .perturbation import ScalarSampler, RangeSampler, DistributionSampler, Perturbation
 from .sensitivity_analysis import SensitivityAnalysis
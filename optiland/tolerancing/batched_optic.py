@@ -0,0 +1,363 @@
+"""Batched Optic Module
+
+This module contains the BatchedOptic class, which traces many perturbed
+instances of an optical system at once.
+
+The perturbed surface parameters (radii, conics, thicknesses, decenters, tilts
+and indices) hold one value per instance. For a trace, the rays of the nominal
+system are replicated for every instance, and each perturbed parameter is
+expanded to one value per ray. As the geometries, coordinate systems and
+materials evaluate their parameters elementwise with the ray coordinates, a
+single trace through a copy of the optic then propagates the rays of all
+instances, with the same array operations as a single trace of more rays. This
+replaces N clones of the optic and N traces in tolerance and yield analyses.
+
+Kramer Harrison, 2025
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import TYPE_CHECKING
+
+import optiland.backend as be
+from optiland.distribution import create_distribution
+from optiland.materials import IdealMaterial
+from optiland.optimization.variable import Variable
+from optiland.rays import PolarizedRays, RealRays
+
+if TYPE_CHECKING:
+    from optiland._types import DistributionType
+    from optiland.distribution import BaseDistribution
+    from optiland.optic import Optic
+
+
+class _PerRayMaterial(IdealMaterial):
+    """Ideal material with one refractive index per ray.
+
+    Args:
+        n (be.ndarray): The refractive index of each ray.
+        propagation_model (BasePropagationModel): The propagation model of the
+            material of the nominal system.
+    """
+
+    def __init__(self, n, propagation_model):
+        super().__init__(n=0.0, k=0.0)
+        self.index = n
+        self.propagation_model = propagation_model
+
+    def n(self, wavelength, **kwargs):
+        """Returns the refractive index of each ray."""
+        return self.index
+
+    def k(self, wavelength, **kwargs):
+        """Returns the extinction coefficient, which is zero."""
+        return be.zeros_like(self.index)
+
+
+class BatchedOptic:
+    """A batch of perturbed instances of an optical system.
+
+    Perturbations are added with one value per instance, with the same
+    variable types and arguments as `Tolerancing.add_perturbation`. The
+    optic itself is not modified. Rays are defined by the nominal system,
+    i.e., every instance is traced with the same object-space rays.
+
+    Args:
+        optic (Optic): The nominal optical system.
+        size (int): The number of instances.
+
+    Attributes:
+        optic (Optic): The nominal optical system.
+        size (int): The number of instances.
+        perturbations (list[dict]): The perturbations, with their variable
+            type, surface number, keyword arguments and values.
+
+    """
+
+    supported_types = ("radius", "conic", "thickness", "decenter", "tilt", "index")
+
+    def __init__(self, optic: Optic, size: int):
+        if size < 1:
+            raise ValueError("The batch size must be a positive integer.")
+        self.optic = optic
+        self.size = size
+        self.perturbations = []
+
+    def add_perturbation(
+        self, variable_type: str, values, surface_number: int, **kwargs
+    ):
+        """Add a perturbation with one value per instance.
+
+        Args:
+            variable_type (str): The type of the perturbed variable. One of
+                'radius', 'conic', 'thickness', 'decenter', 'tilt' and
+                'index'.
+            values (be.ndarray): The value of the variable for each instance,
+                with shape (size,), in the units of the variable (e.g., the
+                new radius of curvature, not its change).
+            surface_number (int): The number of the perturbed surface.
+            **kwargs: Additional keyword arguments for the variable, e.g.,
+                the axis of a decenter or tilt.
+
+        Raises:
+            ValueError: If the variable type is not supported, if the number
+                of values does not match the batch size, or if the
+                perturbation cannot be batched.
+
+        """
+        if variable_type not in self.supported_types:
+            raise ValueError(
+                f'Unsupported perturbation type "{variable_type}". Must be one '
+                f"of {', '.join(self.supported_types)}."
+            )
+
+        values = be.ravel(be.array(values))
+        if be.size(values) != self.size:
+            raise ValueError(
+                f"Expected {self.size} values, got {be.size(values)} values."
+            )
+
+        axis = kwargs.get("axis")
+        if variable_type == "decenter" and axis not in ("x", "y", "z"):
+            raise ValueError(f'Invalid axis "{axis}" for decenter perturbation.')
+        if variable_type == "tilt" and axis not in ("x", "y"):
+            raise ValueError(f'Invalid axis "{axis}" for tilt perturbation.')
+        if variable_type == "thickness" and surface_number == 0:
+            raise ValueError("The object distance cannot be perturbed in a batch.")
+        if variable_type == "radius":
+            radius = getattr(
+                self.optic.surfaces[surface_number].geometry, "radius", None
+            )
+            if radius is None or be.isinf(radius):
+                raise ValueError(
+                    "Radius perturbations require a surface with a finite radius."
+                )
+
+        self.perturbations.append(
+            {
+                "type": variable_type,
+                "surface_number": surface_number,
+                "kwargs": kwargs,
+                "values": values,
+            }
+        )
+
+    def instance(self, index: int) -> Optic:
+        """Return a copy of the optic with the perturbations of an instance.
+
+        The perturbations are applied with optimization variables, as in
+        `Tolerancing`, so that the instance can be analyzed like any optic.
+
+        Args:
+            index (int): The index of the instance.
+
+        Returns:
+            Optic: The perturbed optic.
+
+        """
+        optic = copy.deepcopy(self.optic)
+        for perturbation in self.perturbations:
+            kwargs = perturbation["kwargs"]
+            if perturbation["type"] == "index" and "wavelength" not in kwargs:
+                kwargs = {**kwargs, "wavelength": optic.primary_wavelength}
+            variable = Variable(
+                optic,
+                perturbation["type"],
+                surface_number=perturbation["surface_number"],
+                scaler=None,
+                **kwargs,
+            )
+            variable.variable.update_value(perturbation["values"][index])
+        return optic
+
+    def trace(
+        self,
+        Hx,
+        Hy,
+        wavelength,
+        num_rays: int = 100,
+        distribution: DistributionType | BaseDistribution = "hexapolar",
+    ) -> RealRays:
+        """Trace a distribution of rays through all instances.
+
+        Args:
+            Hx (float or be.ndarray): The normalized x field coordinate.
+            Hy (float or be.ndarray): The normalized y field coordinate.
+            wavelength (float): The wavelength of the rays.
+            num_rays (int, optional): The number of rays used to generate the
+                points of a named distribution. Defaults to 100.
+            distribution (str or Distribution, optional): The distribution of
+                the rays in the pupil. Defaults to 'hexapolar'.
+
+        Returns:
+            RealRays: The traced rays on the image surface. The rays of
+                instance b are at indices b * n to (b + 1) * n - 1, where n is
+                the number of rays per instance. See `split`.
+
+        """
+        if isinstance(distribution, str):
+            distribution = create_distribution(distribution)
+            distribution.generate_points(num_rays)
+
+        Hx = be.atleast_1d(Hx)
+        Hy = be.atleast_1d(Hy)
+        num_pupil_points = be.size(distribution.x)
+        return self.trace_generic(
+            be.repeat(Hx, num_pupil_points),
+            be.repeat(Hy, num_pupil_points),
+            be.tile(distribution.x, be.size(Hx)),
+            be.tile(distribution.y, be.size(Hy)),
+            wavelength,
+        )
+
+    def trace_generic(self, Hx, Hy, Px, Py, wavelength) -> RealRays:
+        """Trace generic rays through all instances.
+
+        Args:
+            Hx (float or be.ndarray): The normalized x field coordinate.
+            Hy (float or be.ndarray): The normalized y field coordinate.
+            Px (float or be.ndarray): The normalized x pupil coordinate.
+            Py (float or be.ndarray): The normalized y pupil coordinate.
+            wavelength (float): The wavelength of the rays.
+
+        Returns:
+            RealRays: The traced rays on the image surface, ordered by
+                instance. See `split`.
+
+        Raises:
+            ValueError: If the optic generates polarized rays.
+
+        """
+        tracer = self.optic.ray_tracer
+        tracer._validate_normalized_coordinates(Hx, Hy, "field")
+        tracer._validate_normalized_coordinates(Px, Py, "pupil")
+
+        vx, vy = self.optic.fields.get_vig_factor(Hx, Hy)
+        Px = Px * (1 - vx)
+        Py = Py * (1 - vy)
+        Hx, Hy, Px, Py = tracer._validate_array_size(Hx, Hy, Px, Py)
+
+        nominal_rays = tracer.ray_generator.generate_rays(Hx, Hy, Px, Py, wavelength)
+        if isinstance(nominal_rays, PolarizedRays):
+            raise ValueError("Polarized rays cannot be traced in a batch.")
+
+        num_rays = be.size(nominal_rays.x)
+        rays = RealRays(
+            *(
+                be.tile(value, self.size)
+                for value in (
+                    nominal_rays.x,
+                    nominal_rays.y,
+                    nominal_rays.z,
+                    nominal_rays.L,
+                    nominal_rays.M,
+                    nominal_rays.N,
+                    nominal_rays.i,
+                    nominal_rays.w,
+                )
+            )
+        )
+
+        optic = self._expand(num_rays)
+        optic.surfaces.trace(rays, record="none")
+
+        last_surface = optic.surfaces[-1]
+        last_surface.material_post.propagation_model.propagate(
+            rays, last_surface.thickness
+        )
+        return rays
+
+    def split(self, values):
+        """Split per-ray values of a batched trace by instance.
+
+        Args:
+            values (be.ndarray): The values of all rays, ordered by instance.
+
+        Returns:
+            be.ndarray: The values with shape (size, n), where n is the
+                number of rays per instance.
+
+        """
+        return be.reshape(values, (self.size, -1))
+
+    def rms_spot_radius(
+        self,
+        Hx,
+        Hy,
+        wavelength,
+        num_rays: int = 100,
+        distribution: DistributionType | BaseDistribution = "hexapolar",
+    ):
+        """Compute the RMS spot radius of every instance about its centroid.
+
+        Args:
+            Hx (float): The normalized x field coordinate.
+            Hy (float): The normalized y field coordinate.
+            wavelength (float): The wavelength of the rays.
+            num_rays (int, optional): The number of rays used to generate the
+                points of a named distribution. Defaults to 100.
+            distribution (str or Distribution, optional): The distribution of
+                the rays in the pupil. Defaults to 'hexapolar'.
+
+        Returns:
+            be.ndarray: The RMS spot radius of each instance, with shape
+                (size,). Vignetted rays are excluded.
+
+        """
+        rays = self.trace(Hx, Hy, wavelength, num_rays, distribution)
+        x = self.split(rays.x)
+        y = self.split(rays.y)
+        weight = self.split(be.where(rays.i > 0, 1.0, 0.0))
+        count = be.sum(weight, axis=1)
+        x0 = be.sum(x * weight, axis=1) / count
+        y0 = be.sum(y * weight, axis=1) / count
+        r2 = (x - x0[:, None]) ** 2 + (y - y0[:, None]) ** 2
+        return be.sqrt(be.sum(r2 * weight, axis=1) / count)
+
+    def _expand(self, num_rays: int) -> Optic:
+        """Return a copy of the optic with per-ray perturbed parameters.
+
+        Args:
+            num_rays (int): The number of rays per instance.
+
+        Returns:
+            Optic: The copy of the optic, which must only be used for tracing
+                rays on the surface group.
+
+        """
+        optic = copy.deepcopy(self.optic)
+        surfaces = optic.surfaces
+
+        # thickness changes shift all subsequent surfaces
+        shifts = {}
+        for perturbation in self.perturbations:
+            if perturbation["type"] == "thickness":
+                number = perturbation["surface_number"]
+                nominal = self.optic.surfaces.get_thickness(number)[0]
+                for index in range(number + 1, len(surfaces)):
+                    shifts[index] = (
+                        shifts.get(index, 0.0) + perturbation["values"] - nominal
+                    )
+        for index, shift in shifts.items():
+            cs = surfaces[index].geometry.cs
+            cs.z = be.repeat(cs.z + shift, num_rays)
+
+        for perturbation in self.perturbations:
+            variable_type = perturbation["type"]
+            surface = surfaces[perturbation["surface_number"]]
+            values = be.repeat(perturbation["values"], num_rays)
+            axis = perturbation["kwargs"].get("axis")
+            if variable_type == "radius":
+                surface.geometry.radius = values
+            elif variable_type == "conic":
+                surface.geometry.k = values
+            elif variable_type == "decenter":
+                setattr(surface.geometry.cs, axis, values)
+            elif variable_type == "tilt":
+                setattr(surface.geometry.cs, f"r{axis}", values)
+            elif variable_type == "index":
+                surface.material_post = _PerRayMaterial(
+                    values, surface.material_post.propagation_model
+                )
+        return optic
@@ -0,0 +1,380 @@
+"""Linearized Monte Carlo Module
+
+This module contains the LinearizedMonteCarlo class, which performs Monte Carlo
+analysis of a tolerancing system with a local model of the operands and
+compensators, instead of compensating and evaluating the optic for each trial.
+
+The model is built once from central differences about the nominal system:
+the perturbations are applied one at a time, at plus and minus a step, and the
+compensated operand and compensator values are recorded. This gives the
+Jacobian of the operands with respect to the perturbations, the compensator
+response matrix, and their diagonal Hessians, for 2p + 1 compensated
+evaluations for p perturbations. The Monte Carlo trials then reduce to matrix
+products, so that millions of trials are evaluated in seconds. As the model
+only holds for small perturbations, a random subsample of the trials can be
+validated against full nonlinear trials.
+
+Kramer Harrison, 2025
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+import optiland.backend as be
+from optiland.tolerancing.monte_carlo import MonteCarlo
+from optiland.tolerancing.perturbation import (
+    DistributionSampler,
+    RangeSampler,
+    ScalarSampler,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from optiland.tolerancing.core import Tolerancing
+    from optiland.tolerancing.perturbation import BaseSampler
+
+
+def _sample(sampler: BaseSampler, size: int, generator=None) -> np.ndarray:
+    """Draw a vector of values from a sampler.
+
+    Args:
+        sampler (BaseSampler): The sampler.
+        size (int): The number of values.
+        generator (optional): The random number generator of distribution
+            samplers. Defaults to None, in which case the generator of the
+            sampler is used.
+
+    Returns:
+        np.ndarray: The sampled values.
+
+    Raises:
+        ValueError: If the sampler type is not supported.
+    """
+    if isinstance(sampler, DistributionSampler):
+        if generator is None:
+            generator = sampler.generator
+        if sampler.distribution == "normal":
+            values = be.random_normal(**sampler.params, size=size, generator=generator)
+        elif sampler.distribution == "uniform":
+            values = be.random_uniform(**sampler.params, size=size, generator=generator)
+        else:
+            raise ValueError(f"Unknown distribution: {sampler.distribution}")
+        return np.asarray(be.to_numpy(values), dtype=float)
+    if isinstance(sampler, RangeSampler):
+        values = np.asarray(be.to_numpy(sampler.values), dtype=float)
+        return values[np.arange(size) % sampler.size]
+    if isinstance(sampler, ScalarSampler):
+        return np.full(size, float(be.to_numpy(sampler.value)))
+    raise ValueError(f"Unsupported sampler type: {type(sampler).__name__}")
+
+
+def _default_step(sampler: BaseSampler, nominal: float) -> float:
+    """Return the finite difference step of a perturbation, i.e., the spread
+    of its sampler about the nominal value.
+
+    Args:
+        sampler (BaseSampler): The sampler of the perturbation.
+        nominal (float): The nominal value of the perturbed variable.
+
+    Returns:
+        float: The step.
+    """
+    step = 0.0
+    if isinstance(sampler, DistributionSampler):
+        params = sampler.params
+        if sampler.distribution == "normal":
+            step = float(params.get("scale", 1.0))
+        elif sampler.distribution == "uniform":
+            step = (float(params.get("high", 1.0)) - float(params.get("low", 0.0))) / 2
+    elif isinstance(sampler, RangeSampler):
+        values = np.asarray(be.to_numpy(sampler.values), dtype=float)
+        step = float(np.max(np.abs(values - nominal)))
+    elif isinstance(sampler, ScalarSampler):
+        step = abs(float(be.to_numpy(sampler.value)) - nominal)
+
+    if step == 0.0:
+        step = 1e-6 * max(1.0, abs(nominal))
+    return step
+
+
+class LinearizedMonteCarlo(MonteCarlo):
+    """Class for performing Monte Carlo analysis on a tolerancing system with a
+    local (first or second order) model of the operands and compensators.
+
+    Args:
+        tolerancing (Tolerancing): The tolerancing system to perform
+            Monte Carlo analysis on.
+
+    Attributes:
+        tolerancing (Tolerancing): The tolerancing system to perform
+            Monte Carlo analysis on.
+        operand_names (list): List of operand names in the tolerancing system.
+        perturbation_names (list): List of perturbation names.
+        compensator_names (list): List of compensator names.
+        nominal (np.ndarray): The nominal values of the perturbed variables,
+            in the units of the samplers, with shape (p,).
+        steps (np.ndarray): The finite difference steps, with shape (p,).
+        operand_nominal (np.ndarray): The compensated operand values of the
+            nominal system, with shape (m,).
+        jacobian (np.ndarray): The derivatives of the compensated operands
+            with respect to the perturbations, with shape (m, p).
+        hessian (np.ndarray | None): The second derivatives of the
+            compensated operands with respect to each perturbation, with
+            shape (m, p), or None for a first-order model.
+        compensator_nominal (np.ndarray): The compensator values of the
+            nominal system, with shape (k,).
+        compensator_response (np.ndarray): The derivatives of the compensator
+            values with respect to the perturbations, with shape (k, p).
+        compensator_hessian (np.ndarray | None): The second derivatives of the
+            compensator values with respect to each perturbation, with shape
+            (k, p), or None for a first-order model.
+        _results (pd.DataFrame): DataFrame to store the Monte Carlo analysis
+            results.
+
+    Methods:
+        build(steps=None, hessian=False): Builds the model of the operands
+            and compensators.
+        run(num_iterations, seed=None): Runs the Monte Carlo analysis on the
+            model for num_iterations.
+        validate(num_samples=10, seed=None): Compares a random subsample of
+            the trials with full nonlinear trials.
+        get_results(): Returns the Monte Carlo analysis results.
+
+    """
+
+    def __init__(self, tolerancing: Tolerancing):
+        super().__init__(tolerancing)
+        self.perturbation_names = [
+            str(perturbation.variable) for perturbation in tolerancing.perturbations
+        ]
+        self.compensator_names = []
+        self.nominal = None
+        self.steps = None
+        self.operand_nominal = None
+        self.jacobian = None
+        self.hessian = None
+        self.compensator_nominal = None
+        self.compensator_response = None
+        self.compensator_hessian = None
+
+    @property
+    def is_built(self) -> bool:
+        """bool: Whether the model has been built."""
+        return self.jacobian is not None
+
+    def build(self, steps: float | Sequence[float] | None = None, hessian=False):
+        """Builds the model of the operands and compensators.
+
+        Each perturbation is applied at its nominal value plus and minus its
+        step, with the other perturbations at their nominal values, and the
+        compensated operand and compensator values are evaluated. The
+        derivatives are then computed by central differences.
+
+        Args:
+            steps (float | Sequence[float], optional): The finite difference
+                step of all perturbations, or of each perturbation. Defaults
+                to None, in which case the spread of the sampler of each
+                perturbation is used (e.g., the standard deviation of a normal
+                distribution), so that the model is fitted over the range of
+                sampled values.
+            hessian (bool, optional): Whether to include the diagonal second
+                derivatives in the model. Defaults to False.
+
+        Raises:
+            ValueError: If the number of steps does not match the number of
+                perturbations, or if a step is not positive.
+
+        """
+        perturbations = self.tolerancing.perturbations
+        self.tolerancing.reset()
+        nominal = np.array(
+            [float(be.to_numpy(p.variable.value)) for p in perturbations]
+        )
+
+        if steps is None:
+            steps = [
+                _default_step(p.sampler, value)
+                for p, value in zip(perturbations, nominal, strict=True)
+            ]
+        steps = np.broadcast_to(np.asarray(steps, dtype=float), nominal.shape)
+        if steps.shape != nominal.shape:
+            raise ValueError("The number of steps must match the perturbations.")
+        if np.any(steps <= 0):
+            raise ValueError("Finite difference steps must be positive.")
+
+        operand_nominal, compensator_nominal = self._evaluate(nominal)
+        plus = []
+        minus = []
+        for index, step in enumerate(steps):
+            for sign, values in ((1.0, plus), (-1.0, minus)):
+                point = nominal.copy()
+                point[index] += sign * step
+                values.append(self._evaluate(point))
+        self.tolerancing.reset()
+
+        operand_plus = np.array([operands for operands, _ in plus]).T
+        operand_minus = np.array([operands for operands, _ in minus]).T
+        compensator_plus = (
+            np.array([comp for _, comp in plus]).reshape(len(steps), -1).T
+        )
+        compensator_minus = (
+            np.array([comp for _, comp in minus]).reshape(len(steps), -1).T
+        )
+
+        self.nominal = nominal
+        self.steps = np.array(steps)
+        self.operand_nominal = operand_nominal
+        self.jacobian = (operand_plus - operand_minus) / (2 * steps)
+        self.compensator_nominal = compensator_nominal
+        self.compensator_response = (compensator_plus - compensator_minus) / (2 * steps)
+        if hessian:
+            self.hessian = (
+                operand_plus - 2 * operand_nominal[:, None] + operand_minus
+            ) / steps**2
+            self.compensator_hessian = (
+                compensator_plus - 2 * compensator_nominal[:, None] + compensator_minus
+            ) / steps**2
+        else:
+            self.hessian = None
+            self.compensator_hessian = None
+
+    def run(self, num_iterations: int, seed: int | None = None):
+        """Executes the Monte Carlo simulation on the model for a specified
+        number of iterations.
+
+        The model is built with default settings if it has not been built.
+        The perturbation values of all trials are sampled at once, and the
+        operand and compensator values are predicted from the model.
+
+        Args:
+            num_iterations (int): The number of iterations to run the
+                simulation.
+            seed (int, optional): The seed of the random streams of the
+                distribution samplers. Defaults to None, in which case the
+                generators of the samplers are used.
+
+        Returns:
+            None: The results are stored in the instance variable `_results`
+                as a pandas DataFrame.
+
+        """
+        if not self.is_built:
+            self.build()
+
+        perturbations = self.tolerancing.perturbations
+        generators = [None] * len(perturbations)
+        if seed is not None:
+            sequences = np.random.SeedSequence(seed).spawn(len(perturbations))
+            generators = [
+                be.default_rng(int(sequence.generate_state(1, dtype=np.uint64)[0]))
+                for sequence in sequences
+            ]
+        samples = np.column_stack(
+            [
+                _sample(perturbation.sampler, num_iterations, generator)
+                for perturbation, generator in zip(
+                    perturbations, generators, strict=True
+                )
+            ]
+        )
+        self._results = self._predict(samples)
+
+    def validate(self, num_samples: int = 10, seed: int | None = None):
+        """Compares a random subsample of the trials with full nonlinear
+        trials.
+
+        The perturbation values of the selected trials are applied to the
+        optic, the compensators are applied and the operands are evaluated.
+
+        Args:
+            num_samples (int, optional): The number of trials to validate.
+                Defaults to 10.
+            seed (int, optional): The seed for selecting the trials. Defaults
+                to None.
+
+        Returns:
+            pd.DataFrame: The predicted ("linearized") and evaluated ("full")
+                operand and compensator values and their difference ("error",
+                full minus linearized), indexed by trial. The columns are
+                pairs of the operand or compensator name and the kind of
+                value.
+
+        Raises:
+            ValueError: If the Monte Carlo analysis has not been run.
+
+        """
+        if self._results.empty:
+            raise ValueError("Run the Monte Carlo analysis before validating.")
+
+        rng = np.random.default_rng(seed)
+        num_samples = min(num_samples, len(self._results))
+        trials = np.sort(
+            rng.choice(len(self._results), size=num_samples, replace=False)
+        )
+        rows = self._results.iloc[trials]
+        names = self.operand_names + self.compensator_names
+
+        full = []
+        for values in rows[self.perturbation_names].to_numpy():
+            operands, compensators = self._evaluate(values)
+            full.append(np.concatenate([operands, compensators]))
+        self.tolerancing.reset()
+
+        linearized = rows[names].to_numpy()
+        full = np.array(full).reshape(linearized.shape)
+        data = {}
+        for index, name in enumerate(names):
+            data[(name, "linearized")] = linearized[:, index]
+            data[(name, "full")] = full[:, index]
+            data[(name, "error")] = full[:, index] - linearized[:, index]
+        return pd.DataFrame(data, index=rows.index)
+
+    def _predict(self, samples: np.ndarray) -> pd.DataFrame:
+        """Predicts the operand and compensator values of trials.
+
+        Args:
+            samples (np.ndarray): The perturbation values of the trials, with
+                shape (n, p).
+
+        Returns:
+            pd.DataFrame: The perturbation, operand and compensator values of
+                the trials.
+        """
+        delta = samples - self.nominal
+        operands = self.operand_nominal + delta @ self.jacobian.T
+        compensators = self.compensator_nominal + delta @ self.compensator_response.T
+        if self.hessian is not None:
+            operands += 0.5 * delta**2 @ self.hessian.T
+            compensators += 0.5 * delta**2 @ self.compensator_hessian.T
+
+        data = dict(zip(self.perturbation_names, samples.T, strict=True))
+        data.update(zip(self.operand_names, operands.T, strict=True))
+        data.update(zip(self.compensator_names, compensators.T, strict=True))
+        return pd.DataFrame(data, index=pd.RangeIndex(len(samples), name="trial"))
+
+    def _evaluate(self, values: Sequence[float]) -> tuple[np.ndarray, np.ndarray]:
+        """Evaluates the compensated operands for given perturbation values.
+
+        Args:
+            values (Sequence[float]): The value of each perturbation.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The operand and compensator values.
+        """
+        self.tolerancing.reset()
+        for perturbation, value in zip(
+            self.tolerancing.perturbations, values, strict=True
+        ):
+            perturbation.value = float(value)
+            perturbation.variable.update(float(value))
+
+        compensator_result = self.tolerancing.apply_compensators()
+        self.compensator_names = list(compensator_result)
+        operands = np.array(self.tolerancing.evaluate(), dtype=float)
+        compensators = np.array(list(compensator_result.values()), dtype=float)
+        return operands, compensators
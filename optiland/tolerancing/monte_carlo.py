@@ -6,11 +6,23 @@ SensitivityAnalysis class and provides methods for running Monte Carlo
 simulations, visualizing the results, and analyzing the correlation between
 operands.
 
+Monte Carlo trials can be run in parallel on worker processes. The tolerancing
+setup is pickled once when the pool is started, and every worker keeps its own
+deserialized replica, on which batches of trials are run. Each trial draws its
+perturbations from random streams derived from a seed and the trial index, so
+that the results are reproducible and independent of the number of workers
+and the batch size. The rows of completed batches can be appended to a
+checkpoint file, from which an interrupted run is resumed.
+
 Kramer Harrison, 2024
 """
 
 from __future__ import annotations
 
+import math
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import TYPE_CHECKING
 
 import matplotlib.pyplot as plt
@@ -18,6 +30,8 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 
+import optiland.backend as be
+from optiland.tolerancing.perturbation import DistributionSampler, RangeSampler
 from optiland.tolerancing.sensitivity_analysis import SensitivityAnalysis
 
 if TYPE_CHECKING:
@@ -27,6 +41,162 @@ if TYPE_CHECKING:
 
     from optiland.tolerancing.core import Tolerancing
 
+# replica of the tolerancing setup held by each worker process
+_worker_tolerancing = None
+_worker_operand_names = None
+
+
+def _init_worker(payload: bytes, backend: str):
+    """Unpickle the tolerancing replica once per worker process."""
+    global _worker_tolerancing, _worker_operand_names
+    be.set_backend(backend)
+    _worker_tolerancing, _worker_operand_names = pickle.loads(payload)
+
+
+def _run_worker_trials(trials: list[int], seed: int) -> list[tuple[int, dict]]:
+    """Run a batch of trials on the tolerancing replica of a worker."""
+    return _run_trials(_worker_tolerancing, _worker_operand_names, trials, seed)
+
+
+def _trial_seed(seed: int, trial: int, index: int) -> int:
+    """Return the seed of the random stream of a perturbation in a trial."""
+    sequence = np.random.SeedSequence(seed, spawn_key=(trial, index))
+    return int(sequence.generate_state(1, dtype=np.uint64)[0])
+
+
+def _run_trial(tolerancing: Tolerancing, operand_names: list[str]) -> dict:
+    """Run a single Monte Carlo trial.
+
+    The trial resets the tolerancing system, applies the perturbations and
+    compensators, and evaluates the operands.
+
+    Args:
+        tolerancing (Tolerancing): The tolerancing system.
+        operand_names (list[str]): The names of the operands.
+
+    Returns:
+        dict: The perturbation values, operand values and compensator values.
+    """
+    # reset the tolerancing system
+    tolerancing.reset()
+
+    # apply perturbations
+    for perturbation in tolerancing.perturbations:
+        perturbation.apply()
+
+    # apply compensators
+    compensator_result = tolerancing.apply_compensators()
+
+    # evaluate operands
+    operand_values = tolerancing.evaluate()
+
+    # save results - perturbation type & value
+    result = {}
+    for perturbation in tolerancing.perturbations:
+        key = str(perturbation.variable)
+        result[key] = float(perturbation.value)
+
+    # save results - operand values
+    result.update(
+        {
+            f"{name}": value
+            for name, value in zip(operand_names, operand_values, strict=False)
+        },
+    )
+
+    # save results - compensator values
+    result.update(compensator_result)
+    return result
+
+
+def _run_trials(
+    tolerancing: Tolerancing, operand_names: list[str], trials: list[int], seed: int
+) -> list[tuple[int, dict]]:
+    """Run Monte Carlo trials with per-trial random streams.
+
+    Before each trial, the distribution samplers are seeded from the seed and
+    the trial index, and range samplers are set to the value of the trial. The
+    state of the samplers is restored afterwards.
+
+    Args:
+        tolerancing (Tolerancing): The tolerancing system.
+        operand_names (list[str]): The names of the operands.
+        trials (list[int]): The indices of the trials.
+        seed (int): The seed of the run.
+
+    Returns:
+        list[tuple[int, dict]]: The index and result of each trial.
+    """
+    samplers = [perturbation.sampler for perturbation in tolerancing.perturbations]
+    states = [dict(vars(sampler)) for sampler in samplers]
+    try:
+        rows = []
+        for trial in trials:
+            for index, sampler in enumerate(samplers):
+                if isinstance(sampler, DistributionSampler):
+                    sampler.generator = be.default_rng(_trial_seed(seed, trial, index))
+                elif isinstance(sampler, RangeSampler):
+                    sampler.index = trial % sampler.size
+            rows.append((trial, _run_trial(tolerancing, operand_names)))
+        return rows
+    finally:
+        for sampler, state in zip(samplers, states, strict=True):
+            vars(sampler).update(state)
+
+
+def _write_checkpoint(path: str | os.PathLike, seed: int, rows: dict[int, dict]):
+    """Write a checkpoint with the seed and the rows of the completed trials.
+
+    The checkpoint is a sequence of pickled records: a header with the seed
+    and the rows, followed by the rows of each batch completed since, see
+    `_add_batch`.
+    """
+    # write to a temporary file first, so that an interruption never leaves a
+    # corrupt checkpoint
+    temporary = f"{os.fspath(path)}.tmp"
+    with open(temporary, "wb") as file:
+        pickle.dump({"seed": seed, "rows": rows}, file)
+    os.replace(temporary, path)
+
+
+def _load_checkpoint(path: str | os.PathLike) -> tuple[int, dict[int, dict]]:
+    """Load the seed and the rows of the completed trials of a checkpoint.
+
+    A batch record truncated by an interruption is ignored.
+    """
+    with open(path, "rb") as file:
+        saved = pickle.load(file)
+        rows = dict(saved["rows"])
+        while True:
+            try:
+                rows.update(pickle.load(file))
+            except (EOFError, pickle.UnpicklingError):
+                break
+    return saved["seed"], rows
+
+
+def _add_batch(
+    rows: dict[int, dict],
+    batch_rows: list[tuple[int, dict]],
+    checkpoint: str | os.PathLike | None,
+):
+    """Add the rows of a completed batch to the results and the checkpoint.
+
+    Only the rows of the batch are appended to the checkpoint, such that the
+    cost of a checkpoint does not grow with the number of completed trials.
+
+    Args:
+        rows (dict[int, dict]): The results of the completed trials, by
+            trial index. Updated in place.
+        batch_rows (list[tuple[int, dict]]): The index and result of each
+            trial of the batch.
+        checkpoint (str or os.PathLike, optional): The checkpoint file.
+    """
+    rows.update(batch_rows)
+    if checkpoint is not None:
+        with open(checkpoint, "ab") as file:
+            pickle.dump(batch_rows, file)
+
 
 class MonteCarlo(SensitivityAnalysis):
     """Class for performing Monte Carlo analysis on a tolerancing system.
@@ -57,18 +227,42 @@ class MonteCarlo(SensitivityAnalysis):
     def __init__(self, tolerancing: Tolerancing):
         super().__init__(tolerancing)
 
-    def run(self, num_iterations: int):
+    def run(
+        self,
+        num_iterations: int,
+        workers: int = 1,
+        batch_size: int | None = None,
+        seed: int | None = None,
+        checkpoint: str | os.PathLike | None = None,
+    ):
         """Executes the Monte Carlo simulation for a specified number of
         iterations.
 
         Args:
             num_iterations (int): The number of iterations to run the
                 simulation.
+            workers (int, optional): The number of worker processes (-1 for
+                all available processors, 1 to run the trials in this
+                process). Defaults to 1.
+            batch_size (int, optional): The number of trials per batch.
+                Defaults to None, in which case the trials are split into
+                four batches per worker.
+            seed (int, optional): The seed of the random streams of the
+                trials. Defaults to None, in which case a random seed is
+                used, which is stored in the `seed` attribute.
+            checkpoint (str or os.PathLike, optional): The file to which the
+                results of each batch are appended when it completes. If the
+                file exists, the run is resumed from it, and only the missing
+                trials are run. Defaults to None.
 
         Returns:
             None: The results are stored in the instance variable `_results`
                 as a pandas DataFrame.
 
+        Raises:
+            ValueError: If the seed differs from the seed of the checkpoint,
+                or if workers or batch_size is not valid.
+
         The method performs the following steps for each iteration:
             1. Resets the tolerancing system.
             2. Applies perturbations to the system.
@@ -80,47 +274,85 @@ class MonteCarlo(SensitivityAnalysis):
         The final results are converted to a pandas DataFrame and stored in
             the `_results` attribute.
 
-        """
-        results = []
-
-        for _ in range(num_iterations):
-            # reset the tolerancing system
-            self.tolerancing.reset()
-
-            # apply perturbations
-            for perturbation in self.tolerancing.perturbations:
-                perturbation.apply()
-
-            # apply compensators
-            compensator_result = self.tolerancing.apply_compensators()
-
-            # evaluate operands
-            operand_values = self.tolerancing.evaluate()
-
-            # save results
-            result = {}
+        If only the number of iterations is given, the samplers draw from
+        their own random streams, and the trials are run in order in this
+        process. Otherwise, each trial draws from its own random stream,
+        derived from the seed and the trial index, and the results are indexed
+        by trial. The results are built once all batches complete, or when the
+        run is interrupted. Samplers other
+        than `DistributionSampler` and `RangeSampler` draw from their own
+        state, and their values are not reproducible across workers.
 
-            # save results - perturbation type & value
-            for perturbation in self.tolerancing.perturbations:
-                key = str(perturbation.variable)
-                result[key] = float(perturbation.value)
-
-            # save results - operand values
-            result.update(
-                {
-                    f"{name}": value
-                    for name, value in zip(
-                        self.operand_names, operand_values, strict=False
+        """
+        if workers == 1 and seed is None and checkpoint is None:
+            results = [
+                _run_trial(self.tolerancing, self.operand_names)
+                for _ in range(num_iterations)
+            ]
+            self._results = pd.DataFrame(results)
+            return
+
+        if workers != -1 and workers < 1:
+            raise ValueError("workers must be a positive integer or -1.")
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+
+        rows = {}
+        if checkpoint is not None and os.path.exists(checkpoint):
+            saved_seed, rows = _load_checkpoint(checkpoint)
+            if seed is not None and seed != saved_seed:
+                raise ValueError(
+                    f"The seed {seed} differs from the seed {saved_seed} of "
+                    "the checkpoint."
+                )
+            seed = saved_seed
+            rows = {trial: row for trial, row in rows.items() if trial < num_iterations}
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        self.seed = seed
+
+        num_workers = (os.cpu_count() or 1) if workers == -1 else workers
+        pending = [trial for trial in range(num_iterations) if trial not in rows]
+        if batch_size is None:
+            batch_size = max(1, math.ceil(len(pending) / (4 * num_workers)))
+        batches = [
+            pending[start : start + batch_size]
+            for start in range(0, len(pending), batch_size)
+        ]
+
+        if checkpoint is not None:
+            _write_checkpoint(checkpoint, seed, rows)
+
+        # the results are built once the batches are done, or interrupted
+        try:
+            if num_workers == 1 or len(batches) <= 1:
+                for batch in batches:
+                    batch_rows = _run_trials(
+                        self.tolerancing, self.operand_names, batch, seed
                     )
-                },
+                    _add_batch(rows, batch_rows, checkpoint)
+                return
+
+            payload = pickle.dumps((self.tolerancing, self.operand_names))
+            pool = ProcessPoolExecutor(
+                max_workers=num_workers,
+                initializer=_init_worker,
+                initargs=(payload, be.get_backend()),
+            )
+            try:
+                futures = [
+                    pool.submit(_run_worker_trials, batch, seed) for batch in batches
+                ]
+                for future in as_completed(futures):
+                    _add_batch(rows, future.result(), checkpoint)
+            finally:
+                pool.shutdown(cancel_futures=True)
+        finally:
+            trials = sorted(rows)
+            self._results = pd.DataFrame(
+                [rows[trial] for trial in trials],
+                index=pd.Index(trials, name="trial"),
             )
-
-            # save results - compensator values
-            result.update(compensator_result)
-
-            results.append(result)
-
-        self._results = pd.DataFrame(results)
 
     def view_histogram(self, kde: bool = True) -> tuple[Figure, NDArray[np.object_]]:
         """Displays a histogram of the data.
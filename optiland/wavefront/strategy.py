@@ -184,7 +184,9 @@ class ChiefRayStrategy(ReferenceStrategy):
         opd_ref = self._correct_tilt(field, opd_ref, x=0, y=0)
 
         # 3. Trace the full grid of rays for the field
-        rays = self.optic.trace(*field, wavelength, None, self.distribution)
+        rays = self.optic.trace(
+            *field, wavelength, None, self.distribution, record="image"
+        )
         intensity = self.optic.surfaces.intensity[-1, :]
 
         # 4. Compute OPD for all rays
@@ -317,7 +319,9 @@ class CentroidStrategy(ReferenceStrategy):
             WavefrontData: Structured data for the computed wavefront.
         """
         # 1. Trace ray bundle to image surface
-        rays = self.optic.trace(*field, wavelength, None, self.distribution)
+        rays = self.optic.trace(
+            *field, wavelength, None, self.distribution, record="image"
+        )
 
         # 2. Tilt correction in object space (assures rays have identical starting OPL)
         rays.opd = self._correct_tilt(field, rays.opd)
@@ -11,6 +11,7 @@ from typing import TYPE_CHECKING
 
 import optiland.backend as be
 from optiland.distribution import BaseDistribution, create_distribution
+from optiland.raytrace.executor import get_executor
 from optiland.utils import resolve_fields, resolve_wavelengths
 
 from .strategy import create_strategy
@@ -161,16 +162,27 @@ class Wavefront:
     def _generate_data(self):
         """Generates wavefront data for all specified fields and wavelengths.
 
-        This method iterates through each field and wavelength pair and
-        delegates the computation to the selected strategy object.
+        Each field and wavelength pair is computed by the selected strategy
+        object, using the trace executor returned by `get_executor`.
         """
-        for fp in self.fields:
-            field = fp.coord
-            for wp in self.wavelengths:
-                wl = wp.value
-                data = self.strategy.compute_wavefront_data(field, wl)
+        jobs = [(fp.coord, wp.value) for fp in self.fields for wp in self.wavelengths]
+        results = get_executor().map(self, "_generate_field_data", jobs)
+        for (field, wl), data in zip(jobs, results, strict=True):
+            self.data[(field, wl)] = data
 
-                if self.remove_tilt:
-                    data.opd = self.fit_and_remove_tilt(data)
+    def _generate_field_data(self, field: tuple[float, float], wl: float):
+        """Computes the wavefront data for a single field and wavelength.
 
-                self.data[(field, wl)] = data
+        Args:
+            field (tuple[float, float]): The field coordinates.
+            wl (float): The wavelength in µm.
+
+        Returns:
+            WavefrontData: The computed wavefront data.
+        """
+        data = self.strategy.compute_wavefront_data(field, wl)
+
+        if self.remove_tilt:
+            data.opd = self.fit_and_remove_tilt(data)
+
+        return data
@@ -10,6 +10,7 @@ Kramer Harrison, 2025
 
 from __future__ import annotations
 
+import math
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, ClassVar
 
@@ -257,6 +258,45 @@ class BaseZernike(ABC):
             return be.cos(m * phi)
         return be.sin(be.abs(m) * phi)
 
+    @staticmethod
+    def _radial_term_and_derivative(n, m, r):
+        """Calculate the radial term and its derivative with respect to r.
+
+        Both are evaluated in a single pass with Horner's scheme, writing the
+        radial term as R_n^m(r) = r^m * P(r^2).
+
+        Args:
+            n (int): Radial order of the Zernike term.
+            m (int): Azimuthal order of the Zernike term.
+            r (be.ndarray): Radial distance from the origin.
+
+        Returns:
+            tuple[be.ndarray, be.ndarray]: The radial term and its derivative.
+        """
+        m = abs(int(m))
+        n = int(n)
+        num_terms = (n - m) // 2 + 1
+        u = r**2
+
+        # coefficient of r^(m + 2j) is the k = (n - m) / 2 - j term of the sum
+        p = 0.0
+        dp = 0.0
+        for j in reversed(range(num_terms)):
+            k = num_terms - 1 - j
+            coeff = (-1) ** k * math.factorial(n - k)
+            coeff /= (
+                math.factorial(k)
+                * math.factorial((n + m) // 2 - k)
+                * math.factorial((n - m) // 2 - k)
+            )
+            dp = dp * u + p
+            p = p * u + coeff
+
+        if m == 0:
+            return p, 2 * r * dp
+        r_pow = r ** (m - 1)
+        return r_pow * r * p, r_pow * (m * p + 2 * u * dp)
+
     @staticmethod
     def _radial_derivative(n, m, r):
         """Calculate the derivative of the radial term with respect to r.
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from unittest.mock import patch
+
 import numpy as np
 import pytest
 
@@ -8,6 +10,7 @@ from optiland.analysis.image_simulation import (
     DistortionWarper,
     ImageSimulationEngine,
     PSFBasisGenerator,
+    PSFCache,
 )
 from optiland.samples.objectives import CookeTriplet
 
@@ -73,3 +76,185 @@ class TestImageSimulation:
 
         resized_coeffs = gen.resize_coefficient_map(coeffs, (64, 64))
         assert resized_coeffs.shape == (2, 64, 64)
+
+
+class TestPSFCache:
+    @pytest.fixture
+    def optic(self):
+        return CookeTriplet()
+
+    def make_generator(self, optic, cache):
+        return PSFBasisGenerator(
+            optic,
+            wavelength=0.55,
+            grid_shape=(3, 3),
+            num_rays=32,
+            psf_grid_size=32,
+            cache=cache,
+        )
+
+    def test_key(self, optic):
+        key = PSFCache.make_key(optic, wavelength=0.55, num_rays=32)
+        assert key == PSFCache.make_key(CookeTriplet(), wavelength=0.55, num_rays=32)
+        assert key != PSFCache.make_key(optic, wavelength=0.65, num_rays=32)
+
+        optic.surfaces[1].geometry.radius = optic.surfaces[1].geometry.radius * 1.01
+        assert key != PSFCache.make_key(optic, wavelength=0.55, num_rays=32)
+
+    def test_memory_lru(self):
+        cache = PSFCache(max_entries=2)
+        cache.put("a", {"x": np.zeros(2)})
+        cache.put("b", {"x": np.ones(2)})
+        assert cache.get("a") is not None  # "a" is now the most recent entry
+        cache.put("c", {"x": np.ones(3)})
+
+        assert len(cache) == 2
+        assert "b" not in cache
+        assert cache.get("b") is None
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+        with pytest.raises(ValueError):
+            PSFCache(max_entries=0)
+
+    def test_basis_generator_skips_psf_generation(self, optic):
+        cache = PSFCache()
+        gen = self.make_generator(optic, cache)
+        basis = gen.generate_basis(n_components=2)
+        assert len(cache) == 2  # PSF grid and basis
+
+        with patch.object(
+            PSFBasisGenerator, "_trace_psf_grid", side_effect=AssertionError
+        ):
+            cached = self.make_generator(optic, cache).generate_basis(n_components=2)
+            # a basis with other components reuses the cached PSF grid
+            self.make_generator(optic, cache).generate_basis(n_components=1)
+
+        for x, y in zip(basis, cached, strict=True):
+            np.testing.assert_allclose(be.to_numpy(x), be.to_numpy(y))
+        uncached = self.make_generator(optic, None).generate_basis(n_components=2)
+        np.testing.assert_allclose(
+            be.to_numpy(uncached[2]), be.to_numpy(cached[2]), atol=1e-12
+        )
+
+        # changing the optic invalidates the entries
+        optic.surfaces[1].geometry.radius = optic.surfaces[1].geometry.radius * 1.01
+        with (
+            patch.object(
+                PSFBasisGenerator, "_trace_psf_grid", side_effect=RuntimeError
+            ),
+            pytest.raises(RuntimeError),
+        ):
+            self.make_generator(optic, cache).generate_basis(n_components=2)
+
+    def test_disk_layer(self, optic, tmp_path):
+        basis = self.make_generator(optic, PSFCache(directory=tmp_path))
+        eigen_psfs = basis.generate_basis(n_components=2)[0]
+        assert len(list(tmp_path.iterdir())) == 2
+
+        cache = PSFCache(directory=tmp_path)
+        key = self.make_generator(optic, cache)._cache_key("basis", n_components=2)
+        assert key in cache
+        arrays = cache.get(key)
+        assert isinstance(arrays["eigen_psfs"], np.memmap)
+        np.testing.assert_allclose(arrays["eigen_psfs"], be.to_numpy(eigen_psfs))
+
+        cache.clear(disk=True)
+        assert key not in cache
+        assert list(tmp_path.iterdir()) == []
+
+    def test_clear_keeps_unrelated_directories(self, tmp_path):
+        cache = PSFCache(directory=tmp_path)
+        key = "0" * 64
+        cache.put(key, {"a": np.ones(3)})
+        (tmp_path / f".{key}.tmp").mkdir()
+        (tmp_path / "data").mkdir()
+        (tmp_path / "data" / "file.txt").write_text("keep")
+        (tmp_path / ("f" * 64 + ".txt")).mkdir()
+
+        cache.clear(disk=True)
+        assert key not in cache
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "data",
+            "f" * 64 + ".txt",
+        ]
+        assert (tmp_path / "data" / "file.txt").read_text() == "keep"
+
+    def test_engine_shared_cache(self, optic, tmp_path):
+        img = np.zeros((16, 16), dtype=np.float32)
+        img[6:10, 6:10] = 1.0
+        config = {
+            "psf_grid_shape": (2, 2),
+            "psf_size": 32,
+            "num_rays": 32,
+            "n_components": 1,
+            "padding": 8,
+            "wavelengths": [0.55],
+            "psf_cache": str(tmp_path),
+        }
+        first = ImageSimulationEngine(optic, img, config=config).run()
+
+        engine = ImageSimulationEngine(optic, img, config=config)
+        assert isinstance(engine.config["psf_cache"], PSFCache)
+        with patch.object(
+            PSFBasisGenerator, "_trace_psf_grid", side_effect=AssertionError
+        ):
+            second = engine.run()
+        np.testing.assert_allclose(be.to_numpy(first), be.to_numpy(second))
+
+
+class TestTiledSimulation:
+    @pytest.fixture
+    def optic(self):
+        return CookeTriplet()
+
+    @pytest.fixture
+    def config(self):
+        return {
+            "psf_grid_shape": (3, 3),
+            "psf_size": 32,
+            "num_rays": 32,
+            "n_components": 2,
+            "padding": 6,
+            "psf_cache": PSFCache(),
+        }
+
+    @pytest.mark.parametrize("oversample", [1, 2])
+    def test_matches_in_memory(self, optic, config, oversample):
+        img = np.random.default_rng(0).random((21, 27, 3))
+        config["oversample"] = oversample
+        expected = ImageSimulationEngine(optic, img, config=config).run()
+
+        config.update(tile_size=8, workers=2)
+        result = ImageSimulationEngine(optic, img, config=config).run()
+        assert result.shape == (21, 27, 3)
+        np.testing.assert_allclose(result, be.to_numpy(expected), atol=1e-12)
+
+    def test_memory_mapped_input_output(self, optic, config, tmp_path):
+        img = np.random.default_rng(1).random((20, 16))
+        np.save(tmp_path / "source.npy", img)
+        config.update(wavelengths=[0.55], tile_size=8)
+        engine = ImageSimulationEngine(optic, str(tmp_path / "source.npy"), config)
+        assert isinstance(engine.source_image, np.memmap)
+
+        result = engine.run(output=tmp_path / "output.npy")
+        assert isinstance(result, np.memmap)
+        output = np.load(tmp_path / "output.npy")
+        np.testing.assert_allclose(output, result)
+
+        config["tile_size"] = None
+        expected = ImageSimulationEngine(optic, img, config=config).run()
+        np.testing.assert_allclose(output, be.to_numpy(expected), atol=1e-12)
+
+        with pytest.raises(ValueError):
+            engine.run(output=np.zeros((20, 16, 3)))
+
+    def test_distortion_map_window(self, optic):
+        warper = DistortionWarper(optic)
+        model = warper.fit_distortion_map(0.55)
+        full = be.to_numpy(warper.evaluate_distortion_map(model, (20, 30)))
+        window = warper.evaluate_distortion_map(
+            model, (20, 30), rows=slice(5, 12), cols=slice(3, 30)
+        )
+        assert window.shape == (1, 7, 27, 2)
+        np.testing.assert_allclose(be.to_numpy(window), full[:, 5:12, 3:30])
@@ -598,7 +598,7 @@ class TestNonRayOperands:
 
 
 class TestMultiWavelength:
-    """Test that rms_spot_size with wavelength='all' falls back to direct."""
+    """Test that rms_spot_size with wavelength='all' is batched."""
 
     def test_rms_spot_all_wavelengths(self):
         lens = CookeTriplet()
@@ -626,6 +626,147 @@ class TestMultiWavelength:
         assert batched == pytest.approx(standard, rel=1e-6)
 
 
+# ---------------------------------------------------------------------------
+# Tests: Merged traces and shared wavefronts
+# ---------------------------------------------------------------------------
+
+
+def _unbatched_fun_array(problem):
+    """Evaluate fun_array with per-operand evaluation."""
+    problem.disable_batching()
+    try:
+        return be.to_numpy(problem.fun_array())
+    finally:
+        problem.enable_batching()
+
+
+def _add_rms_spot(problem, lens, Hy, wavelength=0.55, num_rays=5):
+    problem.add_operand(
+        operand_type="rms_spot_size",
+        target=0.0,
+        weight=1.0,
+        input_data={
+            "optic": lens,
+            "surface_number": -1,
+            "Hx": 0.0,
+            "Hy": Hy,
+            "wavelength": wavelength,
+            "num_rays": num_rays,
+            "distribution": "hexapolar",
+        },
+    )
+
+
+class TestMergedTraces:
+    """Rays of one optic and wavelength are traced in a single call."""
+
+    def _problem(self, lens):
+        problem = optimization.OptimizationProblem()
+        for Hy in (0.0, 0.7, 1.0):
+            _add_rms_spot(problem, lens, Hy)
+        problem.add_operand(
+            operand_type="real_y_intercept",
+            target=0.0,
+            weight=1.0,
+            input_data={
+                "optic": lens,
+                "surface_number": 3,
+                "Hx": 0.0,
+                "Hy": 1.0,
+                "Px": 0.0,
+                "Py": 1.0,
+                "wavelength": 0.55,
+            },
+        )
+        return problem
+
+    def test_fields_merge_into_single_trace(self):
+        lens = CookeTriplet()
+        problem = self._problem(lens)
+        batched = be.to_numpy(problem.fun_array())
+        assert problem.trace_count == 1
+        assert batched == pytest.approx(_unbatched_fun_array(problem), rel=1e-9)
+
+    def test_vignetted_fields(self):
+        lens = CookeTriplet()
+        for field in lens.fields.fields:
+            field.vy = 0.2
+        problem = self._problem(lens)
+        batched = be.to_numpy(problem.fun_array())
+        # trace_generic for the single ray and one trace for all fields
+        assert problem.trace_count == 2
+        assert batched == pytest.approx(_unbatched_fun_array(problem), rel=1e-9)
+
+    def test_rms_spot_all_wavelengths_traces(self):
+        lens = CookeTriplet()
+        problem = optimization.OptimizationProblem()
+        _add_rms_spot(problem, lens, 1.0, wavelength="all")
+        _add_rms_spot(problem, lens, 0.0, wavelength=0.55)
+        batched = be.to_numpy(problem.fun_array())
+        num_wavelengths = len(lens.wavelengths.get_wavelengths())
+        assert problem.trace_count == num_wavelengths
+        assert batched == pytest.approx(_unbatched_fun_array(problem), rel=1e-9)
+
+    def test_clearance(self):
+        lens = CookeTriplet()
+        problem = optimization.OptimizationProblem()
+        problem.add_operand(
+            operand_type="clearance",
+            min_val=1.0,
+            weight=1.0,
+            input_data={
+                "optic": lens,
+                "line_ray_surface_idx": 1,
+                "line_ray_field_coords": (0.0, 0.0),
+                "line_ray_pupil_coords": (0.0, -1.0),
+                "point_ray_surface_idx": 3,
+                "point_ray_field_coords": (0.0, 1.0),
+                "point_ray_pupil_coords": (0.0, 0.0),
+                "wavelength": 0.55,
+            },
+        )
+        evaluator = BatchedRayEvaluator(problem)
+        assert evaluator._operand_plan[0][0] == "clearance"
+        assert len(evaluator._generic_jobs[0].ray_params) == 2
+
+        residuals = be.to_numpy(evaluator.residual_vector())
+        assert evaluator.trace_count == 1
+        problem.disable_batching()
+        assert residuals == pytest.approx(
+            be.to_numpy(problem.residual_vector()), rel=1e-9
+        )
+
+    def test_opd_difference_shares_wavefront(self):
+        lens = CookeTriplet()
+        problem = optimization.OptimizationProblem()
+        for weight in (1.0, 2.0):
+            problem.add_operand(
+                operand_type="OPD_difference",
+                target=0.0,
+                weight=weight,
+                input_data={
+                    "optic": lens,
+                    "Hx": 0.0,
+                    "Hy": 1.0,
+                    "num_rays": 3,
+                    "wavelength": 0.55,
+                },
+            )
+        evaluator = BatchedRayEvaluator(problem)
+        assert len(evaluator._wavefront_jobs) == 1
+
+        batched = be.to_numpy(evaluator.fun_array())
+        assert evaluator.trace_count == 1
+        assert batched == pytest.approx(_unbatched_fun_array(problem), rel=1e-9)
+
+    def test_trace_count_without_batching(self):
+        problem, _ = _make_problem_with_ray_operands()
+        problem.sum_squared()
+        assert problem.trace_count == 1
+        problem.disable_batching()
+        assert problem.trace_count is None
+
+
 # ---------------------------------------------------------------------------
 # Tests: Evaluator structure
 # ---------------------------------------------------------------------------
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from scipy.optimize import approx_fprime
+
+import optiland.backend as be
+from optiland.optimization import (
+    JacobianProvider,
+    LeastSquares,
+    OptimizationProblem,
+    OptimizerGeneric,
+)
+from optiland.optimization.jacobian import _BatchedDifferences
+from optiland.raytrace import get_executor, set_executor
+from optiland.samples.objectives import CookeTriplet
+
+
+def _problem():
+    lens = CookeTriplet()
+    problem = OptimizationProblem()
+    input_data = {"optic": lens}
+    problem.add_operand(
+        operand_type="f2", target=52.0, weight=1.0, input_data=input_data
+    )
+    problem.add_operand(
+        operand_type="rms_spot_size",
+        target=0.0,
+        weight=10.0,
+        input_data={
+            "optic": lens,
+            "surface_number": -1,
+            "Hx": 0.0,
+            "Hy": 1.0,
+            "num_rays": 5,
+            "wavelength": 0.55,
+            "distribution": "hexapolar",
+        },
+    )
+    problem.add_variable(lens, "radius", surface_number=1)
+    problem.add_variable(lens, "radius", surface_number=4)
+    problem.add_variable(lens, "thickness", surface_number=3)
+    return problem
+
+
+def _batched_problem():
+    lens = CookeTriplet()
+    problem = OptimizationProblem()
+    problem.add_operand(
+        operand_type="f2", target=52.0, weight=1.0, input_data={"optic": lens}
+    )
+    for Hy, wavelength in [(0.0, 0.48), (0.7, 0.55), (1.0, 0.65)]:
+        problem.add_operand(
+            operand_type="rms_spot_size",
+            target=0.0,
+            weight=10.0,
+            input_data={
+                "optic": lens,
+                "surface_number": -1,
+                "Hx": 0.0,
+                "Hy": Hy,
+                "num_rays": 4,
+                "wavelength": wavelength,
+            },
+        )
+    problem.add_operand(
+        operand_type="real_y_intercept",
+        target=0.0,
+        weight=1.0,
+        input_data={
+            "optic": lens,
+            "surface_number": -1,
+            "Hx": 0.0,
+            "Hy": 1.0,
+            "Px": 0.0,
+            "Py": 1.0,
+            "wavelength": 0.55,
+        },
+    )
+    problem.add_variable(lens, "radius", surface_number=5)
+    problem.add_variable(lens, "conic", surface_number=6)
+    problem.add_variable(lens, "thickness", surface_number=4)
+    problem.add_variable(lens, "tilt", surface_number=5, axis="x")
+    problem.add_variable(lens, "decenter", surface_number=6, axis="y")
+    return problem
+
+
+@pytest.fixture
+def restore_executor():
+    executor = get_executor()
+    yield
+    set_executor(executor)
+
+
+def test_finite_difference_jacobian():
+    problem = _problem()
+    provider = JacobianProvider(problem)
+    assert provider.method == "finite_difference"
+
+    x0 = np.array([be.to_numpy(var.value).item() for var in problem.variables])
+    r0 = be.to_numpy(problem.residual_vector())
+    jac = provider.jacobian(x0)
+    assert jac.shape == (2, 3)
+
+    # the variables are restored after the evaluation
+    x_after = [be.to_numpy(var.value).item() for var in problem.variables]
+    assert np.allclose(x_after, x0)
+    assert np.allclose(be.to_numpy(problem.residual_vector()), r0)
+
+    for i in range(2):
+        expected = approx_fprime(x0, lambda x, i=i: provider.residuals(x)[i], 1e-6)
+        assert np.allclose(jac[i], expected, rtol=1e-2, atol=1e-6)
+
+
+def test_gradient_matches_jacobian():
+    problem = _problem()
+    problem.operands[1].weight = 1.0
+    provider = JacobianProvider(problem)
+    x0 = np.array([be.to_numpy(var.value).item() for var in problem.variables])
+    jac = provider.jacobian(x0)
+    residuals = provider.residuals(x0)
+    assert np.allclose(
+        provider.gradient(x0), 2 * jac.T @ residuals, rtol=1e-3, atol=1e-6
+    )
+
+
+def test_jacobian_reuses_residuals_at_x():
+    problem = _problem()
+    provider = JacobianProvider(problem)
+    x0 = np.array([be.to_numpy(var.value).item() for var in problem.variables])
+    expected = provider.jacobian(x0)
+
+    provider = JacobianProvider(problem)
+    provider.residuals(x0)
+    with patch.object(
+        problem, "residual_vector", wraps=problem.residual_vector
+    ) as residual_vector:
+        jac = provider.jacobian(x0)
+    assert residual_vector.call_count == len(problem.variables)
+    assert np.allclose(jac, expected)
+
+
+def test_failed_residuals_are_penalized():
+    problem = _problem()
+    provider = JacobianProvider(problem)
+    x0 = np.array([be.to_numpy(var.value).item() for var in problem.variables])
+    with patch.object(problem, "residual_vector", side_effect=ValueError):
+        residuals = provider.residuals(x0)
+    assert residuals.shape == (2,)
+    assert np.isclose(np.sum(residuals**2), 1e10)
+
+
+def test_failed_merit_is_penalized():
+    problem = _problem()
+    provider = JacobianProvider(problem)
+    x0 = np.array([be.to_numpy(var.value).item() for var in problem.variables])
+    with patch.object(problem, "sum_squared", side_effect=ValueError):
+        assert provider.merit(x0) == 1e10
+    with patch.object(problem, "sum_squared", return_value=be.array(np.nan)):
+        assert provider.merit(x0) == 1e10
+
+
+@pytest.mark.parametrize("func_name", ["residuals", "merit"])
+def test_unexpected_errors_are_raised(func_name):
+    problem = _problem()
+    provider = JacobianProvider(problem)
+    x0 = np.array([be.to_numpy(var.value).item() for var in problem.variables])
+    with (
+        patch.object(problem, "residual_vector", side_effect=TypeError),
+        patch.object(problem, "sum_squared", side_effect=TypeError),
+        pytest.raises(TypeError),
+    ):
+        getattr(provider, func_name)(x0)
+
+
+def test_batched_finite_difference():
+    problem = _batched_problem()
+    assert _BatchedDifferences.from_problem(problem) is not None
+    provider = JacobianProvider(problem)
+    x0 = np.array([be.to_numpy(var.value).item() for var in problem.variables])
+    r0 = be.to_numpy(problem.residual_vector())
+    with patch("optiland.optimization.jacobian.get_executor") as get_executor:
+        jac = provider.jacobian(x0)
+        grad = provider.gradient(x0)
+    get_executor.assert_not_called()
+    assert np.allclose(be.to_numpy(problem.residual_vector()), r0)
+
+    with patch.object(_BatchedDifferences, "from_problem", return_value=None):
+        provider = JacobianProvider(problem)
+        assert np.allclose(jac, provider.jacobian(x0), rtol=1e-6, atol=1e-9)
+        assert np.allclose(grad, provider.gradient(x0), rtol=1e-6, atol=1e-9)
+
+
+def test_batched_finite_difference_requires_rays_behind_stop():
+    # the radius of surface 1 changes the entrance pupil
+    assert _BatchedDifferences.from_problem(_problem()) is None
+
+    problem = _batched_problem()
+    lens = problem.variables[0].optic
+    problem.add_variable(lens, "index", surface_number=5, wavelength=0.55)
+    assert _BatchedDifferences.from_problem(problem) is None
+
+
+def test_bounded_step_is_backward():
+    problem = _problem()
+    problem.variables[1].max_val = 20.0
+    provider = JacobianProvider(problem)
+    x0 = np.array([be.to_numpy(var.value).item() for var in problem.variables])
+    x0[1] = be.to_numpy(problem.variables[1].bounds[1]).item()
+    steps = provider._steps(x0)
+    assert steps[0] > 0
+    assert steps[1] < 0
+
+
+def test_threaded_finite_difference(restore_executor):
+    problem = _problem()
+    provider = JacobianProvider(problem)
+    x0 = np.array([be.to_numpy(var.value).item() for var in problem.variables])
+    serial = provider.jacobian(x0)
+
+    set_executor("thread", max_workers=2)
+    assert np.allclose(provider.jacobian(x0), serial)
+
+
+def test_invalid_method():
+    problem = _problem()
+    with pytest.raises(ValueError):
+        JacobianProvider(problem, method="complex_step")
+    if be.get_backend() != "torch":
+        with pytest.raises(ValueError):
+            JacobianProvider(problem, method="autograd")
+
+
+def test_least_squares_with_jacobian():
+    problem = _problem()
+    initial = be.to_numpy(problem.sum_squared()).item()
+    optimizer = LeastSquares(problem)
+    result = optimizer.optimize(maxiter=20, method_choice="trf", jac="auto")
+    assert result.njev >= 1
+    assert be.to_numpy(problem.sum_squared()).item() < initial
+
+
+def test_generic_optimizer_with_jacobian():
+    problem = _problem()
+    initial = be.to_numpy(problem.sum_squared()).item()
+    optimizer = OptimizerGeneric(problem)
+    provider = JacobianProvider(problem)
+    optimizer.optimize(method="L-BFGS-B", maxiter=10, disp=False, jac=provider)
+    assert be.to_numpy(problem.sum_squared()).item() < initial
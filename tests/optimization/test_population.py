@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import pickle
+
+import numpy as np
+import pytest
+
+import optiland.backend as be
+from optiland.optimization import (
+    SHGO,
+    BasinHopping,
+    DifferentialEvolution,
+    DualAnnealing,
+    OptimizationProblem,
+    PopulationEvaluator,
+)
+from optiland.optimization.population import evaluate_merit
+from optiland.samples.microscopes import Microscope20x
+
+
+def _problem(bounded=True):
+    lens = Microscope20x()
+    problem = OptimizationProblem()
+    radius_bounds = {"min_val": -20.0, "max_val": -2.0} if bounded else {}
+    thickness_bounds = {"min_val": 0.5, "max_val": 3.0} if bounded else {}
+    problem.add_variable(lens, "radius", surface_number=3, **radius_bounds)
+    problem.add_variable(lens, "thickness", surface_number=2, **thickness_bounds)
+    problem.add_operand(
+        operand_type="f2", target=90, weight=1.0, input_data={"optic": lens}
+    )
+    return problem
+
+
+def _population(problem, num=6):
+    x0 = np.array([be.to_numpy(var.value).item() for var in problem.variables])
+    offsets = np.linspace(-0.05, 0.05, num)[:, None]
+    return x0 + offsets * np.array([1.0, -1.0])
+
+
+def test_merit_is_cheap_to_pickle():
+    problem = _problem()
+    evaluator = PopulationEvaluator(problem, max_workers=2)
+    assert len(pickle.dumps(evaluator.merit)) < len(pickle.dumps(problem)) / 10
+    with pytest.raises(RuntimeError):
+        pickle.loads(pickle.dumps(evaluator.merit))([0.0, 0.0])
+
+
+def test_evaluate_matches_serial():
+    problem = _problem()
+    population = _population(problem)
+    expected = [evaluate_merit(problem, x) for x in population]
+
+    with PopulationEvaluator(problem, max_workers=2) as evaluator:
+        values = evaluator.evaluate(population)
+        # the pool persists between batches
+        pool = evaluator._pool
+        assert np.allclose(evaluator.evaluate(population[:3]), expected[:3])
+        assert evaluator._pool is pool
+    assert evaluator._pool is None
+    assert np.allclose(values, expected)
+
+
+def test_serial_evaluator():
+    problem = _problem()
+    population = _population(problem)
+    evaluator = PopulationEvaluator(problem, max_workers=1)
+    values = evaluator.evaluate(population)
+    assert evaluator._pool is None
+    assert np.allclose(values, [evaluate_merit(problem, x) for x in population])
+
+
+def test_gradient():
+    problem = _problem()
+    x0 = np.array([be.to_numpy(var.value).item() for var in problem.variables])
+    serial = PopulationEvaluator(problem, max_workers=1).gradient(x0)
+
+    # the problem is left at the current point
+    assert np.isclose(
+        be.to_numpy(problem.sum_squared()).item(), evaluate_merit(problem, x0)
+    )
+
+    with PopulationEvaluator(problem, max_workers=2) as evaluator:
+        assert np.allclose(evaluator.gradient(x0), serial)
+
+
+def test_invalid_workers():
+    with pytest.raises(ValueError):
+        PopulationEvaluator(_problem(), max_workers=0)
+
+
+def test_differential_evolution_with_workers():
+    problem = _problem()
+    optimizer = DifferentialEvolution(problem)
+    with PopulationEvaluator(problem, max_workers=2) as evaluator:
+        result = optimizer.optimize(maxiter=3, disp=False, workers=evaluator)
+    assert result.fun < problem.initial_value
+    assert np.isclose(be.to_numpy(problem.sum_squared()).item(), result.fun)
+
+
+def test_shgo_with_workers():
+    problem = _problem()
+    optimizer = SHGO(problem)
+    result = optimizer.optimize(n=8, workers=2)
+    assert result.fun < problem.initial_value
+
+
+def test_dual_annealing_with_workers():
+    problem = _problem()
+    optimizer = DualAnnealing(problem)
+    result = optimizer.optimize(maxiter=3, disp=False, workers=2)
+    assert result.fun < problem.initial_value
+
+
+def test_basin_hopping_with_workers():
+    problem = _problem(bounded=False)
+    optimizer = BasinHopping(problem)
+    result = optimizer.optimize(niter=2, workers=2)
+    assert result.fun < problem.initial_value
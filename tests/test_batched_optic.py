@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import copy
+
+import numpy as np
+import pytest
+
+import optiland.backend as be
+from optiland.samples.objectives import ReverseTelephoto
+from optiland.tolerancing import BatchedOptic
+
+
+@pytest.fixture
+def optic():
+    return ReverseTelephoto()
+
+
+def nominal_rays(optic, Hx, Hy, Px, Py, wavelength):
+    tracer = optic.ray_tracer
+    Hx, Hy, Px, Py = tracer._validate_array_size(Hx, Hy, Px, Py)
+    return tracer.ray_generator.generate_rays(Hx, Hy, Px, Py, wavelength)
+
+
+def make_batch(optic, size=4):
+    rng = np.random.default_rng(0)
+    radius = float(optic.surfaces.radii[2])
+    thickness = float(optic.surfaces.get_thickness(4)[0])
+    batch = BatchedOptic(optic, size)
+    batch.add_perturbation("radius", radius + rng.normal(0, 0.05, size), 2)
+    batch.add_perturbation("conic", rng.normal(0, 0.01, size), 3)
+    batch.add_perturbation("thickness", thickness + rng.normal(0, 0.01, size), 4)
+    batch.add_perturbation("decenter", rng.normal(0, 0.01, size), 5, axis="x")
+    batch.add_perturbation("tilt", rng.normal(0, 0.001, size), 6, axis="y")
+    batch.add_perturbation("index", 1.6 + rng.normal(0, 0.001, size), 3)
+    return batch
+
+
+def test_trace_generic_matches_instances(optic):
+    batch = make_batch(optic)
+    Px = be.linspace(-1, 1, 5)
+    Py = be.linspace(-0.5, 0.5, 5)
+    rays = batch.trace_generic(0, 1, Px, Py, 0.55)
+    assert be.size(rays.x) == 4 * 5
+
+    x = be.to_numpy(batch.split(rays.x))
+    y = be.to_numpy(batch.split(rays.y))
+    reference = nominal_rays(optic, 0, 1, Px, Py, 0.55)
+    for index in range(batch.size):
+        instance_rays = copy.deepcopy(reference)
+        batch.instance(index).surfaces.trace(instance_rays)
+        assert be.to_numpy(instance_rays.x) == pytest.approx(x[index], abs=1e-10)
+        assert be.to_numpy(instance_rays.y) == pytest.approx(y[index], abs=1e-10)
+
+
+def test_trace_distribution(optic):
+    batch = make_batch(optic, size=3)
+    rays = batch.trace(0, 0.7, 0.55, num_rays=3, distribution="hexapolar")
+    assert batch.split(rays.x).shape[0] == 3
+
+
+def test_unperturbed_batch_matches_optic(optic):
+    batch = BatchedOptic(optic, 2)
+    radius = float(optic.surfaces.radii[1])
+    batch.add_perturbation("radius", [radius, radius], 1)
+    rays = batch.trace_generic(0, 1, 0, 1, 0.55)
+    reference = optic.trace_generic(0, 1, 0, 1, 0.55)
+    assert be.to_numpy(rays.y) == pytest.approx(np.repeat(be.to_numpy(reference.y), 2))
+
+
+def test_optic_not_modified(optic):
+    radius = float(optic.surfaces.radii[2])
+    batch = make_batch(optic)
+    batch.trace(0, 1, 0.55, num_rays=3)
+    batch.instance(0)
+    assert float(optic.surfaces.radii[2]) == pytest.approx(radius)
+
+
+def test_rms_spot_radius(optic):
+    batch = make_batch(optic)
+    spot = be.to_numpy(batch.rms_spot_radius(0, 1, 0.55, num_rays=4))
+    assert spot.shape == (4,)
+    assert np.all(spot > 0)
+
+
+@pytest.mark.parametrize(
+    "variable_type, values, surface_number, kwargs",
+    [
+        ("asphere_coeff", [0.0, 0.0], 1, {}),
+        ("radius", [1.0], 1, {}),
+        ("radius", [1.0, 1.0], 0, {}),
+        ("decenter", [0.0, 0.0], 1, {"axis": "w"}),
+        ("tilt", [0.0, 0.0], 1, {"axis": "z"}),
+        ("thickness", [1.0, 1.0], 0, {}),
+    ],
+)
+def test_invalid_perturbation(optic, variable_type, values, surface_number, kwargs):
+    batch = BatchedOptic(optic, 2)
+    with pytest.raises(ValueError):
+        batch.add_perturbation(variable_type, values, surface_number, **kwargs)
+
+
+def test_invalid_size(optic):
+    with pytest.raises(ValueError):
+        BatchedOptic(optic, 0)
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import optiland.backend as be
+from optiland.optic import Optic
+from optiland.rays import BufferedRealRays, RealRays
+from optiland.samples.objectives import CookeTriplet
+from optiland.samples.telescopes import HubbleTelescope
+from tests.utils import assert_allclose
+
+
+def _random_rays(num_rays=50, seed=0):
+    rng = np.random.default_rng(seed)
+    L = rng.uniform(-0.2, 0.2, num_rays)
+    M = rng.uniform(-0.2, 0.2, num_rays)
+    N = np.sqrt(1 - L**2 - M**2)
+    return dict(
+        x=rng.uniform(-1, 1, num_rays),
+        y=rng.uniform(-1, 1, num_rays),
+        z=rng.uniform(-1, 1, num_rays),
+        L=L,
+        M=M,
+        N=N,
+        intensity=np.ones(num_rays),
+        wavelength=np.full(num_rays, 0.55),
+    )
+
+
+def _assert_rays_equal(a, b):
+    for attr in ["x", "y", "z", "L", "M", "N", "i", "w", "opd"]:
+        assert_allclose(getattr(a, attr), getattr(b, attr))
+
+
+def test_buffer_layout():
+    rays = BufferedRealRays(**_random_rays())
+    assert rays.buffer.shape == (12, 50)
+    assert rays.num_rays == 50
+    assert rays.x.base is rays.buffer
+    assert rays.L0 is None
+    assert rays.x.flags["C_CONTIGUOUS"]
+
+
+def test_assignment_writes_into_buffer():
+    rays = BufferedRealRays(**_random_rays())
+    rays.x = rays.x + 1.0
+    assert_allclose(rays.buffer[0], rays.x)
+    rays.L0 = rays.L
+    assert_allclose(rays.L0, rays.L)
+    rays.L0 = None
+    assert rays.L0 is None
+
+
+def test_scalar_inputs():
+    rays = BufferedRealRays(0.0, [1.0, 2.0], 0.0, 0.0, 0.0, 1.0, 1.0, 0.55)
+    assert_allclose(rays.x, [0.0, 0.0])
+    assert_allclose(rays.y, [1.0, 2.0])
+    assert_allclose(rays.w, [0.55, 0.55])
+
+
+def test_from_rays_copies_state():
+    rays = RealRays(**_random_rays())
+    rays.opd = rays.opd + 3.0
+    buffered = BufferedRealRays.from_rays(rays)
+    _assert_rays_equal(buffered, rays)
+    buffered.x[:] = 0.0
+    assert not np.allclose(rays.x, 0.0)
+
+
+@pytest.mark.parametrize("method", ["rotate_x", "rotate_y", "rotate_z"])
+def test_rotation_matches_real_rays(method):
+    rays = RealRays(**_random_rays())
+    buffered = BufferedRealRays(**_random_rays())
+    getattr(rays, method)(0.3)
+    getattr(buffered, method)(0.3)
+    _assert_rays_equal(buffered, rays)
+
+
+def test_translate_and_propagate_match_real_rays():
+    rays = RealRays(**_random_rays())
+    buffered = BufferedRealRays(**_random_rays())
+    t = np.linspace(0, 5, 50)
+    for r in (rays, buffered):
+        r.translate(0.1, -0.2, 0.3)
+        r.propagate(t)
+    _assert_rays_equal(buffered, rays)
+
+
+def test_refract_and_reflect_match_real_rays():
+    rays = RealRays(**_random_rays())
+    buffered = BufferedRealRays(**_random_rays())
+    nx, ny, nz = 0.1, -0.05, -np.sqrt(1 - 0.1**2 - 0.05**2)
+    for r in (rays, buffered):
+        r.refract(nx, ny, nz, 1.0, 1.5)
+    _assert_rays_equal(buffered, rays)
+    assert_allclose(buffered.L0, rays.L0)
+    for r in (rays, buffered):
+        r.reflect(nx, ny, nz)
+    _assert_rays_equal(buffered, rays)
+
+
+def test_clip_and_normalize():
+    buffered = BufferedRealRays(**_random_rays())
+    buffered.clip(buffered.x > 0)
+    assert np.all(buffered.i[buffered.x > 0] == 0.0)
+    buffered.L = buffered.L * 2
+    buffered.normalize()
+    assert_allclose(buffered.L**2 + buffered.M**2 + buffered.N**2, 1.0)
+
+
+@pytest.mark.parametrize("optic_class", [CookeTriplet, HubbleTelescope])
+def test_trace_matches_unbuffered(optic_class):
+    optic = optic_class()
+    reference = optic.trace(0.0, 1.0, 0.55, num_rays=64, distribution="uniform")
+
+    optic.ray_tracer.use_ray_buffer = True
+    rays = optic.trace(0.0, 1.0, 0.55, num_rays=64, distribution="uniform")
+
+    assert isinstance(rays, BufferedRealRays)
+    _assert_rays_equal(rays, reference)
+
+
+def test_recorded_data_matches_unbuffered():
+    optic = CookeTriplet()
+    optic.trace(0.0, 1.0, 0.55, num_rays=64, distribution="uniform")
+    reference = [optic.surfaces.x, optic.surfaces.L, optic.surfaces.opd]
+
+    optic.ray_tracer.use_ray_buffer = True
+    rays = optic.trace(0.0, 1.0, 0.55, num_rays=64, distribution="uniform")
+
+    for recorded, expected in zip(
+        [optic.surfaces.x, optic.surfaces.L, optic.surfaces.opd], reference
+    ):
+        assert_allclose(recorded, expected)
+    # recorded data is a copy and must not follow later updates of the rays
+    image_x = optic.surfaces[-1].x.copy()
+    rays.translate(1.0, 0.0, 0.0)
+    assert_allclose(optic.surfaces[-1].x, image_x)
+
+
+def test_trace_generic_tilted_surface():
+    optic = Optic()
+    optic.surfaces.add(index=0, thickness=be.inf)
+    optic.surfaces.add(index=1, thickness=5, radius=20, material="N-BK7", is_stop=True)
+    optic.surfaces.add(index=2, thickness=10, radius=-30, rx=0.05, dy=0.2)
+    optic.surfaces.add(index=3)
+    optic.set_aperture(aperture_type="EPD", value=5)
+    optic.fields.set_type(field_type="angle")
+    optic.fields.add(y=0)
+    optic.wavelengths.add(value=0.55, is_primary=True)
+
+    Px = np.linspace(-1, 1, 11)
+    reference = optic.trace_generic(0.0, 0.0, Px, 0.0, 0.55)
+    optic.ray_tracer.use_ray_buffer = True
+    rays = optic.trace_generic(0.0, 0.0, Px, 0.0, 0.55)
+    _assert_rays_equal(rays, reference)
+
+
+def test_requires_numpy_backend():
+    if "torch" not in be.list_available_backends():
+        pytest.skip("torch not available")
+    be.set_backend("torch")
+    try:
+        with pytest.raises(ValueError):
+            BufferedRealRays(**_random_rays())
+    finally:
+        be.set_backend("numpy")
@@ -303,3 +303,22 @@ class TestThinFilmCoatings:
 
         assert be.all(rays_r.i >= 0)
         assert be.all(rays_t.i >= 0)
+
+    def test_thin_film_coating_lookup_table(self, rays_non_parallel):
+        air = materials.IdealMaterial(n=1.0)
+        glass = materials.Material("N-BK7")
+        coating = coatings.ThinFilmCoating(
+            material_pre=air,
+            material_post=glass,
+            layers=[(materials.IdealMaterial(n=1.38), 100.0, "MgF2")],
+        )
+        aoi = be.linspace(0.0, 1.0, 10)
+        expected = coating.jones.calculate_matrix(rays_non_parallel, aoi=aoi)
+
+        table = coating.enable_lookup_table(1.0)
+        assert coating.stack.lookup_table is table
+        result = coating.jones.calculate_matrix(rays_non_parallel, aoi=aoi)
+        assert_allclose(result, expected, atol=table.max_error)
+
+        coating.disable_lookup_table()
+        assert coating.stack.lookup_table is None
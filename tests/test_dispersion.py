@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from importlib import resources
+
+import numpy as np
+import pytest
+
+import optiland.backend as be
+from optiland import materials
+from optiland.materials.dispersion import FORMULAS, DispersionTable, evaluate_dispersion
+from optiland.samples.objectives import CookeTriplet
+
+from .utils import assert_allclose
+
+MATERIAL_FILES = [
+    "data-nk/glass/ami/AMTIR-3.yml",  # formula 1
+    "data-nk/glass/schott/BAFN6.yml",  # formula 2
+    "data-nk/glass/hikari/BASF6.yml",  # formula 3
+    "data-nk/main/CaGdAlO4/Loiko-o.yml",  # formula 4
+    "data-nk/main/YbF3/Amotchkina.yml",  # formula 5
+    "data-nk/main/Ag/Johnson.yml",  # tabulated nk
+]
+
+
+def material_file(path):
+    return materials.MaterialFile(
+        str(resources.files("optiland.database").joinpath(path))
+    )
+
+
+@pytest.fixture
+def material_set():
+    return [
+        materials.Material("N-BK7"),
+        materials.Material("SF11"),
+        materials.Material("N-SF5"),
+        *[material_file(path) for path in MATERIAL_FILES],
+        materials.IdealMaterial(n=1.6),
+        materials.AbbeMaterial(n=1.55, abbe=60, model="buchdahl"),
+    ]
+
+
+def reference(material_list, wavelengths, **kwargs):
+    return np.stack(
+        [
+            np.broadcast_to(
+                be.to_numpy(material._calculate_n(wavelengths, **kwargs)),
+                (len(wavelengths),),
+            )
+            for material in material_list
+        ]
+    )
+
+
+class TestEvaluateDispersion:
+    def test_matches_materials(self, set_test_backend, material_set):
+        wavelengths = be.linspace(0.45, 0.7, 11)
+        n = evaluate_dispersion(material_set, wavelengths)
+        assert n.shape == (len(material_set), 11)
+        assert_allclose(n, reference(material_set, wavelengths), rtol=1e-14)
+
+    def test_environmental_correction(self, set_test_backend, material_set):
+        wavelengths = be.linspace(0.45, 0.7, 11)
+        n = evaluate_dispersion(
+            material_set, wavelengths, temperature=45.0, pressure=0.8
+        )
+        expected = reference(material_set, wavelengths, temperature=45.0, pressure=0.8)
+        assert_allclose(n, expected, rtol=1e-14)
+
+        # the correction changes the index of materials with thermal data
+        nominal = evaluate_dispersion(material_set, wavelengths)
+        assert not np.allclose(be.to_numpy(n[0]), be.to_numpy(nominal[0]))
+
+    def test_empty(self, set_test_backend):
+        assert evaluate_dispersion([], [0.5, 0.6]).shape == (0, 2)
+
+    def test_stacked_formula(self, set_test_backend):
+        bk7 = materials.Material("N-BK7")
+        sf11 = materials.Material("SF11")
+        c = be.stack([be.ravel(bk7.coefficients), be.ravel(sf11.coefficients)], 1)
+        n = FORMULAS["formula 2"](c[:, :, None], be.array([0.5, 0.6]))
+        assert n.shape == (2, 2)
+        assert_allclose(n[1], sf11.n(be.array([0.5, 0.6])))
+
+    def test_invalid_coefficients(self, set_test_backend):
+        material = materials.Material("N-BK7")
+        material.coefficients = be.reshape(be.array([1.0, 0.58, 0.12, 0.87]), (-1, 1))
+        with pytest.raises(ValueError):
+            evaluate_dispersion([material], [0.55])
+
+
+class TestDispersionTable:
+    def test_values(self, set_test_backend, material_set):
+        table = DispersionTable(material_set, [0.6, 0.5, 0.6])
+        assert_allclose(table.wavelengths, [0.5, 0.6])
+        assert_allclose(table.n(material_set[1]), material_set[1].n(table.wavelengths))
+        with pytest.raises(ValueError):
+            table.n(materials.IdealMaterial(n=1.6))
+
+    def test_lookup(self, material_set):
+        table = DispersionTable(material_set, [0.5, 0.6])
+        expected = [material.n(0.5) for material in material_set]
+        rays_w = np.array([0.5, 0.6, 0.6, 0.5])
+        expected_rays = reference(material_set, rays_w)
+        calls = {"count": 0}
+
+        def count(*args, **kwargs):
+            calls["count"] += 1
+            return 1.0
+
+        with table.activate():
+            for material, value, values in zip(
+                material_set, expected, expected_rays, strict=True
+            ):
+                # replace the method without modifying the material
+                object.__setattr__(material, "_calculate_n", count)
+                material._n_cache.clear()
+                assert np.shape(material.n(0.5)) == np.shape(value)
+                assert_allclose(material.n(0.5), value)
+                assert_allclose(material.n(rays_w), values, rtol=1e-14)
+        assert calls["count"] == 0
+
+    def test_lookup_misses(self):
+        material = materials.Material("N-BK7")
+        table = DispersionTable([material], [0.5, 0.6])
+        with table.activate():
+            assert material._dispersion.lookup(material, 0.55, {}) is None
+            assert material._dispersion.lookup(material, [0.5, 0.55], {}) is None
+            assert (
+                material._dispersion.lookup(material, 0.5, {"temperature": 30.0})
+                is None
+            )
+            assert_allclose(material.n(0.55), material._calculate_n(0.55))
+        assert material._dispersion is None
+
+    def test_environment(self):
+        material = materials.Material("N-BK7")
+        table = DispersionTable([material], [0.5], temperature=40.0)
+        with table.activate():
+            row = material._dispersion
+            assert_allclose(
+                row.lookup(material, 0.5, {"temperature": 40.0}),
+                material._calculate_n(0.5, temperature=40.0),
+            )
+            assert row.lookup(material, 0.5, {}) is None
+
+    def test_modified_material(self):
+        material = materials.IdealMaterial(n=1.5)
+        table = DispersionTable([material], [0.55])
+        revision = material.revision
+        table.attach()
+        assert material.revision == revision
+        assert_allclose(material._dispersion.lookup(material, 0.55, {}), 1.5)
+
+        material.index = be.array([1.7])
+        assert material._dispersion.lookup(material, 0.55, {}) is None
+        table.detach()
+
+    def test_trace(self):
+        lens = CookeTriplet()
+        rays = lens.trace(0, 1, 0.55, num_rays=64, distribution="uniform")
+        expected = [be.copy(value) for value in (rays.x, rays.y, rays.L, rays.opd)]
+
+        table = DispersionTable.from_optic(lens)
+        for surface in lens.surfaces:
+            assert any(m is surface.material_post for m in table.materials)
+        assert_allclose(table.wavelengths, lens.wavelengths.get_wavelengths())
+        with table.activate():
+            rays = lens.trace(0, 1, 0.55, num_rays=64, distribution="uniform")
+        for value, reference_value in zip(
+            (rays.x, rays.y, rays.L, rays.opd), expected, strict=True
+        ):
+            assert_allclose(value, reference_value)
@@ -10,7 +10,7 @@ from matplotlib.axes import Axes
 from matplotlib.figure import Figure
 
 import optiland.backend as be
-from optiland.psf import FFTPSF
+from optiland.psf import FFTPSF, BatchedFFTPSF
 from optiland.psf.fft import calculate_grid_size
 from optiland.samples.objectives import CookeTriplet
 
@@ -238,3 +238,39 @@ def test_large_threshold(make_fftpsf):
     assert min_y == 0
     assert max_x == 128
     assert max_y == 128
+
+
+@pytest.mark.parametrize("batch_size", [None, 2])
+def test_batched_psf_matches_fftpsf(set_test_backend, batch_size):
+    optic = CookeTriplet()
+    batched = BatchedFFTPSF(optic, num_rays=32, grid_size=64, batch_size=batch_size)
+    assert batched.psf.shape == (3, 3, 64, 64)
+    for i, field in enumerate(batched.fields):
+        for j, wavelength in enumerate(batched.wavelengths):
+            fftpsf = FFTPSF(optic, field, wavelength, num_rays=32, grid_size=64)
+            assert_allclose(batched.psf[i, j], fftpsf.psf, atol=1e-9)
+
+
+def test_batched_psf_otf(set_test_backend):
+    optic = CookeTriplet()
+    batched = BatchedFFTPSF(
+        optic, fields=[(0, 0), (0, 1)], wavelengths="primary", num_rays=64
+    )
+    num_rays, grid_size = calculate_grid_size(64)
+    assert batched.num_rays == num_rays
+    assert batched.psf.shape == (2, 1, grid_size, grid_size)
+
+    otf = batched.otf()
+    assert otf.shape == (2, 1, grid_size, grid_size // 2 + 1)
+    expected = be.fft.fft2(batched.psf[1, 0])
+    assert_allclose(otf[1, 0], expected[:, : grid_size // 2 + 1], atol=1e-6)
+
+
+def test_batched_psf_invalid_arguments(set_test_backend):
+    optic = CookeTriplet()
+    with pytest.raises(ValueError):
+        BatchedFFTPSF(optic, num_rays=16)
+    with pytest.raises(ValueError):
+        BatchedFFTPSF(optic, num_rays=64, grid_size=32)
+    with pytest.raises(ValueError):
+        BatchedFFTPSF(optic, num_rays=32, grid_size=64, batch_size=0)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import pytest
+
+import optiland.backend as be
+from optiland.physical_apertures import RadialAperture
+from optiland.rays import RealRays
+from optiland.samples.objectives import CookeTriplet, DoubleGauss
+from optiland.samples.simple import AsphericSinglet
+from optiland.samples.telescopes import HubbleTelescope
+from optiland.surfaces.fused_conic import supports_fused_trace
+from tests.utils import assert_allclose
+
+ATTRS = ["x", "y", "z", "L", "M", "N", "i", "opd"]
+
+
+def _trace(lens, fused, buffered=False, Hy=1.0):
+    lens.ray_tracer.use_fused_kernels = fused
+    lens.ray_tracer.use_ray_buffer = buffered
+    return lens.trace(0.0, Hy, 0.55, num_rays=16, distribution="uniform")
+
+
+@pytest.mark.parametrize("lens_cls", [CookeTriplet, DoubleGauss, HubbleTelescope])
+@pytest.mark.parametrize("buffered", [False, True])
+def test_fused_matches_generic(lens_cls, buffered):
+    lens = lens_cls()
+    generic = _trace(lens, fused=False)
+    generic_y = be.copy(lens.surfaces.y)
+    fused = _trace(lens, fused=True, buffered=buffered)
+
+    for attr in ATTRS:
+        assert_allclose(getattr(fused, attr), getattr(generic, attr))
+    assert_allclose(lens.surfaces.y, generic_y)
+
+
+def test_fused_aperture_and_decenter():
+    lens = CookeTriplet()
+    lens.surfaces[3].aperture = RadialAperture(r_max=4.0, r_min=0.5)
+    lens.surfaces[5].geometry.cs.y = be.array(0.2)
+
+    generic = _trace(lens, fused=False, Hy=0.7)
+    fused = _trace(lens, fused=True, Hy=0.7)
+    assert be.sum(generic.i == 0) > 0
+    for attr in ATTRS:
+        assert_allclose(getattr(fused, attr), getattr(generic, attr))
+
+
+def test_fused_falls_back_for_unsupported_surfaces():
+    lens = AsphericSinglet()
+    generic = _trace(lens, fused=False)
+    fused = _trace(lens, fused=True)
+    for attr in ATTRS:
+        assert_allclose(getattr(fused, attr), getattr(generic, attr))
+
+    rays = RealRays(0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 1.0, 0.55)
+    assert not supports_fused_trace(lens.surfaces[2], rays)
+
+    lens = CookeTriplet()
+    assert supports_fused_trace(lens.surfaces[1], rays)
+    lens.surfaces[1].geometry.cs.rx = be.array(0.1)
+    assert not supports_fused_trace(lens.surfaces[1], rays)
+
+
+def test_fused_sets_pre_surface_cosines():
+    lens = CookeTriplet()
+    _trace(lens, fused=False)
+    generic_N = be.copy(lens.surfaces[2].N)
+    rays = _trace(lens, fused=True)
+    assert rays.L0 is not None
+    assert_allclose(lens.surfaces[2].N, generic_N)
@@ -24,6 +24,75 @@ from optiland.rays import RealRays
 from .utils import assert_allclose, assert_array_equal
 
 
+@pytest.mark.parametrize(
+    "geometry_factory",
+    [
+        lambda cs: geometries.EvenAsphere(
+            cs, radius=-41.1, conic=0.3, coefficients=[1e-3, -1e-5, 1e-7]
+        ),
+        lambda cs: geometries.OddAsphere(
+            cs, radius=30.0, conic=0.1, coefficients=[1e-3, -2e-4, 1e-5]
+        ),
+        lambda cs: geometries.PolynomialGeometry(
+            cs,
+            radius=30.0,
+            conic=0.1,
+            coefficients=be.array([[0.0, 1e-3, 2e-4], [1e-3, -1e-4, 0.0]]),
+        ),
+        lambda cs: geometries.ChebyshevPolynomialGeometry(
+            cs,
+            radius=-26.0,
+            conic=0.1,
+            coefficients=be.array([[0.0, 1e-2, -2e-3], [0.1, 1e-2, -1e-3]]),
+            norm_x=10,
+            norm_y=10,
+        ),
+        lambda cs: geometries.ZernikePolynomialGeometry(
+            cs,
+            radius=30.0,
+            conic=0.1,
+            coefficients=[0.0, 1e-3, -2e-3, 5e-4, 1e-4, -3e-4, 2e-4, 1e-4, 1e-4],
+            norm_radius=5.0,
+        ),
+        lambda cs: geometries.StandardGeometry(cs, radius=-12.0, conic=-0.5),
+    ],
+)
+def test_sag_and_gradient(set_test_backend, geometry_factory):
+    geometry = geometry_factory(CoordinateSystem())
+    x = be.array([0.2, 1.0, -2.0, 0.5, 3.1])
+    y = be.array([-0.1, 0.5, 1.5, -2.5, -0.2])
+
+    sag, dfdx, dfdy = geometry.sag_and_gradient(x, y)
+    assert_allclose(sag, geometry.sag(x, y))
+
+    # the gradient is the derivative of the sag
+    h = 1e-6
+    assert_allclose(
+        dfdx, (geometry.sag(x + h, y) - geometry.sag(x - h, y)) / (2 * h), atol=1e-7
+    )
+    assert_allclose(
+        dfdy, (geometry.sag(x, y + h) - geometry.sag(x, y - h)) / (2 * h), atol=1e-7
+    )
+
+
+def test_sag_and_gradient_default(set_test_backend):
+    # the default is derived from the surface normal of the geometry
+    cs = CoordinateSystem()
+    x_grid = be.linspace(-2.0, 2.0, 5)
+    X, Y = be.meshgrid(x_grid, x_grid)
+    geometry = geometries.GridSagGeometry(cs, x_grid, x_grid, 0.1 * X + 0.2 * Y)
+
+    x = be.array([0.5, -1.0])
+    y = be.array([0.25, 1.5])
+    sag, dfdx, dfdy = geometry.sag_and_gradient(x, y)
+    rays = RealRays(x, y, sag, 0.0, 0.0, 1.0, 1.0, 0.55)
+    nx, ny, nz = geometry.surface_normal(rays)
+
+    assert_allclose(sag, geometry.sag(x, y))
+    assert_allclose(dfdx, -nx / nz)
+    assert_allclose(dfdy, -ny / nz)
+
+
 def test_unknown_geometry(set_test_backend):
     with pytest.raises(ValueError):
         geometries.BaseGeometry.from_dict({"type": "UnknownGeometry"})
@@ -318,6 +387,56 @@ class TestEvenAsphere:
         distance = geometry.distance(rays)
         assert_allclose(distance, 10.625463223037386)
 
+    def test_distance_active_set(self, set_test_backend):
+        cs = CoordinateSystem()
+        geometry = geometries.EvenAsphere(
+            cs,
+            radius=-41.1,
+            conic=0.0,
+            coefficients=[1e-3, -1e-5, 1e-7],
+        )
+
+        # the last ray misses the surface and must not hold up the others
+        rays = RealRays(
+            [1.0, 2.0, 0.0],
+            [2.0, 3.0, 0.0],
+            [-3.0, -4.0, -1.0],
+            [0.0, 0.0, 1.0],
+            [0.0, 0.0, 0.0],
+            [1.0, 1.0, 0.0],
+            [1.0, 1.0, 1.0],
+            [1.0, 1.0, 1.0],
+        )
+        distance = geometry.distance(rays)
+        assert_allclose(distance[:2], [2.9438901710409624, 3.8530733934173256])
+        assert be.to_numpy(geometry.iterations[:2]).max() < 10
+        assert be.to_numpy(geometry.iterations).max() < geometry.max_iter
+
+    def test_distance_safeguard(self, set_test_backend):
+        cs = CoordinateSystem()
+        geometry = geometries.EvenAsphere(
+            cs,
+            radius=-41.1,
+            conic=0.0,
+            coefficients=[1e-3, -1e-5, 1e-7],
+        )
+        L = 0.222
+        M = -0.229
+        N = np.sqrt(1 - L**2 - M**2)
+        rays = RealRays(1.0, 2.0, -10.2, L, M, N, 1.0, 0.0)
+        expected = geometry.distance(rays)
+
+        geometry.safeguard = True
+        assert_allclose(geometry.distance(rays), expected)
+        assert_allclose(geometry.distance(rays), 10.625463223037386)
+
+    def test_bracket_step(self, set_test_backend):
+        t_new = be.array([0.5, 3.0, 3.0])
+        t_pos = be.array([0.0, 0.0, be.nan])
+        t_neg = be.array([1.0, 1.0, 1.0])
+        t = geometries.NewtonRaphsonGeometry._bracket_step(t_new, t_pos, t_neg)
+        assert_allclose(t, [0.5, 0.5, 3.0])
+
     def test_surface_normal(self, set_test_backend):
         cs = CoordinateSystem()
         geometry = geometries.EvenAsphere(
@@ -607,11 +726,13 @@ class TestChebyshevGeometry:
             norm_y=10,
         )
 
+        # the normal follows the derivative of the sag, including the
+        # 1/norm_x and 1/norm_y factors of the normalized coordinates
         rays = RealRays(1.0, 2.0, 3.0, 0.0, 0.0, 1.0, 1.0, 1.0)
         nx, ny, nz = geometry.surface_normal(rays)
-        assert_allclose(nx, 0.14317439)
-        assert_allclose(ny, -0.07668599)
-        assert_allclose(nz, -0.98672202)
+        assert_allclose(nx, -0.02018265)
+        assert_allclose(ny, -0.07704044)
+        assert_allclose(nz, -0.99682367)
 
     def test_invalid_input(self, set_test_backend):
         cs = CoordinateSystem()
@@ -910,128 +1031,130 @@ class TestZernikeGeometry:
 
         assert_allclose(sag, reference, atol=1e-6)
 
+    # normals derived from the derivative of the sag, i.e., including the
+    # normalization constants of the standard (and Noll) Zernike terms
     REFERENCE_GRADIENT = {
         "standard": np.array(
             [
                 [
-                    [-0.69922039, -0.58360519, -0.41291141],
-                    [-0.58584794, -0.61891081, -0.52319365],
-                    [-0.43588997, -0.64349955, -0.62921242],
-                    [-0.26225921, -0.65565742, -0.70804905],
-                    [-0.08528575, -0.66166676, -0.74493183],
-                    [0.0823724, -0.6690924, -0.73860012],
-                    [0.23882481, -0.67838895, -0.69480295],
-                    [0.3845705, -0.68243823, -0.62159761],
-                    [0.51637133, -0.67277311, -0.52984619],
-                    [0.62879296, -0.6460985, -0.43263859],
+                    [-0.77811617, -0.57389089, -0.25531249],
+                    [-0.68845574, -0.63248963, -0.35494444],
+                    [-0.54087516, -0.69466327, -0.47423306],
+                    [-0.3302144, -0.74471361, -0.57996559],
+                    [-0.09353888, -0.77236329, -0.62825586],
+                    [0.11945966, -0.78504257, -0.60781374],
+                    [0.29258823, -0.78933162, -0.53976636],
+                    [0.43361254, -0.78061748, -0.45012945],
+                    [0.55132462, -0.75330052, -0.35857982],
+                    [0.64947777, -0.70818153, -0.276871],
                 ],
                 [
-                    [-0.7230823, -0.47869456, -0.4979995],
-                    [-0.59800005, -0.49121134, -0.63333037],
-                    [-0.43588123, -0.48759509, -0.75647775],
-                    [-0.25922765, -0.47392709, -0.84154271],
-                    [-0.09042355, -0.464726, -0.88082537],
-                    [0.06666968, -0.47050177, -0.87987683],
-                    [0.22143063, -0.49048026, -0.84285087],
-                    [0.38011481, -0.51327155, -0.76945763],
-                    [0.53510722, -0.5231329, -0.6633191],
-                    [0.66943028, -0.51063855, -0.53954738],
+                    [-0.8156317, -0.48187914, -0.32021466],
+                    [-0.72602408, -0.5115538, -0.45956692],
+                    [-0.57093309, -0.52860442, -0.62818212],
+                    [-0.35251056, -0.52584554, -0.77409481],
+                    [-0.12098085, -0.52128461, -0.84476386],
+                    [0.08581655, -0.54060469, -0.83688834],
+                    [0.27327086, -0.58091074, -0.76672404],
+                    [0.45011844, -0.61308476, -0.64924607],
+                    [0.6060158, -0.61082644, -0.50954481],
+                    [0.72725849, -0.57283248, -0.37809793],
                 ],
                 [
-                    [-0.72966613, -0.36532612, -0.57803474],
-                    [-0.5858297, -0.35634459, -0.72788879],
-                    [-0.40989935, -0.32987631, -0.85039059],
-                    [-0.23593263, -0.29876348, -0.92470329],
-                    [-0.08398426, -0.2790976, -0.95658307],
-                    [0.05314045, -0.27901255, -0.95881598],
-                    [0.19586825, -0.29730614, -0.93447562],
-                    [0.35891437, -0.32458199, -0.87511542],
-                    [0.53485494, -0.34500852, -0.77129716],
-                    [0.69399255, -0.34507355, -0.63190077],
+                    [-0.83444126, -0.388896, -0.3904711],
+                    [-0.72699185, -0.38704114, -0.56717017],
+                    [-0.54291983, -0.35229852, -0.76231477],
+                    [-0.31616047, -0.29363813, -0.90211929],
+                    [-0.11629652, -0.25302401, -0.96044467],
+                    [0.04862539, -0.25797462, -0.96492729],
+                    [0.22063304, -0.30472693, -0.92653255],
+                    [0.42745119, -0.3641144, -0.82746975],
+                    [0.63718027, -0.39318741, -0.66287628],
+                    [0.79265568, -0.37534468, -0.48043038],
                 ],
                 [
-                    [-0.72364456, -0.24726071, -0.64436069],
-                    [-0.55950744, -0.22712405, -0.79709855],
-                    [-0.37328687, -0.19417622, -0.9071673],
-                    [-0.2061676, -0.16184728, -0.96503906],
-                    [-0.07140386, -0.14112401, -0.98741354],
-                    [0.04713024, -0.13547177, -0.98965961],
-                    [0.17631368, -0.14312988, -0.97387233],
-                    [0.33698032, -0.15842423, -0.9280873],
-                    [0.52503303, -0.17157039, -0.83360897],
-                    [0.70311772, -0.17271833, -0.68977811],
+                    [-0.83776232, -0.29435664, -0.4599005],
+                    [-0.69725368, -0.27241024, -0.66304598],
+                    [-0.47582163, -0.21252834, -0.85347846],
+                    [-0.25117502, -0.13937516, -0.95785472],
+                    [-0.08986984, -0.09087326, -0.9917991],
+                    [0.03142652, -0.07859106, -0.99641147],
+                    [0.1745792, -0.09693493, -0.97986005],
+                    [0.386587, -0.13110722, -0.9128863],
+                    [0.63658411, -0.15487078, -0.755497],
+                    [0.82473689, -0.15016845, -0.54521418],
                 ],
                 [
-                    [-0.71363817, -0.12289009, -0.68965106],
-                    [-0.53428719, -0.10456653, -0.83881049],
-                    [-0.34302984, -0.08098097, -0.93582724],
-                    [-0.18232384, -0.05982326, -0.98141693],
-                    [-0.05856711, -0.04505135, -0.9972664],
-                    [0.0495254, -0.03643636, -0.99810802],
-                    [0.17137003, -0.0318194, -0.98469276],
-                    [0.32983361, -0.02832571, -0.94361403],
-                    [0.52189187, -0.02311, -0.85269854],
-                    [0.70679267, -0.0149619, -0.70726251],
+                    [-0.83414229, -0.18674662, -0.51897238],
+                    [-0.65850616, -0.16330764, -0.73464294],
+                    [-0.40948543, -0.11458393, -0.90509237],
+                    [-0.19443591, -0.06284495, -0.97889999],
+                    [-0.05987519, -0.02659293, -0.99785158],
+                    [0.03750981, -0.00556699, -0.99928075],
+                    [0.16551176, 0.00726484, -0.98618106],
+                    [0.37529171, 0.01894198, -0.92671319],
+                    [0.6355567, 0.03228986, -0.77137866],
+                    [0.83150159, 0.04415303, -0.55376494],
                 ],
                 [
-                    [-0.70679267, 0.0149619, -0.70726251],
-                    [-0.52189187, 0.02311, -0.85269854],
-                    [-0.32983361, 0.02832571, -0.94361403],
-                    [-0.17137003, 0.0318194, -0.98469276],
-                    [-0.0495254, 0.03643636, -0.99810802],
-                    [0.05856711, 0.04505135, -0.9972664],
-                    [0.18232384, 0.05982326, -0.98141693],
-                    [0.34302984, 0.08098097, -0.93582724],
-                    [0.53428719, 0.10456653, -0.83881049],
-                    [0.71363817, 0.12289009, -0.68965106],
+                    [-0.83150159, -0.04415303, -0.55376494],
+                    [-0.6355567, -0.03228986, -0.77137866],
+                    [-0.37529171, -0.01894198, -0.92671319],
+                    [-0.16551176, -0.00726484, -0.98618106],
+                    [-0.03750981, 0.00556699, -0.99928075],
+                    [0.05987519, 0.02659293, -0.99785158],
+                    [0.19443591, 0.06284495, -0.97889999],
+                    [0.40948543, 0.11458393, -0.90509237],
+                    [0.65850616, 0.16330764, -0.73464294],
+                    [0.83414229, 0.18674662, -0.51897238],
                 ],
                 [
-                    [-0.70311772, 0.17271833, -0.68977811],
-                    [-0.52503303, 0.17157039, -0.83360897],
-                    [-0.33698032, 0.15842423, -0.9280873],
-                    [-0.17631368, 0.14312988, -0.97387233],
-                    [-0.04713024, 0.13547177, -0.98965961],
-                    [0.07140386, 0.14112401, -0.98741354],
-                    [0.2061676, 0.16184728, -0.96503906],
-                    [0.37328687, 0.19417622, -0.9071673],
-                    [0.55950744, 0.22712405, -0.79709855],
-                    [0.72364456, 0.24726071, -0.64436069],
+                    [-0.82473689, 0.15016845, -0.54521418],
+                    [-0.63658411, 0.15487078, -0.755497],
+                    [-0.386587, 0.13110722, -0.9128863],
+                    [-0.1745792, 0.09693493, -0.97986005],
+                    [-0.03142652, 0.07859106, -0.99641147],
+                    [0.08986984, 0.09087326, -0.9917991],
+                    [0.25117502, 0.13937516, -0.95785472],
+                    [0.47582163, 0.21252834, -0.85347846],
+                    [0.69725368, 0.27241024, -0.66304598],
+                    [0.83776232, 0.29435664, -0.4599005],
                 ],
                 [
-                    [-0.69399255, 0.34507355, -0.63190077],
-                    [-0.53485494, 0.34500852, -0.77129716],
-                    [-0.35891437, 0.32458199, -0.87511542],
-                    [-0.19586825, 0.29730614, -0.93447562],
-                    [-0.05314045, 0.27901255, -0.95881598],
-                    [0.08398426, 0.2790976, -0.95658307],
-                    [0.23593263, 0.29876348, -0.92470329],
-                    [0.40989935, 0.32987631, -0.85039059],
-                    [0.5858297, 0.35634459, -0.72788879],
-                    [0.72966613, 0.36532612, -0.57803474],
+                    [-0.79265568, 0.37534468, -0.48043038],
+                    [-0.63718027, 0.39318741, -0.66287628],
+                    [-0.42745119, 0.3641144, -0.82746975],
+                    [-0.22063304, 0.30472693, -0.92653255],
+                    [-0.04862539, 0.25797462, -0.96492729],
+                    [0.11629652, 0.25302401, -0.96044467],
+                    [0.31616047, 0.29363813, -0.90211929],
+                    [0.54291983, 0.35229852, -0.76231477],
+                    [0.72699185, 0.38704114, -0.56717017],
+                    [0.83444126, 0.388896, -0.3904711],
                 ],
                 [
-                    [-0.66943028, 0.51063855, -0.53954738],
-                    [-0.53510722, 0.5231329, -0.6633191],
-                    [-0.38011481, 0.51327155, -0.76945763],
-                    [-0.22143063, 0.49048026, -0.84285087],
-                    [-0.06666968, 0.47050177, -0.87987683],
-                    [0.09042355, 0.464726, -0.88082537],
-                    [0.25922765, 0.47392709, -0.84154271],
-                    [0.43588123, 0.48759509, -0.75647775],
-                    [0.59800005, 0.49121134, -0.63333037],
-                    [0.7230823, 0.47869456, -0.4979995],
+                    [-0.72725849, 0.57283248, -0.37809793],
+                    [-0.6060158, 0.61082644, -0.50954481],
+                    [-0.45011844, 0.61308476, -0.64924607],
+                    [-0.27327086, 0.58091074, -0.76672404],
+                    [-0.08581655, 0.54060469, -0.83688834],
+                    [0.12098085, 0.52128461, -0.84476386],
+                    [0.35251056, 0.52584554, -0.77409481],
+                    [0.57093309, 0.52860442, -0.62818212],
+                    [0.72602408, 0.5115538, -0.45956692],
+                    [0.8156317, 0.48187914, -0.32021466],
                 ],
                 [
-                    [-0.62879296, 0.6460985, -0.43263859],
-                    [-0.51637133, 0.67277311, -0.52984619],
-                    [-0.3845705, 0.68243823, -0.62159761],
-                    [-0.23882481, 0.67838895, -0.69480295],
-                    [-0.0823724, 0.6690924, -0.73860012],
-                    [0.08528575, 0.66166676, -0.74493183],
-                    [0.26225921, 0.65565742, -0.70804905],
-                    [0.43588997, 0.64349955, -0.62921242],
-                    [0.58584794, 0.61891081, -0.52319365],
-                    [0.69922039, 0.58360519, -0.41291141],
+                    [-0.64947777, 0.70818153, -0.276871],
+                    [-0.55132462, 0.75330052, -0.35857982],
+                    [-0.43361254, 0.78061748, -0.45012945],
+                    [-0.29258823, 0.78933162, -0.53976636],
+                    [-0.11945966, 0.78504257, -0.60781374],
+                    [0.09353888, 0.77236329, -0.62825586],
+                    [0.3302144, 0.74471361, -0.57996559],
+                    [0.54087516, 0.69466327, -0.47423306],
+                    [0.68845574, 0.63248963, -0.35494444],
+                    [0.77811617, 0.57389089, -0.25531249],
                 ],
             ]
         ),
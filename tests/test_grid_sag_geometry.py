@@ -84,6 +84,34 @@ def test_grid_sag_distance_and_normal(set_test_backend):
     assert be.allclose(nz, be.asarray([1 / expected_norm_mag], dtype=dtype), atol=1e-5)
 
 
+def test_grid_sag_distance_iterations(set_test_backend):
+    """Test that converged rays leave the iteration early."""
+    cs = CoordinateSystem()
+    x_coords = [-1.0, 1.0]
+    y_coords = [-1.0, 1.0]
+    sag_values = [[-0.1, 0.1], [-0.1, 0.1]]
+    geometry = GridSagGeometry(cs, x_coords, y_coords, sag_values)
+
+    rays = RealRays(
+        x=[0.0, 0.5, 0.0],
+        y=[0.0, 0.0, 0.0],
+        z=[0.0, -1.0, -1.0],
+        L=[0.0, 0.0, 0.0],
+        M=[0.0, 0.0, 0.0],
+        N=[1.0, 1.0, 1.0],
+        intensity=1.0,
+        wavelength=0.55,
+    )
+
+    distance = geometry.distance(rays)
+    dtype = rays.x.dtype
+    expected = be.asarray([0.0, 1.05, 1.0], dtype=dtype)
+    assert be.allclose(distance, expected, atol=1e-5)
+    iterations = be.to_numpy(geometry.iterations)
+    assert iterations[0] == 1
+    assert iterations.max() < geometry.max_iter
+
+
 def test_grid_sag_serialization(set_test_backend):
     """Test the to_dict and from_dict methods."""
     cs = CoordinateSystem()
@@ -9,6 +9,7 @@ import pytest
 
 import optiland.backend as be
 from optiland.psf.huygens_fresnel import HuygensPSF
+from optiland.psf.huygens_fresnel_strategies import NUFFTSummation, _direct_field
 from optiland.samples.objectives import CookeTriplet, DoubleGauss, ReverseTelephoto
 
 matplotlib.use("Agg")  # use non-interactive backend for testing
@@ -540,3 +541,100 @@ class TestHuygensPSF:
         # The extent is centered around (cx, cy)
         assert np.isclose(xmax - xmin, 2 * expected_extent)
         assert np.isclose(ymax - ymin, 2 * expected_extent)
+
+
+class TestNUFFTSummation:
+    """
+    Test suite for the non-uniform FFT Huygens-Fresnel summation.
+    """
+
+    @staticmethod
+    def sphere_pupil(num=24, radius=50.0, na=0.15, seed=0):
+        """Pupil points on a reference sphere centered on (0, 0, 60)."""
+        rng = np.random.default_rng(seed)
+        u, v = np.meshgrid(np.linspace(-1, 1, num), np.linspace(-1, 1, num))
+        inside = u**2 + v**2 <= 1
+        x, y = na * radius * u[inside], na * radius * v[inside]
+        z = 60.0 - np.sqrt(radius**2 - x**2 - y**2)
+        opd = 2e-4 * (u[inside] ** 2 + v[inside] ** 2) ** 2  # spherical, mm
+        amp = 1.0 + 0.1 * rng.random(x.shape)
+        return x, y, z, amp, opd, radius
+
+    @pytest.mark.parametrize("tilt", [0.0, 0.3])
+    def test_matches_direct_field(self, tilt):
+        x, y, z, amp, opd, radius = self.sphere_pupil()
+        wavelength = 0.55e-3
+        u = np.linspace(-0.01, 0.012, 40)
+        U, V = np.meshgrid(u, u)
+        # tilted image plane through the focus
+        image_x = U * np.cos(tilt)
+        image_y = V
+        image_z = 60.0 + U * np.sin(tilt) + 1e-3 * (U**2 + V**2)
+
+        summation = NUFFTSummation(tol=1e-7)
+        psf = summation.compute(
+            image_x, image_y, image_z, x, y, z, amp, opd, wavelength, radius
+        )
+
+        weights = amp * np.exp(-2j * np.pi / wavelength * opd)
+        points = np.stack([image_x, image_y, image_z], axis=-1).reshape(-1, 3)
+        pupil = np.stack([x, y, z], axis=-1)
+        field = _direct_field(points, pupil, weights, 2 * np.pi / wavelength, radius)
+        expected = np.abs(field.reshape(psf.shape)) ** 2
+
+        assert summation.num_tiles >= 1
+        assert np.max(np.abs(psf - expected)) < 1e-6 * np.max(expected)
+
+    def test_psf_matches_direct(self, cooke_triplet_optic):
+        kwargs = dict(
+            optic=cooke_triplet_optic,
+            field=(0, 0.7),
+            wavelength=0.55,
+            num_rays=32,
+            image_size=32,
+        )
+        direct = HuygensPSF(**kwargs)
+        fast = HuygensPSF(**kwargs, summation="nufft")
+
+        assert isinstance(fast._summation_strategy, NUFFTSummation)
+        assert np.isclose(fast.normalization, direct.normalization)
+        assert np.max(np.abs(fast.psf - direct.psf)) < 1e-3
+
+    def test_validation(self, cooke_triplet_optic):
+        summation = NUFFTSummation(tol=1e-6, validate=16)
+        HuygensPSF(
+            optic=cooke_triplet_optic,
+            field=(0, 0),
+            wavelength=0.55,
+            num_rays=32,
+            image_size=32,
+            summation=summation,
+        )
+        assert summation.validation_error < 1e-6
+
+        # an inaccurate non-uniform FFT is reported by the validation
+        summation = NUFFTSummation(tol=1e-4, validate=16)
+        summation.msp = 1
+        with pytest.warns(UserWarning, match="exceeds the tolerance"):
+            HuygensPSF(
+                optic=cooke_triplet_optic,
+                field=(0, 0),
+                wavelength=0.55,
+                num_rays=32,
+                image_size=32,
+                summation=summation,
+            )
+        assert summation.validation_error > 1e-4
+
+    def test_invalid_arguments(self, cooke_triplet_optic):
+        with pytest.raises(ValueError, match="tol must be positive"):
+            NUFFTSummation(tol=0.0)
+        with pytest.raises(ValueError, match="Unsupported Huygens-Fresnel"):
+            HuygensPSF(
+                optic=cooke_triplet_optic,
+                field=(0, 0),
+                wavelength=0.55,
+                num_rays=8,
+                image_size=8,
+                summation="fast",
+            )
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import pytest
+
+import optiland.backend as be
+from optiland.optimization import OptimizationProblem
+from optiland.raytrace import IncrementalTrace
+from optiland.samples.objectives import CookeTriplet, ReverseTelephoto
+from optiland.samples.simple import AsphericSinglet
+from tests.utils import assert_allclose
+
+SURFACE_ATTRS = ["x", "y", "z", "L", "M", "N", "intensity", "opd"]
+
+
+def _trace(lens, record="all"):
+    return lens.trace(
+        0.0, 1.0, 0.55, num_rays=16, distribution="uniform", record=record
+    )
+
+
+def _surface_data(lens):
+    return [
+        [be.copy(getattr(surface, attr)) for attr in SURFACE_ATTRS]
+        for surface in lens.surfaces
+    ]
+
+
+def _assert_same_trace(lens, reference, record="all"):
+    rays = _trace(lens, record)
+    expected = _trace(reference, record)
+    for attr in ["x", "y", "z", "L", "M", "N", "i", "opd"]:
+        assert_allclose(getattr(rays, attr), getattr(expected, attr))
+    for actual, wanted in zip(
+        _surface_data(lens), _surface_data(reference), strict=True
+    ):
+        for a, b in zip(actual, wanted, strict=True):
+            assert_allclose(a, b)
+
+
+@pytest.fixture
+def lenses():
+    lens = ReverseTelephoto()
+    lens.ray_tracer.use_incremental_trace = True
+    return lens, ReverseTelephoto()
+
+
+def test_unmodified_system_is_not_retraced(set_test_backend, lenses):
+    lens, reference = lenses
+    _assert_same_trace(lens, reference)
+    assert lens.ray_tracer.incremental_trace.last_start_index == 0
+    _assert_same_trace(lens, reference)
+    num_surfaces = lens.surfaces.num_surfaces
+    if be.get_backend() == "numpy":
+        assert lens.ray_tracer.incremental_trace.last_start_index == num_surfaces
+
+
+def test_resume_from_modified_surface(set_test_backend, lenses):
+    lens, reference = lenses
+    _trace(lens)
+    index = lens.surfaces.num_surfaces - 3
+    for optic in (lens, reference):
+        radius = optic.surfaces[index].geometry.radius
+        optic.updater.set_radius(radius * 1.01, index)
+    _assert_same_trace(lens, reference)
+    if be.get_backend() == "numpy":
+        assert lens.ray_tracer.incremental_trace.last_start_index == index
+
+
+def test_direct_modification_marks_surface_dirty(set_test_backend, lenses):
+    lens, reference = lenses
+    _trace(lens)
+    for optic in (lens, reference):
+        optic.surfaces[4].geometry.k = 0.1
+        optic.surfaces[6].material_post.propagation_model = optic.surfaces[
+            6
+        ].material_post.propagation_model
+    _assert_same_trace(lens, reference)
+    if be.get_backend() == "numpy":
+        assert lens.ray_tracer.incremental_trace.last_start_index == 4
+
+    index = lens.surfaces.num_surfaces - 3
+    for optic in (lens, reference):
+        optic.surfaces[index].geometry.cs.x = be.array(0.01)
+    _assert_same_trace(lens, reference)
+    if be.get_backend() == "numpy":
+        assert lens.ray_tracer.incremental_trace.last_start_index == index
+
+
+def test_unchanged_assignment_keeps_revision():
+    lens = CookeTriplet()
+    geometry = lens.surfaces[2].geometry
+    revision = geometry.revision
+    geometry.k = be.copy(geometry.k)
+    assert geometry.revision == revision
+    geometry.k = geometry.k + 0.1
+    assert geometry.revision > revision
+
+
+def test_solver_diagnostics_keep_revision(set_test_backend):
+    lens = AsphericSinglet()
+    geometry = lens.surfaces[1].geometry
+    version = lens.state_version
+    _trace(lens)
+    assert geometry.iterations is not None
+    assert lens.state_version == version
+
+
+def test_record_policy(set_test_backend, lenses):
+    lens, reference = lenses
+    _trace(lens)
+    index = lens.surfaces.num_surfaces - 2
+    for optic in (lens, reference):
+        optic.updater.set_conic(0.2, index)
+    _assert_same_trace(lens, reference, record=[1, index])
+    assert be.size(lens.surfaces[2].y) == 0
+    _assert_same_trace(lens, reference, record="image")
+    _assert_same_trace(lens, reference, record="all")
+
+
+def test_different_rays_are_fully_traced(lenses):
+    lens, _ = lenses
+    _trace(lens)
+    lens.trace(0.0, 0.5, 0.55, num_rays=16, distribution="uniform")
+    assert lens.ray_tracer.incremental_trace.last_start_index == 0
+
+
+def test_max_rays(lenses):
+    lens, reference = lenses
+    lens.ray_tracer.incremental_trace = IncrementalTrace(max_rays=10)
+    _assert_same_trace(lens, reference)
+    _assert_same_trace(lens, reference)
+    assert lens.ray_tracer.incremental_trace.last_start_index == 0
+
+
+def test_max_bytes(lenses):
+    lens, reference = lenses
+    _trace(lens)
+    snapshot_bytes = max(
+        value.nbytes
+        for value in vars(_trace(lens)).values()
+        if hasattr(value, "nbytes")
+    )
+    lens.ray_tracer.incremental_trace = IncrementalTrace(
+        max_bytes=3 * 12 * snapshot_bytes
+    )
+    _assert_same_trace(lens, reference)
+    _assert_same_trace(lens, reference)
+    num_stored = lens.ray_tracer.incremental_trace.last_start_index
+    assert 0 < num_stored < lens.surfaces.num_surfaces
+
+    for optic in (lens, reference):
+        optic.updater.set_conic(0.2, lens.surfaces.num_surfaces - 2)
+    _assert_same_trace(lens, reference)
+    assert lens.ray_tracer.incremental_trace.last_start_index == num_stored
+
+
+def test_coefficient_variable_marks_geometry_dirty():
+    lens = AsphericSinglet()
+    reference = AsphericSinglet()
+    lens.ray_tracer.use_incremental_trace = True
+    problem = OptimizationProblem()
+    problem.add_variable(lens, "asphere_coeff", surface_number=1, coeff_number=0)
+    _trace(lens)
+    revision = lens.surfaces[1].geometry.revision
+    problem.variables[0].update(1e-4)
+    assert lens.surfaces[1].geometry.revision > revision
+
+    reference.surfaces[1].geometry.coefficients[0] = lens.surfaces[
+        1
+    ].geometry.coefficients[0]
+    _assert_same_trace(lens, reference)
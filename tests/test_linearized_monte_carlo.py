@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from optiland.optimization.variable import Variable
+from optiland.samples.objectives import ReverseTelephoto
+from optiland.tolerancing import LinearizedMonteCarlo
+from optiland.tolerancing.core import Tolerancing
+from optiland.tolerancing.perturbation import (
+    DistributionSampler,
+    RangeSampler,
+    ScalarSampler,
+)
+
+
+def nominal_value(optic, variable_type, **kwargs):
+    return float(Variable(optic, variable_type, **kwargs).variable.get_value())
+
+
+def make_tolerancing(compensator=True):
+    optic = ReverseTelephoto()
+    tolerancing = Tolerancing(optic)
+    tolerancing.add_operand(operand_type="f1", input_data={"optic": optic})
+    tolerancing.add_operand(operand_type="f2", input_data={"optic": optic})
+    radius = nominal_value(optic, "radius", surface_number=1)
+    thickness = nominal_value(optic, "thickness", surface_number=3)
+    tolerancing.add_perturbation(
+        "radius",
+        DistributionSampler("normal", loc=radius, scale=1e-3),
+        surface_number=1,
+    )
+    tolerancing.add_perturbation(
+        "thickness",
+        DistributionSampler("uniform", low=thickness - 1e-3, high=thickness + 1e-3),
+        surface_number=3,
+    )
+    if compensator:
+        tolerancing.add_compensator("thickness", surface_number=2)
+    return tolerancing
+
+
+@pytest.fixture
+def linearized():
+    return LinearizedMonteCarlo(make_tolerancing())
+
+
+@pytest.fixture
+def linearized_no_compensator():
+    return LinearizedMonteCarlo(make_tolerancing(compensator=False))
+
+
+def test_build(linearized):
+    linearized.build(hessian=True)
+    assert linearized.is_built
+    assert linearized.jacobian.shape == (2, 2)
+    assert linearized.hessian.shape == (2, 2)
+    assert linearized.compensator_response.shape == (1, 2)
+    assert linearized.compensator_names == ["C0: Thickness, Surface 2"]
+    assert linearized.steps == pytest.approx([1e-3, 1e-3])
+
+
+def test_build_first_order(linearized_no_compensator):
+    linearized_no_compensator.build()
+    assert linearized_no_compensator.hessian is None
+    assert linearized_no_compensator.compensator_response.shape == (0, 2)
+
+
+def test_build_invalid_steps(linearized):
+    with pytest.raises(ValueError):
+        linearized.build(steps=[1e-3, 1e-3, 1e-3])
+    with pytest.raises(ValueError):
+        linearized.build(steps=0.0)
+
+
+def test_run(linearized):
+    linearized.run(100_000, seed=1)
+    results = linearized.get_results()
+    assert len(results) == 100_000
+    assert set(results.columns) == {
+        "0: f1",
+        "1: f2",
+        "Radius of Curvature, Surface 1",
+        "Thickness, Surface 3",
+        "C0: Thickness, Surface 2",
+    }
+    assert results["Radius of Curvature, Surface 1"].std() == pytest.approx(
+        1e-3, rel=0.05
+    )
+
+
+def test_run_seeded(linearized_no_compensator):
+    linearized_no_compensator.run(50, seed=3)
+    first = linearized_no_compensator.get_results().copy()
+    linearized_no_compensator.run(50, seed=3)
+    assert first.equals(linearized_no_compensator.get_results())
+
+
+def test_validate(linearized):
+    linearized.build(hessian=True)
+    linearized.run(1000, seed=2)
+    validation = linearized.validate(num_samples=3, seed=0)
+    assert len(validation) == 3
+    for name in ["0: f1", "1: f2", "C0: Thickness, Surface 2"]:
+        full = validation[(name, "full")].to_numpy()
+        error = validation[(name, "error")].to_numpy()
+        assert np.all(np.abs(error) <= 1e-3 * np.maximum(1.0, np.abs(full)))
+
+
+def test_validate_without_run(linearized):
+    with pytest.raises(ValueError):
+        linearized.validate()
+
+
+def test_range_and_scalar_samplers():
+    optic = ReverseTelephoto()
+    tolerancing = Tolerancing(optic)
+    tolerancing.add_operand(operand_type="f1", input_data={"optic": optic})
+    radius = nominal_value(optic, "radius", surface_number=1)
+    thickness = nominal_value(optic, "thickness", surface_number=3)
+    tolerancing.add_perturbation(
+        "radius", RangeSampler(radius - 1e-3, radius + 1e-3, 3), surface_number=1
+    )
+    tolerancing.add_perturbation(
+        "thickness", ScalarSampler(thickness + 1e-3), surface_number=3
+    )
+    linearized = LinearizedMonteCarlo(tolerancing)
+    linearized.run(6)
+    results = linearized.get_results()
+    assert results["Radius of Curvature, Surface 1"].to_numpy() == pytest.approx(
+        [radius - 1e-3, radius, radius + 1e-3] * 2
+    )
+    assert linearized.steps == pytest.approx([1e-3, 1e-3])
+
+
+def test_nominal_restored(linearized):
+    optic = linearized.tolerancing.optic
+    radius = nominal_value(optic, "radius", surface_number=1)
+    linearized.build()
+    linearized.run(10)
+    linearized.validate(num_samples=2)
+    assert nominal_value(optic, "radius", surface_number=1) == pytest.approx(radius)
@@ -9,6 +9,9 @@ import pytest
 import optiland.backend as be
 from optiland import materials
 from optiland.materials.base import BaseMaterial
+from optiland.materials.catalog import MaterialCatalog, compile_catalog
+from optiland.materials.glass_map import compile_glass_map
+from optiland.materials.material_file import MaterialFile
 from optiland.optic import Optic
 
 from .utils import assert_allclose
@@ -638,6 +641,193 @@ class TestMaterial:
         materials.Material("LITHOTEC-CAF2")  # prints a warning
 
 
+class TestMaterialCatalog:
+    def test_catalog_rows(self):
+        catalog = MaterialCatalog.load()
+        df = materials.Material._load_dataframe()
+        assert len(catalog) == len(df)
+        assert catalog.row(5) == {
+            key: value for key, value in df.iloc[5].to_dict().items()
+        }
+
+    def test_exact_matches(self):
+        catalog = MaterialCatalog.load()
+        rows = catalog.exact_matches("n-bk7")
+        assert rows
+        for row in rows:
+            entry = catalog.row(row)
+            assert "n-bk7" in (
+                entry["category_name"].lower(),
+                entry["name"].lower(),
+                entry["filename_no_ext"].lower(),
+            )
+        assert catalog.exact_matches("not a material") == []
+
+    @pytest.mark.parametrize(
+        "name, reference",
+        [("N-BK7", "schott"), ("SF11", None), ("N-SF5", None), ("CaF2", None)],
+    )
+    def test_same_as_full_search(self, set_test_backend, name, reference):
+        class FullSearchMaterial(materials.Material):
+            def _find_exact_match(self):
+                return None
+
+        material = materials.Material(name, reference)
+        expected = FullSearchMaterial(name, reference)
+        assert material.filename == expected.filename
+        assert material.material_data == expected.material_data
+        wavelengths = be.linspace(0.45, 0.65, 5)
+        assert_allclose(material.n(wavelengths), expected.n(wavelengths))
+        assert_allclose(material.k(wavelengths), expected.k(wavelengths))
+        assert_allclose(
+            material.n(wavelengths, temperature=40.0),
+            expected.n(wavelengths, temperature=40.0),
+        )
+        assert material.reference_data == expected.reference_data
+
+    def test_formula_material_reads_no_file(self, set_test_backend, monkeypatch):
+        def fail(self):
+            raise AssertionError("material file read")
+
+        monkeypatch.setattr(MaterialFile, "_read_file", fail)
+        material = materials.Material("N-BK7", "schott")
+        assert material.n(0.5) == pytest.approx(1.5214144757734767)
+
+    def test_tabulated_material_reads_file(self, set_test_backend):
+        catalog = MaterialCatalog.load()
+        row = catalog.exact_matches("Johnson")[0]
+        assert catalog.material_data(row) is None
+        material = materials.Material("Johnson", reference="Ag")
+        assert material._n_formula == "tabulated nk"
+
+    def test_compile_catalog(self, tmp_path):
+        database = resources.files("optiland.database")
+        df = materials.Material._load_dataframe()
+        filenames = ["glass/schott/N-BK7.yml", "main/Ag/Johnson.yml"]
+        subset = df[df["filename"].isin(filenames)].drop_duplicates("filename")
+        subset.to_csv(tmp_path / "catalog_nk.csv", index=False)
+        for filename in subset["filename"]:
+            target = tmp_path / "data-nk" / filename
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(database.joinpath("data-nk", filename).read_bytes())
+
+        compile_catalog(database_dir=tmp_path)
+        with np.load(tmp_path / "catalog_nk.npz") as data:
+            catalog = MaterialCatalog(data)
+        assert len(catalog) == 2
+
+        rows = {catalog.row(row)["filename"]: row for row in range(2)}
+        data = catalog.material_data(rows["glass/schott/N-BK7.yml"])
+        material = MaterialFile(
+            str(database.joinpath("data-nk", "glass/schott/N-BK7.yml"))
+        )
+        assert data["formula"] == material._n_formula
+        assert data["coefficients"] == pytest.approx(
+            np.ravel(be.to_numpy(material.coefficients))
+        )
+        assert data["t0"] == material._t0
+        assert catalog.material_data(rows["main/Ag/Johnson.yml"]) is None
+
+    def test_levenshtein_distance(self):
+        distance = materials.Material._levenshtein_distance
+        assert distance("kitten", "sitting") == 3
+        assert distance("", "abc") == 3
+        assert distance("n-bk7", "n-bk7") == 0
+
+
+class TestGlassMap:
+    @staticmethod
+    def brute_force(glass_map, point, weights, use_pgf=False):
+        columns = [glass_map.nd, glass_map.vd] + ([glass_map.pgf] if use_pgf else [])
+        points = np.stack(columns, axis=1) * weights
+        distances = np.linalg.norm(points - np.asarray(point) * weights, axis=1)
+        distances[~np.isfinite(distances)] = np.inf
+        order = np.argsort(distances, kind="stable")
+        return [glass_map.names[i] for i in order], distances[order]
+
+    def test_load(self):
+        glass_map = materials.GlassMap.load()
+        assert len(glass_map) > 1000
+        index = glass_map.find("glass/schott/N-BK7.yml")
+        assert glass_map.names[index] == "N-BK7"
+        assert glass_map.manufacturers[index] == "schott"
+        assert (glass_map.nd[index], glass_map.vd[index]) == (1.5168, 64.17)
+
+        bk7 = materials.Material("N-BK7")
+        n_g, n_f, n_c = bk7.n(np.array([0.4358343, 0.4861327, 0.6562725]))
+        assert glass_map.pgf[index] == pytest.approx((n_g - n_f) / (n_f - n_c))
+        assert glass_map.find("main/Ag/Johnson.yml") is None
+
+    @pytest.mark.parametrize("use_pgf", [False, True])
+    def test_nearest_matches_brute_force(self, use_pgf):
+        glass_map = materials.GlassMap.load().subset(manufacturers=["SCHOTT", "ohara"])
+        assert set(glass_map.manufacturers) == {"schott", "ohara"}
+
+        rng = np.random.default_rng(0)
+        weights = np.array([100.0, 1.0, 1000.0])[: 3 if use_pgf else 2]
+        for _ in range(10):
+            point = [rng.uniform(1.45, 1.95), rng.uniform(20, 90), 0.55]
+            point = point[: 3 if use_pgf else 2]
+            names, _ = self.brute_force(glass_map, point, weights, use_pgf)
+            nearest = glass_map.nearest(
+                point[0],
+                point[1],
+                k=5,
+                pgf=point[2] if use_pgf else None,
+                weights=tuple(weights) + (1.0,),
+            )
+            assert nearest == names[:5]
+
+    def test_within_and_exclude(self):
+        glass_map = materials.GlassMap.load()
+        names, distances = self.brute_force(glass_map, (1.5168, 64.17), [1.0, 1.0])
+        within = glass_map.within(1.5168, 64.17, radius=1.0)
+        assert within == names[: np.count_nonzero(distances <= 1.0)]
+        assert within[0] == "N-BK7"
+        assert (
+            glass_map.nearest(1.5168, 64.17, k=3, exclude=["N-BK7"])
+            == [name for name in names if name != "N-BK7"][:3]
+        )
+
+    def test_get_nd_vd_without_material(self, monkeypatch):
+        from optiland.materials import material_utils
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Material should not be loaded")
+
+        monkeypatch.setattr(material_utils, "Material", fail)
+        assert materials.get_nd_vd("N-BK7") == (1.5168, 64.17)
+
+    def test_neighbour_glasses_from_dict(self):
+        glass_dict = {"Ref": (1.5, 60.0), "B": (1.6, 59.0), "A": (1.4, 61.0)}
+        glass_map = materials.GlassMap.from_dict(glass_dict)
+        # equal distances are sorted in the order of the dictionary
+        assert materials.get_neighbour_glasses(
+            "Ref", glass_dict=glass_dict, num_neighbours=2, glass_map=glass_map
+        ) == ["B", "A"]
+        assert glass_map.within(1.5, 60.0, radius=0.5) == ["Ref"]
+
+    def test_compile_glass_map(self, tmp_path, monkeypatch):
+        database = resources.files("optiland.database")
+        df = materials.Material._load_dataframe()
+        filenames = ["glass/schott/N-BK7.yml", "main/Ag/Johnson.yml"]
+        subset = df[df["filename"].isin(filenames)].drop_duplicates("filename")
+        subset.to_csv(tmp_path / "catalog_nk.csv", index=False)
+        for filename in subset["filename"]:
+            target = tmp_path / "data-nk" / filename
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(database.joinpath("data-nk", filename).read_bytes())
+
+        compile_glass_map(database_dir=tmp_path)
+        monkeypatch.setattr(
+            materials.GlassMap, "_filename", str(tmp_path / "glass_map.npz")
+        )
+        monkeypatch.setattr(materials.GlassMap, "_instance", None)
+        glass_map = materials.GlassMap.load()
+        assert glass_map.names == ["N-BK7"]
+        assert glass_map.filenames == ["glass/schott/N-BK7.yml"]
+
+
 def test_glasses_selection(set_test_backend):
     glasses = materials.glasses_selection(0.3, 2.5, catalogs=["schott"])
     expected_glasses = [
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import pickle
+
 import matplotlib
 import matplotlib.pyplot as plt
 import pytest
@@ -128,3 +130,87 @@ def test_validate_no_perturbations(monte_carlo):
     msg = "No perturbations found in the tolerancing system."
     with pytest.raises(ValueError, match=msg):
         monte_carlo._validate()
+
+
+def assert_results_close(results, expected):
+    assert list(results.index) == list(expected.index)
+    assert set(results.columns) == set(expected.columns)
+    for column in expected.columns:
+        assert results[column].to_numpy() == pytest.approx(expected[column].to_numpy())
+
+
+def test_run_seeded_reproducible(monte_carlo):
+    monte_carlo.run(6, seed=42)
+    first = monte_carlo._results.copy()
+    assert first.index.name == "trial"
+    assert list(first.index) == list(range(6))
+
+    monte_carlo.run(6, seed=42, batch_size=4)
+    assert_results_close(monte_carlo._results, first)
+
+    monte_carlo.run(6, seed=43)
+    radius = "Radius of Curvature, Surface 1"
+    assert not first[radius].equals(monte_carlo._results[radius])
+
+
+def test_run_parallel_matches_serial(monte_carlo_no_compensator):
+    monte_carlo_no_compensator.run(8, seed=7)
+    serial = monte_carlo_no_compensator._results.copy()
+    monte_carlo_no_compensator.run(8, workers=2, batch_size=3, seed=7)
+    assert_results_close(monte_carlo_no_compensator._results, serial)
+
+
+def test_run_checkpoint_resume(monte_carlo_no_compensator, tmp_path):
+    checkpoint = tmp_path / "mc.pkl"
+    monte_carlo_no_compensator.run(4, seed=3, checkpoint=checkpoint)
+    assert checkpoint.exists()
+    partial = monte_carlo_no_compensator._results.copy()
+
+    # resume with more trials, reusing the stored seed
+    monte_carlo_no_compensator.run(7, checkpoint=checkpoint)
+    resumed = monte_carlo_no_compensator._results
+    assert monte_carlo_no_compensator.seed == 3
+    assert len(resumed) == 7
+    assert_results_close(resumed.iloc[:4], partial)
+
+    monte_carlo_no_compensator.run(7, seed=3)
+    assert_results_close(monte_carlo_no_compensator._results, resumed)
+
+
+def test_run_checkpoint_appends_batches(monte_carlo_no_compensator, tmp_path):
+    checkpoint = tmp_path / "mc.pkl"
+    monte_carlo_no_compensator.run(6, seed=5, batch_size=2, checkpoint=checkpoint)
+    expected = monte_carlo_no_compensator._results.copy()
+
+    # a header followed by one record per batch
+    records = []
+    with open(checkpoint, "rb") as file:
+        while True:
+            try:
+                records.append(pickle.load(file))
+            except EOFError:
+                break
+    assert records[0] == {"seed": 5, "rows": {}}
+    assert [[trial for trial, _ in batch] for batch in records[1:]] == [
+        [0, 1],
+        [2, 3],
+        [4, 5],
+    ]
+
+    # a batch record truncated by an interruption is run again
+    data = checkpoint.read_bytes()
+    checkpoint.write_bytes(data[:-10])
+    monte_carlo_no_compensator.run(6, checkpoint=checkpoint)
+    assert_results_close(monte_carlo_no_compensator._results, expected)
+
+
+def test_run_checkpoint_seed_mismatch(monte_carlo_no_compensator, tmp_path):
+    checkpoint = tmp_path / "mc.pkl"
+    monte_carlo_no_compensator.run(2, seed=1, checkpoint=checkpoint)
+    with pytest.raises(ValueError):
+        monte_carlo_no_compensator.run(2, seed=2, checkpoint=checkpoint)
+
+
+def test_run_invalid_workers(monte_carlo_no_compensator):
+    with pytest.raises(ValueError):
+        monte_carlo_no_compensator.run(2, workers=0)
@@ -0,0 +1,73 @@
+"""Unit tests for the PupilMTF class."""
+
+from __future__ import annotations
+
+import matplotlib
+
+matplotlib.use("Agg")  # ensure non-interactive backend for testing
+
+import matplotlib.pyplot as plt
+import pytest
+
+import optiland.backend as be
+from optiland.mtf import PupilMTF, ScalarFFTMTF
+from optiland.samples.objectives import CookeTriplet
+from tests.utils import assert_allclose
+
+
+@pytest.fixture
+def optic():
+    """A fresh CookeTriplet for each test."""
+    return CookeTriplet()
+
+
+class TestPupilMTF:
+    """Tests for the PupilMTF class."""
+
+    def test_matches_fft_mtf(self, set_test_backend, optic):
+        """Tangential and sagittal curves match the FFT MTF."""
+        fft_mtf = ScalarFFTMTF(optic, num_rays=64)
+        pupil_mtf = PupilMTF(optic, num_rays=fft_mtf.num_rays)
+        n = fft_mtf.num_rays
+        for k in range(len(optic.fields.fields)):
+            for i, freq in enumerate((fft_mtf.freq_tang, fft_mtf.freq_sag)):
+                assert_allclose(pupil_mtf.mtf[k][i], fft_mtf.mtf[k][i][:n], atol=1e-10)
+                assert_allclose(pupil_mtf.freq[k][i], freq[k][:n])
+
+    def test_arbitrary_azimuths(self, set_test_backend, optic):
+        """On axis, the MTF of a rotationally symmetric system is the same
+        along all azimuths."""
+        m = PupilMTF(optic, fields=[(0, 0)], num_rays=32, azimuths=[0, 30, 135])
+        assert len(m.mtf[0]) == 3
+        for curve in m.mtf[0]:
+            assert curve.shape == (32,)
+            assert be.to_numpy(curve)[0] == pytest.approx(1.0)
+            assert_allclose(curve, m.mtf[0][0], atol=1e-8)
+        assert_allclose(m.freq[0][1], m.freq[0][0])
+
+    def test_through_focus(self, set_test_backend, optic):
+        """Defocused curves match the FFT MTF of a shifted image plane."""
+        field = (0, 0.7)
+        m = PupilMTF(optic, fields=[field], num_rays=32, defocus=[0.0, 0.05])
+        assert m.mtf[0][0].shape == (2, 32)
+
+        nominal = PupilMTF(optic, fields=[field], num_rays=32)
+        assert_allclose(m.mtf[0][0][0], nominal.mtf[0][0])
+
+        optic.image_surface.geometry.cs.z = optic.image_surface.geometry.cs.z + 0.05
+        fft_mtf = ScalarFFTMTF(optic, fields=[field], num_rays=32, grid_size=64)
+        for i in range(2):
+            assert_allclose(m.mtf[0][i][1], fft_mtf.mtf[0][i][:32], atol=0.03)
+
+    def test_view(self, set_test_backend, optic):
+        m = PupilMTF(optic, num_rays=32, azimuths=[90, 0, 45], defocus=[-0.01, 0.0])
+        fig, ax = m.view(add_reference=True)
+        assert fig is not None
+        assert len(ax.get_lines()) == 3 * len(m.resolved_fields) + 1
+        plt.close(fig)
+
+    def test_invalid_arguments(self, set_test_backend, optic):
+        with pytest.raises(ValueError):
+            PupilMTF(optic, num_rays=1)
+        with pytest.raises(ValueError):
+            PupilMTF(optic, azimuths=[])
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import optiland.backend as be
+from optiland.distribution import create_distribution
+from optiland.raytrace import (
+    IrradianceReducer,
+    OPDReducer,
+    OPLReducer,
+    SpotReducer,
+    reduce_stream,
+)
+from optiland.samples.objectives import CookeTriplet
+from optiland.wavefront import OPD
+from tests.utils import assert_allclose
+
+
+def _concat(chunks, attr):
+    return be.concatenate([getattr(rays, attr) for rays in chunks])
+
+
+@pytest.mark.parametrize("chunk_size", [7, 64, 10000])
+def test_stream_matches_trace(set_test_backend, chunk_size):
+    lens = CookeTriplet()
+    Hx = be.array([0.0, 0.0, 0.3])
+    Hy = be.array([0.0, 0.7, 1.0])
+    rays = lens.trace(Hx, Hy, 0.55, num_rays=8)
+
+    chunks = list(lens.trace_stream(Hx, Hy, 0.55, num_rays=8, chunk_size=chunk_size))
+    assert all(be.size(chunk.x) <= chunk_size for chunk in chunks)
+    for attr in ["x", "y", "z", "L", "M", "N", "i", "opd"]:
+        assert_allclose(_concat(chunks, attr), getattr(rays, attr))
+
+
+def test_stream_does_not_record(set_test_backend):
+    lens = CookeTriplet()
+    for _ in lens.trace_stream(0.0, 1.0, 0.55, num_rays=4, chunk_size=10):
+        pass
+    for surface in lens.surfaces.surfaces:
+        assert be.size(surface.x) == 0
+
+
+def test_stream_invalid_chunk_size(set_test_backend):
+    lens = CookeTriplet()
+    with pytest.raises(ValueError):
+        next(lens.trace_stream(0.0, 1.0, 0.55, chunk_size=0))
+
+
+def test_spot_reducer(set_test_backend):
+    lens = CookeTriplet()
+    rays = lens.trace(0.0, 1.0, 0.55, num_rays=12)
+    mask = be.to_numpy(rays.i) > 0
+    x = be.to_numpy(rays.x)[mask]
+    y = be.to_numpy(rays.y)[mask]
+
+    reducer = SpotReducer()
+    result = reducer.consume(
+        lens.trace_stream(0.0, 1.0, 0.55, num_rays=12, chunk_size=50)
+    )
+    assert reducer.num_rays == x.size
+    assert_allclose(result["centroid"], (np.mean(x), np.mean(y)))
+    rms = np.sqrt(np.mean((x - x.mean()) ** 2 + (y - y.mean()) ** 2))
+    assert_allclose(result["rms_spot_radius"], rms)
+
+
+def test_opl_reducer(set_test_backend):
+    lens = CookeTriplet()
+    rays = lens.trace(0.0, 0.5, 0.55, num_rays=12)
+    opl = be.to_numpy(rays.opd)[be.to_numpy(rays.i) > 0]
+
+    reducer = OPLReducer(wavelength=0.55)
+    result = reducer.consume(
+        lens.trace_stream(0.0, 0.5, 0.55, num_rays=12, chunk_size=33)
+    )
+    waves = 0.55e-3
+    assert_allclose(result["mean"], np.mean(opl) / waves)
+    assert_allclose(result["rms"], np.std(opl) / waves)
+    assert_allclose(result["peak_to_valley"], np.ptp(opl) / waves)
+
+
+@pytest.mark.parametrize("field", [(0.0, 0.0), (0.0, 1.0), (0.4, 0.7)])
+def test_opd_reducer_matches_opd(set_test_backend, field):
+    lens = CookeTriplet()
+    opd = OPD(lens, field, 0.55, num_rays=12)
+    data = opd.get_data(opd.fields[0], opd.wavelengths[0])
+    expected = be.to_numpy(data.opd)[be.to_numpy(data.intensity) > 0]
+
+    distribution = create_distribution("hexapolar")
+    distribution.generate_points(12)
+    reducer = OPDReducer(lens, field, 0.55, distribution)
+    result = reducer.consume(
+        lens.trace_stream(*field, 0.55, distribution=distribution, chunk_size=50)
+    )
+    assert reducer.num_rays == expected.size
+    assert_allclose(result["mean"], np.mean(expected))
+    assert_allclose(result["rms"], be.to_numpy(opd.rms()))
+    assert_allclose(result["peak_to_valley"], np.ptp(expected))
+
+
+def test_irradiance_reducer(set_test_backend):
+    lens = CookeTriplet()
+    x_edges = np.linspace(-20, 20, 11)
+    y_edges = np.linspace(-20, 20, 9)
+    rays = lens.trace(0.0, 1.0, 0.55, num_rays=12)
+    mask = be.to_numpy(rays.i) > 0
+    expected, _, _ = np.histogram2d(
+        be.to_numpy(rays.x)[mask],
+        be.to_numpy(rays.y)[mask],
+        bins=[x_edges, y_edges],
+        weights=be.to_numpy(rays.i)[mask],
+    )
+    pixel_area = (x_edges[1] - x_edges[0]) * (y_edges[1] - y_edges[0])
+
+    irradiance, spot = reduce_stream(
+        lens.trace_stream(0.0, 1.0, 0.55, num_rays=12, chunk_size=40),
+        IrradianceReducer(x_edges, y_edges),
+        SpotReducer(),
+    )
+    assert irradiance.shape == (10, 8)
+    assert_allclose(irradiance, expected / pixel_area)
+    assert spot["rms_spot_radius"] > 0
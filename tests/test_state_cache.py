@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import optiland.backend as be
+from optiland.aberrations import Aberrations
+from optiland.optimization import OptimizationProblem
+from optiland.samples.objectives import CookeTriplet
+from tests.utils import assert_allclose
+
+
+def _count_paraxial_traces(lens, monkeypatch):
+    calls = []
+    tracer = lens.paraxial._ray_tracer
+    trace_generic = tracer.trace_generic
+
+    def counting_trace_generic(*args, **kwargs):
+        calls.append(args)
+        return trace_generic(*args, **kwargs)
+
+    monkeypatch.setattr(tracer, "trace_generic", counting_trace_generic)
+    return calls
+
+
+def test_results_are_memoized_while_active(set_test_backend, monkeypatch):
+    lens = CookeTriplet()
+    calls = _count_paraxial_traces(lens, monkeypatch)
+    expected = lens.paraxial.f2()
+    num_calls = len(calls)
+    lens.paraxial.f2()
+    assert len(calls) == 2 * num_calls
+
+    with lens.state_cache.activate():
+        assert_allclose(lens.paraxial.f2(), expected)
+        lens.paraxial.f2()
+        assert len(calls) == 3 * num_calls
+
+    # the memoized results are discarded with the outermost context
+    lens.paraxial.f2()
+    assert len(calls) == 4 * num_calls
+
+
+def test_aberration_precalculations_on_cache_hit(set_test_backend):
+    lens = CookeTriplet()
+    with lens.state_cache.activate():
+        first = Aberrations(lens)
+        first._precalculations()
+
+        # the precalculated values are memoized, but set on every instance
+        second = Aberrations(lens)
+        second._precalculations()
+        assert_allclose(second._B, first._B)
+        assert_allclose(second._ua, first._ua)
+        assert_allclose(second.TSC(), Aberrations(lens).TSC())
+
+
+def test_memoized_arrays_are_not_shared(set_test_backend):
+    lens = CookeTriplet()
+    with lens.state_cache.activate():
+        ya, ua = lens.paraxial.marginal_ray()
+        expected = be.copy(ya)
+        ya[...] = 0.0
+        ua[...] = 0.0
+        ya_again, _ = lens.paraxial.marginal_ray()
+        assert_allclose(ya_again, expected)
+
+
+def test_updater_invalidates_results(set_test_backend):
+    lens = CookeTriplet()
+    with lens.state_cache.activate():
+        f2 = lens.paraxial.f2()
+        version = lens.state_version
+        lens.updater.set_radius(30.0, 1)
+        assert lens.state_version > version
+        f2_new = lens.paraxial.f2()
+    assert not be.isclose(f2_new, f2)
+    assert_allclose(f2_new, lens.paraxial.f2())
+
+
+def test_direct_modification_outside_context(set_test_backend):
+    lens = CookeTriplet()
+    with lens.state_cache.activate():
+        f2 = lens.paraxial.f2()
+    lens.surfaces[1].geometry.radius = be.array(30.0)
+    with lens.state_cache.activate():
+        assert not be.isclose(lens.paraxial.f2(), f2)
+
+
+def test_direct_modification_inside_context(set_test_backend):
+    lens = CookeTriplet()
+    with lens.state_cache.activate():
+        f2 = lens.paraxial.f2()
+        version = lens.state_version
+        lens.surfaces[1].geometry.radius = be.array(30.0)
+        assert lens.state_version > version
+        assert not be.isclose(lens.paraxial.f2(), f2)
+
+
+def test_aberrations_are_memoized(set_test_backend, monkeypatch):
+    lens = CookeTriplet()
+    expected = lens.aberrations.third_order()
+    with lens.state_cache.activate():
+        result = lens.aberrations.third_order()
+        calls = _count_paraxial_traces(lens, monkeypatch)
+        lens.aberrations.seidels()
+        lens.aberrations.TSC()
+        lens.aberrations.SC()
+        assert not calls
+    for value, expected_value in zip(result, expected, strict=True):
+        assert_allclose(value, expected_value)
+
+
+def test_problem_shares_analysis_between_operands(set_test_backend, monkeypatch):
+    lens = CookeTriplet()
+    problem = OptimizationProblem()
+    input_data = {"optic": lens}
+    problem.add_operand(operand_type="f2", target=50, input_data=input_data)
+    problem.add_operand(operand_type="EPD", target=10, input_data=input_data)
+    for seidel_number in range(1, 6):
+        problem.add_operand(
+            operand_type="seidel",
+            target=0.0,
+            input_data={"optic": lens, "seidel_number": seidel_number},
+        )
+    problem.add_operand(
+        operand_type="TSC", target=0.0, input_data={"optic": lens, "surface_number": 1}
+    )
+    problem.add_variable(lens, "radius", surface_number=1)
+
+    expected = be.sum(be.stack([op.fun() ** 2 for op in problem.operands]))
+    calls = _count_paraxial_traces(lens, monkeypatch)
+    assert_allclose(problem.sum_squared(), expected)
+    num_calls = len(calls)
+
+    # one evaluation requires about as many traces as a single operand would
+    calls.clear()
+    lens.aberrations.seidels()
+    assert num_calls <= len(calls) + 5
+
+    # variable updates change the state version
+    version = lens.state_version
+    problem.variables[0].update(problem.variables[0].value * 1.01)
+    assert lens.state_version > version
+    expected = be.sum(be.stack([op.fun() ** 2 for op in problem.operands]))
+    assert_allclose(problem.sum_squared(), expected)
@@ -583,3 +583,62 @@ class TestSurfaceGroupUpdatesRealObjects:
             match=("Surface index cannot be zero after first surface is created."),
         ):
             lens1.surfaces.add(index=0, thickness=be.inf, material="Air")
+
+
+class TestSurfaceGroupRecordPolicy:
+    def _trace(self, record):
+        from optiland.samples.objectives import CookeTriplet
+
+        lens = CookeTriplet()
+        rays = lens.trace(0.0, 1.0, 0.55, num_rays=5, record=record)
+        return lens, rays
+
+    def test_record_all(self, set_test_backend):
+        lens, _ = self._trace("all")
+        assert lens.surfaces.x.shape == (lens.surfaces.num_surfaces, 91)
+
+    def test_record_image(self, set_test_backend):
+        lens, rays = self._trace("image")
+        num_surfaces = lens.surfaces.num_surfaces
+        assert lens.surfaces.x.shape == (num_surfaces, 91)
+        assert_allclose(lens.surfaces.x[-1], rays.x)
+        assert be.all(be.isnan(lens.surfaces.x[:-1]))
+        for surface in lens.surfaces.surfaces[:-1]:
+            assert be.size(surface.x) == 0
+
+    def test_record_none(self, set_test_backend):
+        lens, rays = self._trace("none")
+        assert be.size(rays.x) == 91
+        for surface in lens.surfaces.surfaces:
+            assert be.size(surface.x) == 0
+        with pytest.raises(ValueError, match="No ray data"):
+            lens.surfaces.x
+
+    def test_record_indices_match_full_trace(self, set_test_backend):
+        lens_all, _ = self._trace("all")
+        lens, _ = self._trace([2, -1])
+        recorded = [i for i, s in enumerate(lens.surfaces.surfaces) if be.size(s.x) > 0]
+        assert recorded == [2, lens.surfaces.num_surfaces - 1]
+        assert_allclose(lens.surfaces[2].y, lens_all.surfaces[2].y)
+        assert_allclose(lens.surfaces[-1].opd, lens_all.surfaces[-1].opd)
+        # rows of the stacked data stay aligned with the surface indices
+        assert_allclose(lens.surfaces.y[2], lens_all.surfaces.y[2])
+        assert be.all(be.isnan(lens.surfaces.y[3]))
+
+    def test_record_trace_generic(self, set_test_backend):
+        from optiland.samples.objectives import CookeTriplet
+
+        lens = CookeTriplet()
+        lens.trace_generic(0.0, 1.0, 0.0, 1.0, 0.55, record="image")
+        assert lens.surfaces.y.shape == (lens.surfaces.num_surfaces, 1)
+
+    def test_record_invalid(self, set_test_backend):
+        lens = optic.Optic()
+        lens.surfaces.add(index=0, radius=be.inf, thickness=be.inf)
+        lens.surfaces.add(index=1, radius=be.inf, thickness=5, is_stop=True)
+        lens.surfaces.add(index=2)
+        with pytest.raises(ValueError, match="Invalid record policy"):
+            lens.surfaces.resolve_record_indices("some")
+        with pytest.raises(IndexError):
+            lens.surfaces.resolve_record_indices([3])
+        assert lens.surfaces.resolve_record_indices([-1, 0]) == {0, 2}
@@ -1099,6 +1099,83 @@ class TestSpectralAnalyzer:
         )
 
 
+class TestRTLookupTable:
+    """Test the tabulated element-wise coefficients."""
+
+    wavelengths = np.array([0.48613, 0.58756, 0.65627])
+
+    def rays(self, num_rays=500):
+        rng = np.random.default_rng(0)
+        wl = self.wavelengths[rng.integers(0, 3, num_rays)]
+        th = rng.uniform(0.0, np.deg2rad(80.0), num_rays)
+        return wl, th
+
+    def test_matches_tmm(self, multilayer_stack):
+        wl, th = self.rays()
+        expected = {
+            pol: multilayer_stack.compute_rtRTA_elementwise(wl, th, pol)
+            for pol in ["s", "p", "u"]
+        }
+        table = multilayer_stack.enable_lookup_table(self.wavelengths)
+        assert table.max_error < 1e-2
+        for pol in ["s", "p", "u"]:
+            result = multilayer_stack.compute_rtRTA_elementwise(wl, th, pol)
+            for key in ["r", "t"]:
+                error = np.max(np.abs(result[key] - expected[pol][key]))
+                assert error <= table.max_error
+            assert_allclose(result["R"] + result["T"] + result["A"], 1.0)
+
+    def test_tolerance(self, multilayer_stack):
+        wl, th = self.rays()
+        expected = multilayer_stack.compute_rtRTA_elementwise(wl, th, "p")
+        table = multilayer_stack.enable_lookup_table(
+            self.wavelengths, num_aoi=10, tolerance=1e-5
+        )
+        assert table.max_error <= 1e-5
+        assert len(table.aoi) > 10
+        result = multilayer_stack.compute_rtRTA_elementwise(wl, th, "p")
+        assert_allclose(result["r"], expected["r"], atol=1e-5)
+
+        with pytest.warns(UserWarning):
+            multilayer_stack.enable_lookup_table(
+                self.wavelengths, num_aoi=10, tolerance=1e-12
+            )
+
+    def test_untabulated_rays(self, multilayer_stack):
+        wl = np.array([0.58756, 0.55, 0.58756])
+        th = np.array([0.3, 0.3, np.deg2rad(89.5)])
+        expected = multilayer_stack.compute_rtRTA_elementwise(wl, th, "s")
+        multilayer_stack.enable_lookup_table(self.wavelengths)
+        result = multilayer_stack.compute_rtRTA_elementwise(wl, th, "s")
+        assert_allclose(result["r"][1:], expected["r"][1:], rtol=1e-12)
+
+    def test_invalidation(self, multilayer_stack, sio2):
+        wl, th = self.rays(50)
+        table = multilayer_stack.enable_lookup_table(self.wavelengths, tolerance=1e-6)
+        assert table.is_valid
+
+        multilayer_stack.layers[0].thickness_um *= 1.1
+        multilayer_stack.add_layer_nm(sio2, 50.0)
+        multilayer_stack.incident_material = IdealMaterial(n=1.33)
+        assert not table.is_valid
+
+        result = multilayer_stack.compute_rtRTA_elementwise(wl, th, "s")
+        assert table.is_valid
+        multilayer_stack.disable_lookup_table()
+        assert multilayer_stack.lookup_table is None
+        expected = multilayer_stack.compute_rtRTA_elementwise(wl, th, "s")
+        assert_allclose(result["r"], expected["r"], atol=1e-6)
+
+    def test_copy_has_no_table(self, multilayer_stack):
+        multilayer_stack.enable_lookup_table(self.wavelengths)
+        assert multilayer_stack.copy().lookup_table is None
+        assert multilayer_stack.deep_copy().lookup_table is None
+
+    def test_invalid_num_aoi(self, multilayer_stack):
+        with pytest.raises(ValueError):
+            multilayer_stack.enable_lookup_table(self.wavelengths, num_aoi=1)
+
+
 @pytest.mark.usefixtures("thin_film_torch_compat")
 class TestThinFilmStackComplex:
     """Test more complex scenarios."""
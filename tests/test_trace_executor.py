@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import pytest
+
+import optiland.backend as be
+from optiland.analysis import SpotDiagram
+from optiland.raytrace import TraceExecutor, get_executor, set_executor
+from optiland.samples.objectives import CookeTriplet
+from optiland.wavefront import Wavefront
+from tests.utils import assert_allclose
+
+
+@pytest.fixture
+def restore_executor():
+    executor = get_executor()
+    yield
+    set_executor(executor)
+
+
+class _Squarer:
+    def __init__(self):
+        self.calls = 0
+
+    def square(self, x, offset=0):
+        self.calls += 1
+        return x**2 + offset
+
+    def precision(self, _):
+        return be.get_precision()
+
+
+@pytest.mark.parametrize("mode", ["serial", "thread", "process"])
+def test_map_preserves_order(mode):
+    executor = TraceExecutor(mode, max_workers=2)
+    jobs = [(k, 1) for k in range(10)]
+    assert executor.map(_Squarer(), "square", jobs) == [k**2 + 1 for k in range(10)]
+
+
+def test_map_replicates_target_on_threads():
+    target = _Squarer()
+    TraceExecutor("thread", max_workers=2).map(target, "square", [(1,), (2,)])
+    assert target.calls == 0
+    TraceExecutor("serial").map(target, "square", [(1,), (2,)])
+    assert target.calls == 2
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_pool_persists_between_calls(mode):
+    with TraceExecutor(mode, max_workers=2) as executor:
+        assert executor.map(_Squarer(), "square", [(1,), (2,)]) == [1, 4]
+        pool = executor._pool
+        assert executor.map(_Squarer(), "square", [(3,), (4,)]) == [9, 16]
+        assert executor._pool is pool
+    assert executor._pool is None
+
+
+def test_process_workers_use_precision():
+    be.set_precision("float32")
+    try:
+        with TraceExecutor("process", max_workers=2) as executor:
+            assert executor.map(_Squarer(), "precision", [(0,), (1,)]) == [32, 32]
+    finally:
+        be.set_precision("float64")
+
+
+def test_invalid_executor():
+    with pytest.raises(ValueError):
+        TraceExecutor("gpu")
+    with pytest.raises(ValueError):
+        TraceExecutor("thread", max_workers=0)
+
+
+def test_set_executor(restore_executor):
+    set_executor("thread", max_workers=3)
+    assert get_executor().mode == "thread"
+    assert get_executor().max_workers == 3
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_spot_diagram_parallel(set_test_backend, restore_executor, mode):
+    lens = CookeTriplet()
+    serial = SpotDiagram(lens, num_rings=4)
+
+    set_executor(mode, max_workers=2)
+    parallel = SpotDiagram(lens, num_rings=4)
+
+    assert len(parallel.data) == len(serial.data)
+    for field_serial, field_parallel in zip(serial.data, parallel.data, strict=True):
+        assert len(field_parallel) == len(field_serial)
+        for a, b in zip(field_serial, field_parallel, strict=True):
+            assert_allclose(a.x, b.x)
+            assert_allclose(a.y, b.y)
+            assert_allclose(a.intensity, b.intensity)
+    for rms_serial, rms_parallel in zip(
+        serial.rms_spot_radius(), parallel.rms_spot_radius(), strict=True
+    ):
+        for a, b in zip(rms_serial, rms_parallel, strict=True):
+            assert_allclose(a, b)
+
+
+def test_wavefront_parallel(set_test_backend, restore_executor):
+    lens = CookeTriplet()
+    serial = Wavefront(lens, num_rays=8)
+
+    set_executor("process", max_workers=2)
+    parallel = Wavefront(lens, num_rays=8)
+
+    assert parallel.data.keys() == serial.data.keys()
+    for key, data in serial.data.items():
+        assert_allclose(parallel.data[key].opd, data.opd)
+        assert_allclose(parallel.data[key].intensity, data.intensity)
+    assert be.size(lens.surfaces[-1].x) > 0
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import pytest
+
+import optiland.backend as be
+from optiland.physical_apertures import RadialAperture
+from optiland.raytrace import TracePlan
+from optiland.raytrace.trace_plan import _plane_distance
+from optiland.samples.objectives import CookeTriplet, DoubleGauss
+from optiland.samples.simple import AsphericSinglet
+from optiland.samples.telescopes import HubbleTelescope
+from tests.utils import assert_allclose
+
+ATTRS = ["x", "y", "z", "L", "M", "N", "i", "opd"]
+SURFACE_ATTRS = ["x", "y", "z", "L", "M", "N", "intensity", "opd"]
+
+
+def _trace(lens, plan, buffered=False, Hy=1.0, record="all"):
+    lens.ray_tracer.use_trace_plan = plan
+    lens.ray_tracer.use_ray_buffer = buffered
+    return lens.trace(0.0, Hy, 0.55, num_rays=16, distribution="uniform", record=record)
+
+
+def _surface_data(lens):
+    return [
+        [be.copy(getattr(surface, attr)) for attr in SURFACE_ATTRS]
+        for surface in lens.surfaces
+    ]
+
+
+@pytest.mark.parametrize(
+    "lens_cls", [CookeTriplet, DoubleGauss, HubbleTelescope, AsphericSinglet]
+)
+@pytest.mark.parametrize("buffered", [False, True])
+def test_plan_matches_generic(lens_cls, buffered):
+    lens = lens_cls()
+    generic = _trace(lens, plan=False)
+    generic_data = _surface_data(lens)
+    planned = _trace(lens, plan=True, buffered=buffered)
+    assert lens.ray_tracer._trace_plan is not None
+
+    for attr in ATTRS:
+        assert_allclose(getattr(planned, attr), getattr(generic, attr), atol=1e-8)
+    for expected, actual in zip(generic_data, _surface_data(lens), strict=True):
+        for a, b in zip(expected, actual, strict=True):
+            assert_allclose(b, a, atol=1e-8)
+
+
+def test_plan_record_policy():
+    lens = CookeTriplet()
+    _trace(lens, plan=False)
+    image_y = be.copy(lens.surfaces[-1].y)
+    surface_y = be.copy(lens.surfaces[3].y)
+
+    _trace(lens, plan=True, record="image")
+    assert_allclose(lens.surfaces[-1].y, image_y)
+    assert be.size(lens.surfaces[3].y) == 0
+
+    _trace(lens, plan=True, record=[3])
+    assert_allclose(lens.surfaces[3].y, surface_y)
+    assert be.size(lens.surfaces[-1].y) == 0
+
+    rays = _trace(lens, plan=True, record="none")
+    assert_allclose(rays.y, image_y)
+    assert all(be.size(surface.y) == 0 for surface in lens.surfaces)
+
+
+def test_plan_aperture_clipping():
+    lens = CookeTriplet()
+    lens.surfaces[3].aperture = RadialAperture(r_max=4.0, r_min=0.5)
+    generic = _trace(lens, plan=False, Hy=0.7)
+    planned = _trace(lens, plan=True, Hy=0.7)
+    assert be.sum(generic.i == 0) > 0
+    for attr in ATTRS:
+        assert_allclose(getattr(planned, attr), getattr(generic, attr))
+
+
+def test_plan_rebuilt_on_change():
+    lens = CookeTriplet()
+    _trace(lens, plan=True)
+    plan = lens.ray_tracer._trace_plan
+    assert plan.is_valid(lens.surfaces)
+
+    lens.updater.set_radius(25.0, 1)
+    assert not plan.is_valid(lens.surfaces)
+    planned = _trace(lens, plan=True)
+    assert lens.ray_tracer._trace_plan is not plan
+    generic = _trace(lens, plan=False)
+    for attr in ATTRS:
+        assert_allclose(getattr(planned, attr), getattr(generic, attr))
+
+
+def test_plan_falls_back_for_unsupported_surfaces():
+    lens = CookeTriplet()
+    lens.surfaces[3].geometry.cs.y = be.array(0.2)
+    assert TracePlan.signature(lens.surfaces) is None
+    with pytest.raises(ValueError):
+        TracePlan(lens.surfaces)
+
+    generic = _trace(lens, plan=False)
+    planned = _trace(lens, plan=True)
+    assert lens.ray_tracer._trace_plan is None
+    for attr in ATTRS:
+        assert_allclose(getattr(planned, attr), getattr(generic, attr))
+
+
+def test_plane_distance_grazing_ray():
+    assert be.isfinite(_plane_distance(1.0, 0.0))
+    assert_allclose(_plane_distance(1.0, -0.5), 2.0)